@@ -12,6 +12,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import logging
 
+from src.utils.sqlite_pool import connection_manager
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,9 +73,13 @@ class SignalStorage:
         # その他の場合は現在時刻を返す
         return datetime.now().isoformat()
     
+    def _connect(self) -> sqlite3.Connection:
+        """スレッドごとにプールされたSQLite接続を取得"""
+        return connection_manager.connection(self.db_path)
+    
     def initialize_database(self):
         """データベース初期化"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # シグナル履歴テーブル
@@ -159,7 +165,7 @@ class SignalStorage:
             保存されたシグナルのID
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # active_rulesをJSON文字列に変換
@@ -242,7 +248,7 @@ class SignalStorage:
                 query += " LIMIT ?"
                 params.append(limit)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 df = pd.read_sql_query(query, conn, params=params)
                 
                 if not df.empty:
@@ -271,7 +277,7 @@ class SignalStorage:
             保存されたレコードのID
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -346,7 +352,7 @@ class SignalStorage:
             
             query += " ORDER BY entry_time DESC"
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 df = pd.read_sql_query(query, conn, params=params)
                 
                 if not df.empty:
@@ -485,7 +491,7 @@ class SignalStorage:
                 query += " AND sh.symbol = ?"
                 params.append(symbol)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 df = pd.read_sql_query(query, conn, params=params)
             
             if df.empty:
@@ -520,7 +526,7 @@ class SignalStorage:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # 古いシグナル履歴削除
@@ -549,7 +555,7 @@ class SignalStorage:
             データベース統計情報
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # 各テーブルのレコード数取得
@@ -14,6 +14,11 @@ sys.path.append(str(Path(__file__).parent))
 
 from src.data_collector.stock_data_collector import StockDataCollector
 from src.data_collector.symbol_manager import SymbolManager, MarketType
+from src.data_collector.bar_store import ParquetBarStore, migrate_sqlite_cache
+from src.data_collector.bar_resampler import BarResampler
+from src.data_collector.cache_retention import CacheRetentionManager
+from src.data_collector.refresh_daemon import RefreshDaemon
+from src.data_collector.watchlist_storage import WatchlistStorage
 from src.config.settings import settings_manager
 from src.utils.data_validator import DataValidator
 from src.technical_analysis.indicators import TechnicalIndicators
@@ -84,13 +89,14 @@ def collect_multiple_stocks(symbols: List[str], interval: str = "5m", period: st
         info = symbol_manager.get_symbol_info(symbol)
         print(f"  {symbol} -> {normalized} ({info['name']})")
     
-    # 並列データ取得
-    print(f"\n並列取得開始...")
+    # 一括データ取得
+    print("\n一括取得開始...")
     results = collector.get_multiple_stocks(
         symbols=normalized_symbols,
         interval=interval,
         period=period,
-        use_cache=True
+        use_cache=True,
+        batch_size=settings_manager.settings.data_collector.download_batch_size
     )
     
     # 結果表示
@@ -117,9 +123,27 @@ def show_cache_stats():
     stats = collector.get_cache_stats()
     
     print(f"総レコード数: {stats.get('total_records', 0):,}")
+    if stats.get('cold_blocks'):
+        print(f"  うち圧縮済み: {stats['cold_records']:,}件 ({stats['cold_blocks']:,}ブロック)")
     print(f"登録銘柄数: {stats.get('unique_symbols', 0)}")
     print(f"最終更新: {stats.get('latest_update', 'N/A')}")
-    print(f"キャッシュサイズ: {stats.get('cache_file_size', 'N/A')}")
+    print(f"キャッシュサイズ: {stats.get('cache_file_size', 'N/A')} "
+          f"(データ推定 {stats.get('data_size', 'N/A')})")
+
+    pool_stats = stats.get('connection_pool')
+    if pool_stats:
+        print(f"DB接続プール: {pool_stats['open_connections']}接続 / "
+              f"再利用率 {pool_stats['reuse_ratio'] * 100:.1f}%")
+
+    frame_stats = stats.get('frame_cache')
+    if frame_stats:
+        print(f"メモリキャッシュ: {frame_stats['entries']}系列 / "
+              f"{frame_stats['bytes'] / 1024 / 1024:.1f}MB / "
+              f"ヒット率 {frame_stats['hit_ratio'] * 100:.1f}%")
+
+    flight_stats = stats.get('single_flight')
+    if flight_stats:
+        print(f"同時リクエスト共有: {flight_stats['shared']}件 / 実行 {flight_stats['executed']}件")
 
 
 def show_sample_symbols():
@@ -159,8 +183,9 @@ def technical_analysis(symbol: str, interval: str = "5m", period: str = "1d"):
     print(f"銘柄情報: {symbol_info['name']} ({normalized_symbol})")
     
     try:
-        # データ取得
-        data = collector.get_stock_data(
+        # データ取得（キャッシュ済みの細かい足から生成できる場合はリサンプリング）
+        resampler = BarResampler(collector, symbol_manager)
+        data = resampler.get_resampled(
             symbol=normalized_symbol,
             interval=interval,
             period=period,
@@ -364,8 +389,9 @@ def support_resistance_analysis(symbol: str, interval: str = "1h", period: str =
     print(f"銘柄情報: {symbol_info['name']} ({normalized_symbol})")
     
     try:
-        # データ取得
-        data = collector.get_stock_data(
+        # データ取得（キャッシュ済みの細かい足から生成できる場合はリサンプリング）
+        resampler = BarResampler(collector, symbol_manager)
+        data = resampler.get_resampled(
             symbol=normalized_symbol,
             interval=interval,
             period=period,
@@ -603,6 +629,13 @@ def clean_cache(days: int = 30):
     # クリーニング実行
     collector.clear_cache(older_than_days=days)
     
+    # 保持期間・容量上限の適用と空き領域の返却
+    retention = CacheRetentionManager(collector).enforce()
+    if retention['expired_rows'] or retention['evicted_series']:
+        print(f"保持期間外: {retention['expired_rows']:,}件 / "
+              f"容量超過: {retention['evicted_series']}系列 ({retention['evicted_rows']:,}件)")
+    print(f"返却ページ数: {retention['freed_pages']:,}")
+
     # クリーニング後の統計
     stats_after = collector.get_cache_stats()
     print(f"クリーニング後: {stats_after.get('total_records', 0):,}件")
@@ -611,6 +644,61 @@ def clean_cache(days: int = 30):
     print(f"削除されたレコード: {removed:,}件")
 
 
+def compact_cache(days: int = None):
+    """古い取引日のキャッシュを日次圧縮ブロックへ移動"""
+    if days is None:
+        days = settings_manager.settings.data_collector.cold_storage_days
+    print(f"{days}日より前の取引日のキャッシュを圧縮")
+
+    collector = StockDataCollector()
+    size_before = collector.db_path.stat().st_size
+
+    compacted = collector.compact_cache(older_than_days=days, vacuum=True)
+
+    size_after = collector.db_path.stat().st_size
+    print(f"圧縮件数: {compacted:,}件")
+    print(f"キャッシュサイズ: {size_before / 1024 / 1024:.2f} MB → "
+          f"{size_after / 1024 / 1024:.2f} MB")
+
+
+def migrate_cache():
+    """SQLiteキャッシュをParquetバックエンドへ移行"""
+    print("SQLiteキャッシュをParquetへ移行")
+
+    cache_dir = Path(settings_manager.settings.data_collector.cache_dir)
+    store = ParquetBarStore(cache_dir / "bars")
+    result = migrate_sqlite_cache(cache_dir / "stock_data.db", store)
+
+    print(f"移行系列数: {result['series']}")
+    print(f"移行レコード数: {result['records']:,}件")
+    print(f"移行先: {store.root_dir}")
+    print("config/settings.json の data_collector.storage_backend を "
+          "\"parquet\" に変更すると有効になります")
+
+
+def run_refresh_daemon(once: bool = False):
+    """ウォッチリストのキャッシュ先読み（onceなら全間隔を1回ずつ実行して終了）"""
+    settings_manager.setup_logging()
+    daemon = RefreshDaemon(watchlist_storage=WatchlistStorage())
+    symbols = daemon.get_symbols()
+    intervals = daemon.config.data_update_intervals
+
+    print(f"キャッシュ先読み: {len(symbols)}銘柄")
+    for interval, expression in intervals.items():
+        print(f"  {interval}: {expression} ({daemon.config.timezone})")
+
+    if once:
+        results = daemon.refresh_all()
+        for interval, summary in results.items():
+            print(f"{interval}: 成功 {summary['refreshed']} / 失敗 {summary['failed']} "
+                  f"/ スキップ {summary['skipped']}")
+        return all(summary['failed'] == 0 for summary in results.values())
+
+    print("Ctrl+Cで停止します")
+    daemon.run()
+    return True
+
+
 def main():
     """メイン関数"""
     parser = argparse.ArgumentParser(
@@ -642,6 +730,15 @@ def main():
   # 30日以上古いキャッシュをクリーニング
   python main.py --clean-cache 30
   
+  # 30日より前の取引日のキャッシュを圧縮ブロックへ移動
+  python main.py --compact-cache 30
+
+  # SQLiteキャッシュをParquetバックエンドへ移行
+  python main.py --migrate-cache
+
+  # ウォッチリストのキャッシュ先読みデーモン（scheduler.data_update_intervals のスケジュールで実行）
+  python main.py --refresh-daemon
+
   # サンプル銘柄表示
   python main.py --samples
         """
@@ -665,6 +762,16 @@ def main():
                        help="キャッシュ統計表示")
     parser.add_argument("--clean-cache", type=int, metavar="DAYS",
                        help="指定日数以上古いキャッシュをクリーニング")
+    parser.add_argument("--compact-cache", type=int, nargs="?", const=-1,
+                        metavar="DAYS",
+                        help="指定日数より前の取引日のキャッシュを圧縮 "
+                             "(省略時: cold_storage_days)")
+    parser.add_argument("--migrate-cache", action="store_true",
+                        help="SQLiteキャッシュをParquetバックエンドへ移行")
+    parser.add_argument("--refresh-daemon", action="store_true",
+                        help="ウォッチリストのキャッシュ先読みデーモンを起動")
+    parser.add_argument("--once", action="store_true",
+                        help="--refresh-daemon で全間隔を1回ずつ先読みして終了")
     parser.add_argument("--samples", action="store_true",
                        help="サンプル銘柄表示")
     
@@ -709,6 +816,19 @@ def main():
         elif args.clean_cache is not None:
             clean_cache(args.clean_cache)
         
+        # キャッシュ圧縮
+        elif args.compact_cache is not None:
+            compact_cache(None if args.compact_cache < 0 else args.compact_cache)
+
+        # キャッシュ移行
+        elif args.migrate_cache:
+            migrate_cache()
+
+        # キャッシュ先読み
+        elif args.refresh_daemon:
+            success = run_refresh_daemon(args.once)
+            sys.exit(0 if success else 1)
+
         # サンプル銘柄表示
         elif args.samples:
             show_sample_symbols()
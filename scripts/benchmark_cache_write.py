@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+キャッシュ書き込みベンチマークスクリプト
+
+従来の1行ずつINSERTする方式と、StockDataCollector.save_framesによる
+単一トランザクションの一括挿入を比較し、rows/秒を表示する。
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# プロジェクトルートをPythonパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data_collector.stock_data_collector import StockDataCollector
+
+
+def create_frames(symbols: int, bars: int) -> list:
+    """ベンチマーク用の1分足データを生成"""
+    rng = np.random.default_rng(42)
+    timestamps = pd.date_range("2024-01-01 09:00", periods=bars, freq="1min")
+    frames = []
+    for i in range(symbols):
+        closes = 1000 + np.cumsum(rng.normal(0, 1, bars))
+        frames.append(pd.DataFrame({
+            "timestamp": timestamps,
+            "open": closes,
+            "high": closes + 1,
+            "low": closes - 1,
+            "close": closes,
+            "volume": rng.integers(1000, 10000, bars),
+            "symbol": f"BENCH{i:03d}",
+            "interval": "1m",
+            "created_at": datetime.now().isoformat(),
+        }))
+    return frames
+
+
+# 旧スキーマ（TEXTタイムスタンプ）のstock_dataテーブル
+LEGACY_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS stock_data (
+        symbol TEXT,
+        interval TEXT,
+        timestamp TEXT,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume INTEGER,
+        created_at TEXT,
+        PRIMARY KEY (symbol, interval, timestamp)
+    )
+"""
+
+
+def legacy_save(db_path: Path, frames: list) -> None:
+    """従来方式: TEXTスキーマのテーブルへiterrowsで1行ずつINSERT"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(LEGACY_TABLE_SQL)
+        for frame in frames:
+            data = frame.copy()
+            data["timestamp"] = data["timestamp"].astype(str)
+            data = data[StockDataCollector.CACHE_COLUMNS]
+            for _, row in data.iterrows():
+                conn.execute(
+                    "INSERT OR REPLACE INTO stock_data "
+                    "(symbol, interval, timestamp, open, high, low, close, volume, "
+                    "created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    tuple(row),
+                )
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="キャッシュ書き込みベンチマーク")
+    parser.add_argument("--symbols", type=int, default=50, help="銘柄数")
+    parser.add_argument(
+        "--bars", type=int, default=1950, help="銘柄あたりのバー数（5日分の1分足≒1950）"
+    )
+    args = parser.parse_args()
+
+    frames = create_frames(args.symbols, args.bars)
+    total_rows = args.symbols * args.bars
+    print(f"📊 {args.symbols}銘柄 x {args.bars}本 = {total_rows:,}行")
+
+    with tempfile.TemporaryDirectory() as legacy_dir, \
+            tempfile.TemporaryDirectory() as bulk_dir:
+        start = time.perf_counter()
+        legacy_save(Path(legacy_dir) / "legacy.db", frames)
+        legacy_elapsed = time.perf_counter() - start
+
+        bulk_collector = StockDataCollector(cache_dir=bulk_dir)
+        bulk_collector.save_frames(frames)
+        bulk_stats = bulk_collector.last_write_stats
+
+    print(f"従来方式: {legacy_elapsed:.2f}秒 ({total_rows / legacy_elapsed:,.0f} rows/s)")
+    print(
+        f"一括挿入: {bulk_stats['seconds']:.2f}秒 "
+        f"({bulk_stats['rows_per_second']:,.0f} rows/s)"
+    )
+    print(f"高速化率: {legacy_elapsed / bulk_stats['seconds']:.1f}倍")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,33 @@ class DataCollectorConfig:
     cache_dir: str = "cache"
     max_workers: int = 5
     min_request_interval: float = 0.1
-    cache_expire_hours: int = 1
+    cache_expire_hours: int = 1  # 固定期限ポリシー・市場不明の銘柄のキャッシュ有効期限
+    # "fixed"（cache_expire_hoursの固定期限）または "market_hours"（取引時間に基づく）
+    cache_ttl_policy: str = "fixed"
+    market_holidays: Dict[str, List[str]] = field(default_factory=dict)  # 市場ごとの追加休場日
     default_interval: str = "1m"
     default_period: str = "1d"
     retry_attempts: int = 3
     retry_min_wait: int = 4
     retry_max_wait: int = 10
+    storage_backend: str = "sqlite"  # "sqlite" または "parquet"（pyarrowが必要）
+    download_batch_size: int = 50  # 複数銘柄一括ダウンロードの1リクエストあたり銘柄数
+    data_provider: str = "yfinance"  # "yfinance" または "replay"（オフライン再生）
+    replay_data_dir: str = "cache/replay"  # replay時の記録データディレクトリ
+    replay_latency: float = 0.0  # replay時の1リクエストあたり疑似レイテンシ（秒）
+    frame_cache_mb: int = 128  # 読み込み済みバーデータのメモリキャッシュ上限（0で無効）
+    cold_storage_days: int = 30  # この日数より前の取引日のバーを日次圧縮ブロックへ移動（0で無効）
+    retention_days: int = 0  # この日数より前のバーを削除（0で無期限）
+    max_cache_mb: int = 0  # バーデータの容量上限、超過時は最終取得が古い系列から削除（0で無制限）
+    compact_frames: bool = False  # 返却するバーデータから銘柄・間隔・取得時刻の列を除き、数値列を詰める
+    compact_float32: bool = False  # compact_frames時に価格列をfloat32にする
+    fundamentals_ttl_hours: Dict[str, float] = field(default_factory=lambda: {
+        "info": 24,             # 銘柄情報（株価連動の指標を含む）
+        "financials": 720,      # 損益計算書（四半期ごとの更新）
+        "balance_sheet": 720    # 貸借対照表（四半期ごとの更新）
+    })
+    ingestion_validation: bool = True  # 取得したバーを保存前に検証し、不正なバーを隔離テーブルへ移す
+    ingestion_max_price_jump: float = 0.5  # 直前のバーの終値（中央値）からの乖離率がこれを超えるバーを隔離（0で無効）
 
 
 @dataclass
@@ -28,11 +49,14 @@ class DatabaseConfig:
     backup_enabled: bool = True
     backup_interval_hours: int = 24
     vacuum_interval_days: int = 7
+    cache_size_kb: int = 16000  # 接続ごとのページキャッシュ（PRAGMA cache_size）
+    mmap_size_mb: int = 256  # メモリマップI/Oの上限（PRAGMA mmap_size）
     backup_dir: str = "cache/backups"
     backup_before_operations: List[str] = field(default_factory=lambda: ["remove", "clear", "reorder"])
     backup_retention_count: int = 10
     backup_compression_enabled: bool = False
     daily_backup_enabled: bool = True
+    backup_incremental: bool = True  # ページ単位の差分バックアップ（変更されたページのみ保存）
 
 
 @dataclass
@@ -57,6 +81,11 @@ class SchedulerConfig:
         "1h": "0 * * * *",    # 毎時
         "1d": "0 9 * * *"     # 毎日9時
     })
+    refresh_max_concurrency: int = 4  # 先読みの同時取得銘柄数
+    refresh_jitter_seconds: int = 30  # 先読み開始時刻の揺らぎ（秒）
+    refresh_backoff_base_seconds: int = 60  # 先読み失敗時の初回待機（秒、失敗ごとに倍増）
+    refresh_backoff_max_seconds: int = 3600  # 先読み失敗時の最大待機（秒）
+    fundamentals_refresh_cron: str = "0 8 * * 1-5"  # ファンダメンタルズの一括更新（空文字で無効）
 
 
 @dataclass
@@ -215,18 +244,43 @@ class SettingsManager:
                 "max_workers": settings.data_collector.max_workers,
                 "min_request_interval": settings.data_collector.min_request_interval,
                 "cache_expire_hours": settings.data_collector.cache_expire_hours,
+                "cache_ttl_policy": settings.data_collector.cache_ttl_policy,
+                "market_holidays": settings.data_collector.market_holidays,
                 "default_interval": settings.data_collector.default_interval,
                 "default_period": settings.data_collector.default_period,
                 "retry_attempts": settings.data_collector.retry_attempts,
                 "retry_min_wait": settings.data_collector.retry_min_wait,
-                "retry_max_wait": settings.data_collector.retry_max_wait
+                "retry_max_wait": settings.data_collector.retry_max_wait,
+                "storage_backend": settings.data_collector.storage_backend,
+                "download_batch_size": settings.data_collector.download_batch_size,
+                "data_provider": settings.data_collector.data_provider,
+                "replay_data_dir": settings.data_collector.replay_data_dir,
+                "replay_latency": settings.data_collector.replay_latency,
+                "frame_cache_mb": settings.data_collector.frame_cache_mb,
+                "cold_storage_days": settings.data_collector.cold_storage_days,
+                "retention_days": settings.data_collector.retention_days,
+                "max_cache_mb": settings.data_collector.max_cache_mb,
+                "compact_frames": settings.data_collector.compact_frames,
+                "compact_float32": settings.data_collector.compact_float32,
+                "fundamentals_ttl_hours": (
+                    settings.data_collector.fundamentals_ttl_hours
+                ),
+                "ingestion_validation": (
+                    settings.data_collector.ingestion_validation
+                ),
+                "ingestion_max_price_jump": (
+                    settings.data_collector.ingestion_max_price_jump
+                )
             },
             "database": {
                 "type": settings.database.type,
                 "path": settings.database.path,
                 "backup_enabled": settings.database.backup_enabled,
                 "backup_interval_hours": settings.database.backup_interval_hours,
-                "vacuum_interval_days": settings.database.vacuum_interval_days
+                "vacuum_interval_days": settings.database.vacuum_interval_days,
+                "cache_size_kb": settings.database.cache_size_kb,
+                "mmap_size_mb": settings.database.mmap_size_mb,
+                "backup_incremental": settings.database.backup_incremental
             },
             "logging": {
                 "level": settings.logging.level,
@@ -239,7 +293,18 @@ class SettingsManager:
             "scheduler": {
                 "enabled": settings.scheduler.enabled,
                 "timezone": settings.scheduler.timezone,
-                "data_update_intervals": settings.scheduler.data_update_intervals
+                "data_update_intervals": settings.scheduler.data_update_intervals,
+                "refresh_max_concurrency": settings.scheduler.refresh_max_concurrency,
+                "refresh_jitter_seconds": settings.scheduler.refresh_jitter_seconds,
+                "refresh_backoff_base_seconds": (
+                    settings.scheduler.refresh_backoff_base_seconds
+                ),
+                "refresh_backoff_max_seconds": (
+                    settings.scheduler.refresh_backoff_max_seconds
+                ),
+                "fundamentals_refresh_cron": (
+                    settings.scheduler.fundamentals_refresh_cron
+                )
             },
             "api": {
                 "yfinance_enabled": settings.api.yfinance_enabled,
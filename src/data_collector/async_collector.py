@@ -0,0 +1,209 @@
+"""
+asyncio対応の株価データ取得クラス
+StockDataCollectorの取得・キャッシュ処理を上限付きの並行度でイベントループから呼び出す
+"""
+
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import asyncio
+import functools
+import pandas as pd
+from loguru import logger
+
+from .stock_data_collector import StockDataCollector
+
+T = TypeVar("T")
+
+
+class AsyncStockDataCollector:
+    """
+    asyncio版 株価データ取得クラス
+    yfinance・SQLiteは同期APIのため、並行度と同数のワーカーを持つ専用スレッドプールで実行する
+    （銘柄数に関わらずスレッド数は max_concurrency で固定）
+    リトライ・レート制限は StockDataCollector._fetch_data_yfinance の挙動をそのまま引き継ぐ
+    """
+
+    def __init__(
+        self,
+        collector: Optional[StockDataCollector] = None,
+        max_concurrency: int = 10,
+        **collector_kwargs
+    ):
+        """
+        初期化
+
+        Args:
+            collector: ラップする同期コレクター（省略時はcollector_kwargsで新規作成）
+            max_concurrency: 同時実行する取得処理の上限
+            **collector_kwargs: StockDataCollectorの初期化引数
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrencyは1以上が必要です: {max_concurrency}")
+
+        self.collector = collector or StockDataCollector(**collector_kwargs)
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="async-collector"
+        )
+        # セマフォはイベントループに紐づくため、実行中のループが変わったら作り直す
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """実行中のイベントループ用の並行度制御セマフォ"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """同期処理を並行度の上限内で専用スレッドプールに投入"""
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def get_stock_data(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        period: str = "1d",
+        use_cache: bool = True,
+        cache_expire_hours: Optional[float] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        株価データ取得（StockDataCollector.get_stock_dataの非同期版）
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            period: 取得期間
+            use_cache: キャッシュ使用フラグ
+            cache_expire_hours: キャッシュ有効期限（時間、省略時は有効期限ポリシーで判定）
+
+        Returns:
+            株価データのDataFrame
+        """
+        return await self._run(
+            self.collector.get_stock_data,
+            symbol, interval, period, use_cache, cache_expire_hours
+        )
+
+    async def load_from_cache(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Optional[pd.DataFrame]:
+        """キャッシュからの非同期読み込み"""
+        return await self._run(
+            self.collector._load_from_cache, symbol, interval, start_time, end_time
+        )
+
+    async def save_frames(self, frames: List[pd.DataFrame]) -> int:
+        """キャッシュへの非同期一括保存"""
+        return await self._run(self.collector.save_frames, frames)
+
+    async def _fetch_one(
+        self,
+        symbol: str,
+        interval: str,
+        period: str,
+        use_cache: bool,
+        timeout: Optional[float]
+    ) -> Tuple[str, Optional[pd.DataFrame]]:
+        """1銘柄の取得（失敗・タイムアウトはNoneとして扱う）"""
+        try:
+            data = await asyncio.wait_for(
+                self.get_stock_data(symbol, interval, period, use_cache), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"データ取得タイムアウト: {symbol}")
+            data = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"非同期取得エラー {symbol}: {str(e)}")
+            data = None
+        return symbol, data
+
+    async def iter_stocks(
+        self,
+        symbols: List[str],
+        interval: str = "1m",
+        period: str = "1d",
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Optional[pd.DataFrame]]]:
+        """
+        複数銘柄を並行取得し、完了した順に (銘柄コード, データ) を返す
+
+        反復を途中で終了した場合やキャンセルされた場合は、未完了の取得タスクもキャンセルする
+
+        Args:
+            symbols: 銘柄コードのリスト
+            interval: データ間隔
+            period: 取得期間
+            use_cache: キャッシュ使用フラグ
+            timeout: 1銘柄あたりのタイムアウト秒数
+        """
+        tasks = [
+            asyncio.ensure_future(
+                self._fetch_one(symbol, interval, period, use_cache, timeout)
+            )
+            for symbol in dict.fromkeys(symbols)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_multiple_stocks(
+        self,
+        symbols: List[str],
+        interval: str = "1m",
+        period: str = "1d",
+        use_cache: bool = True,
+        timeout: Optional[float] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        複数銘柄のデータを並行取得（StockDataCollector.get_multiple_stocksの非同期版）
+
+        Args:
+            symbols: 銘柄コードのリスト
+            interval: データ間隔
+            period: 取得期間
+            use_cache: キャッシュ使用フラグ
+            timeout: 1銘柄あたりのタイムアウト秒数
+
+        Returns:
+            銘柄コードをキーとした株価データの辞書
+        """
+        results = {}
+        stocks = self.iter_stocks(symbols, interval, period, use_cache, timeout)
+        async for symbol, data in stocks:
+            if data is not None:
+                results[symbol] = data
+            else:
+                logger.warning(f"データ取得失敗: {symbol}")
+
+        logger.info(f"複数銘柄非同期取得完了: {len(results)}/{len(set(symbols))}")
+        return results
+
+    def close(self):
+        """スレッドプールを終了"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncStockDataCollector":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
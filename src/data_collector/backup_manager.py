@@ -8,13 +8,19 @@ import shutil
 import gzip
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
 import logging
 
+from .page_store import PageStore
+
 logger = logging.getLogger(__name__)
 
+# 差分バックアップのファイルパス表記（"<ページストア>#<スナップショットID>"）
+SNAPSHOT_REF_SEPARATOR = "#"
+PAGE_STORE_FILENAME = "page_store.db"
+
 
 @dataclass
 class BackupInfo:
@@ -26,6 +32,7 @@ class BackupInfo:
     original_db_path: str
     backup_type: str  # 'auto', 'manual', 'before_operation'
     operation_context: Optional[str] = None
+    snapshot_id: Optional[int] = None  # 差分バックアップの場合のスナップショットID
 
 
 @dataclass
@@ -38,6 +45,7 @@ class BackupConfig:
     backup_compression_enabled: bool = False
     daily_backup_enabled: bool = True
     backup_interval_hours: int = 24
+    incremental: bool = False  # ページ単位の差分バックアップ（変更されたページのみ保存）
     
     def __post_init__(self):
         if self.backup_before_operations is None:
@@ -55,6 +63,7 @@ class BackupManager:
             config: バックアップ設定
         """
         self.config = config or BackupConfig()
+        self._page_stores: Dict[str, PageStore] = {}
         self.ensure_backup_directory()
     
     def ensure_backup_directory(self):
@@ -63,6 +72,41 @@ class BackupManager:
         backup_dir.mkdir(parents=True, exist_ok=True)
         logger.debug(f"バックアップディレクトリ確保: {backup_dir}")
     
+    def _page_store(self, store_path: Optional[str] = None) -> PageStore:
+        """
+        差分バックアップのページストアを取得
+
+        Args:
+            store_path: ストアのパス（省略時はバックアップディレクトリのストア）
+        """
+        if not store_path:
+            store_path = str(Path(self.config.backup_dir) / PAGE_STORE_FILENAME)
+        if store_path not in self._page_stores:
+            self._page_stores[store_path] = PageStore(
+                store_path, compress=self.config.backup_compression_enabled
+            )
+        return self._page_stores[store_path]
+
+    @staticmethod
+    def _parse_snapshot_ref(backup_path: str) -> Optional[Tuple[str, int]]:
+        """差分バックアップのパス表記を（ストアのパス, スナップショットID）に分解"""
+        store_path, separator, snapshot_id = backup_path.rpartition(
+            SNAPSHOT_REF_SEPARATOR
+        )
+        if not separator or not snapshot_id.isdigit():
+            return None
+        return store_path, int(snapshot_id)
+
+    def _backup_exists(self, backup_path: str) -> bool:
+        """バックアップが存在するか（差分バックアップはストア内のスナップショットを確認）"""
+        ref = self._parse_snapshot_ref(backup_path)
+        if ref is None:
+            return Path(backup_path).exists()
+        store_path, snapshot_id = ref
+        if not Path(store_path).exists():
+            return False
+        return self._page_store(store_path).has_snapshot(snapshot_id)
+
     def create_backup(self, 
                      db_path: str, 
                      backup_type: str = "manual",
@@ -87,6 +131,14 @@ class BackupManager:
                 logger.warning(f"バックアップ対象のDBファイルが存在しません: {db_path}")
                 return None
             
+            # 差分バックアップ（失敗した場合は全体バックアップ）
+            if self.config.incremental:
+                snapshot_ref = self._create_incremental_backup(
+                    db_path, backup_type, operation_context
+                )
+                if snapshot_ref:
+                    return snapshot_ref
+
             # バックアップファイル名生成
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             db_name = Path(db_path).stem
@@ -116,6 +168,46 @@ class BackupManager:
             logger.error(f"バックアップ作成エラー: {e}")
             return None
     
+    def _create_incremental_backup(self,
+                                   db_path: str,
+                                   backup_type: str,
+                                   operation_context: Optional[str]) -> Optional[str]:
+        """
+        ページ単位の差分バックアップを作成
+        前回のスナップショットから変更されたページのみページストアに追加する
+
+        Args:
+            db_path: バックアップ対象のデータベースパス
+            backup_type: バックアップタイプ
+            operation_context: 操作コンテキスト
+
+        Returns:
+            スナップショットのパス表記（失敗時はNone）
+        """
+        try:
+            store = self._page_store()
+            snapshot = store.snapshot(db_path)
+            snapshot_ref = (
+                f"{store.store_path}{SNAPSHOT_REF_SEPARATOR}{snapshot['snapshot_id']}"
+            )
+
+            self._record_backup_info(
+                snapshot_ref, db_path, backup_type, operation_context,
+                file_size=snapshot['bytes_added'],
+                is_compressed=store.compress,
+                snapshot_id=snapshot['snapshot_id']
+            )
+
+            logger.info(
+                f"差分バックアップ作成完了: {snapshot_ref} "
+                f"(変更{snapshot['changed_pages']}/{snapshot['page_count']}ページ)"
+            )
+            return snapshot_ref
+
+        except Exception as e:
+            logger.error(f"差分バックアップ作成エラー: {e}")
+            return None
+
     def _create_sqlite_backup(self, source_db: str, backup_path: str) -> Optional[str]:
         """
         SQLiteオンラインバックアップAPI使用
@@ -178,11 +270,14 @@ class BackupManager:
             logger.error(f"バックアップ圧縮エラー: {e}")
             return None
     
-    def _record_backup_info(self, 
-                           backup_path: str, 
-                           original_db_path: str,
-                           backup_type: str,
-                           operation_context: Optional[str]):
+    def _record_backup_info(self,
+                            backup_path: str,
+                            original_db_path: str,
+                            backup_type: str,
+                            operation_context: Optional[str],
+                            file_size: Optional[int] = None,
+                            is_compressed: Optional[bool] = None,
+                            snapshot_id: Optional[int] = None):
         """
         バックアップ情報をメタデータファイルに記録
         
@@ -191,16 +286,24 @@ class BackupManager:
             original_db_path: 元データベースパス
             backup_type: バックアップタイプ
             operation_context: 操作コンテキスト
+            file_size: サイズ（省略時はファイルサイズ、差分バックアップは追加したバイト数）
+            is_compressed: 圧縮有無（省略時は拡張子で判定）
+            snapshot_id: 差分バックアップのスナップショットID
         """
         try:
+            if file_size is None:
+                file_size = Path(backup_path).stat().st_size
+            if is_compressed is None:
+                is_compressed = backup_path.endswith('.gz')
             backup_info = BackupInfo(
                 file_path=backup_path,
                 created_at=datetime.now(),
-                file_size=Path(backup_path).stat().st_size,
-                is_compressed=backup_path.endswith('.gz'),
+                file_size=file_size,
+                is_compressed=is_compressed,
                 original_db_path=original_db_path,
                 backup_type=backup_type,
-                operation_context=operation_context
+                operation_context=operation_context,
+                snapshot_id=snapshot_id
             )
             
             # メタデータファイルパス
@@ -256,7 +359,7 @@ class BackupManager:
             backups = []
             for item in backup_data:
                 # ファイルが実際に存在するかチェック
-                if not Path(item['file_path']).exists():
+                if not self._backup_exists(item['file_path']):
                     continue
                 
                 backup_info = BackupInfo(
@@ -266,7 +369,8 @@ class BackupManager:
                     is_compressed=item['is_compressed'],
                     original_db_path=item['original_db_path'],
                     backup_type=item['backup_type'],
-                    operation_context=item.get('operation_context')
+                    operation_context=item.get('operation_context'),
+                    snapshot_id=item.get('snapshot_id')
                 )
                 
                 # DB名でフィルタリング
@@ -298,7 +402,7 @@ class BackupManager:
             復元成功の場合True
         """
         try:
-            if not Path(backup_path).exists():
+            if not self._backup_exists(backup_path):
                 logger.error(f"バックアップファイルが存在しません: {backup_path}")
                 return False
             
@@ -312,8 +416,13 @@ class BackupManager:
                 if restore_backup_path:
                     logger.info(f"復元前バックアップ作成: {restore_backup_path}")
             
+            snapshot_ref = self._parse_snapshot_ref(backup_path)
+            if snapshot_ref is not None:
+                # 差分バックアップはページを書き出して置き換え
+                store_path, snapshot_id = snapshot_ref
+                self._page_store(store_path).restore(snapshot_id, target_path)
             # 圧縮ファイルの場合は解凍
-            if backup_path.endswith('.gz'):
+            elif backup_path.endswith('.gz'):
                 temp_path = f"{target_path}.tmp"
                 with gzip.open(backup_path, 'rb') as f_in:
                     with open(temp_path, 'wb') as f_out:
@@ -334,9 +443,37 @@ class BackupManager:
             logger.error(f"バックアップ復元エラー: {e}")
             return False
     
+    def restore_to_time(self, db_path: str, at: datetime,
+                        target_path: Optional[str] = None) -> bool:
+        """
+        指定時点のデータベースを復元（その時点以前で最新のバックアップを使用）
+
+        Args:
+            db_path: 対象データベースパス
+            at: 復元する時点
+            target_path: 復元先（省略時は対象データベースを置き換え）
+
+        Returns:
+            復元成功の場合True
+        """
+        original = Path(db_path).resolve()
+        candidates = [
+            backup for backup in self.list_backups(Path(db_path).stem)
+            if backup.created_at <= at
+            and Path(backup.original_db_path).resolve() == original
+        ]
+        if not candidates:
+            logger.error(f"指定時点以前のバックアップがありません: {db_path} ({at.isoformat()})")
+            return False
+
+        # list_backupsは作成日時の降順
+        return self.restore_backup(candidates[0].file_path, target_path or db_path)
+
     def cleanup_old_backups(self, db_name: Optional[str] = None) -> int:
         """
         古いバックアップを削除
+        差分バックアップはメタデータではなくページストアのスナップショット一覧から判定する
+        （メタデータに記録されなかったスナップショットも削除対象にする）
         
         Args:
             db_name: 特定のDBのバックアップのみクリーンアップ（Noneの場合は全て）
@@ -346,15 +483,16 @@ class BackupManager:
         """
         try:
             backups = self.list_backups(db_name)
-            
-            if len(backups) <= self.config.backup_retention_count:
-                return 0
-            
+            deleted_count = self._cleanup_snapshots(
+                db_name, {self._parse_snapshot_ref(b.file_path) for b in backups}
+            )
+
+            file_backups = [
+                backup for backup in backups
+                if self._parse_snapshot_ref(backup.file_path) is None
+            ]
             # 削除対象（保持数を超えた古いバックアップ）
-            backups_to_delete = backups[self.config.backup_retention_count:]
-            deleted_count = 0
-            
-            for backup in backups_to_delete:
+            for backup in file_backups[self.config.backup_retention_count:]:
                 try:
                     Path(backup.file_path).unlink()
                     deleted_count += 1
@@ -373,6 +511,47 @@ class BackupManager:
         except Exception as e:
             logger.error(f"バックアップクリーンアップエラー: {e}")
             return 0
+
+    def _cleanup_snapshots(
+        self,
+        db_name: Optional[str],
+        refs: Set[Optional[Tuple[str, int]]]
+    ) -> int:
+        """
+        保持数を超えた差分バックアップをストアごとに削除し、参照されなくなったページを解放
+
+        Args:
+            db_name: 特定のDBのスナップショットのみ対象（Noneの場合は全て）
+            refs: メタデータに記録されたスナップショット（ストアの特定に使用）
+
+        Returns:
+            削除したスナップショット数
+        """
+        store_paths = {ref[0] for ref in refs if ref is not None}
+        store_paths.add(str(Path(self.config.backup_dir) / PAGE_STORE_FILENAME))
+
+        deleted_count = 0
+        for store_path in sorted(store_paths):
+            if not Path(store_path).exists():
+                continue
+            try:
+                store = self._page_store(store_path)
+                snapshot_ids = [
+                    snapshot['snapshot_id']
+                    for snapshot in reversed(store.list_snapshots())
+                    if db_name is None or Path(snapshot['db_path']).stem == db_name
+                ][self.config.backup_retention_count:]
+                if not snapshot_ids:
+                    continue
+                released = store.delete_snapshots(snapshot_ids)
+                deleted_count += len(snapshot_ids)
+                logger.debug(
+                    f"古い差分バックアップ削除: {store_path} {len(snapshot_ids)}件 "
+                    f"(解放{released}ページ)"
+                )
+            except Exception as e:
+                logger.warning(f"差分バックアップ削除失敗: {store_path} - {e}")
+        return deleted_count
     
     def _cleanup_metadata(self):
         """存在しないファイルのメタデータを削除"""
@@ -389,7 +568,7 @@ class BackupManager:
             # 存在するファイルのみ保持
             valid_backups = []
             for item in backup_data:
-                if Path(item['file_path']).exists():
+                if self._backup_exists(item['file_path']):
                     valid_backups.append(item)
             
             # メタデータ更新
@@ -443,7 +622,8 @@ class BackupManager:
                 "latest_backup": backups[0].created_at.isoformat() if backups else None,
                 "backup_types": backup_types,
                 "retention_count": self.config.backup_retention_count,
-                "compression_enabled": self.config.backup_compression_enabled
+                "compression_enabled": self.config.backup_compression_enabled,
+                "incremental_enabled": self.config.incremental
             }
             
             return stats
@@ -0,0 +1,209 @@
+"""
+メモリマップ型バー配列
+系列ごとの固定幅バイナリファイルにOHLCVを保持し、読み取り専用のNumPyビューとして公開する。
+複数のワーカープロセスが同じ履歴を開いてもページキャッシュを共有するため、
+プロセスごとのDataFrame複製やデシリアライズが発生しない。
+
+ファイル形式（リトルエンディアン、8バイト境界）:
+    ヘッダー 64バイト: マジック(8) / 行数(int64) / タイムゾーン名(UTF-8, NUL埋め 48)
+    timestamp: int64[行数]（エポックナノ秒、タイムゾーン付き系列はUTC基準）
+    values: float64[5, 行数]（open, high, low, close, volume の列ごとに連続）
+"""
+
+from typing import Optional, Union
+from pathlib import Path
+import os
+import struct
+import tempfile
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .bar_schema import parse_timezone, timezone_name, to_epoch_ns
+
+
+# 値配列の列順
+VALUE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+_MAGIC = b"PYSTBAR1"
+_HEADER = struct.Struct("<8sq48s")
+
+
+class BarArrays:
+    """
+    メモリマップされた1系列分のバー
+    各列はファイルを直接参照する読み取り専用ビュー（書き込みはValueError）
+    """
+
+    def __init__(self, path: Union[str, Path], symbol: str, interval: str):
+        """
+        初期化
+
+        Args:
+            path: バー配列ファイル
+            symbol: 銘柄コード
+            interval: データ間隔
+        """
+        self.path = Path(path)
+        self.symbol = symbol
+        self.interval = interval
+
+        with open(self.path, "rb") as f:
+            magic, rows, tz = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"未対応のバー配列ファイルです: {self.path}")
+        self.tz: Optional[str] = tz.rstrip(b"\0").decode("utf-8") or None
+        self.rows = rows
+
+        if rows:
+            self.ts = np.memmap(
+                self.path, dtype='<i8', mode='r', offset=_HEADER.size, shape=(rows,)
+            )
+            self.values = np.memmap(
+                self.path, dtype='<f8', mode='r',
+                offset=_HEADER.size + rows * 8, shape=(len(VALUE_COLUMNS), rows)
+            )
+        else:
+            self.ts = np.empty(0, dtype='<i8')
+            self.values = np.empty((len(VALUE_COLUMNS), 0), dtype='<f8')
+            self.ts.flags.writeable = False
+            self.values.flags.writeable = False
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """指定列の読み取り専用ビュー"""
+        return self.values[VALUE_COLUMNS.index(name)]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.column('open')
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.column('high')
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.column('low')
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column('close')
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.column('volume')
+
+    @property
+    def timestamps(self) -> pd.DatetimeIndex:
+        """時刻（エポックナノ秒配列をdatetime64として参照、タイムゾーン付き系列は現地時刻）"""
+        index = pd.DatetimeIndex(self.ts.view('M8[ns]'), copy=False)
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(parse_timezone(self.tz))
+        return index
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        分析クラスにそのまま渡せるDataFrame（OHLCVはファイルを参照し、複製しない）
+        TechnicalIndicators・SupportResistanceDetector・SignalGeneratorは列の追加・置き換えのみ行うため、
+        受け取ったDataFrameを浅いコピーで呼び出し元と分離し、バー配列は複製しない
+
+        Returns:
+            timestamp, open, high, low, close, volume のDataFrame
+        """
+        frame = pd.DataFrame(self.values.T, columns=VALUE_COLUMNS, copy=False)
+        frame.insert(0, 'timestamp', self.timestamps)
+        return frame
+
+
+class BarArrayStore:
+    """系列ごとのバー配列ファイルの書き出し・読み込み"""
+
+    def __init__(self, root_dir: Union[str, Path] = "cache/arrays"):
+        """
+        初期化
+
+        Args:
+            root_dir: バー配列ファイルの保存ルートディレクトリ
+        """
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, symbol: str, interval: str) -> Path:
+        """系列のバー配列ファイルパス"""
+        return self.root_dir / f"symbol={symbol}" / f"{interval}.bars"
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame) -> Path:
+        """
+        バーを書き出し（一時ファイルへの書き込み後に置き換えるため、開いている読み手は古い内容を参照し続ける）
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            data: timestamp・OHLCVを持つDataFrame
+
+        Returns:
+            書き出したファイルパス
+        """
+        if not data['timestamp'].is_monotonic_increasing:
+            data = data.sort_values('timestamp')
+        timestamps = data['timestamp']
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, format='ISO8601')
+
+        tz = timezone_name(timestamps) or ""
+        ts = to_epoch_ns(timestamps).astype('<i8', copy=False)
+        values = np.vstack([
+            pd.to_numeric(data[col]).to_numpy(dtype='<f8') for col in VALUE_COLUMNS
+        ])
+
+        path = self.path(symbol, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, len(ts), tz.encode("utf-8")))
+                f.write(np.ascontiguousarray(ts).tobytes())
+                f.write(np.ascontiguousarray(values).tobytes())
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        logger.debug(f"バー配列書き出し: {symbol} {interval} ({len(ts)}件)")
+        return path
+
+    def export(self, collector, symbol: str, interval: str) -> Optional[Path]:
+        """
+        コレクターのキャッシュ済みバーを書き出し
+
+        Args:
+            collector: StockDataCollector
+            symbol: 銘柄コード
+            interval: データ間隔
+
+        Returns:
+            書き出したファイルパス（キャッシュがない場合はNone）
+        """
+        data = collector._load_from_cache(symbol, interval)
+        if data is None or data.empty:
+            return None
+        return self.write(symbol, interval, data)
+
+    def open(self, symbol: str, interval: str) -> Optional[BarArrays]:
+        """
+        バー配列をメモリマップで開く
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+
+        Returns:
+            バー配列（ファイルがない場合はNone）
+        """
+        path = self.path(symbol, interval)
+        if not path.exists():
+            return None
+        return BarArrays(path, symbol, interval)
@@ -0,0 +1,275 @@
+"""
+コールドストレージ用の日次バーブロック
+古い取引日のバーを系列・現地日ごとに1行の圧縮列指向BLOBとして保持する。
+各列はバイトシャッフル（同じ桁のバイトを連続させる）してからzlibで圧縮し、
+タイムスタンプは差分で保持するため一定間隔の足はほぼ定数列として圧縮される。
+"""
+
+from typing import Iterable, Iterator, Optional
+import sqlite3
+import struct
+import zlib
+import numpy as np
+import pandas as pd
+
+
+BLOCK_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS bar_blocks (
+        series_id INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        start_ts INTEGER NOT NULL,
+        end_ts INTEGER NOT NULL,
+        row_count INTEGER NOT NULL,
+        min_created_at INTEGER,
+        max_created_at INTEGER,
+        payload BLOB NOT NULL,
+        PRIMARY KEY (series_id, day)
+    )
+"""
+
+# ブロック内の列（barsテーブルと同じ）
+BLOCK_COLUMNS = ['ts', 'open', 'high', 'low', 'close', 'volume', 'created_at']
+
+# 現地日の0時はその日のバーより最大1日前（UTCオフセット分）のため、範囲検索の下限に加える余裕
+DAY_NS = 24 * 3600 * 1_000_000_000
+
+_MAGIC = b"BB1"
+_HEADER = struct.Struct("<3sI")
+_PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+# 整数列のNULL表現
+_NULL_INT = np.iinfo(np.int64).min
+_COMPRESSION_LEVEL = 6
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """8バイト値の配列をバイト位置ごとに並べ替え"""
+    return np.ascontiguousarray(values).view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(buffer: memoryview, count: int, dtype) -> np.ndarray:
+    """_shuffleの逆変換"""
+    raw = np.frombuffer(buffer, dtype=np.uint8).reshape(8, count)
+    return np.ascontiguousarray(raw.T).view(dtype).ravel()
+
+
+def _int_column(values: pd.Series) -> np.ndarray:
+    """NULLを含む整数列を番兵値付きのint64配列に変換"""
+    return values.astype('Int64').fillna(_NULL_INT).to_numpy(dtype=np.int64)
+
+
+def _restore_int_column(values: np.ndarray) -> np.ndarray:
+    """番兵値をNaNに戻す（NULLがなければint64のまま、read_sql_queryと同じ型）"""
+    nulls = values == _NULL_INT
+    if not nulls.any():
+        return values
+    restored = values.astype(np.float64)
+    restored[nulls] = np.nan
+    return restored
+
+
+def encode_block(rows: pd.DataFrame) -> bytes:
+    """
+    バーを圧縮ブロックに変換
+
+    Args:
+        rows: BLOCK_COLUMNSを持つts昇順のバー
+
+    Returns:
+        圧縮済みペイロード
+    """
+    ts = rows['ts'].to_numpy(dtype=np.int64)
+    columns = [np.diff(ts, prepend=np.int64(0))]
+    columns.extend(
+        pd.to_numeric(rows[col]).to_numpy(dtype=np.float64) for col in _PRICE_COLUMNS
+    )
+    columns.append(_int_column(rows['volume']))
+    columns.append(_int_column(rows['created_at']))
+
+    body = b"".join(_shuffle(column) for column in columns)
+    return _HEADER.pack(_MAGIC, len(ts)) + zlib.compress(body, _COMPRESSION_LEVEL)
+
+
+def decode_block(payload: bytes) -> pd.DataFrame:
+    """
+    圧縮ブロックをバーに復元
+
+    Args:
+        payload: encode_blockの出力
+
+    Returns:
+        BLOCK_COLUMNSのDataFrame
+    """
+    magic, count = _HEADER.unpack_from(payload)
+    if magic != _MAGIC:
+        raise ValueError("未対応のバーブロック形式です")
+
+    body = memoryview(zlib.decompress(payload[_HEADER.size:]))
+    width = count * 8
+
+    def column(index: int, dtype) -> np.ndarray:
+        return _unshuffle(body[index * width:(index + 1) * width], count, dtype)
+
+    data = {'ts': np.cumsum(column(0, np.int64))}
+    for index, col in enumerate(_PRICE_COLUMNS, start=1):
+        data[col] = column(index, np.float64)
+    data['volume'] = _restore_int_column(column(5, np.int64))
+    data['created_at'] = _restore_int_column(column(6, np.int64))
+    return pd.DataFrame(data, columns=BLOCK_COLUMNS)
+
+
+def iter_block_rows(
+    conn: sqlite3.Connection,
+    series_id: int,
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    範囲に重なるブロックを1日ずつ展開（展開済みのブロックは1つだけ保持する）
+
+    Args:
+        conn: SQLite接続
+        series_id: 系列ID
+        start_ns: 開始（エポックナノ秒、含む）
+        end_ns: 終了（エポックナノ秒、含む）
+
+    Yields:
+        BLOCK_COLUMNSのts昇順DataFrame（範囲外の行は除外済み、空のブロックは返さない）
+    """
+    query = "SELECT payload FROM bar_blocks WHERE series_id = ?"
+    params = [series_id]
+    if start_ns is not None:
+        # 主キー (series_id, day) の範囲で絞ってからブロックの実範囲で判定
+        query += " AND day > ? AND end_ts >= ?"
+        params.extend([start_ns - DAY_NS, start_ns])
+    if end_ns is not None:
+        query += " AND day <= ? AND start_ts <= ?"
+        params.extend([end_ns, end_ns])
+    query += " ORDER BY day"
+
+    for payload, in conn.execute(query, params):
+        rows = decode_block(payload)
+        mask = np.ones(len(rows), dtype=bool)
+        if start_ns is not None:
+            mask &= rows['ts'].to_numpy() >= start_ns
+        if end_ns is not None:
+            mask &= rows['ts'].to_numpy() <= end_ns
+        if not mask.all():
+            rows = rows[mask].reset_index(drop=True)
+        if not rows.empty:
+            yield rows
+
+
+def read_block_rows(
+    conn: sqlite3.Connection,
+    series_id: int,
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None
+) -> Optional[pd.DataFrame]:
+    """
+    範囲に重なるブロックを展開して読み込み
+
+    Args:
+        conn: SQLite接続
+        series_id: 系列ID
+        start_ns: 開始（エポックナノ秒、含む）
+        end_ns: 終了（エポックナノ秒、含む）
+
+    Returns:
+        BLOCK_COLUMNSのts昇順DataFrame（該当ブロックがない場合はNone）
+    """
+    blocks = list(iter_block_rows(conn, series_id, start_ns, end_ns))
+    if not blocks:
+        return None
+    return pd.concat(blocks, ignore_index=True) if len(blocks) > 1 else blocks[0]
+
+
+def read_day_block(
+    conn: sqlite3.Connection, series_id: int, day: int
+) -> Optional[pd.DataFrame]:
+    """指定日のブロックを展開（ない場合はNone）"""
+    row = conn.execute(
+        "SELECT payload FROM bar_blocks WHERE series_id = ? AND day = ?",
+        (series_id, day)
+    ).fetchone()
+    return decode_block(row[0]) if row is not None else None
+
+
+def write_block(conn: sqlite3.Connection, series_id: int, day: int, rows: pd.DataFrame):
+    """
+    1日分のブロックを書き込み（同じ日のブロックは置き換え、空なら削除）
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+        series_id: 系列ID
+        day: 現地日の0時（系列と同じ基準のエポックナノ秒）
+        rows: BLOCK_COLUMNSを持つts昇順のバー
+    """
+    if rows.empty:
+        conn.execute(
+            "DELETE FROM bar_blocks WHERE series_id = ? AND day = ?", (series_id, day)
+        )
+        return
+
+    created = rows['created_at'].dropna()
+    conn.execute(
+        "INSERT INTO bar_blocks "
+        "(series_id, day, start_ts, end_ts, row_count, "
+        "min_created_at, max_created_at, payload) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (series_id, day) DO UPDATE SET "
+        "start_ts = excluded.start_ts, end_ts = excluded.end_ts, "
+        "row_count = excluded.row_count, "
+        "min_created_at = excluded.min_created_at, "
+        "max_created_at = excluded.max_created_at, "
+        "payload = excluded.payload",
+        (
+            series_id, day, int(rows['ts'].iloc[0]), int(rows['ts'].iloc[-1]),
+            len(rows),
+            int(created.min()) if not created.empty else None,
+            int(created.max()) if not created.empty else None,
+            encode_block(rows),
+        )
+    )
+
+
+def delete_blocks_created_before(
+    conn: sqlite3.Connection,
+    cutoff_ns: int,
+    series_ids: Optional[Iterable[int]] = None
+) -> int:
+    """
+    取得時刻が指定より古いバーをブロックから削除（取得時刻が不明なバーは残す）
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+        cutoff_ns: 取得時刻の閾値（エポックナノ秒）
+        series_ids: 対象の系列（Noneの場合は全系列）
+
+    Returns:
+        削除したバー数
+    """
+    condition = "min_created_at < ?"
+    params = [cutoff_ns]
+    if series_ids is not None:
+        series_ids = list(series_ids)
+        if not series_ids:
+            return 0
+        condition += f" AND series_id IN ({', '.join('?' * len(series_ids))})"
+        params.extend(series_ids)
+
+    removed = 0
+    blocks = conn.execute(
+        "SELECT series_id, day, row_count, max_created_at, payload "
+        f"FROM bar_blocks WHERE {condition}",
+        params
+    ).fetchall()
+    for series_id, day, row_count, max_created_at, payload in blocks:
+        rows = decode_block(payload)
+        if max_created_at < cutoff_ns and rows['created_at'].notna().all():
+            kept = rows.iloc[0:0]
+        else:
+            created = rows['created_at']
+            kept = rows[created.isna() | (created >= cutoff_ns)].reset_index(drop=True)
+        write_block(conn, series_id, day, kept)
+        removed += row_count - len(kept)
+    return removed
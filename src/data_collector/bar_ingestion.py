@@ -0,0 +1,389 @@
+"""
+取得データの取り込み前検証
+取得したバーをキャッシュへ保存する前に整形・検証し、不正なバーは理由コード付きで
+bar_quarantineテーブルへ隔離する。既存キャッシュとの比較は新しいバーの直前の数本（末尾）だけで行い、
+保存済みの履歴全体は読み込まない。後続のバーも同じ水準の乖離は一時的な外れ値ではなく水準の変化として受け入れ、
+取得したバーがそろって末尾から乖離している場合（株式分割など）は履歴の再取得が必要と判定する
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+
+from .bar_blocks import decode_block
+from .bar_schema import (
+    bound_to_epoch_ns, get_series, parse_timezone, timezone_name, to_epoch_ns
+)
+from ..utils.data_validator import DataValidator
+
+
+QUARANTINE_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS bar_quarantine (
+        symbol TEXT NOT NULL,
+        interval TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        tz TEXT,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume REAL,
+        reasons TEXT NOT NULL,
+        quarantined_at INTEGER NOT NULL,
+        PRIMARY KEY (symbol, interval, ts)
+    ) WITHOUT ROWID
+"""
+
+# 同じバーを再取得した場合は最新の値・理由で上書き
+UPSERT_QUARANTINE_SQL = (
+    "INSERT INTO bar_quarantine "
+    "(symbol, interval, ts, tz, open, high, low, close, volume, reasons, "
+    "quarantined_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (symbol, interval, ts) DO UPDATE SET "
+    "tz = excluded.tz, open = excluded.open, high = excluded.high, "
+    "low = excluded.low, close = excluded.close, volume = excluded.volume, "
+    "reasons = excluded.reasons, quarantined_at = excluded.quarantined_at"
+)
+
+QUARANTINE_COLUMNS = ['symbol', 'interval', 'timestamp', 'open', 'high', 'low', 'close',
+                      'volume', 'reasons', 'quarantined_at']
+
+
+@dataclass
+class IngestionResult:
+    """取り込み前検証の結果"""
+    accepted: pd.DataFrame  # 保存するバー（timestamp昇順、重複なし）
+    rejected: pd.DataFrame  # 隔離するバー（reasonsカラムに理由コード）
+    duplicates: int = 0  # 取得データ内で重複していたタイムスタンプの件数（後の行を採用）
+    invalid_timestamps: int = 0  # タイムスタンプを解釈できず破棄した件数
+    rebase: bool = False  # 取得したバーが一貫して既存キャッシュの末尾から乖離（履歴の再取得が必要）
+
+
+class BarIngestionStage:
+    """
+    取得したバーの整形・検証
+    取得データ内の重複除去・時系列ソートを行い、DataValidator.bar_rejection_reasonsで
+    欠損・0以下の価格・負の出来高・OHLCの不整合・直前の終値からの過大な乖離を判定する
+    """
+
+    def __init__(
+        self,
+        validator: Optional[DataValidator] = None,
+        max_price_jump: Optional[float] = None,
+        tail_rows: int = 5
+    ):
+        """
+        初期化
+
+        Args:
+            validator: 判定に使用するバリデーター
+            max_price_jump: 参照終値からの乖離率の上限（省略時はバリデーターの設定、0で無効）
+            tail_rows: 参照終値（直前のバーの終値の中央値）に使う本数
+        """
+        self.validator = validator or DataValidator()
+        if max_price_jump is not None:
+            self.validator.max_price_jump = max_price_jump
+        self.tail_rows = tail_rows
+
+    @staticmethod
+    def _clean(data: pd.DataFrame) -> IngestionResult:
+        """型の整形・タイムスタンプ不正行の破棄・時系列ソート・重複除去"""
+        data = data.copy()
+        if not pd.api.types.is_datetime64_any_dtype(data['timestamp']):
+            data['timestamp'] = pd.to_datetime(
+                data['timestamp'], format='ISO8601', errors='coerce'
+            )
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            if col in data.columns and not pd.api.types.is_numeric_dtype(data[col]):
+                data[col] = pd.to_numeric(data[col], errors='coerce')
+
+        invalid = data['timestamp'].isna()
+        if invalid.any():
+            data = data[~invalid]
+
+        if not data['timestamp'].is_monotonic_increasing:
+            data = data.sort_values('timestamp', kind='stable')
+        duplicated = data['timestamp'].duplicated(keep='last')
+        if duplicated.any():
+            data = data[~duplicated]
+
+        # 出来高の欠損は取引なしとして0で補完
+        if data['volume'].isna().any():
+            data['volume'] = data['volume'].fillna(0)
+
+        return IngestionResult(
+            accepted=data.reset_index(drop=True),
+            rejected=data.iloc[0:0],
+            duplicates=int(duplicated.sum()),
+            invalid_timestamps=int(invalid.sum())
+        )
+
+    def reference_close(self, close: pd.Series,
+                        tail_close: Optional[pd.Series]) -> np.ndarray:
+        """
+        バーごとの参照終値（直前tail_rows本の終値の中央値、既存キャッシュの末尾を含む）
+
+        Args:
+            close: 新しいバーの終値（timestamp昇順）
+            tail_close: 既存キャッシュで新しいバーより前の終値（timestamp昇順）
+
+        Returns:
+            closeと同じ長さの参照終値（直前のバーがない場合はNaN）
+        """
+        history = close.to_numpy(dtype='float64', na_value=np.nan)
+        history = np.where(history > 0, history, np.nan)
+        if tail_close is None:
+            tail = np.empty(0)
+        else:
+            tail = tail_close.to_numpy(dtype='float64', na_value=np.nan)
+        series = pd.Series(np.concatenate([tail, history]))
+        reference = series.shift(1).rolling(self.tail_rows, min_periods=1).median()
+        return reference.to_numpy()[len(tail):]
+
+    def forward_close(self, close: pd.Series) -> np.ndarray:
+        """
+        バーごとの後続の終値（直後tail_rows本の終値の中央値）
+
+        Args:
+            close: 新しいバーの終値（timestamp昇順）
+
+        Returns:
+            closeと同じ長さの後続の終値（後続のバーがない場合はNaN）
+        """
+        history = close.to_numpy(dtype='float64', na_value=np.nan)
+        history = np.where(history > 0, history, np.nan)
+        series = pd.Series(history[::-1])
+        median = series.shift(1).rolling(self.tail_rows, min_periods=1).median()
+        return median.to_numpy()[::-1]
+
+    def _jump_reference(self, close: pd.Series,
+                        tail_close: Optional[pd.Series]) -> np.ndarray:
+        """
+        乖離判定に使う参照終値
+        後続のバーも同じ水準にある場合は水準の変化とみなして比較しない（NaN）。
+        後続のバーがない末尾のバーは直前のバーと比較するため、2本以上続いた水準の変化は受け入れる
+        """
+        reference = self.reference_close(close, tail_close)
+        max_jump = self.validator.max_price_jump
+        if max_jump > 0:
+            values = close.to_numpy(dtype='float64', na_value=np.nan)
+            following = self.forward_close(close).copy()
+            if len(values) > 1:
+                following[-1] = values[-2]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                level_shift = np.abs(values / following - 1) <= max_jump
+            reference = np.where(level_shift, np.nan, reference)
+        return reference
+
+    def _is_rebase(self, cleaned: pd.DataFrame,
+                   tail_close: Optional[pd.Series]) -> bool:
+        """
+        取得したバーが内部では一貫しているが、先頭・中央値とも既存キャッシュの末尾から乖離しているか
+        株式分割などで取得元の価格が遡って調整された場合、キャッシュ済みの履歴が古い水準のまま残るため
+        """
+        max_jump = self.validator.max_price_jump
+        if tail_close is None or max_jump <= 0:
+            return False
+        tail = tail_close.to_numpy(dtype='float64', na_value=np.nan)
+        tail = tail[tail > 0][-self.tail_rows:]
+        close = cleaned['close'].to_numpy(dtype='float64', na_value=np.nan)
+        close = close[close > 0]
+        if len(tail) == 0 or len(close) == 0:
+            return False
+        level = np.median(tail)
+        if (abs(close[0] / level - 1) <= max_jump
+                or abs(np.median(close) / level - 1) <= max_jump):
+            return False
+
+        internal = self.validator.bar_rejection_reasons(
+            cleaned, self._jump_reference(cleaned['close'], None)
+        )
+        return not internal.str.contains("price_jump").any()
+
+    def process(self, data: pd.DataFrame,
+                tail_close: Optional[pd.Series] = None) -> IngestionResult:
+        """
+        取得したバーを整形・検証
+
+        Args:
+            data: 取得結果（_normalize_history済みのDataFrame）
+            tail_close: 既存キャッシュで新しいバーより前の終値（timestamp昇順）
+
+        Returns:
+            保存するバーと隔離するバー（rebaseの場合も末尾と比較した判定結果）
+        """
+        result = self._clean(data)
+        cleaned = result.accepted
+        if cleaned.empty:
+            return result
+
+        result.rebase = self._is_rebase(cleaned, tail_close)
+        reasons = self.validator.bar_rejection_reasons(
+            cleaned, self._jump_reference(cleaned['close'], tail_close)
+        )
+        rejected = (reasons != "").to_numpy()
+        if rejected.any():
+            rejected_rows = cleaned[rejected].assign(reasons=reasons[rejected])
+            result.rejected = rejected_rows.reset_index(drop=True)
+            result.accepted = cleaned[~rejected].reset_index(drop=True)
+        return result
+
+
+def initialize_quarantine_schema(conn: sqlite3.Connection):
+    """隔離テーブルを作成"""
+    conn.execute(QUARANTINE_SCHEMA_SQL)
+
+
+def read_tail_close(
+    conn: sqlite3.Connection,
+    symbol: str,
+    interval: str,
+    before: pd.Timestamp,
+    rows: int
+) -> Optional[pd.Series]:
+    """
+    指定時刻より前の直近rows本の終値を読み込み
+    barsテーブルは主キーの逆順スキャン、圧縮ブロックは新しい日から必要な本数がそろうまで展開する
+
+    Args:
+        conn: SQLite接続
+        symbol: 銘柄コード
+        interval: データ間隔
+        before: 新しいバーの先頭時刻（含まない）
+        rows: 読み込む本数
+
+    Returns:
+        timestamp昇順の終値（キャッシュがない場合はNone）
+    """
+    series = get_series(conn, symbol, interval)
+    if series is None:
+        return None
+    series_id, tz = series
+    before_ns = bound_to_epoch_ns(before, tz)
+    fetched = conn.execute(
+        "SELECT ts, close FROM bars WHERE series_id = ? AND ts < ? "
+        "ORDER BY ts DESC LIMIT ?",
+        (series_id, before_ns, rows)
+    ).fetchall()
+    frames = [pd.DataFrame(fetched[::-1], columns=['ts', 'close'])] if fetched else []
+
+    query = "SELECT payload FROM bar_blocks WHERE series_id = ? AND start_ts < ?"
+    params = [series_id, before_ns]
+    if len(fetched) == rows:
+        # barsだけでrows本そろっている場合、それより古いブロックは不要
+        query += " AND end_ts >= ?"
+        params.append(fetched[-1][0])
+    cold_rows = 0
+    for payload, in conn.execute(query + " ORDER BY day DESC", params):
+        block = decode_block(payload)
+        block = block.loc[block['ts'] < before_ns, ['ts', 'close']]
+        if block.empty:
+            continue
+        frames.insert(0, block)
+        cold_rows += len(block)
+        if cold_rows >= rows:
+            break
+    if not frames:
+        return None
+
+    # 同じ時刻はbars側の新しい書き込みを優先
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.sort_values('ts', kind='stable').drop_duplicates('ts', keep='last')
+    return merged['close'].tail(rows).reset_index(drop=True).astype('float64')
+
+
+def write_quarantine(conn: sqlite3.Connection, rejected: pd.DataFrame) -> int:
+    """
+    隔離するバーを保存
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+        rejected: BarIngestionStage.processの隔離結果
+
+    Returns:
+        保存した件数
+    """
+    if rejected.empty:
+        return 0
+    now_ns = time.time_ns()
+    columns = [
+        rejected['symbol'].tolist(),
+        rejected['interval'].tolist(),
+        to_epoch_ns(rejected['timestamp']).tolist(),
+        [timezone_name(rejected['timestamp'])] * len(rejected),
+    ]
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        values = rejected[col].astype(object)
+        columns.append(values.where(rejected[col].notna(), None).tolist())
+    columns.append(rejected['reasons'].tolist())
+    columns.append([now_ns] * len(rejected))
+    conn.executemany(UPSERT_QUARANTINE_SQL, list(zip(*columns)))
+    return len(rejected)
+
+
+def release_quarantine(conn: sqlite3.Connection, accepted: pd.DataFrame) -> int:
+    """
+    再検証で受け入れたバー（後続のバーで水準の変化と確認できた場合など）の隔離を解除
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+        accepted: BarIngestionStage.processの受け入れ結果（1銘柄・1間隔）
+
+    Returns:
+        解除した件数
+    """
+    if accepted.empty:
+        return 0
+    symbol = accepted['symbol'].iloc[0]
+    interval = accepted['interval'].iloc[0]
+    if conn.execute(
+        "SELECT 1 FROM bar_quarantine WHERE symbol = ? AND interval = ? LIMIT 1",
+        (symbol, interval)
+    ).fetchone() is None:
+        return 0
+    before = conn.total_changes
+    conn.executemany(
+        "DELETE FROM bar_quarantine WHERE symbol = ? AND interval = ? AND ts = ?",
+        [(symbol, interval, ts) for ts in to_epoch_ns(accepted['timestamp']).tolist()]
+    )
+    return conn.total_changes - before
+
+
+def read_quarantine(
+    conn: sqlite3.Connection,
+    symbol: Optional[str] = None,
+    interval: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    隔離したバーを読み込み
+
+    Args:
+        conn: SQLite接続
+        symbol: 銘柄コード（省略時はすべて）
+        interval: データ間隔（省略時はすべて）
+
+    Returns:
+        QUARANTINE_COLUMNSのDataFrame（timestampは取得データのタイムゾーン、quarantined_atはUTC）
+    """
+    query = "SELECT * FROM bar_quarantine WHERE 1 = 1"
+    params = []
+    if symbol is not None:
+        query += " AND symbol = ?"
+        params.append(symbol)
+    if interval is not None:
+        query += " AND interval = ?"
+        params.append(interval)
+    rows = pd.read_sql_query(
+        query + " ORDER BY symbol, interval, ts", conn, params=params
+    )
+    rows['timestamp'] = [
+        pd.Timestamp(ts, tz='UTC').tz_convert(parse_timezone(tz))
+        if tz else pd.Timestamp(ts)
+        for ts, tz in zip(rows.pop('ts'), rows.pop('tz'))
+    ]
+    rows['quarantined_at'] = pd.to_datetime(rows['quarantined_at'], unit='ns', utc=True)
+    return rows[QUARANTINE_COLUMNS]
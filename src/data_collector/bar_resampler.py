@@ -0,0 +1,399 @@
+"""
+バーのリサンプリング
+キャッシュ済みの細かい足（1分足など）から粗い足（2分〜日足）のOHLCVを生成し、
+上流APIへの問い合わせなしで複数の時間軸を提供する
+"""
+
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import re
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .symbol_manager import SymbolManager
+
+
+# 間隔ごとの長さ（分）。日足は1日単位のバケットとして扱う
+INTERVAL_MINUTES = {
+    "1m": 1,
+    "2m": 2,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "60m": 60,
+    "1h": 60,
+    "90m": 90,
+    "1d": 24 * 60,
+}
+
+# リサンプリングで生成できる間隔
+RESAMPLE_TARGETS = ["2m", "5m", "15m", "30m", "1h", "1d"]
+
+# 元データとして使う間隔（細かい順）
+SOURCE_INTERVALS = ["1m", "2m", "5m", "15m", "30m", "1h"]
+
+# yfinanceで取得できる分足の遡及上限
+SOURCE_LOOKBACK = {
+    "1m": timedelta(days=7),
+    "2m": timedelta(days=60),
+    "5m": timedelta(days=60),
+    "15m": timedelta(days=60),
+    "30m": timedelta(days=60),
+    "1h": timedelta(days=730),
+}
+
+_SESSION = re.compile(r"(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})")
+
+
+def parse_sessions(regular_hours: Optional[str]) -> List[Tuple[int, int]]:
+    """
+    取引時間の表記（例: "09:00-11:30, 12:30-15:00"）を分単位のセッション一覧に変換
+
+    Args:
+        regular_hours: SymbolManager.get_market_hours_infoのregular_hours
+
+    Returns:
+        (開始分, 終了分) のリスト（0時起点）
+    """
+    if not regular_hours:
+        return []
+    return [
+        (int(h1) * 60 + int(m1), int(h2) * 60 + int(m2))
+        for h1, m1, h2, m2 in _SESSION.findall(regular_hours)
+    ]
+
+
+def resample_bars(
+    data: pd.DataFrame,
+    target_interval: str,
+    sessions: Optional[List[Tuple[int, int]]] = None,
+    market_tz: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    細かい足を粗い足に集約（open=最初, high=最大, low=最小, close=最後, volume=合計）
+
+    分足のバケットは各セッションの開始時刻を起点に区切る（東証の1時間足なら
+    9:00, 10:00, 11:00, 12:30, 13:30, 14:30）。セッション外のバーは0時起点で区切る。
+    vwapは元バーのvwap（なければ典型価格）を出来高で加重平均した値。
+
+    Args:
+        data: timestamp, open, high, low, close, volume列を持つ株価データ
+        target_interval: 生成する間隔
+        sessions: 取引セッション（分単位、市場の現地時刻）
+        market_tz: 市場のタイムゾーン（タイムゾーンなしのtimestampは現地時刻として扱う）
+
+    Returns:
+        集約後のDataFrame（symbol, interval, timestamp, open, high, low, close, volume, vwap）
+    """
+    if target_interval not in INTERVAL_MINUTES:
+        raise ValueError(f"未対応の間隔: {target_interval}")
+
+    columns = ['symbol', 'interval', 'timestamp', 'open', 'high', 'low', 'close',
+               'volume', 'vwap']
+    data = (
+        data.dropna(subset=['timestamp'])
+        .sort_values('timestamp', kind='stable')
+        .reset_index(drop=True)
+    )
+    if data.empty:
+        return pd.DataFrame(columns=columns)
+
+    timestamps = data['timestamp']
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, format='ISO8601')
+
+    # バケット境界は市場の現地時刻で判定
+    local = timestamps
+    if timestamps.dt.tz is not None and market_tz is not None:
+        local = timestamps.dt.tz_convert(market_tz)
+
+    if target_interval == "1d":
+        buckets = local.dt.normalize()
+    else:
+        step = INTERVAL_MINUTES[target_interval]
+        minute = (local.dt.hour * 60 + local.dt.minute).to_numpy()
+        bucket_minute = (minute // step) * step
+        for start, end in sessions or []:
+            in_session = (minute >= start) & (minute < end)
+            bucket_minute = np.where(
+                in_session, start + ((minute - start) // step) * step, bucket_minute
+            )
+        offset = pd.to_timedelta(minute - bucket_minute, unit='min')
+        buckets = local.dt.floor('min') - offset
+
+    if timestamps.dt.tz is not None:
+        buckets = buckets.dt.tz_convert(timestamps.dt.tz)
+
+    if 'vwap' in data.columns:
+        price = data['vwap'].fillna((data['high'] + data['low'] + data['close']) / 3)
+    else:
+        price = (data['high'] + data['low'] + data['close']) / 3
+
+    frame = pd.DataFrame({
+        'timestamp': buckets,
+        'open': data['open'],
+        'high': data['high'],
+        'low': data['low'],
+        'close': data['close'],
+        'volume': data['volume'],
+        'pv': price * data['volume'],
+    })
+    grouped = frame.groupby('timestamp', sort=True).agg(
+        open=('open', 'first'),
+        high=('high', 'max'),
+        low=('low', 'min'),
+        close=('close', 'last'),
+        volume=('volume', 'sum'),
+        pv=('pv', 'sum'),
+    ).reset_index()
+
+    # 出来高ゼロのバケットは終値をvwapとする
+    vwap = grouped['pv'] / grouped['volume'].where(grouped['volume'] > 0)
+    grouped['vwap'] = vwap.fillna(grouped['close'])
+
+    grouped['symbol'] = data['symbol'].iloc[0] if 'symbol' in data.columns else None
+    grouped['interval'] = target_interval
+    return grouped[columns]
+
+
+class BarResampler:
+    """
+    キャッシュ済みの細かい足から粗い足を生成・永続化するクラス
+    生成済みの粗い足は最新バケット以降のみ再計算する（差分マテリアライズ）
+    """
+
+    def __init__(self, collector, symbol_manager: Optional[SymbolManager] = None):
+        """
+        初期化
+
+        Args:
+            collector: StockDataCollector（キャッシュの読み書きと元データの取得に使用）
+            symbol_manager: 市場判定・取引時間の取得に使用
+        """
+        self.collector = collector
+        self.symbol_manager = symbol_manager or SymbolManager()
+        self._market_cache: Dict[str, Tuple[List[Tuple[int, int]], Optional[str]]] = {}
+
+    def _market(self, symbol: str) -> Tuple[List[Tuple[int, int]], Optional[str]]:
+        """銘柄の取引セッションとタイムゾーン"""
+        if symbol not in self._market_cache:
+            market_type = self.symbol_manager.detect_market_type(symbol)
+            hours = self.symbol_manager.get_market_hours_info(market_type)
+            self._market_cache[symbol] = (
+                parse_sessions(hours.get("regular_hours")), hours.get("timezone")
+            )
+        return self._market_cache[symbol]
+
+    def resample(
+        self,
+        data: pd.DataFrame,
+        target_interval: str,
+        symbol: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        銘柄の取引時間に合わせて粗い足に集約
+
+        Args:
+            data: 細かい足の株価データ
+            target_interval: 生成する間隔
+            symbol: 銘柄コード（省略時はdataのsymbol列）
+
+        Returns:
+            集約後のDataFrame
+        """
+        symbol = symbol or data['symbol'].iloc[0]
+        sessions, market_tz = self._market(symbol)
+        return resample_bars(data, target_interval, sessions, market_tz)
+
+    def _period_length(self, period: str) -> Optional[timedelta]:
+        """取得期間の長さ（maxなど長さが決まらない場合はNone）"""
+        if period == "ytd":
+            return timedelta(days=366)
+        return self.collector.PERIOD_LENGTHS.get(period)
+
+    def candidate_sources(self, target_interval: str, period: str) -> List[str]:
+        """
+        指定の間隔・期間を生成できる元データの間隔（細かい順）
+
+        Args:
+            target_interval: 生成する間隔
+            period: 取得期間
+
+        Returns:
+            元データの間隔のリスト（生成できない場合は空）
+        """
+        if target_interval not in RESAMPLE_TARGETS:
+            return []
+        length = self._period_length(period)
+        if length is None:
+            return []
+
+        target_minutes = INTERVAL_MINUTES[target_interval]
+        candidates = []
+        for source in SOURCE_INTERVALS:
+            source_minutes = INTERVAL_MINUTES[source]
+            if source_minutes >= target_minutes:
+                break
+            if target_interval != "1d" and target_minutes % source_minutes != 0:
+                continue
+            if length > SOURCE_LOOKBACK[source]:
+                continue
+            candidates.append(source)
+        return candidates
+
+    def _covers_period(self, symbol: str, source: str, period: str) -> bool:
+        """
+        元データの取得済み範囲が期間全体をカバーしているか
+        直近の鮮度は問わない（末尾の不足分はget_stock_dataが差分取得する）
+        """
+        if self.collector.get_latest_timestamp(symbol, source) is None:
+            return False
+        now = pd.Timestamp.now(tz='UTC')
+        start = self.collector._period_start(period, now)
+        uncovered = self.collector.range_index.uncovered_ranges(
+            symbol, source, start, now, timedelta(0),
+            is_live_fresh=lambda fetched_at: True
+        )
+        return uncovered == []
+
+    def select_source(
+        self,
+        symbol: str,
+        target_interval: str,
+        period: str
+    ) -> Optional[str]:
+        """
+        元データの間隔を選択（期間全体をカバーするキャッシュ済みの系列がある場合のみ）
+        キャッシュがない状態で細かい足を取得すると粗い足を直接取得するより転送量が増えるため生成しない
+
+        Args:
+            symbol: 銘柄コード
+            target_interval: 生成する間隔
+            period: 取得期間
+
+        Returns:
+            元データの間隔（キャッシュ済みの系列がない場合はNone）
+        """
+        for source in self.candidate_sources(target_interval, period):
+            if self._covers_period(symbol, source, period):
+                return source
+        return None
+
+    def _save(self, data: pd.DataFrame):
+        """粗い足をキャッシュへ保存（vwapはbarsテーブルの列ではないため除外）"""
+        frame = data.drop(columns=['vwap']).assign(
+            created_at=pd.Timestamp(datetime.now())
+        )
+        self.collector.save_frames([frame])
+
+    def materialize(
+        self,
+        symbol: str,
+        target_interval: str,
+        source_interval: str = "1m",
+        source_data: Optional[pd.DataFrame] = None
+    ) -> int:
+        """
+        粗い足を差分生成してキャッシュに保存
+        生成済みの最新バケット（未確定の可能性がある）以降の細かい足のみを再集約する
+
+        Args:
+            symbol: 銘柄コード
+            target_interval: 生成する間隔
+            source_interval: 元データの間隔
+            source_data: 元データ（省略時はキャッシュから読み込み）
+
+        Returns:
+            保存したバー数
+        """
+        latest = self.collector.get_latest_timestamp(symbol, target_interval)
+
+        if source_data is None:
+            source_data = self.collector._load_from_cache(
+                symbol, source_interval, start_time=latest
+            )
+        elif latest is not None and not source_data.empty:
+            source_data = source_data[source_data['timestamp'] >= latest]
+
+        if source_data is None or source_data.empty:
+            return 0
+
+        coarse = self.resample(source_data, target_interval, symbol)
+        if coarse.empty:
+            return 0
+
+        self._save(coarse)
+        logger.debug(
+            f"リサンプリング保存: {symbol} {source_interval}→{target_interval} ({len(coarse)}件)"
+        )
+        return len(coarse)
+
+    def materialize_all(
+        self,
+        symbol: str,
+        source_interval: str = "1m"
+    ) -> Dict[str, int]:
+        """
+        元データから生成できるすべての粗い足を差分生成
+
+        Args:
+            symbol: 銘柄コード
+            source_interval: 元データの間隔
+
+        Returns:
+            間隔ごとの保存バー数
+        """
+        source_minutes = INTERVAL_MINUTES[source_interval]
+        results = {}
+        for target in RESAMPLE_TARGETS:
+            target_minutes = INTERVAL_MINUTES[target]
+            if target_minutes <= source_minutes:
+                continue
+            if target != "1d" and target_minutes % source_minutes != 0:
+                continue
+            results[target] = self.materialize(symbol, target, source_interval)
+        return results
+
+    def get_resampled(
+        self,
+        symbol: str,
+        interval: str,
+        period: str = "1d",
+        use_cache: bool = True
+    ) -> Optional[pd.DataFrame]:
+        """
+        細かい足から粗い足のデータを取得（生成できない場合は直接取得）
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            period: 取得期間
+            use_cache: キャッシュ使用フラグ
+
+        Returns:
+            株価データのDataFrame（vwap列付き）
+        """
+        source = self.select_source(symbol, interval, period)
+        if source is None:
+            return self.collector.get_stock_data(symbol, interval, period, use_cache)
+
+        # 集約・保存には銘柄列などが必要なため、元データは省メモリ化せずに取得
+        fine = self.collector.get_stock_data(
+            symbol, source, period, use_cache, compact=False
+        )
+        if fine is None or fine.empty:
+            logger.info(f"元データなし、直接取得: {symbol} {interval}")
+            return self.collector.get_stock_data(symbol, interval, period, use_cache)
+
+        if use_cache:
+            try:
+                self.materialize(symbol, interval, source, source_data=fine)
+            except Exception as e:
+                logger.error(f"リサンプリング保存エラー: {str(e)}")
+
+        logger.info(f"リサンプリング: {symbol} {source}→{interval} ({len(fine)}件)")
+        resampled = self.resample(fine, interval, symbol)
+        if self.collector.compact_frames:
+            return self.collector._compact_output(resampled)
+        return resampled
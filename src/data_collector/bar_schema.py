@@ -0,0 +1,740 @@
+"""
+SQLiteバーキャッシュのスキーマ
+タイムスタンプはエポックナノ秒のINTEGER、銘柄・間隔はseries辞書テーブルに集約し、
+barsテーブルは (series_id, ts) をクラスタ化主キーとするWITHOUT ROWIDテーブルで保持する。
+古い取引日のバーはbar_blocksテーブルの日次圧縮ブロックへ移動でき、読み込み時に透過的に展開される。
+系列ごとの件数・期間・最終取得時刻・推定サイズはトリガーでseries_statsテーブルに集計する
+"""
+
+from typing import Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone, tzinfo
+import re
+import sqlite3
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .bar_blocks import (
+    BLOCK_COLUMNS, BLOCK_SCHEMA_SQL, iter_block_rows, read_block_rows, read_day_block,
+    write_block
+)
+
+
+SCHEMA_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS series (
+        series_id INTEGER PRIMARY KEY,
+        symbol TEXT NOT NULL,
+        interval TEXT NOT NULL,
+        tz TEXT,
+        UNIQUE (symbol, interval)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bars (
+        series_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume INTEGER,
+        created_at INTEGER,
+        PRIMARY KEY (series_id, ts)
+    ) WITHOUT ROWID
+    """,
+    BLOCK_SCHEMA_SQL,
+    """
+    CREATE TABLE IF NOT EXISTS series_stats (
+        series_id INTEGER PRIMARY KEY,
+        row_count INTEGER NOT NULL DEFAULT 0,
+        cold_rows INTEGER NOT NULL DEFAULT 0,
+        cold_blocks INTEGER NOT NULL DEFAULT 0,
+        min_ts INTEGER,
+        max_ts INTEGER,
+        last_fetch INTEGER,
+        bytes INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    # created_at条件の削除（clear_cache）用
+    "CREATE INDEX IF NOT EXISTS idx_bars_created_at ON bars(created_at)",
+]
+
+# barsテーブル1行あたりの推定サイズ（値7列 + キー・レコードヘッダー）
+HOT_ROW_BYTES = 64
+
+# バーの書き込み（既存行は更新として扱い、REPLACEによる削除・挿入でトリガーの集計がずれないようにする）
+UPSERT_BAR_SQL = (
+    "INSERT INTO bars (series_id, ts, open, high, low, close, volume, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (series_id, ts) DO UPDATE SET "
+    "open = excluded.open, high = excluded.high, "
+    "low = excluded.low, close = excluded.close, "
+    "volume = excluded.volume, created_at = excluded.created_at"
+)
+
+
+def _series_bound_sql(func: str, series_ref: str) -> str:
+    """barsと圧縮ブロックを合わせた系列の最初/最後の時刻を求めるサブクエリ"""
+    block_column = 'start_ts' if func == 'MIN' else 'end_ts'
+    return (
+        f"(SELECT {func}(v) FROM ("
+        f"SELECT {func}(ts) AS v FROM bars WHERE series_id = {series_ref} "
+        f"UNION ALL SELECT {func}({block_column}) FROM bar_blocks "
+        f"WHERE series_id = {series_ref}))"
+    )
+
+
+def _latest_sql(column: str, value: str) -> str:
+    """NULLを無視した2値の最大値"""
+    return f"MAX(COALESCE({column}, {value}), COALESCE({value}, {column}))"
+
+
+# series_statsを維持するトリガー（削除で境界の行が消えた場合のみ主キー順で再計算）
+STATS_TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bars_stats_insert AFTER INSERT ON bars BEGIN
+        INSERT INTO series_stats
+            (series_id, row_count, min_ts, max_ts, last_fetch, bytes)
+        VALUES (NEW.series_id, 1, NEW.ts, NEW.ts, NEW.created_at, {HOT_ROW_BYTES})
+        ON CONFLICT (series_id) DO UPDATE SET
+            row_count = row_count + 1,
+            min_ts = MIN(COALESCE(min_ts, NEW.ts), NEW.ts),
+            max_ts = MAX(COALESCE(max_ts, NEW.ts), NEW.ts),
+            last_fetch = {_latest_sql('last_fetch', 'NEW.created_at')},
+            bytes = bytes + {HOT_ROW_BYTES};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bars_stats_update AFTER UPDATE OF created_at ON bars
+    WHEN NEW.created_at IS NOT NULL BEGIN
+        UPDATE series_stats
+        SET last_fetch = {_latest_sql('last_fetch', 'NEW.created_at')}
+        WHERE series_id = NEW.series_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bars_stats_delete AFTER DELETE ON bars BEGIN
+        UPDATE series_stats SET
+            row_count = row_count - 1,
+            bytes = bytes - {HOT_ROW_BYTES},
+            min_ts = CASE WHEN OLD.ts <= min_ts
+                THEN {_series_bound_sql('MIN', 'OLD.series_id')} ELSE min_ts END,
+            max_ts = CASE WHEN OLD.ts >= max_ts
+                THEN {_series_bound_sql('MAX', 'OLD.series_id')} ELSE max_ts END
+        WHERE series_id = OLD.series_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bar_blocks_stats_insert
+    AFTER INSERT ON bar_blocks BEGIN
+        INSERT INTO series_stats
+            (series_id, cold_rows, cold_blocks, min_ts, max_ts, last_fetch, bytes)
+        VALUES (NEW.series_id, NEW.row_count, 1, NEW.start_ts, NEW.end_ts,
+                NEW.max_created_at, length(NEW.payload))
+        ON CONFLICT (series_id) DO UPDATE SET
+            cold_rows = cold_rows + NEW.row_count,
+            cold_blocks = cold_blocks + 1,
+            min_ts = MIN(COALESCE(min_ts, NEW.start_ts), NEW.start_ts),
+            max_ts = MAX(COALESCE(max_ts, NEW.end_ts), NEW.end_ts),
+            last_fetch = {_latest_sql('last_fetch', 'NEW.max_created_at')},
+            bytes = bytes + length(NEW.payload);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bar_blocks_stats_update
+    AFTER UPDATE ON bar_blocks BEGIN
+        UPDATE series_stats SET
+            cold_rows = cold_rows + NEW.row_count - OLD.row_count,
+            min_ts = {_series_bound_sql('MIN', 'NEW.series_id')},
+            max_ts = {_series_bound_sql('MAX', 'NEW.series_id')},
+            last_fetch = {_latest_sql('last_fetch', 'NEW.max_created_at')},
+            bytes = bytes + length(NEW.payload) - length(OLD.payload)
+        WHERE series_id = NEW.series_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS bar_blocks_stats_delete
+    AFTER DELETE ON bar_blocks BEGIN
+        UPDATE series_stats SET
+            cold_rows = cold_rows - OLD.row_count,
+            cold_blocks = cold_blocks - 1,
+            bytes = bytes - length(OLD.payload),
+            min_ts = CASE WHEN OLD.start_ts <= min_ts
+                THEN {_series_bound_sql('MIN', 'OLD.series_id')} ELSE min_ts END,
+            max_ts = CASE WHEN OLD.end_ts >= max_ts
+                THEN {_series_bound_sql('MAX', 'OLD.series_id')} ELSE max_ts END
+        WHERE series_id = OLD.series_id;
+    END
+    """,
+]
+
+# 旧スキーマ互換の読み取り専用ビュー（タイムスタンプはUTC、タイムゾーンなし系列は現地時刻のテキスト）
+COMPAT_VIEW_SQL = """
+    CREATE VIEW IF NOT EXISTS stock_data AS
+    SELECT
+        s.symbol AS symbol,
+        s.interval AS interval,
+        strftime('%Y-%m-%d %H:%M:%S', b.ts / 1000000000, 'unixepoch')
+            || CASE WHEN s.tz IS NULL THEN '' ELSE '+00:00' END AS timestamp,
+        b.open AS open,
+        b.high AS high,
+        b.low AS low,
+        b.close AS close,
+        b.volume AS volume,
+        strftime('%Y-%m-%dT%H:%M:%S', b.created_at / 1000000000, 'unixepoch')
+            AS created_at
+    FROM bars b JOIN series s ON s.series_id = b.series_id
+"""
+
+# 読み込み結果のカラム順（旧stock_dataテーブルと同じ）
+BAR_FRAME_COLUMNS = ['symbol', 'interval', 'timestamp', 'open', 'high',
+                     'low', 'close', 'volume', 'created_at']
+
+_FIXED_OFFSET = re.compile(r"^UTC([+-])(\d{2}):(\d{2})$")
+
+
+def parse_timezone(name: Optional[str]) -> Optional[Union[str, tzinfo]]:
+    """series.tzの文字列をpandasで使えるタイムゾーンに変換（固定オフセット表記にも対応）"""
+    if name is None:
+        return None
+    match = _FIXED_OFFSET.match(name)
+    if match:
+        sign = 1 if match.group(1) == "+" else -1
+        offset = timedelta(hours=int(match.group(2)), minutes=int(match.group(3)))
+        return timezone(sign * offset)
+    return name
+
+
+def timezone_name(values: pd.Series) -> Optional[str]:
+    """datetime列のタイムゾーン名（タイムゾーンなしはNone）"""
+    tz = getattr(values.dt, 'tz', None)
+    return str(tz) if tz is not None else None
+
+
+def to_epoch_ns(values: pd.Series) -> np.ndarray:
+    """
+    datetime列をエポックナノ秒に変換
+    タイムゾーン付きはUTC基準、タイムゾーンなしは壁時計時刻をそのまま数値化する（NaTは最小値）
+    """
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, format='ISO8601')
+    return pd.DatetimeIndex(values).as_unit('ns').asi8
+
+
+def from_epoch_ns(values: Union[pd.Series, np.ndarray], tz: Optional[str]) -> pd.Series:
+    """エポックナノ秒をdatetime列に変換（文字列解析なし）"""
+    timestamps = pd.to_datetime(np.asarray(values, dtype=np.int64), unit='ns')
+    if tz is not None:
+        timestamps = timestamps.tz_localize('UTC').tz_convert(parse_timezone(tz))
+    return pd.Series(timestamps)
+
+
+def bound_to_epoch_ns(bound: datetime, tz: Optional[str]) -> int:
+    """
+    範囲指定の境界値を系列と同じ基準のエポックナノ秒に変換
+    タイムゾーンなしの境界は系列のタイムゾーン（市場現地時刻）として解釈する
+    """
+    bound = pd.Timestamp(bound)
+    if tz is not None and bound.tzinfo is None:
+        bound = bound.tz_localize(parse_timezone(tz))
+    elif tz is None and bound.tzinfo is not None:
+        bound = bound.tz_convert(None)
+    return bound.as_unit('ns').value
+
+
+def _legacy_table_exists(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name = 'stock_data'"
+    ).fetchone()
+    return row is not None and row[0] == 'table'
+
+
+def iter_legacy_series(conn: sqlite3.Connection) -> Iterator[pd.DataFrame]:
+    """
+    旧TEXTスキーマのstock_dataテーブルを系列ごとに読み込み（接続には書き込まない）
+
+    Args:
+        conn: SQLite接続
+
+    Returns:
+        系列ごとのDataFrame（BAR_FRAME_COLUMNS、timestamp・created_atはdatetime）のイテレータ
+    """
+    if not _legacy_table_exists(conn):
+        return
+    series_list = conn.execute(
+        "SELECT DISTINCT symbol, interval FROM stock_data"
+    ).fetchall()
+
+    for symbol, interval in series_list:
+        data = pd.read_sql_query(
+            "SELECT symbol, interval, timestamp, open, high, low, close, volume, "
+            "created_at FROM stock_data WHERE symbol = ? AND interval = ?",
+            conn,
+            params=[symbol, interval]
+        )
+        try:
+            timestamps = pd.to_datetime(data['timestamp'], format='ISO8601')
+        except (ValueError, TypeError):
+            timestamps = None
+        if timestamps is None or timestamps.dtype == object:
+            # 夏時間などでオフセットが混在する系列はUTCに揃える
+            timestamps = pd.to_datetime(data['timestamp'], format='ISO8601', utc=True)
+
+        data['timestamp'] = timestamps
+        data['created_at'] = pd.to_datetime(data['created_at'], format='ISO8601')
+        yield data
+
+
+def _migrate_legacy_table(conn: sqlite3.Connection) -> int:
+    """TEXTタイムスタンプのstock_dataテーブルをbarsへ移行して削除"""
+    migrated = 0
+    for data in iter_legacy_series(conn):
+        symbol, interval = data['symbol'].iat[0], data['interval'].iat[0]
+        series_id, _ = get_series(
+            conn, symbol, interval, timezone_name(data['timestamp']), create=True
+        )
+
+        rows = build_bar_rows(series_id, data['timestamp'], data, data['created_at'])
+        conn.executemany(UPSERT_BAR_SQL, rows)
+        migrated += len(rows)
+
+    conn.execute("DROP TABLE stock_data")
+    return migrated
+
+
+def build_bar_rows(
+    series_id: int,
+    timestamps: pd.Series,
+    data: pd.DataFrame,
+    created_at: Optional[pd.Series] = None
+) -> list:
+    """barsテーブルへのバルク挿入用タプル列を作成（欠損値はNULL）"""
+    columns = [[series_id] * len(data), to_epoch_ns(timestamps).tolist()]
+    for col in ('open', 'high', 'low', 'close', 'volume'):
+        if col not in data.columns:
+            columns.append([None] * len(data))
+            continue
+        values = data[col]
+        if values.isna().any():
+            values = values.astype(object).where(values.notna(), None)
+        columns.append(values.tolist())
+
+    if created_at is None:
+        columns.append([None] * len(data))
+    else:
+        created_ns = pd.Series(to_epoch_ns(created_at), index=created_at.index)
+        known = created_at.notna().values
+        columns.append(created_ns.astype(object).where(known, None).tolist())
+    return list(zip(*columns))
+
+
+def initialize_bar_schema(conn: sqlite3.Connection) -> int:
+    """
+    スキーマ作成（旧TEXTスキーマのstock_dataテーブルがあれば移行）
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+
+    Returns:
+        旧テーブルから移行した件数
+    """
+    tables = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    if not tables and not conn.in_transaction:
+        # 新規DBは削除で空いたページをincremental_vacuumで返却できるようにする（テーブル作成前のみ変更可能）
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+
+    for statement in SCHEMA_SQL + STATS_TRIGGER_SQL:
+        conn.execute(statement)
+
+    migrated = 0
+    if _legacy_table_exists(conn):
+        migrated = _migrate_legacy_table(conn)
+        logger.info(f"キャッシュスキーマ移行完了: stock_data → bars ({migrated}件)")
+
+    if 'series_stats' not in tables:
+        # 集計テーブル導入前のDBは既存のバーから集計を作成
+        rebuild_series_stats(conn)
+
+    conn.execute(COMPAT_VIEW_SQL)
+    return migrated
+
+
+def rebuild_series_stats(conn: sqlite3.Connection):
+    """
+    series_statsをbars・bar_blocksから再集計
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+    """
+    conn.execute("DELETE FROM series_stats")
+    conn.execute(f"""
+        INSERT INTO series_stats
+            (series_id, row_count, cold_rows, cold_blocks,
+             min_ts, max_ts, last_fetch, bytes)
+        SELECT series_id, SUM(row_count), SUM(cold_rows), SUM(cold_blocks),
+               MIN(min_ts), MAX(max_ts), MAX(last_fetch), SUM(bytes)
+        FROM (
+            SELECT series_id, COUNT(*) AS row_count, 0 AS cold_rows, 0 AS cold_blocks,
+                   MIN(ts) AS min_ts, MAX(ts) AS max_ts, MAX(created_at) AS last_fetch,
+                   COUNT(*) * {HOT_ROW_BYTES} AS bytes
+            FROM bars GROUP BY series_id
+            UNION ALL
+            SELECT series_id, 0, SUM(row_count), COUNT(*), MIN(start_ts), MAX(end_ts),
+                   MAX(max_created_at), SUM(length(payload))
+            FROM bar_blocks GROUP BY series_id
+        )
+        GROUP BY series_id
+    """)
+
+
+def read_series_stats(conn: sqlite3.Connection) -> pd.DataFrame:
+    """
+    系列ごとの集計（データが残っている系列のみ、系列数に比例するコスト）
+
+    Args:
+        conn: SQLite接続
+
+    Returns:
+        symbol, interval, tz, records, cold_records, cold_blocks,
+        min_ts, max_ts, last_fetch, bytes のDataFrame
+    """
+    return pd.read_sql_query(
+        """
+        SELECT s.series_id, s.symbol, s.interval, s.tz,
+               st.row_count + st.cold_rows AS records, st.cold_rows AS cold_records,
+               st.cold_blocks, st.min_ts, st.max_ts, st.last_fetch, st.bytes
+        FROM series_stats st JOIN series s ON s.series_id = st.series_id
+        WHERE st.row_count + st.cold_rows > 0
+        ORDER BY s.symbol, s.interval
+        """,
+        conn
+    )
+
+
+def drop_series_before(conn: sqlite3.Connection, series_id: int, cutoff_ns: int) -> int:
+    """
+    系列の指定時刻より前のバーを削除（圧縮ブロックは日単位で削除し、境界の日のみ展開して切り詰める）
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+        series_id: 系列ID
+        cutoff_ns: この時刻（エポックナノ秒）より前を削除
+
+    Returns:
+        削除したバー数
+    """
+    removed = conn.execute(
+        "DELETE FROM bars WHERE series_id = ? AND ts < ?", (series_id, cutoff_ns)
+    ).rowcount
+
+    whole, = conn.execute(
+        "SELECT COALESCE(SUM(row_count), 0) FROM bar_blocks "
+        "WHERE series_id = ? AND end_ts < ?",
+        (series_id, cutoff_ns)
+    ).fetchone()
+    conn.execute(
+        "DELETE FROM bar_blocks WHERE series_id = ? AND end_ts < ?",
+        (series_id, cutoff_ns)
+    )
+    removed += whole
+
+    for day, row_count in conn.execute(
+        "SELECT day, row_count FROM bar_blocks WHERE series_id = ? AND start_ts < ?",
+        (series_id, cutoff_ns)
+    ).fetchall():
+        rows = read_day_block(conn, series_id, day)
+        kept = rows[rows['ts'] >= cutoff_ns].reset_index(drop=True)
+        write_block(conn, series_id, day, kept)
+        removed += row_count - len(kept)
+    return removed
+
+
+def drop_series(conn: sqlite3.Connection, series_id: int) -> int:
+    """
+    系列のバー・圧縮ブロックをすべて削除
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+        series_id: 系列ID
+
+    Returns:
+        削除したバー数
+    """
+    row = conn.execute(
+        "SELECT row_count + cold_rows FROM series_stats WHERE series_id = ?",
+        (series_id,)
+    ).fetchone()
+    conn.execute("DELETE FROM bars WHERE series_id = ?", (series_id,))
+    conn.execute("DELETE FROM bar_blocks WHERE series_id = ?", (series_id,))
+    return row[0] if row else 0
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages: Optional[int] = None) -> int:
+    """
+    削除で空いたページをファイルから返却（auto_vacuum=INCREMENTALでないDBは一度だけVACUUMで変換）
+
+    Args:
+        conn: SQLite接続（トランザクション外で実行）
+        pages: 返却する最大ページ数（Noneの場合はすべて）
+
+    Returns:
+        返却したページ数
+    """
+    before, = conn.execute("PRAGMA freelist_count").fetchone()
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        logger.info("キャッシュDBをincremental auto_vacuumへ変換（初回のみVACUUMを実行）")
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return before
+
+    # executeでは1ページずつしか進まないため、最後まで実行するexecutescriptを使用
+    conn.executescript(f"PRAGMA incremental_vacuum({pages or 0});")
+    after, = conn.execute("PRAGMA freelist_count").fetchone()
+    return before - after
+
+
+def get_series(
+    conn: sqlite3.Connection,
+    symbol: str,
+    interval: str,
+    tz: Optional[str] = None,
+    create: bool = False
+) -> Optional[Tuple[int, Optional[str]]]:
+    """
+    系列IDとタイムゾーンを取得
+
+    Args:
+        conn: SQLite接続
+        symbol: 銘柄コード
+        interval: データ間隔
+        tz: 書き込むデータのタイムゾーン（create時に登録・更新）
+        create: 未登録の場合に登録するか
+
+    Returns:
+        (series_id, tz)（未登録かつcreate=Falseの場合はNone）
+    """
+    row = conn.execute(
+        "SELECT series_id, tz FROM series WHERE symbol = ? AND interval = ?",
+        (symbol, interval)
+    ).fetchone()
+    if row is None:
+        if not create:
+            return None
+        conn.execute(
+            "INSERT OR IGNORE INTO series (symbol, interval, tz) VALUES (?, ?, ?)",
+            (symbol, interval, tz)
+        )
+        return get_series(conn, symbol, interval)
+
+    series_id, series_tz = row
+    if create and tz is not None and series_tz is not None and tz != series_tz:
+        # 値はUTC基準のため、タイムゾーンの付け替えは表示上の変更のみ
+        conn.execute("UPDATE series SET tz = ? WHERE series_id = ?", (tz, series_id))
+        series_tz = tz
+    return series_id, series_tz
+
+
+def _merge_block_rows(blocks: pd.DataFrame, bars: pd.DataFrame) -> pd.DataFrame:
+    """圧縮ブロックとbarsテーブルの行を時刻順に結合（同じ時刻はbars側の新しい書き込みを優先）"""
+    if bars.empty:
+        return blocks
+    if blocks.empty:
+        return bars
+    merged = pd.concat([blocks, bars], ignore_index=True)
+    if blocks['ts'].iloc[-1] < bars['ts'].iloc[0]:
+        return merged
+    merged = merged.sort_values('ts', kind='stable')
+    return merged.drop_duplicates('ts', keep='last').reset_index(drop=True)
+
+
+def _bar_range_query(
+    series_id: int, start_ns: Optional[int], end_ns: Optional[int]
+) -> Tuple[str, List[int]]:
+    """barsテーブルの範囲読み込みクエリ（主キー順）"""
+    query = (
+        "SELECT ts, open, high, low, close, volume, created_at FROM bars "
+        "WHERE series_id = ?"
+    )
+    params = [series_id]
+    if start_ns is not None:
+        query += " AND ts >= ?"
+        params.append(start_ns)
+    if end_ns is not None:
+        query += " AND ts <= ?"
+        params.append(end_ns)
+    return query + " ORDER BY ts", params
+
+
+def to_bar_frame(
+    rows: pd.DataFrame, symbol: str, interval: str, tz: Optional[str]
+) -> pd.DataFrame:
+    """
+    BLOCK_COLUMNSの行をキャッシュ読み込み結果の形式に変換
+
+    Args:
+        rows: ts, OHLCV, created_at（エポックナノ秒）のDataFrame
+        symbol: 銘柄コード
+        interval: データ間隔
+        tz: 系列のタイムゾーン
+
+    Returns:
+        旧stock_dataテーブルと同じカラム構成のDataFrame
+    """
+    return pd.DataFrame({
+        'symbol': symbol,
+        'interval': interval,
+        'timestamp': from_epoch_ns(rows['ts'], tz),
+        'open': rows['open'],
+        'high': rows['high'],
+        'low': rows['low'],
+        'close': rows['close'],
+        'volume': rows['volume'],
+        'created_at': pd.to_datetime(rows['created_at'], unit='ns'),
+    }, columns=BAR_FRAME_COLUMNS)
+
+
+def read_bars(
+    conn: sqlite3.Connection,
+    series_id: int,
+    symbol: str,
+    interval: str,
+    tz: Optional[str],
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    系列のバーを読み込み（範囲条件は整数比較、timestampは文字列解析なしでdatetime64に変換）
+
+    Args:
+        conn: SQLite接続
+        series_id: 系列ID
+        symbol: 銘柄コード
+        interval: データ間隔
+        tz: 系列のタイムゾーン
+        start_ns: 開始（エポックナノ秒、含む）
+        end_ns: 終了（エポックナノ秒、含む）
+
+    Returns:
+        旧stock_dataテーブルと同じカラム構成のDataFrame
+    """
+    query, params = _bar_range_query(series_id, start_ns, end_ns)
+    bars = pd.read_sql_query(query, conn, params=params)
+    blocks = read_block_rows(conn, series_id, start_ns, end_ns)
+    if blocks is not None:
+        bars = _merge_block_rows(blocks, bars)
+    return to_bar_frame(bars, symbol, interval, tz)
+
+
+def iter_bar_rows(
+    conn: sqlite3.Connection,
+    series_id: int,
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None,
+    chunk_rows: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """
+    系列のバーを時刻順に分割して読み込み
+    barsテーブルはカーソルからchunk_rows件ずつ、圧縮ブロックは1日ずつ展開して突き合わせるため、
+    保持する行数は系列の長さによらずchunk_rows + 1日分に収まる
+
+    Args:
+        conn: SQLite接続（反復中は他の書き込みに使わないこと）
+        series_id: 系列ID
+        start_ns: 開始（エポックナノ秒、含む）
+        end_ns: 終了（エポックナノ秒、含む）
+        chunk_rows: barsテーブルから1回に取り出す行数
+
+    Yields:
+        BLOCK_COLUMNSのts昇順DataFrame（同じ時刻はbars側を優先、各チャンクの行数は一定でない）
+    """
+    query, params = _bar_range_query(series_id, start_ns, end_ns)
+    cursor = conn.execute(query, params)
+    blocks = iter_block_rows(conn, series_id, start_ns, end_ns)
+    empty = pd.DataFrame(columns=BLOCK_COLUMNS)
+    hot = cold = empty
+
+    try:
+        while True:
+            # 空のバッファは補充し、補充できなければその読み込み元は終端
+            if hot.empty:
+                fetched = cursor.fetchmany(chunk_rows)
+                hot = pd.DataFrame(fetched, columns=BLOCK_COLUMNS) if fetched else empty
+            if cold.empty:
+                cold = next(blocks, empty)
+            if hot.empty and cold.empty:
+                return
+
+            # 両方に行が残っている場合、末尾が早い方の時刻までは両方の行が出そろっている
+            bound = min(
+                frame['ts'].iloc[-1] for frame in (hot, cold) if not frame.empty
+            )
+            hot_cut = int(np.searchsorted(hot['ts'].to_numpy(), bound, side='right'))
+            cold_cut = int(np.searchsorted(cold['ts'].to_numpy(), bound, side='right'))
+            merged = _merge_block_rows(cold.iloc[:cold_cut], hot.iloc[:hot_cut])
+            hot = hot.iloc[hot_cut:].reset_index(drop=True)
+            cold = cold.iloc[cold_cut:].reset_index(drop=True)
+            yield merged.reset_index(drop=True)
+    finally:
+        cursor.close()
+        blocks.close()
+
+
+def compact_series(
+    conn: sqlite3.Connection,
+    series_id: int,
+    tz: Optional[str],
+    before: datetime
+) -> int:
+    """
+    指定時刻を含む日より前の現地日のバーを日次圧縮ブロックへ移動
+
+    Args:
+        conn: SQLite接続（呼び出し側のトランザクション内で実行）
+        series_id: 系列ID
+        tz: 系列のタイムゾーン
+        before: この時刻の現地日の0時より前のバーを移動
+
+    Returns:
+        移動したバー数
+    """
+    bound = pd.Timestamp(before)
+    if tz is not None:
+        zone = parse_timezone(tz)
+        if bound.tzinfo is None:
+            bound = bound.tz_localize(zone)
+        else:
+            bound = bound.tz_convert(zone)
+    elif bound.tzinfo is not None:
+        bound = bound.tz_convert(None)
+    cutoff_ns = bound_to_epoch_ns(bound.normalize(), tz)
+
+    rows = pd.DataFrame(
+        conn.execute(
+            "SELECT ts, open, high, low, close, volume, created_at FROM bars "
+            "WHERE series_id = ? AND ts < ? ORDER BY ts",
+            (series_id, cutoff_ns)
+        ).fetchall(),
+        columns=BLOCK_COLUMNS
+    )
+    if rows.empty:
+        return 0
+
+    # 系列のタイムゾーンでの日付ごとにまとめ、既存ブロックがあれば後から書き込まれた行で上書きして結合
+    days = to_epoch_ns(from_epoch_ns(rows['ts'], tz).dt.normalize())
+    for day, group in rows.groupby(days, sort=True):
+        existing = read_day_block(conn, series_id, int(day))
+        if existing is not None:
+            group = pd.concat([existing, group], ignore_index=True)
+            group = group.sort_values('ts', kind='stable')
+            group = group.drop_duplicates('ts', keep='last')
+        write_block(conn, series_id, int(day), group.reset_index(drop=True))
+
+    conn.execute(
+        "DELETE FROM bars WHERE series_id = ? AND ts < ?", (series_id, cutoff_ns)
+    )
+    return len(rows)
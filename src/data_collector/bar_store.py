@@ -0,0 +1,385 @@
+"""
+バーデータ保存バックエンド
+StockDataCollectorのキャッシュ保存先を差し替えるためのストレージ層
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Union
+from datetime import datetime, date
+from pathlib import Path
+import os
+import sqlite3
+import threading
+import pandas as pd
+from loguru import logger
+
+from .bar_schema import iter_legacy_series, read_bars
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+    pq = None
+
+
+# キャッシュから返すDataFrameのカラム順（SQLiteバックエンドと同一）
+BAR_COLUMNS = ['symbol', 'interval', 'timestamp', 'open', 'high',
+               'low', 'close', 'volume', 'created_at']
+
+
+def align_timestamp_bound(bound: datetime, timestamps: pd.Series) -> pd.Timestamp:
+    """
+    範囲指定の境界値をtimestampカラムとタイムゾーン有無を揃えて返す
+    タイムゾーンなしの境界はカラムのタイムゾーン（市場現地時刻）として解釈する
+    """
+    bound = pd.Timestamp(bound)
+    column_tz = getattr(timestamps.dt, 'tz', None)
+    if column_tz is not None and bound.tzinfo is None:
+        return bound.tz_localize(column_tz)
+    if column_tz is None and bound.tzinfo is not None:
+        return bound.tz_convert(None)
+    return bound
+
+
+class BarStore(ABC):
+    """バーデータ保存バックエンドの共通インターフェース"""
+
+    @abstractmethod
+    def save(self, data: pd.DataFrame) -> int:
+        """
+        バーデータを保存（同一timestampは上書き）
+
+        Returns:
+            保存した件数
+        """
+
+    @abstractmethod
+    def load(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Optional[pd.DataFrame]:
+        """バーデータを時系列順に読み込み（該当なしはNone）"""
+
+    def iter_load(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Iterator[pd.DataFrame]:
+        """バーデータを時系列順に分割して読み込み（既定は一括読み込み）"""
+        data = self.load(symbol, interval, start_time, end_time)
+        if data is not None:
+            yield data
+
+    @abstractmethod
+    def clear(
+        self,
+        symbol: Optional[str] = None,
+        older_than: Optional[datetime] = None,
+        interval: Optional[str] = None
+    ) -> int:
+        """
+        created_atがolder_thanより古いデータを削除（intervalは指定時のみ絞り込み）
+
+        Returns:
+            削除した件数
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Union[int, str]]:
+        """キャッシュ統計情報（get_cache_statsと同じキー）"""
+
+    def series_version(self, symbol: str, interval: str) -> Optional[tuple]:
+        """系列の変更を示す値（他プロセスの書き込み検出用、未対応のストアはNone）"""
+        return None
+
+
+class ParquetBarStore(BarStore):
+    """
+    Parquet列指向バーデータストア
+    symbol/interval/日付 単位でパーティション分割したParquetファイルに保存し、
+    読み込み時は型付きのカラムとして直接DataFrameに展開する
+    """
+
+    def __init__(self, root_dir: Union[str, Path], compression: str = "zstd"):
+        """
+        初期化
+
+        Args:
+            root_dir: Parquetファイルの保存ルートディレクトリ
+            compression: Parquet圧縮方式
+        """
+        if pa is None:
+            raise ImportError(
+                "Parquetバックエンドにはpyarrowが必要です: pip install 'py-stock[columnar]'"
+            )
+
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self._write_lock = threading.Lock()
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        """symbol/intervalパーティションのディレクトリ"""
+        return self.root_dir / f"symbol={symbol}" / f"interval={interval}"
+
+    def series_version(self, symbol: str, interval: str) -> Optional[tuple]:
+        """系列ディレクトリの更新時刻（パーティションは置き換えで書き込むため書き込みごとに変わる）"""
+        series_dir = self._series_dir(symbol, interval)
+        return (series_dir.stat().st_mtime_ns,) if series_dir.exists() else ()
+
+    @staticmethod
+    def _partition_date(path: Path) -> Optional[date]:
+        """パーティションファイル名から日付を取得"""
+        try:
+            return date.fromisoformat(path.stem)
+        except ValueError:
+            return None
+
+    def _partition_files(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> List[Path]:
+        """日付範囲に該当するパーティションファイル一覧"""
+        series_dir = self._series_dir(symbol, interval)
+        if not series_dir.exists():
+            return []
+
+        # タイムゾーン差を考慮して前後1日分は余分に読み込み、後で厳密にフィルタする
+        margin = pd.Timedelta(days=1)
+        start_date = (pd.Timestamp(start_time) - margin).date() if start_time else None
+        end_date = (pd.Timestamp(end_time) + margin).date() if end_time else None
+
+        files = []
+        for path in sorted(series_dir.glob("*.parquet")):
+            partition_date = self._partition_date(path)
+            if partition_date is None:
+                continue
+            if start_date and partition_date < start_date:
+                continue
+            if end_date and partition_date > end_date:
+                continue
+            files.append(path)
+        return files
+
+    @staticmethod
+    def _read_partition(path: Path) -> pd.DataFrame:
+        """
+        パーティションファイルを1つ読み込み
+        ディレクトリ名（symbol=/interval=）をhiveパーティション列として推論させない
+        """
+        return pq.read_table(path, partitioning=None).to_pandas()
+
+    def _write_partition(self, path: Path, frame: pd.DataFrame):
+        """パーティションファイルを一時ファイル経由でアトミックに書き込み"""
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        tmp_path = path.with_suffix(".parquet.tmp")
+        pq.write_table(table, tmp_path, compression=self.compression)
+        os.replace(tmp_path, path)
+
+    def save(self, data: pd.DataFrame) -> int:
+        """バーデータをsymbol/interval/日付パーティションに保存"""
+        if data is None or data.empty:
+            return 0
+
+        frame = data[[col for col in BAR_COLUMNS if col in data.columns]].copy()
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+
+        with self._write_lock:
+            grouped = frame.groupby(['symbol', 'interval'], sort=False)
+            for (symbol, interval), series in grouped:
+                series_dir = self._series_dir(symbol, interval)
+                series_dir.mkdir(parents=True, exist_ok=True)
+
+                partitions = series.groupby(series['timestamp'].dt.date, sort=False)
+                for partition_date, part in partitions:
+                    path = series_dir / f"{partition_date.isoformat()}.parquet"
+                    if path.exists():
+                        existing = self._read_partition(path)
+                        part = pd.concat([existing, part], ignore_index=True)
+                    part = (
+                        part.drop_duplicates(subset=['timestamp'], keep='last')
+                        .sort_values('timestamp')
+                        .reset_index(drop=True)
+                    )
+                    self._write_partition(path, part)
+
+        logger.debug(f"Parquetキャッシュ保存完了: {len(frame)}件")
+        return len(frame)
+
+    def load(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Optional[pd.DataFrame]:
+        """パーティションを読み込み、時系列順のDataFrameとして返す"""
+        files = self._partition_files(symbol, interval, start_time, end_time)
+        if not files:
+            return None
+
+        data = pd.concat(
+            [self._read_partition(path) for path in files], ignore_index=True
+        )
+
+        timestamps = data['timestamp']
+        mask = pd.Series(True, index=data.index)
+        if start_time is not None:
+            mask &= timestamps >= align_timestamp_bound(start_time, timestamps)
+        if end_time is not None:
+            mask &= timestamps <= align_timestamp_bound(end_time, timestamps)
+        data = data[mask]
+
+        if data.empty:
+            return None
+
+        return data.sort_values('timestamp').reset_index(drop=True)
+
+    def iter_load(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Iterator[pd.DataFrame]:
+        """日付パーティションを1つずつ読み込み、時系列順に返す"""
+        for path in self._partition_files(symbol, interval, start_time, end_time):
+            data = self._read_partition(path)
+            timestamps = data['timestamp']
+            mask = pd.Series(True, index=data.index)
+            if start_time is not None:
+                mask &= timestamps >= align_timestamp_bound(start_time, timestamps)
+            if end_time is not None:
+                mask &= timestamps <= align_timestamp_bound(end_time, timestamps)
+            data = data[mask]
+            if not data.empty:
+                yield data.sort_values('timestamp').reset_index(drop=True)
+
+    def clear(
+        self,
+        symbol: Optional[str] = None,
+        older_than: Optional[datetime] = None,
+        interval: Optional[str] = None
+    ) -> int:
+        """created_atがolder_thanより古い行を削除し、空になったパーティションは削除"""
+        symbol_dir = f"symbol={symbol}" if symbol else "*"
+        interval_dir = f"interval={interval}" if interval else "*"
+        pattern = f"{symbol_dir}/{interval_dir}/*.parquet"
+        cutoff = older_than.isoformat() if older_than else None
+        removed = 0
+
+        with self._write_lock:
+            for path in self.root_dir.glob(pattern):
+                frame = self._read_partition(path)
+                if cutoff:
+                    # 取得時刻が不明な行はSQLiteバックエンドと同様に残す
+                    keep = frame['created_at'].isna() | (frame['created_at'] >= cutoff)
+                else:
+                    keep = pd.Series(False, index=frame.index)
+                removed += int((~keep).sum())
+
+                if not keep.any():
+                    path.unlink()
+                elif not keep.all():
+                    self._write_partition(path, frame[keep].reset_index(drop=True))
+
+        return removed
+
+    def stats(self) -> Dict[str, Union[int, str]]:
+        """パーティションのメタデータから統計情報を集計"""
+        total_records = 0
+        symbols = set()
+        latest_update = None
+        total_size = 0
+
+        for path in self.root_dir.glob("*/*/*.parquet"):
+            metadata = pq.read_metadata(path)
+            total_records += metadata.num_rows
+            total_size += path.stat().st_size
+            symbols.add(path.parent.parent.name.split("=", 1)[1])
+
+            # created_atの最大値は行グループ統計から取得（データ本体は読まない）
+            schema = metadata.schema.to_arrow_schema()
+            column_index = schema.get_field_index('created_at')
+            for group in range(metadata.num_row_groups):
+                statistics = metadata.row_group(group).column(column_index).statistics
+                if statistics is not None and statistics.has_min_max:
+                    file_latest = statistics.max
+                    if latest_update is None or file_latest > latest_update:
+                        latest_update = file_latest
+
+        return {
+            'total_records': total_records,
+            'unique_symbols': len(symbols),
+            'latest_update': latest_update or 'N/A',
+            'cache_file_size': f"{total_size / 1024 / 1024:.2f} MB"
+        }
+
+
+def _iter_source_series(conn: sqlite3.Connection) -> Iterator[pd.DataFrame]:
+    """移行元の系列を読み込み（barsスキーマと旧TEXTスキーマのstock_dataテーブルの両方に対応）"""
+    tables = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    if {'series', 'bars'} <= tables:
+        series_list = conn.execute(
+            "SELECT series_id, symbol, interval, tz FROM series "
+            "ORDER BY symbol, interval"
+        ).fetchall()
+        for series_id, symbol, interval, tz in series_list:
+            yield read_bars(conn, series_id, symbol, interval, tz)
+
+    yield from iter_legacy_series(conn)
+
+
+def migrate_sqlite_cache(db_path: Union[str, Path], store: BarStore) -> Dict[str, int]:
+    """
+    既存のSQLiteキャッシュ（barsテーブルまたは旧スキーマのstock_dataテーブル）を別バックエンドへ移行
+
+    Args:
+        db_path: 移行元のSQLiteデータベースパス
+        store: 移行先のバーデータストア
+
+    Returns:
+        {'series': 移行したsymbol/interval数, 'records': 移行した件数}
+    """
+    result = {'series': 0, 'records': 0}
+    db_path = Path(db_path)
+
+    if not db_path.exists():
+        logger.warning(f"移行元のキャッシュDBが存在しません: {db_path}")
+        return result
+
+    # 移行元は読み取り専用で開く（スキーマの作成・移行はしない）
+    conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        for data in _iter_source_series(conn):
+            if data.empty:
+                continue
+            symbol, interval = data['symbol'].iat[0], data['interval'].iat[0]
+            # Parquetストアのcreated_atはISO形式の文字列（取得時刻が不明な行はNoneのまま）
+            created_at = data['created_at']
+            data['created_at'] = (
+                created_at.dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+                .astype(object)
+                .where(created_at.notna(), None)
+            )
+
+            result['records'] += store.save(data)
+            result['series'] += 1
+            logger.info(f"キャッシュ移行: {symbol} {interval} ({len(data)}件)")
+    finally:
+        conn.close()
+
+    logger.info(f"キャッシュ移行完了: {result['series']}系列, {result['records']}件")
+    return result
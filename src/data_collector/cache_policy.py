@@ -0,0 +1,316 @@
+"""
+キャッシュ有効期限ポリシー
+取引時間外に取得したデータは次の取引開始まで変化しないため再取得せず、
+取引中のデータは間隔ごとの短い期限で更新する
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from datetime import date, datetime, time as dt_time, timedelta
+import pandas as pd
+
+from .bar_resampler import parse_sessions
+from .cache_ranges import from_epoch, to_epoch
+from .symbol_manager import MarketType, SymbolManager
+from ..config.settings import settings_manager
+
+try:
+    import holidays as holiday_calendars
+except ImportError:  # pragma: no cover
+    holiday_calendars = None
+
+
+# 取得時刻の表現: datetime（タイムゾーンなしはローカル時刻）またはUNIX秒
+FetchedAt = Union[datetime, float]
+
+
+def _to_utc(value: FetchedAt) -> pd.Timestamp:
+    """取得時刻をUTCタイムスタンプに変換"""
+    if isinstance(value, (int, float)):
+        return from_epoch(value)
+    return from_epoch(to_epoch(value))
+
+
+class CacheTTLPolicy(ABC):
+    """キャッシュ鮮度判定の共通インターフェース"""
+
+    @abstractmethod
+    def live_ttl(self, symbol: str, interval: str) -> timedelta:
+        """現在時刻を含む（更新中の）データの有効期間"""
+
+    @abstractmethod
+    def is_fresh(
+        self,
+        symbol: str,
+        interval: str,
+        fetched_at: FetchedAt,
+        now: Optional[FetchedAt] = None
+    ) -> bool:
+        """
+        取得済みデータを再取得せずに使えるか
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            fetched_at: 取得時刻
+            now: 判定時刻（省略時は現在時刻）
+
+        Returns:
+            有効期限内か
+        """
+
+
+class FixedTTLPolicy(CacheTTLPolicy):
+    """取得からの経過時間のみで判定する固定期限ポリシー"""
+
+    def __init__(self, expire_hours: float = 1):
+        """
+        初期化
+
+        Args:
+            expire_hours: 有効期限（時間）
+        """
+        self.ttl = timedelta(hours=expire_hours)
+
+    def live_ttl(self, symbol: str, interval: str) -> timedelta:
+        return self.ttl
+
+    def is_fresh(
+        self,
+        symbol: str,
+        interval: str,
+        fetched_at: FetchedAt,
+        now: Optional[FetchedAt] = None
+    ) -> bool:
+        now = pd.Timestamp.now(tz='UTC') if now is None else _to_utc(now)
+        return now - _to_utc(fetched_at) < self.ttl
+
+
+class MarketHoursTTLPolicy(CacheTTLPolicy):
+    """
+    取引時間に基づく期限ポリシー
+    取得後に取引時間（終了後の猶予を含む）が経過していなければ新しいバーはないため有効、
+    取引中は経過した取引時間が間隔ごとの期限未満の間だけ有効とする。
+    市場を判定できない銘柄は固定期限で判定する。
+    """
+
+    # 取引中のデータの有効期間（バーの確定間隔）
+    LIVE_TTL = {
+        "1m": timedelta(minutes=1),
+        "2m": timedelta(minutes=2),
+        "5m": timedelta(minutes=5),
+        "15m": timedelta(minutes=15),
+        "30m": timedelta(minutes=30),
+        "60m": timedelta(hours=1),
+        "90m": timedelta(minutes=90),
+        "1h": timedelta(hours=1),
+    }
+    # 日足以上は取引中も値が変わり続けるため一定間隔で更新
+    DAILY_LIVE_TTL = timedelta(minutes=30)
+
+    # 取引終了後も遅延配信の確定バーを取り込むまで取引中として扱う猶予
+    CLOSE_GRACE = timedelta(minutes=20)
+
+    # 取引所の定例休場日（月, 日）
+    FIXED_HOLIDAYS = {
+        MarketType.JAPAN: [(1, 1), (1, 2), (1, 3), (12, 31)],
+        MarketType.US: [(1, 1), (7, 4), (12, 25)],
+    }
+
+    # 取得時刻から判定時刻までの取引時間を数える最大日数（超える場合は期限切れ）
+    MAX_SCAN_DAYS = 14
+
+    def __init__(
+        self,
+        symbol_manager: Optional[SymbolManager] = None,
+        holidays: Optional[Dict[str, Iterable[str]]] = None,
+        fallback_expire_hours: float = 1,
+        close_grace: Optional[timedelta] = None
+    ):
+        """
+        初期化
+
+        Args:
+            symbol_manager: 市場判定・取引時間の取得に使用
+            holidays: 市場ごとの追加休場日（{"japan": ["2024-11-04", ...]}）
+            fallback_expire_hours: 市場を判定できない銘柄の有効期限（時間）
+            close_grace: 取引終了後の猶予（省略時はCLOSE_GRACE）
+        """
+        self.symbol_manager = symbol_manager or SymbolManager()
+        self.fallback = FixedTTLPolicy(fallback_expire_hours)
+        self.close_grace = self.CLOSE_GRACE if close_grace is None else close_grace
+        self._holidays = {
+            market: {date.fromisoformat(day) for day in days}
+            for market, days in (holidays or {}).items()
+        }
+        self._calendars: Dict[MarketType, object] = {}
+        self._markets: Dict[str, Tuple[MarketType, str, List[Tuple[int, int]]]] = {}
+
+    def _market(self, symbol: str) -> Tuple[MarketType, str, List[Tuple[int, int]]]:
+        """銘柄の市場・タイムゾーン・取引セッション"""
+        if symbol not in self._markets:
+            market_type = self.symbol_manager.detect_market_type(symbol)
+            hours = self.symbol_manager.get_market_hours_info(market_type)
+            self._markets[symbol] = (
+                market_type,
+                hours.get("timezone", "UTC"),
+                parse_sessions(hours.get("regular_hours"))
+            )
+        return self._markets[symbol]
+
+    def _calendar(self, market_type: MarketType):
+        """祝日カレンダー（holidaysパッケージがない場合はNone）"""
+        if holiday_calendars is None:
+            return None
+        if market_type not in self._calendars:
+            if market_type == MarketType.US:
+                self._calendars[market_type] = (
+                    holiday_calendars.financial_holidays("NYSE")
+                )
+            else:
+                self._calendars[market_type] = holiday_calendars.country_holidays("JP")
+        return self._calendars[market_type]
+
+    def is_trading_day(self, market_type: MarketType, day: date) -> bool:
+        """
+        取引日か（土日・定例休場日・祝日・設定の休場日は非取引日）
+
+        Args:
+            market_type: 市場タイプ
+            day: 市場の現地日付
+
+        Returns:
+            取引日か
+        """
+        if day.weekday() >= 5:
+            return False
+        if (day.month, day.day) in self.FIXED_HOLIDAYS.get(market_type, []):
+            return False
+        if day in self._holidays.get(market_type.value, set()):
+            return False
+        calendar = self._calendar(market_type)
+        return calendar is None or day not in calendar
+
+    def _sessions_on(
+        self,
+        symbol: str,
+        day: date
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """指定日の取引セッション（終了は猶予込み、UTC）"""
+        market_type, tz, sessions = self._market(symbol)
+        if not self.is_trading_day(market_type, day):
+            return []
+        midnight = pd.Timestamp(datetime.combine(day, dt_time())).tz_localize(tz)
+        return [
+            (
+                (midnight + timedelta(minutes=open_minute)).tz_convert('UTC'),
+                (
+                    midnight + timedelta(minutes=close_minute) + self.close_grace
+                ).tz_convert('UTC'),
+            )
+            for open_minute, close_minute in sessions
+        ]
+
+    def trading_time_between(
+        self,
+        symbol: str,
+        start: FetchedAt,
+        end: FetchedAt
+    ) -> timedelta:
+        """
+        期間内の取引時間（終了後の猶予を含む）
+
+        Args:
+            symbol: 銘柄コード
+            start: 期間の開始
+            end: 期間の終了
+
+        Returns:
+            取引時間の合計
+        """
+        start, end = _to_utc(start), _to_utc(end)
+        if end <= start:
+            return timedelta()
+
+        _, tz, _ = self._market(symbol)
+        first_day = start.tz_convert(tz).date()
+        last_day = min(
+            end.tz_convert(tz).date(), first_day + timedelta(days=self.MAX_SCAN_DAYS)
+        )
+
+        total = timedelta()
+        day = first_day
+        while day <= last_day:
+            for session_start, session_end in self._sessions_on(symbol, day):
+                overlap = min(end, session_end) - max(start, session_start)
+                if overlap > timedelta():
+                    total += overlap
+            day += timedelta(days=1)
+        return total
+
+    def is_open(self, symbol: str, at: Optional[FetchedAt] = None) -> bool:
+        """
+        取引中か（取引終了後の猶予を含む）
+
+        Args:
+            symbol: 銘柄コード
+            at: 判定時刻（省略時は現在時刻）
+
+        Returns:
+            取引中か
+        """
+        at = pd.Timestamp.now(tz='UTC') if at is None else _to_utc(at)
+        _, tz, _ = self._market(symbol)
+        local_day = at.tz_convert(tz).date()
+        # 猶予で日付をまたぐセッションに備えて前日分も確認
+        for day in (local_day - timedelta(days=1), local_day):
+            for session_start, session_end in self._sessions_on(symbol, day):
+                if session_start <= at < session_end:
+                    return True
+        return False
+
+    def live_ttl(self, symbol: str, interval: str) -> timedelta:
+        if self._market(symbol)[0] == MarketType.UNKNOWN:
+            return self.fallback.live_ttl(symbol, interval)
+        return self.LIVE_TTL.get(interval, self.DAILY_LIVE_TTL)
+
+    def is_fresh(
+        self,
+        symbol: str,
+        interval: str,
+        fetched_at: FetchedAt,
+        now: Optional[FetchedAt] = None
+    ) -> bool:
+        market_type, _, sessions = self._market(symbol)
+        if market_type == MarketType.UNKNOWN or not sessions:
+            return self.fallback.is_fresh(symbol, interval, fetched_at, now)
+
+        now = pd.Timestamp.now(tz='UTC') if now is None else _to_utc(now)
+        elapsed = self.trading_time_between(symbol, fetched_at, now)
+        if elapsed <= timedelta():
+            # 取得後に取引がない（時間外・週末・休場日）ため確定済み
+            return True
+        # 取引終了後は確定バーを取り込むため1回だけ再取得する
+        return self.is_open(symbol, now) and elapsed < self.live_ttl(symbol, interval)
+
+
+def create_ttl_policy(name: Optional[str] = None) -> CacheTTLPolicy:
+    """
+    設定に従ってキャッシュ有効期限ポリシーを作成
+
+    Args:
+        name: "market_hours" または "fixed"（省略時はDataCollectorConfig.cache_ttl_policy）
+
+    Returns:
+        有効期限ポリシー
+    """
+    config = settings_manager.settings.data_collector
+    name = name or config.cache_ttl_policy
+    if name == "market_hours":
+        return MarketHoursTTLPolicy(
+            holidays=config.market_holidays,
+            fallback_expire_hours=config.cache_expire_hours
+        )
+    if name == "fixed":
+        return FixedTTLPolicy(config.cache_expire_hours)
+    raise ValueError(f"未対応のキャッシュ有効期限ポリシー: {name}")
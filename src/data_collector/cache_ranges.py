@@ -0,0 +1,262 @@
+"""
+キャッシュ取得範囲メタデータ
+どの時間範囲をいつ取得したかを記録し、バーデータを読み込まずに鮮度を判定する
+"""
+
+from typing import Callable, List, Optional, Tuple
+from datetime import datetime, timedelta
+import sqlite3
+import time
+import pandas as pd
+
+
+# 取得範囲の表現: (開始, 終了) のUTCタイムスタンプ
+TimeRange = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+def to_epoch(value: datetime) -> float:
+    """日時をUNIX秒に変換（タイムゾーンなしはローカル時刻として扱う）"""
+    return pd.Timestamp(value).to_pydatetime().timestamp()
+
+
+def from_epoch(value: float) -> pd.Timestamp:
+    """UNIX秒をUTCタイムスタンプに変換"""
+    return pd.Timestamp(value, unit='s', tz='UTC')
+
+
+class CacheRangeIndex:
+    """
+    取得済み時間範囲のインデックス
+    cache_rangesテーブルに (symbol, interval, 範囲, 取得時刻) を保持する
+    """
+
+    # 取得時点で「現在」まで届いていた範囲とみなす許容誤差（秒）
+    LIVE_EDGE_TOLERANCE = 60.0
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection]):
+        """
+        初期化
+
+        Args:
+            connect: SQLite接続を返す関数
+        """
+        self._connect = connect
+        self.initialize()
+
+    def initialize(self):
+        """メタデータテーブル作成"""
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_ranges (
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    range_start REAL NOT NULL,
+                    range_end REAL NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cache_ranges_series
+                ON cache_ranges(symbol, interval, range_end)
+            """)
+
+    def record(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        fetched_at: Optional[float] = None
+    ):
+        """
+        取得済み範囲を記録（重なる・接する既存の記録は1行に統合）
+
+        統合後の範囲が現在時刻まで届いている（ライブ範囲の）場合、取得時刻は末尾を取得した
+        記録のうち最新のものを使う。過去で閉じた範囲は統合した記録の最新の取得時刻を使う。
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            start: 取得範囲の開始
+            end: 取得範囲の終了
+            fetched_at: 取得時刻（UNIX秒、省略時は現在時刻）
+        """
+        range_start, range_end = to_epoch(start), to_epoch(end)
+        fetched_at = time.time() if fetched_at is None else fetched_at
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT rowid, range_start, range_end, fetched_at FROM cache_ranges "
+                "WHERE symbol = ? AND interval = ? ORDER BY range_start",
+                (symbol, interval)
+            ).fetchall()
+
+            # 統合で範囲が広がると別の記録と重なる場合があるため、重ならなくなるまで繰り返す
+            merged = [(range_start, range_end, fetched_at)]
+            absorbed = []
+            remaining = rows
+            while True:
+                overlapping = [
+                    row for row in remaining
+                    if row[1] <= range_end and row[2] >= range_start
+                ]
+                if not overlapping:
+                    break
+                for rowid, row_start, row_end, row_fetched in overlapping:
+                    absorbed.append(rowid)
+                    merged.append((row_start, row_end, row_fetched))
+                    range_start = min(range_start, row_start)
+                    range_end = max(range_end, row_end)
+                remaining = [row for row in remaining if row[0] not in absorbed]
+
+            fetched_at = self._merged_fetched_at(merged, range_end)
+            for i in range(0, len(absorbed), 500):
+                batch = absorbed[i:i + 500]
+                placeholders = ','.join('?' * len(batch))
+                conn.execute(
+                    f"DELETE FROM cache_ranges WHERE rowid IN ({placeholders})", batch
+                )
+            conn.execute(
+                "INSERT INTO cache_ranges "
+                "(symbol, interval, range_start, range_end, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (symbol, interval, range_start, range_end, fetched_at)
+            )
+
+    def _merged_fetched_at(
+        self, ranges: List[Tuple[float, float, float]], range_end: float
+    ) -> float:
+        """
+        統合後の記録の取得時刻
+
+        末尾がライブ範囲の場合、それより新しい取得時刻を使うと過去で閉じた範囲とみなされ
+        未確定のバーまで確定扱いになるため、ライブのまま扱える取得時刻のうち最新のものを使う。
+        """
+        live = any(
+            end == range_end and end >= fetched - self.LIVE_EDGE_TOLERANCE
+            for _, end, fetched in ranges
+        )
+        if live:
+            return max(
+                fetched for _, _, fetched in ranges
+                if range_end >= fetched - self.LIVE_EDGE_TOLERANCE
+            )
+        return max(fetched for _, _, fetched in ranges)
+
+    def uncovered_ranges(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        live_ttl: timedelta,
+        now: Optional[float] = None,
+        is_live_fresh: Optional[Callable[[float], bool]] = None
+    ) -> Optional[List[TimeRange]]:
+        """
+        [start, end] のうち鮮度のある取得範囲でカバーされていない部分範囲を返す
+
+        取得時点で現在時刻まで届いていた範囲（ライブ範囲）は、取得時刻からlive_ttlの間
+        （is_live_fresh指定時はその判定が真の間）だけ現在時刻までカバーしているとみなす。
+        過去で閉じた範囲は確定済みとして期限なしで有効。
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            start: 判定範囲の開始
+            end: 判定範囲の終了
+            live_ttl: ライブ範囲の有効期間
+            now: 判定時刻（UNIX秒、省略時は現在時刻）
+            is_live_fresh: ライブ範囲の取得時刻（UNIX秒）から鮮度を判定する関数
+
+        Returns:
+            未カバー範囲のリスト（全てカバー済みなら空リスト、記録自体がなければNone）
+        """
+        now = time.time() if now is None else now
+        request_start, request_end = to_epoch(start), to_epoch(end)
+        ttl_seconds = live_ttl.total_seconds()
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT range_start, range_end, fetched_at FROM cache_ranges "
+                "WHERE symbol = ? AND interval = ?",
+                (symbol, interval)
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        covered = []
+        for range_start, range_end, fetched_at in rows:
+            if range_end >= fetched_at - self.LIVE_EDGE_TOLERANCE:
+                # ライブ範囲: TTL内なら現在時刻まで、期限切れなら取得時刻-TTLまでを確定とみなす
+                if is_live_fresh:
+                    fresh = is_live_fresh(fetched_at)
+                else:
+                    fresh = now - fetched_at < ttl_seconds
+                if fresh:
+                    range_end = max(range_end, now)
+                else:
+                    range_end = fetched_at - ttl_seconds
+            if range_end > range_start:
+                covered.append((range_start, range_end))
+
+        uncovered = []
+        cursor = request_start
+        for range_start, range_end in sorted(covered):
+            if range_end <= cursor:
+                continue
+            if range_start > cursor:
+                uncovered.append((cursor, min(range_start, request_end)))
+            cursor = max(cursor, range_end)
+            if cursor >= request_end:
+                break
+        if cursor < request_end:
+            uncovered.append((cursor, request_end))
+
+        return [(from_epoch(s), from_epoch(e)) for s, e in uncovered if e > s]
+
+    def clear(
+        self,
+        symbol: Optional[str] = None,
+        older_than: Optional[datetime] = None
+    ):
+        """取得時刻がolder_thanより古い記録を削除"""
+        cutoff = to_epoch(older_than) if older_than is not None else float('inf')
+        with self._connect() as conn:
+            if symbol:
+                conn.execute(
+                    "DELETE FROM cache_ranges WHERE symbol = ? AND fetched_at < ?",
+                    (symbol, cutoff)
+                )
+            else:
+                conn.execute("DELETE FROM cache_ranges WHERE fetched_at < ?", (cutoff,))
+
+    def trim(self, symbol: str, interval: str, before: Optional[datetime] = None):
+        """
+        保持期間外となった範囲の記録を削除（beforeをまたぐ範囲は開始を切り詰める）
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            before: この時刻より前を削除（Noneの場合は系列の記録をすべて削除）
+        """
+        with self._connect() as conn:
+            if before is None:
+                conn.execute(
+                    "DELETE FROM cache_ranges WHERE symbol = ? AND interval = ?",
+                    (symbol, interval)
+                )
+                return
+
+            cutoff = to_epoch(before)
+            conn.execute(
+                "DELETE FROM cache_ranges "
+                "WHERE symbol = ? AND interval = ? AND range_end <= ?",
+                (symbol, interval, cutoff)
+            )
+            conn.execute(
+                "UPDATE cache_ranges SET range_start = ? "
+                "WHERE symbol = ? AND interval = ? AND range_start < ?",
+                (cutoff, symbol, interval, cutoff)
+            )
@@ -0,0 +1,152 @@
+"""
+キャッシュ保持期間・容量の管理
+系列ごとの集計テーブル（series_stats）から対象を選ぶため、全バーの走査なしで
+保持期間を過ぎたバーの削除・容量超過時の系列単位の追い出しを行い、空いたページをファイルから返却する
+"""
+
+from typing import Dict, List, Optional, Tuple
+from datetime import timedelta
+import pandas as pd
+from loguru import logger
+
+from .bar_schema import (
+    bound_to_epoch_ns, drop_series, drop_series_before, incremental_vacuum,
+    read_series_stats
+)
+from ..config.settings import settings_manager
+
+
+class CacheRetentionManager:
+    """
+    SQLiteバーキャッシュの保持ポリシー
+    保持期間（バーの時刻基準）を過ぎたバーは系列ごとの主キー範囲・日次ブロック単位で削除し、
+    容量上限を超えた場合は最終取得が古い系列から削除する。
+    """
+
+    def __init__(
+        self,
+        collector,
+        retention_days: Optional[int] = None,
+        max_cache_mb: Optional[float] = None,
+        vacuum_pages: Optional[int] = None
+    ):
+        """
+        初期化
+
+        Args:
+            collector: 対象のStockDataCollector
+            retention_days: バーの保持日数（省略時はDataCollectorConfig.retention_days、0以下で無期限）
+            max_cache_mb: バーデータの容量上限MB（省略時はDataCollectorConfig.max_cache_mb、0以下で無制限）
+            vacuum_pages: 1回に返却する最大ページ数（Noneの場合はすべて）
+        """
+        config = settings_manager.settings.data_collector
+        self.collector = collector
+        if retention_days is None:
+            retention_days = config.retention_days
+        if max_cache_mb is None:
+            max_cache_mb = config.max_cache_mb
+        self.retention_days = retention_days
+        self.max_bytes = int(max_cache_mb * 1024 * 1024)
+        self.vacuum_pages = vacuum_pages
+
+    def _forget(self, series: List[Tuple[str, str]],
+                before: Optional[pd.Timestamp] = None):
+        """削除した系列の取得範囲記録・メモリキャッシュを更新"""
+        for symbol, interval in series:
+            self.collector.range_index.trim(symbol, interval, before)
+            self.collector.frame_cache.invalidate(
+                self.collector._cache_location, symbol, interval
+            )
+
+    def drop_expired(self) -> int:
+        """
+        保持期間を過ぎたバーを削除
+
+        Returns:
+            削除したバー数
+        """
+        if self.retention_days <= 0:
+            return 0
+
+        cutoff = pd.Timestamp.now(tz='UTC') - timedelta(days=self.retention_days)
+        removed = 0
+        affected = []
+        with self.collector._connect() as conn:
+            for row in read_series_stats(conn).itertuples(index=False):
+                cutoff_ns = bound_to_epoch_ns(cutoff, row.tz)
+                if row.min_ts >= cutoff_ns:
+                    continue
+                removed += drop_series_before(conn, row.series_id, cutoff_ns)
+                affected.append((row.symbol, row.interval))
+
+        self._forget(affected, cutoff)
+        if removed:
+            logger.info(
+                f"保持期間外のキャッシュ削除: {len(affected)}系列 "
+                f"({removed}件, {self.retention_days}日より前)"
+            )
+        return removed
+
+    def evict_to_size(self) -> Dict[str, int]:
+        """
+        容量上限を超えている場合、最終取得が古い系列から削除
+
+        Returns:
+            削除した系列数・バー数
+        """
+        result = {'series': 0, 'rows': 0}
+        if self.max_bytes <= 0:
+            return result
+
+        evicted = []
+        with self.collector._connect() as conn:
+            stats = read_series_stats(conn)
+            total = int(stats['bytes'].sum())
+            if total <= self.max_bytes:
+                return result
+
+            stats = stats.sort_values('last_fetch', na_position='first')
+            for row in stats.itertuples(index=False):
+                if total <= self.max_bytes:
+                    break
+                result['rows'] += drop_series(conn, row.series_id)
+                result['series'] += 1
+                total -= row.bytes
+                evicted.append((row.symbol, row.interval))
+
+        self._forget(evicted)
+        logger.info(f"容量超過のためキャッシュ削除: {result['series']}系列 ({result['rows']}件)")
+        return result
+
+    def vacuum(self) -> int:
+        """
+        削除で空いたページをファイルから返却
+
+        Returns:
+            返却したページ数
+        """
+        with self.collector._connect() as conn:
+            return incremental_vacuum(conn, self.vacuum_pages)
+
+    def enforce(self) -> Dict[str, int]:
+        """
+        保持期間・容量上限を適用して空き領域を返却
+
+        Returns:
+            削除したバー数・追い出した系列数・返却したページ数
+        """
+        if self.collector.bar_store is not None:
+            logger.info("Parquetバックエンドの保持期間はclear_cacheで管理します")
+            return {
+                'expired_rows': 0, 'evicted_series': 0, 'evicted_rows': 0,
+                'freed_pages': 0
+            }
+
+        expired = self.drop_expired()
+        evicted = self.evict_to_size()
+        return {
+            'expired_rows': expired,
+            'evicted_series': evicted['series'],
+            'evicted_rows': evicted['rows'],
+            'freed_pages': self.vacuum(),
+        }
@@ -0,0 +1,547 @@
+"""
+市場データプロバイダー
+yfinance呼び出しを抽象化し、記録済みデータや合成データによるオフライン再生と差し替え可能にする
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+import random
+import time
+import zlib
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from loguru import logger
+
+from ..config.settings import settings_manager
+
+
+# 財務諸表: (損益計算書, 貸借対照表)
+FinancialStatements = Tuple[pd.DataFrame, pd.DataFrame]
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class DataProvider(ABC):
+    """
+    市場データプロバイダーの基底クラス
+    戻り値はyfinanceと同じ形式（DatetimeIndex + Open/High/Low/Close/Volume）に揃える
+    """
+
+    # 上流APIのレート制限を適用するか（オフライン再生では不要）
+    rate_limited = True
+
+    @abstractmethod
+    def history(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        period: Optional[str] = "1mo",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        OHLCV履歴を取得
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            period: 取得期間（startが指定された場合は無視）
+            start: 取得開始日時
+            end: 取得終了日時
+
+        Returns:
+            yfinance形式の株価データ（データがない場合は空のDataFrame）
+        """
+
+    @abstractmethod
+    def info(self, symbol: str) -> Dict:
+        """銘柄情報（yfinanceのTicker.info相当）"""
+
+    @abstractmethod
+    def financials(self, symbol: str) -> FinancialStatements:
+        """財務諸表（損益計算書, 貸借対照表）"""
+
+    def download(
+        self,
+        symbols: List[str],
+        interval: str = "1d",
+        period: str = "1mo"
+    ) -> pd.DataFrame:
+        """
+        複数銘柄の一括取得（yf.download(group_by='ticker')と同じ列構成）
+
+        Args:
+            symbols: 銘柄コードのリスト
+            interval: データ間隔
+            period: 取得期間
+
+        Returns:
+            (銘柄, 項目) のMultiIndex列を持つDataFrame
+        """
+        frames = {}
+        for symbol in symbols:
+            frame = self.history(symbol, interval=interval, period=period)
+            if not frame.empty:
+                frames[symbol] = frame[OHLCV_COLUMNS]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+
+class YFinanceProvider(DataProvider):
+    """yfinance経由で取得するプロバイダー（既定）"""
+
+    def history(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        period: Optional[str] = "1mo",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        ticker = yf.Ticker(symbol)
+        if start is not None:
+            return ticker.history(start=start, end=end, interval=interval)
+        return ticker.history(period=period, interval=interval)
+
+    def info(self, symbol: str) -> Dict:
+        return yf.Ticker(symbol).info
+
+    def financials(self, symbol: str) -> FinancialStatements:
+        ticker = yf.Ticker(symbol)
+        return ticker.financials, ticker.balance_sheet
+
+    def download(
+        self,
+        symbols: List[str],
+        interval: str = "1d",
+        period: str = "1mo"
+    ) -> pd.DataFrame:
+        return yf.download(
+            tickers=symbols,
+            period=period,
+            interval=interval,
+            group_by='ticker',
+            auto_adjust=True,
+            threads=False,
+            progress=False
+        )
+
+
+class ReplayDataProvider(DataProvider):
+    """
+    オフライン再生プロバイダー
+    data_dir配下の記録済みデータを返し、記録がない銘柄は合成データを生成する（synthetic=Trueの場合）。
+    合成データは銘柄と時刻から決定的に生成されるため、同じ要求には常に同じ結果を返す。
+
+    ディレクトリ構成:
+        history/<銘柄>/<間隔>.csv    OHLCV履歴（先頭列が日時）
+        info/<銘柄>.json             銘柄情報
+        financials/<銘柄>_income.csv, financials/<銘柄>_balance.csv  財務諸表
+    """
+
+    rate_limited = False
+
+    # 取得期間の長さ（ytd・maxは別扱い）
+    PERIOD_LENGTHS = {
+        "1d": timedelta(days=1),
+        "5d": timedelta(days=5),
+        "1mo": timedelta(days=31),
+        "3mo": timedelta(days=92),
+        "6mo": timedelta(days=183),
+        "1y": timedelta(days=366),
+        "2y": timedelta(days=731),
+        "5y": timedelta(days=1827),
+        "10y": timedelta(days=3653),
+    }
+    MAX_PERIOD = timedelta(days=3653)
+
+    # 日足以上の間隔に対応する日付頻度
+    DAILY_FREQUENCIES = {
+        "1d": "B", "5d": "5B", "1wk": "W-MON", "1mo": "MS", "3mo": "QS"
+    }
+
+    # 合成データの取引時間帯: (タイムゾーン, 開始, 終了)
+    SESSIONS = {
+        "japan": ("Asia/Tokyo", "09:00", "15:00"),
+        "us": ("America/New_York", "09:30", "16:00"),
+    }
+
+    def __init__(
+        self,
+        data_dir: Optional[Union[str, Path]] = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        synthetic: bool = True,
+        seed: int = 0
+    ):
+        """
+        初期化
+
+        Args:
+            data_dir: 記録済みデータのディレクトリ（Noneの場合は合成データのみ）
+            latency: 1リクエストあたりの疑似レイテンシ（秒）
+            latency_jitter: レイテンシに加える一様乱数の幅（秒）
+            synthetic: 記録がない銘柄に合成データを返すか
+            seed: 合成データの乱数シード
+        """
+        self.data_dir = Path(data_dir) if data_dir is not None else None
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.synthetic = synthetic
+        self.seed = seed
+        self.request_count = 0
+
+    def _simulate_latency(self):
+        """設定されたレイテンシ分待機"""
+        self.request_count += 1
+        delay = self.latency
+        if self.latency_jitter > 0:
+            delay += random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def _file_name(symbol: str) -> str:
+        return symbol.replace("/", "_")
+
+    def _path(self, kind: str, name: str) -> Optional[Path]:
+        if self.data_dir is None:
+            return None
+        return self.data_dir / kind / name
+
+    def _symbol_seed(self, symbol: str) -> int:
+        return zlib.crc32(symbol.encode("utf-8")) ^ self.seed
+
+    @classmethod
+    def _is_intraday(cls, interval: str) -> bool:
+        return interval not in cls.DAILY_FREQUENCIES
+
+    @staticmethod
+    def _intraday_step(interval: str) -> pd.Timedelta:
+        """分足・時間足の間隔（例: 5m, 1h）"""
+        if interval.endswith("m"):
+            return pd.Timedelta(minutes=int(interval[:-1]))
+        if interval.endswith("h"):
+            return pd.Timedelta(hours=int(interval[:-1]))
+        raise ValueError(f"未対応のデータ間隔: {interval}")
+
+    def _session(self, symbol: str) -> Tuple[str, str, str]:
+        market = "japan" if symbol.endswith(".T") or symbol.isdigit() else "us"
+        return self.SESSIONS[market]
+
+    # ---- 記録 ----
+
+    def record_history(self, symbol: str, interval: str, data: pd.DataFrame):
+        """OHLCV履歴を記録（既存の記録と時刻で統合）"""
+        path = self._path("history", f"{self._file_name(symbol)}/{interval}.csv")
+        if path is None:
+            raise ValueError("data_dirが指定されていないため記録できません")
+
+        data = data[OHLCV_COLUMNS].copy()
+        index = pd.DatetimeIndex(data.index)
+        if index.tz is not None:
+            data.index = index.tz_convert("UTC")
+        else:
+            data.index = index.tz_localize("UTC")
+
+        existing = self._read_history_file(path)
+        if existing is not None:
+            data = pd.concat([existing, data])
+            data = data[~data.index.duplicated(keep='last')].sort_index()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data.to_csv(path, index_label="Datetime")
+
+    def record_info(self, symbol: str, info: Dict):
+        """銘柄情報を記録"""
+        path = self._path("info", f"{self._file_name(symbol)}.json")
+        if path is None:
+            raise ValueError("data_dirが指定されていないため記録できません")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(info, ensure_ascii=False, default=str), encoding="utf-8"
+        )
+
+    def record_financials(
+        self,
+        symbol: str,
+        financials: pd.DataFrame,
+        balance_sheet: pd.DataFrame
+    ):
+        """財務諸表を記録"""
+        income_path = self._path("financials", f"{self._file_name(symbol)}_income.csv")
+        if income_path is None:
+            raise ValueError("data_dirが指定されていないため記録できません")
+        income_path.parent.mkdir(parents=True, exist_ok=True)
+        financials.to_csv(income_path)
+        balance_sheet.to_csv(
+            income_path.with_name(f"{self._file_name(symbol)}_balance.csv")
+        )
+
+    # ---- 再生 ----
+
+    @staticmethod
+    def _read_history_file(path: Path) -> Optional[pd.DataFrame]:
+        if not path.exists():
+            return None
+        data = pd.read_csv(path, index_col=0)
+        data.index = pd.to_datetime(data.index, utc=True)
+        return data
+
+    def _resolve_window(
+        self,
+        period: Optional[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        tz: str
+    ) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """要求範囲をタイムゾーン付きの [開始, 終了) に変換"""
+        def localize(value) -> pd.Timestamp:
+            ts = pd.Timestamp(value)
+            return ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+
+        window_end = localize(end) if end is not None else pd.Timestamp.now(tz=tz)
+        if start is not None:
+            return localize(start), window_end
+        if period == "ytd":
+            return window_end.normalize().replace(month=1, day=1), window_end
+        length = self.PERIOD_LENGTHS.get(period or "1mo", self.MAX_PERIOD)
+        return window_end - length, window_end
+
+    def _synthetic_history(
+        self,
+        symbol: str,
+        interval: str,
+        window_start: pd.Timestamp,
+        window_end: pd.Timestamp
+    ) -> pd.DataFrame:
+        """時刻から決定的に計算する合成OHLCV"""
+        tz, session_open, session_close = self._session(symbol)
+
+        if not self._is_intraday(interval):
+            step = pd.Timedelta(days=1)
+            index = pd.date_range(
+                window_start.normalize(), window_end,
+                freq=self.DAILY_FREQUENCIES[interval], inclusive="left"
+            )
+            index.name = "Date"
+        else:
+            step = self._intraday_step(interval)
+            index = pd.date_range(
+                window_start.floor(step), window_end, freq=step, inclusive="left"
+            )
+            index = index[index >= window_start]
+            index = index[index.dayofweek < 5]
+            times = index.strftime("%H:%M")
+            index = index[(times >= session_open) & (times < session_close)]
+            index.name = "Datetime"
+
+        if len(index) == 0:
+            return pd.DataFrame(columns=OHLCV_COLUMNS, index=index)
+
+        seed = self._symbol_seed(symbol)
+        base_price = 500 + seed % 9500
+        seconds = index.asi8 // 10**9
+
+        def noise(values: np.ndarray, salt: int) -> np.ndarray:
+            # 整数ハッシュによる [0, 1) の擬似乱数（時刻が同じなら常に同じ値）
+            hashed = (values * 2654435761 + seed * 40503 + salt * 97) % 4294967296
+            return hashed / 4294967296.0
+
+        def price_at(values: np.ndarray) -> np.ndarray:
+            days = values / 86400.0
+            phase = (seed % 360) * np.pi / 180
+            trend = (
+                0.15 * np.sin(2 * np.pi * days / 180 + phase)
+                + 0.05 * np.sin(2 * np.pi * days / 9 + phase / 2)
+            )
+            return base_price * (1 + trend + 0.01 * (noise(values, 1) - 0.5))
+
+        step_seconds = int(step.total_seconds())
+        close = price_at(seconds)
+        open_ = price_at(seconds - step_seconds)
+        spread = 0.004 * base_price * noise(seconds, 2)
+        data = pd.DataFrame({
+            'Open': open_.round(2),
+            'High': (np.maximum(open_, close) + spread).round(2),
+            'Low': (np.minimum(open_, close) - spread).round(2),
+            'Close': close.round(2),
+            'Volume': (1000 + noise(seconds, 3) * 100000).astype(np.int64),
+        }, index=index)
+        return data
+
+    def history(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        period: Optional[str] = "1mo",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        self._simulate_latency()
+        tz = self._session(symbol)[0]
+        window_start, window_end = self._resolve_window(period, start, end, tz)
+
+        path = self._path("history", f"{self._file_name(symbol)}/{interval}.csv")
+        recorded = self._read_history_file(path) if path is not None else None
+        if recorded is not None:
+            recorded.index = recorded.index.tz_convert(tz)
+            recorded.index.name = "Datetime" if self._is_intraday(interval) else "Date"
+            if start is None and end is None:
+                # 記録データは記録時点の「現在」基準のため、期間指定は記録の末尾から数える
+                window_end = recorded.index.max() + pd.Timedelta(seconds=1)
+                window_start, window_end = self._resolve_window(
+                    period, None, window_end, tz
+                )
+            in_window = (recorded.index >= window_start) & (recorded.index < window_end)
+            return recorded[in_window]
+
+        if not self.synthetic:
+            logger.warning(f"再生データがありません: {symbol} ({interval})")
+            return pd.DataFrame()
+        return self._synthetic_history(symbol, interval, window_start, window_end)
+
+    def info(self, symbol: str) -> Dict:
+        self._simulate_latency()
+        path = self._path("info", f"{self._file_name(symbol)}.json")
+        if path is not None and path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))
+        if not self.synthetic:
+            return {}
+
+        seed = self._symbol_seed(symbol)
+        history = self.history(symbol, interval="1d", period="5d")
+        if history.empty:
+            price = float(500 + seed % 9500)
+        else:
+            price = float(history['Close'].iloc[-1])
+        shares = 1_000_000 * (10 + seed % 990)
+        return {
+            'symbol': symbol,
+            'longName': f"Synthetic {symbol}",
+            'currentPrice': price,
+            'regularMarketPrice': price,
+            'trailingPE': round(8 + (seed % 300) / 10, 2),
+            'priceToBook': round(0.5 + (seed % 40) / 10, 2),
+            'returnOnEquity': round(0.02 + (seed % 20) / 100, 4),
+            'returnOnAssets': round(0.01 + (seed % 10) / 100, 4),
+            'dividendRate': round(price * (seed % 40) / 1000, 2),
+            'dividendYield': round((seed % 40) / 1000, 4),
+            'marketCap': price * shares,
+            'sharesOutstanding': shares,
+            'sector': [
+                "Technology", "Industrials", "Financial Services", "Consumer Cyclical"
+            ][seed % 4],
+        }
+
+    def financials(self, symbol: str) -> FinancialStatements:
+        self._simulate_latency()
+        income_path = self._path("financials", f"{self._file_name(symbol)}_income.csv")
+        if income_path is not None and income_path.exists():
+            balance_path = income_path.with_name(
+                f"{self._file_name(symbol)}_balance.csv"
+            )
+            financials = pd.read_csv(income_path, index_col=0)
+            if balance_path.exists():
+                balance_sheet = pd.read_csv(balance_path, index_col=0)
+            else:
+                balance_sheet = pd.DataFrame()
+            financials.columns = pd.to_datetime(financials.columns)
+            if not balance_sheet.empty:
+                balance_sheet.columns = pd.to_datetime(balance_sheet.columns)
+            return financials, balance_sheet
+        if not self.synthetic:
+            return pd.DataFrame(), pd.DataFrame()
+
+        seed = self._symbol_seed(symbol)
+        this_year = datetime.now().year
+        years = [pd.Timestamp(f"{this_year - offset}-03-31") for offset in range(1, 5)]
+        growth = 1 + (seed % 15) / 100
+        revenue = [1e10 * (1 + seed % 50) / growth ** offset for offset in range(4)]
+        financials = pd.DataFrame(
+            [revenue, [value * 0.08 for value in revenue]],
+            index=["Total Revenue", "Net Income"], columns=years
+        )
+        total_assets = [value * 1.5 for value in revenue]
+        balance_sheet = pd.DataFrame(
+            [
+                total_assets,
+                [value * 0.45 for value in total_assets],
+                [value * 0.4 for value in total_assets],
+                [value * 0.3 for value in total_assets],
+                [value * 0.25 for value in total_assets],
+            ],
+            index=["Total Assets", "Total Equity Gross Minority Interest",
+                   "Current Assets", "Current Liabilities", "Total Debt"],
+            columns=years
+        )
+        return financials, balance_sheet
+
+
+class RecordingDataProvider(DataProvider):
+    """
+    取得結果を記録しながら別のプロバイダーへ委譲するプロバイダー
+    オンラインで一度実行した内容を、ReplayDataProviderでオフライン再生するために使う
+    """
+
+    def __init__(self, provider: DataProvider, data_dir: Union[str, Path]):
+        """
+        初期化
+
+        Args:
+            provider: 実際の取得を行うプロバイダー
+            data_dir: 記録先ディレクトリ
+        """
+        self.provider = provider
+        self.recorder = ReplayDataProvider(data_dir, synthetic=False)
+        self.rate_limited = provider.rate_limited
+
+    def history(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        period: Optional[str] = "1mo",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        data = self.provider.history(
+            symbol, interval=interval, period=period, start=start, end=end
+        )
+        if data is not None and not data.empty:
+            self.recorder.record_history(symbol, interval, data)
+        return data
+
+    def info(self, symbol: str) -> Dict:
+        info = self.provider.info(symbol)
+        if info:
+            self.recorder.record_info(symbol, info)
+        return info
+
+    def financials(self, symbol: str) -> FinancialStatements:
+        financials, balance_sheet = self.provider.financials(symbol)
+        if financials is not None and not financials.empty:
+            self.recorder.record_financials(symbol, financials, balance_sheet)
+        return financials, balance_sheet
+
+
+def create_data_provider(name: Optional[str] = None) -> DataProvider:
+    """
+    設定に従ってプロバイダーを作成
+
+    Args:
+        name: プロバイダー名（"yfinance" または "replay"、省略時はDataCollectorConfig.data_provider）
+
+    Returns:
+        データプロバイダー
+    """
+    config = settings_manager.settings.data_collector
+    name = name or config.data_provider
+    if name == "yfinance":
+        return YFinanceProvider()
+    if name == "replay":
+        return ReplayDataProvider(config.replay_data_dir, latency=config.replay_latency)
+    raise ValueError(f"未対応のデータプロバイダー: {name}")
@@ -0,0 +1,265 @@
+"""
+解析済みバーデータのプロセス内キャッシュ
+SQLite/Parquetから読み込んだDataFrameをメモリ上限付きのLRUで保持し、
+同じ系列の再読み込み・再変換を省略する。他プロセスの書き込みは、呼び出し側が渡す系列のバージョン
+（保存先の変更を示す安価な値）が登録時と異なることで検出する
+"""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+import threading
+import pandas as pd
+
+from .bar_store import align_timestamp_bound
+from ..config.settings import settings_manager
+
+
+# 系列キー: (キャッシュの保存先, 銘柄コード, データ間隔)
+SeriesKey = Tuple[str, str, str]
+
+
+@dataclass
+class _Entry:
+    """キャッシュエントリ（読み込んだ範囲とメモリ使用量）"""
+    frame: pd.DataFrame
+    start: Optional[pd.Timestamp]
+    end: Optional[pd.Timestamp]
+    nbytes: int
+    version: Optional[Hashable] = None
+
+
+class FrameCache:
+    """
+    バイト数上限付きのLRUフレームキャッシュ
+    系列ごとに読み込み済みの範囲を保持し、要求範囲を含む場合はその範囲を切り出して返す。
+    書き込み時にinvalidateで破棄する（読み込み中に書き込みがあった結果は世代番号で登録を拒否する）。
+    他プロセスからの書き込みは取得時に渡されたバージョンが登録時と異なる場合に破棄する。
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        """
+        初期化
+
+        Args:
+            max_bytes: 保持するDataFrameの合計バイト数の上限（0でキャッシュ無効）
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[SeriesKey, _Entry]" = OrderedDict()
+        self._generations: Dict[SeriesKey, int] = {}
+        self._epoch = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def _bound(
+        value: Optional[datetime],
+        frame: pd.DataFrame
+    ) -> Optional[pd.Timestamp]:
+        """範囲の境界をDataFrameのtimestampカラムとタイムゾーン有無を揃えて比較可能にする"""
+        if value is None:
+            return None
+        return align_timestamp_bound(value, frame['timestamp'])
+
+    @staticmethod
+    def _covers(
+        entry: _Entry,
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp]
+    ) -> bool:
+        """エントリの読み込み範囲が要求範囲を含むか"""
+        if entry.start is not None and (start is None or start < entry.start):
+            return False
+        if entry.end is not None and (end is None or end > entry.end):
+            return False
+        return True
+
+    def generation(self, key: SeriesKey) -> Tuple[int, int]:
+        """
+        系列の世代番号（読み込み前に取得し、putに渡す）
+
+        Args:
+            key: 系列キー
+
+        Returns:
+            (全体の世代, 系列の世代)
+        """
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def get(
+        self,
+        key: SeriesKey,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        version: Optional[Hashable] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        キャッシュ済みのDataFrameを取得
+
+        Args:
+            key: 系列キー
+            start: 開始（含む）
+            end: 終了（含む）
+            version: 保存先の現在の系列バージョン（登録時と異なる場合は破棄してミス）
+
+        Returns:
+            要求範囲のDataFrameのコピー（キャッシュにない場合はNone）
+        """
+        if self.max_bytes <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and version is not None and entry.version != version:
+                # 他プロセスが書き込んだため古い
+                self._bytes -= self._entries.pop(key).nbytes
+                self._counters['invalidations'] += 1
+                entry = None
+            if entry is not None:
+                start = self._bound(start, entry.frame)
+                end = self._bound(end, entry.frame)
+            if entry is None or not self._covers(entry, start, end):
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            frame = entry.frame
+
+        # 呼び出し側での変更がキャッシュに波及しないようコピーを返す
+        if start == entry.start and end == entry.end:
+            return frame.copy()
+        timestamps = frame['timestamp']
+        mask = pd.Series(True, index=frame.index)
+        if start is not None:
+            mask &= timestamps >= start
+        if end is not None:
+            mask &= timestamps <= end
+        if not mask.any():
+            return None
+        return frame[mask].reset_index(drop=True)
+
+    def put(
+        self,
+        key: SeriesKey,
+        frame: pd.DataFrame,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        generation: Tuple[int, int],
+        version: Optional[Hashable] = None
+    ) -> bool:
+        """
+        読み込んだDataFrameを登録（上限を超える分は最も古く使われたものから破棄）
+
+        Args:
+            key: 系列キー
+            frame: 読み込んだDataFrame（登録後は変更しないこと）
+            start: 読み込み範囲の開始
+            end: 読み込み範囲の終了
+            generation: 読み込み前に取得した世代番号
+            version: 読み込み前に取得した保存先の系列バージョン
+
+        Returns:
+            登録したか
+        """
+        if self.max_bytes <= 0:
+            return False
+
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return False
+
+        with self._lock:
+            if generation != (self._epoch, self._generations.get(key, 0)):
+                # 読み込み中に書き込まれたため古い可能性がある
+                return False
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = _Entry(
+                frame, self._bound(start, frame), self._bound(end, frame),
+                nbytes, version
+            )
+            self._bytes += nbytes
+
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._counters['evictions'] += 1
+        return True
+
+    def invalidate(
+        self,
+        location: str,
+        symbol: Optional[str] = None,
+        interval: Optional[str] = None
+    ) -> int:
+        """
+        書き込まれた系列のエントリを破棄
+
+        Args:
+            location: キャッシュの保存先
+            symbol: 銘柄コード（Noneの場合は保存先の全系列）
+            interval: データ間隔（Noneの場合は銘柄の全間隔）
+
+        Returns:
+            破棄したエントリ数
+        """
+        with self._lock:
+            if symbol is not None and interval is not None:
+                key = (location, symbol, interval)
+                self._generations[key] = self._generations.get(key, 0) + 1
+                keys = [key] if key in self._entries else []
+            else:
+                # 対象の系列を列挙できないため全体の世代を進める
+                self._epoch += 1
+                keys = [
+                    key for key in self._entries
+                    if key[0] == location and (symbol is None or key[1] == symbol)
+                ]
+
+            for key in keys:
+                self._bytes -= self._entries.pop(key).nbytes
+            self._counters['invalidations'] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        """全エントリを破棄"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        キャッシュ統計
+
+        Returns:
+            エントリ数・使用バイト数とヒット/ミスなどの累計カウンタ
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+            used = self._bytes
+
+        requests = counters['hits'] + counters['misses']
+        return {
+            'entries': entries,
+            'bytes': used,
+            'max_bytes': self.max_bytes,
+            **counters,
+            'hit_ratio': counters['hits'] / requests if requests else 0.0,
+        }
+
+
+def _create_default_cache() -> FrameCache:
+    """設定（DataCollectorConfig.frame_cache_mb）に従った既定のキャッシュを作成"""
+    size_mb = settings_manager.settings.data_collector.frame_cache_mb
+    return FrameCache(max_bytes=int(size_mb) * 1024 * 1024)
+
+
+# アプリケーション全体で共有するフレームキャッシュ（同じキャッシュを使うコレクター間で共有）
+frame_cache = _create_default_cache()
@@ -0,0 +1,98 @@
+"""
+返却用バーデータの省メモリ化
+銘柄・間隔のように全行で同じ値の列や行ごとの文字列メタデータを除き、
+数値列を必要最小限の型に詰めることで、多数の銘柄のデータを同時に保持しやすくする
+"""
+
+from typing import Dict
+import pandas as pd
+
+
+# 価格系の列（float32化の対象）
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'vwap']
+
+# 行ごとに保持するメタデータ列（全行同じ値の銘柄・間隔とキャッシュ取得時刻）
+METADATA_COLUMNS = ['symbol', 'interval', 'created_at']
+
+
+def frame_memory_bytes(data: pd.DataFrame) -> int:
+    """DataFrameのメモリ使用量（文字列などのオブジェクトの実体を含む）"""
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+def compact_bar_frame(
+    data: pd.DataFrame,
+    float32_prices: bool = False,
+    drop_metadata: bool = True
+) -> pd.DataFrame:
+    """
+    バーデータを省メモリな型に変換した新しいDataFrameを作成
+
+    - timestamp: 文字列の場合はdatetime64に変換
+    - open/high/low/close/vwap: float32_prices指定時のみfloat32（有効桁数は約7桁）
+    - volume: 整数列は値域に収まる最小の整数型
+    - symbol/interval/created_at: drop_metadata指定時は列を削除し、
+      銘柄・間隔・最終取得時刻は DataFrame.attrs の symbol / interval / fetched_at に保持。
+      削除しない場合は銘柄・間隔をcategory型、created_atをdatetime64に変換
+
+    Args:
+        data: キャッシュ読み込み・取得結果と同じカラム構成のDataFrame
+        float32_prices: 価格列をfloat32にするか
+        drop_metadata: メタデータ列を削除してattrsに移すか
+
+    Returns:
+        変換後のDataFrame（元のDataFrameは変更しない）
+    """
+    compact = data.drop(columns=[
+        col for col in METADATA_COLUMNS if drop_metadata and col in data.columns
+    ])
+    attrs = dict(data.attrs)
+
+    if ('timestamp' in compact.columns
+            and not pd.api.types.is_datetime64_any_dtype(compact['timestamp'])):
+        compact['timestamp'] = pd.to_datetime(compact['timestamp'], format='ISO8601')
+
+    if float32_prices:
+        for col in PRICE_COLUMNS:
+            if col in compact.columns:
+                compact[col] = compact[col].astype('float32')
+
+    if 'volume' in compact.columns and pd.api.types.is_integer_dtype(compact['volume']):
+        compact['volume'] = pd.to_numeric(compact['volume'], downcast='integer')
+
+    for col in ['symbol', 'interval']:
+        if col not in data.columns or data.empty:
+            continue
+        if drop_metadata:
+            attrs[col] = data[col].iloc[0]
+        else:
+            compact[col] = data[col].astype('category')
+
+    if 'created_at' in data.columns:
+        created_at = data['created_at']
+        if not pd.api.types.is_datetime64_any_dtype(created_at):
+            created_at = pd.to_datetime(created_at, format='ISO8601')
+        if drop_metadata:
+            if created_at.notna().any():
+                attrs['fetched_at'] = created_at.max()
+        else:
+            compact['created_at'] = created_at
+
+    compact.attrs = attrs
+    return compact
+
+
+def compaction_report(before: pd.DataFrame, after: pd.DataFrame) -> Dict[str, int]:
+    """
+    変換前後のメモリ使用量
+
+    Returns:
+        bytes_before, bytes_after, bytes_saved の辞書
+    """
+    bytes_before = frame_memory_bytes(before)
+    bytes_after = frame_memory_bytes(after)
+    return {
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'bytes_saved': bytes_before - bytes_after,
+    }
@@ -0,0 +1,342 @@
+"""
+ファンダメンタルズの永続キャッシュ
+銘柄情報（Ticker.info）・損益計算書・貸借対照表を銘柄×項目ごとにSQLiteへ保存し、
+項目ごとの有効期限（四半期更新の財務諸表は長め）で再取得を判断する。
+プロセス・ダッシュボードのセッションをまたいで共有され、期限切れの銘柄だけをまとめて並列取得する
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from datetime import datetime, timedelta
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json
+import sqlite3
+import time
+import pandas as pd
+from loguru import logger
+
+from .data_provider import DataProvider
+from ..config.settings import settings_manager
+from ..utils.sqlite_pool import connection_manager
+
+
+# 保存する項目（financials / balance_sheet は DataProvider.financials の1回の取得で両方そろう）
+FUNDAMENTAL_FIELDS = ("info", "financials", "balance_sheet")
+STATEMENT_FIELDS = ("financials", "balance_sheet")
+
+# 項目ごとの既定の有効期限（時間）
+DEFAULT_TTL_HOURS = {
+    "info": 24,
+    "financials": 24 * 30,
+    "balance_sheet": 24 * 30,
+}
+
+# 保存値と取得時刻
+CachedValue = Tuple[Any, datetime]
+
+
+def _encode_frame(frame: Optional[pd.DataFrame]) -> str:
+    """財務諸表（行: 勘定科目, 列: 決算期）をJSONに変換"""
+    if frame is None:
+        frame = pd.DataFrame()
+    date_columns = isinstance(frame.columns, pd.DatetimeIndex)
+    return json.dumps({
+        'index': [str(label) for label in frame.index],
+        'columns': [
+            label.isoformat() if date_columns else str(label) for label in frame.columns
+        ],
+        'date_columns': date_columns,
+        'data': (
+            json.loads(frame.to_json(orient='values', double_precision=15))
+            if not frame.empty else []
+        ),
+    })
+
+
+def _decode_frame(payload: str) -> pd.DataFrame:
+    """_encode_frameの逆変換"""
+    data = json.loads(payload)
+    columns = data['columns']
+    if data['date_columns']:
+        columns = pd.to_datetime(columns)
+    if not data['data']:
+        return pd.DataFrame(index=data['index'], columns=columns)
+    return pd.DataFrame(data['data'], index=data['index'], columns=columns)
+
+
+def _encode(field: str, value: Any) -> str:
+    if field == "info":
+        return json.dumps(value, default=str)
+    return _encode_frame(value)
+
+
+def _decode(field: str, payload: str) -> Any:
+    if field == "info":
+        return json.loads(payload)
+    return _decode_frame(payload)
+
+
+class FundamentalsStore:
+    """
+    ファンダメンタルズのディスクキャッシュ
+    fundamentalsテーブルに (symbol, field) ごとのJSONと取得時刻を保持する
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path, None] = None,
+        ttl_hours: Optional[Dict[str, float]] = None
+    ):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteファイル（省略時は DataCollectorConfig.cache_dir 配下の fundamentals.db）
+            ttl_hours: 項目ごとの有効期限（省略時は DataCollectorConfig.fundamentals_ttl_hours）
+        """
+        config = settings_manager.settings.data_collector
+        if db_path is None:
+            db_path = Path(config.cache_dir) / "fundamentals.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_hours = {
+            **DEFAULT_TTL_HOURS,
+            **(config.fundamentals_ttl_hours if ttl_hours is None else ttl_hours)
+        }
+        self.initialize()
+
+    def _connect(self) -> sqlite3.Connection:
+        """スレッドごとにプールされたSQLite接続を取得"""
+        return connection_manager.connection(self.db_path)
+
+    def initialize(self):
+        """テーブル作成"""
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fundamentals (
+                    symbol TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (symbol, field)
+                ) WITHOUT ROWID
+            """)
+
+    def ttl(self, field: str) -> timedelta:
+        """項目の有効期限"""
+        return timedelta(hours=self.ttl_hours[field])
+
+    def is_fresh(self, field: str, fetched_at: datetime,
+                 now: Optional[datetime] = None) -> bool:
+        """取得時刻が有効期限内か"""
+        return (now or datetime.now()) - fetched_at < self.ttl(field)
+
+    def load_many(
+        self,
+        symbols: Sequence[str],
+        fields: Sequence[str] = FUNDAMENTAL_FIELDS,
+        include_stale: bool = False
+    ) -> Dict[Tuple[str, str], CachedValue]:
+        """
+        複数銘柄・項目を1回のクエリで読み込み
+
+        Args:
+            symbols: 銘柄コードのリスト
+            fields: 読み込む項目
+            include_stale: 有効期限切れの値も返すか
+
+        Returns:
+            (銘柄, 項目) をキーとした (値, 取得時刻) の辞書
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+
+        now = time.time()
+        max_age = {field: self.ttl_hours[field] * 3600 for field in fields}
+        results = {}
+        with self._connect() as conn:
+            # SQLiteのパラメータ数上限を避けるため銘柄を分割
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT symbol, field, payload, fetched_at FROM fundamentals "
+                    f"WHERE symbol IN ({','.join('?' * len(chunk))}) "
+                    f"AND field IN ({','.join('?' * len(fields))})",
+                    [*chunk, *fields]
+                ).fetchall()
+                for symbol, field, payload, fetched_at in rows:
+                    if not include_stale and now - fetched_at >= max_age[field]:
+                        continue
+                    results[(symbol, field)] = (
+                        _decode(field, payload), datetime.fromtimestamp(fetched_at)
+                    )
+        return results
+
+    def get(self, symbol: str, field: str) -> Optional[CachedValue]:
+        """
+        有効期限内の値を取得
+
+        Returns:
+            (値, 取得時刻)（未保存・期限切れの場合はNone）
+        """
+        return self.load_many([symbol], [field]).get((symbol, field))
+
+    def put_many(self, entries: Iterable[Tuple[str, str, Any]],
+                 fetched_at: Optional[float] = None) -> int:
+        """
+        複数の値を単一トランザクションで保存
+
+        Args:
+            entries: (銘柄, 項目, 値) の列
+            fetched_at: 取得時刻（UNIX秒、省略時は現在時刻）
+
+        Returns:
+            保存した件数
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = [
+            (symbol, field, _encode(field, value), fetched_at)
+            for symbol, field, value in entries
+        ]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO fundamentals (symbol, field, payload, fetched_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (symbol, field) DO UPDATE SET "
+                "payload = excluded.payload, fetched_at = excluded.fetched_at",
+                rows
+            )
+        return len(rows)
+
+    def put(self, symbol: str, field: str, value: Any):
+        """値を保存"""
+        self.put_many([(symbol, field, value)])
+
+    def stale_fields(
+        self,
+        symbols: Sequence[str],
+        fields: Sequence[str] = FUNDAMENTAL_FIELDS
+    ) -> Dict[str, List[str]]:
+        """
+        未保存・期限切れの項目（値は読み込まない）
+
+        Returns:
+            銘柄をキーとした再取得が必要な項目のリスト（すべて有効な銘柄は含まない）
+        """
+        symbols = list(dict.fromkeys(symbols))
+        now = time.time()
+        fresh = set()
+        with self._connect() as conn:
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i + 500]
+                for symbol, field, fetched_at in conn.execute(
+                    f"SELECT symbol, field, fetched_at FROM fundamentals "
+                    f"WHERE symbol IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ):
+                    if field not in fields:
+                        continue
+                    if now - fetched_at < self.ttl_hours[field] * 3600:
+                        fresh.add((symbol, field))
+
+        stale = {}
+        for symbol in symbols:
+            missing = [field for field in fields if (symbol, field) not in fresh]
+            if missing:
+                stale[symbol] = missing
+        return stale
+
+    @staticmethod
+    def _fetch(
+        provider: DataProvider, symbol: str, fields: Sequence[str]
+    ) -> List[Tuple[str, str, Any]]:
+        """1銘柄の必要な項目を取得（空の銘柄情報・財務諸表は取得失敗として保存しない）"""
+        entries = []
+        if "info" in fields:
+            info = provider.info(symbol)
+            if not info:
+                raise ValueError("銘柄情報が空です")
+            entries.append((symbol, "info", info))
+        if any(field in fields for field in STATEMENT_FIELDS):
+            financials, balance_sheet = provider.financials(symbol)
+            if financials.empty or balance_sheet.empty:
+                raise ValueError("財務諸表が空です")
+            entries.append((symbol, "financials", financials))
+            entries.append((symbol, "balance_sheet", balance_sheet))
+        return entries
+
+    def refresh(
+        self,
+        symbols: Sequence[str],
+        provider: DataProvider,
+        fields: Sequence[str] = FUNDAMENTAL_FIELDS,
+        force: bool = False,
+        max_workers: int = 4
+    ) -> Dict[str, int]:
+        """
+        未保存・期限切れの項目をまとめて並列取得し、単一トランザクションで保存
+
+        Args:
+            symbols: 銘柄コードのリスト
+            provider: 取得元
+            fields: 対象の項目
+            force: 有効期限内の項目も再取得するか
+            max_workers: 同時取得銘柄数
+
+        Returns:
+            対象銘柄数・取得した銘柄数・失敗した銘柄数・有効期限内だった銘柄数
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if force:
+            stale = {symbol: list(fields) for symbol in symbols}
+        else:
+            stale = self.stale_fields(symbols, fields)
+        summary = {
+            'symbols': len(symbols), 'fetched': 0, 'failed': 0,
+            'fresh': len(symbols) - len(stale)
+        }
+        if not stale:
+            return summary
+
+        entries = []
+        max_workers = max(1, min(max_workers, len(stale)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch, provider, symbol, missing): symbol
+                for symbol, missing in stale.items()
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    entries.extend(future.result())
+                    summary['fetched'] += 1
+                except Exception as e:
+                    summary['failed'] += 1
+                    logger.error(f"ファンダメンタルズ取得エラー {symbol}: {e}")
+
+        self.put_many(entries)
+        logger.info(
+            f"ファンダメンタルズ更新: 取得{summary['fetched']} 失敗{summary['failed']} "
+            f"有効期限内{summary['fresh']} / {summary['symbols']}銘柄"
+        )
+        return summary
+
+    def clear(self, symbol: Optional[str] = None) -> int:
+        """
+        保存値を削除
+
+        Args:
+            symbol: 銘柄コード（省略時はすべて）
+
+        Returns:
+            削除した件数
+        """
+        with self._connect() as conn:
+            if symbol is None:
+                return conn.execute("DELETE FROM fundamentals").rowcount
+            return conn.execute(
+                "DELETE FROM fundamentals WHERE symbol = ?", (symbol,)
+            ).rowcount
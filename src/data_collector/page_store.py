@@ -0,0 +1,426 @@
+"""
+SQLiteデータベースのページ単位の差分スナップショット
+データベースファイルをページごとにハッシュし、内容で重複排除したページだけを保存する。
+スナップショットはページのハッシュ列（マニフェスト）で表し、マニフェストも一定ページ数ごとの
+チャンクとして同じストアに重複排除して保存するため、変更の少ない大きなデータベースでも
+1回のスナップショットで増えるのは変更されたページと変更箇所のチャンクだけになる
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+import os
+import sqlite3
+import time
+import zlib
+from loguru import logger
+
+from .bar_schema import incremental_vacuum
+from ..utils.sqlite_pool import connection_manager
+
+
+# ページ・チャンクのハッシュ長（バイト）
+HASH_BYTES = 16
+
+# マニフェストの1チャンクに含めるページ数（チャンクは HASH_BYTES * この値 のバイト列）
+MANIFEST_CHUNK_PAGES = 1024
+
+# データベースファイルを1回に読み込むページ数
+READ_PAGES = 256
+
+# ストア自体のページサイズ（SQLiteの上限）
+STORE_PAGE_SIZE = 65536
+
+# IN句1回あたりのハッシュ数
+QUERY_BATCH = 500
+
+STORE_SCHEMA_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS objects (
+        hash BLOB PRIMARY KEY,
+        data BLOB NOT NULL,
+        compressed INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS snapshots (
+        snapshot_id INTEGER PRIMARY KEY,
+        db_path TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        page_size INTEGER NOT NULL,
+        page_count INTEGER NOT NULL,
+        manifest BLOB NOT NULL,
+        bytes_added INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_snapshots_db_path "
+    "ON snapshots(db_path, created_at)",
+]
+
+
+def _digest(data: Union[bytes, memoryview]) -> bytes:
+    return blake2b(data, digest_size=HASH_BYTES).digest()
+
+
+def _split_hashes(data: bytes) -> List[bytes]:
+    return [data[i:i + HASH_BYTES] for i in range(0, len(data), HASH_BYTES)]
+
+
+def _placeholders(values: Sequence) -> str:
+    return ','.join('?' * len(values))
+
+
+class PageStore:
+    """
+    内容アドレス方式のページストア
+    objectsテーブルにページ・マニフェストチャンクをハッシュをキーとして1回だけ保存し、
+    snapshotsテーブルにスナップショットごとのチャンクハッシュ列を保持する
+    """
+
+    def __init__(self, store_path: Union[str, Path], compress: bool = False):
+        """
+        初期化
+
+        Args:
+            store_path: ストアのSQLiteファイル
+            compress: 新しく保存するページをzlibで圧縮するか
+        """
+        self.store_path = Path(store_path)
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self.initialize()
+
+    def _connect(self) -> sqlite3.Connection:
+        """スレッドごとにプールされたSQLite接続を取得"""
+        return connection_manager.connection(self.store_path)
+
+    def initialize(self):
+        """テーブル作成（新規ストアはページサイズを設定し、削除したページを返却できるようにする）"""
+        if not self.store_path.exists():
+            # WALに切り替わるとページサイズを変更できないため、プール外の接続で作成する
+            # 対象DBのページ（既定4KiB）を1行に収められるようストアのページは大きくする
+            conn = sqlite3.connect(self.store_path)
+            try:
+                conn.execute(f"PRAGMA page_size = {STORE_PAGE_SIZE}")
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                with conn:
+                    for statement in STORE_SCHEMA_SQL:
+                        conn.execute(statement)
+            finally:
+                conn.close()
+        conn = self._connect()
+        with conn:
+            for statement in STORE_SCHEMA_SQL:
+                conn.execute(statement)
+
+    @staticmethod
+    @contextmanager
+    def _stable_source(db_path: Path, attempts: int = 5) -> Iterator[int]:
+        """
+        スナップショット中にデータベースファイルが変わらないようにする
+        WALをファイルへ書き戻して空にしたうえで書き込みロックを保持する（読み込みは妨げない）
+
+        Yields:
+            ページサイズ
+        """
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        wal_path = Path(f"{db_path}-wal")
+        try:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            for _ in range(attempts):
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.execute("BEGIN IMMEDIATE")
+                if not wal_path.exists() or wal_path.stat().st_size == 0:
+                    break
+                # 読み込み中の接続があり書き戻せなかった場合は待って再試行
+                conn.execute("ROLLBACK")
+                time.sleep(0.1)
+            else:
+                raise sqlite3.OperationalError(f"WALを書き戻せません: {db_path}")
+            yield page_size
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            conn.close()
+
+    @staticmethod
+    def _truncate_wal(conn: sqlite3.Connection):
+        """書き込み後にWALを書き戻して切り詰める（初回スナップショットでWALがDBと同じ大きさになるため）"""
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _encode(self, data: bytes) -> tuple:
+        if self.compress:
+            compressed = zlib.compress(data, 1)
+            if len(compressed) < len(data):
+                return compressed, 1
+        return data, 0
+
+    def _store_missing(self, conn: sqlite3.Connection,
+                       objects: Dict[bytes, bytes]) -> int:
+        """ストアにないオブジェクトのみ保存し、増えたバイト数を返す"""
+        added = 0
+        hashes = list(objects)
+        for i in range(0, len(hashes), QUERY_BATCH):
+            batch = hashes[i:i + QUERY_BATCH]
+            existing = {
+                row[0] for row in conn.execute(
+                    f"SELECT hash FROM objects WHERE hash IN ({_placeholders(batch)})",
+                    batch
+                )
+            }
+            rows = []
+            for digest in batch:
+                if digest not in existing:
+                    data, compressed = self._encode(objects[digest])
+                    rows.append((digest, data, compressed))
+                    added += len(data)
+            conn.executemany(
+                "INSERT INTO objects (hash, data, compressed) VALUES (?, ?, ?)", rows
+            )
+        return added
+
+    def _load_objects(self, conn: sqlite3.Connection,
+                      hashes: Sequence[bytes]) -> Dict[bytes, bytes]:
+        """オブジェクトを読み込み（展開済み）"""
+        unique = list(dict.fromkeys(hashes))
+        objects = {}
+        for i in range(0, len(unique), QUERY_BATCH):
+            batch = unique[i:i + QUERY_BATCH]
+            for digest, data, compressed in conn.execute(
+                "SELECT hash, data, compressed FROM objects "
+                f"WHERE hash IN ({_placeholders(batch)})",
+                batch
+            ):
+                objects[digest] = zlib.decompress(data) if compressed else data
+        missing = len(unique) - len(objects)
+        if missing:
+            raise ValueError(f"ストアにないページがあります: {missing}件")
+        return objects
+
+    def _page_hashes(self, conn: sqlite3.Connection, manifest: bytes) -> bytes:
+        """マニフェスト（チャンクハッシュ列）からページハッシュ列を復元"""
+        chunk_hashes = _split_hashes(manifest)
+        chunks = self._load_objects(conn, chunk_hashes)
+        return b"".join(chunks[digest] for digest in chunk_hashes)
+
+    def _latest_page_hashes(self, conn: sqlite3.Connection, db_path: str,
+                            page_size: int) -> bytes:
+        """同じデータベースの直近のスナップショットのページハッシュ列（差分判定用）"""
+        row = conn.execute(
+            "SELECT manifest FROM snapshots WHERE db_path = ? AND page_size = ? "
+            "ORDER BY snapshot_id DESC LIMIT 1",
+            (db_path, page_size)
+        ).fetchone()
+        return self._page_hashes(conn, row[0]) if row else b""
+
+    def snapshot(self, db_path: Union[str, Path]) -> Dict[str, Union[int, float, str]]:
+        """
+        データベースのスナップショットを作成
+
+        直近のスナップショットとハッシュが異なるページだけをストアと照合して保存する。
+        読み込み中は対象データベースへの書き込みを待たせる
+
+        Args:
+            db_path: 対象のSQLiteファイル
+
+        Returns:
+            snapshot_id, created_at, page_count, changed_pages, bytes_added, seconds
+        """
+        start = time.perf_counter()
+        db_path = Path(db_path)
+        key = str(db_path.resolve())
+        conn = self._connect()
+
+        with self._stable_source(db_path) as page_size, conn:
+            previous = self._latest_page_hashes(conn, key, page_size)
+            page_hashes = bytearray()
+            changed: Dict[bytes, bytes] = {}
+            bytes_added = 0
+
+            with open(db_path, 'rb') as f:
+                while True:
+                    block = f.read(page_size * READ_PAGES)
+                    if len(block) < page_size:
+                        break
+                    view = memoryview(block)
+                    for offset in range(0, len(block) - page_size + 1, page_size):
+                        page = view[offset:offset + page_size]
+                        digest = _digest(page)
+                        position = len(page_hashes)
+                        if previous[position:position + HASH_BYTES] != digest:
+                            changed.setdefault(digest, bytes(page))
+                        page_hashes += digest
+                    if len(changed) >= READ_PAGES:
+                        bytes_added += self._store_missing(conn, changed)
+                        changed.clear()
+            changed_pages = sum(
+                previous[i:i + HASH_BYTES] != page_hashes[i:i + HASH_BYTES]
+                for i in range(0, len(page_hashes), HASH_BYTES)
+            )
+
+            # マニフェストをチャンクに分けて保存（変更のないチャンクは既存のものを共有）
+            chunk_bytes = HASH_BYTES * MANIFEST_CHUNK_PAGES
+            manifest = bytearray()
+            for i in range(0, len(page_hashes), chunk_bytes):
+                chunk = bytes(page_hashes[i:i + chunk_bytes])
+                digest = _digest(chunk)
+                changed[digest] = chunk
+                manifest += digest
+            bytes_added += self._store_missing(conn, changed)
+
+            created_at = datetime.now()
+            cursor = conn.execute(
+                "INSERT INTO snapshots "
+                "(db_path, created_at, page_size, page_count, manifest, bytes_added) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, created_at.isoformat(), page_size, len(page_hashes) // HASH_BYTES,
+                 bytes(manifest), bytes_added)
+            )
+
+        self._truncate_wal(conn)
+
+        result = {
+            'snapshot_id': cursor.lastrowid,
+            'created_at': created_at.isoformat(),
+            'page_count': len(page_hashes) // HASH_BYTES,
+            'changed_pages': changed_pages,
+            'bytes_added': bytes_added,
+            'seconds': time.perf_counter() - start,
+        }
+        logger.debug(
+            f"スナップショット作成: {db_path} #{result['snapshot_id']} "
+            f"(変更{changed_pages}/{result['page_count']}ページ, +{bytes_added:,}バイト)"
+        )
+        return result
+
+    def has_snapshot(self, snapshot_id: int) -> bool:
+        """スナップショットが存在するか"""
+        row = self._connect().execute(
+            "SELECT 1 FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)
+        ).fetchone()
+        return row is not None
+
+    def list_snapshots(
+        self, db_path: Optional[Union[str, Path]] = None
+    ) -> List[Dict[str, Union[int, str]]]:
+        """
+        スナップショット一覧（作成順）
+
+        Args:
+            db_path: 対象のデータベース（省略時はすべて）
+        """
+        query = (
+            "SELECT snapshot_id, db_path, created_at, page_size, page_count, "
+            "bytes_added FROM snapshots"
+        )
+        params = []
+        if db_path is not None:
+            query += " WHERE db_path = ?"
+            params.append(str(Path(db_path).resolve()))
+        columns = [
+            'snapshot_id', 'db_path', 'created_at', 'page_size', 'page_count',
+            'bytes_added'
+        ]
+        return [
+            dict(zip(columns, row))
+            for row in self._connect().execute(query + " ORDER BY snapshot_id", params)
+        ]
+
+    def restore(self, snapshot_id: int, target_path: Union[str, Path]) -> int:
+        """
+        スナップショットをデータベースファイルとして書き出し
+
+        一時ファイルに書き出してから置き換え、置き換え先に残ったWAL・共有メモリファイルは削除する
+
+        Args:
+            snapshot_id: スナップショットID
+            target_path: 書き出し先
+
+        Returns:
+            書き出したページ数
+        """
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT manifest, page_count FROM snapshots WHERE snapshot_id = ?",
+            (snapshot_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"スナップショットが存在しません: {snapshot_id}")
+
+        page_hashes = _split_hashes(self._page_hashes(conn, row[0]))
+        target_path = Path(target_path)
+        temp_path = target_path.with_name(f"{target_path.name}.restore")
+        with open(temp_path, 'wb') as f:
+            batch_pages = QUERY_BATCH * 8
+            for i in range(0, len(page_hashes), batch_pages):
+                batch = page_hashes[i:i + batch_pages]
+                pages = self._load_objects(conn, batch)
+                f.write(b"".join(pages[digest] for digest in batch))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_path, target_path)
+        for suffix in ("-wal", "-shm"):
+            Path(f"{target_path}{suffix}").unlink(missing_ok=True)
+        return row[1]
+
+    def delete_snapshots(self, snapshot_ids: Sequence[int]) -> int:
+        """
+        スナップショットを削除し、参照されなくなったページを解放
+
+        Returns:
+            解放したオブジェクト数
+        """
+        if not snapshot_ids:
+            return 0
+        conn = self._connect()
+        with conn:
+            for i in range(0, len(snapshot_ids), QUERY_BATCH):
+                batch = list(snapshot_ids[i:i + QUERY_BATCH])
+                conn.execute(
+                    "DELETE FROM snapshots "
+                    f"WHERE snapshot_id IN ({_placeholders(batch)})",
+                    batch
+                )
+        return self.collect_garbage()
+
+    def collect_garbage(self) -> int:
+        """
+        どのスナップショットからも参照されないオブジェクトを削除
+
+        Returns:
+            削除したオブジェクト数
+        """
+        conn = self._connect()
+        with conn:
+            referenced = set()
+            for manifest, in conn.execute("SELECT manifest FROM snapshots").fetchall():
+                new_chunks = [
+                    digest for digest in _split_hashes(manifest)
+                    if digest not in referenced
+                ]
+                referenced.update(new_chunks)
+                for chunk in self._load_objects(conn, new_chunks).values():
+                    referenced.update(_split_hashes(chunk))
+
+            unreferenced = [
+                digest for digest, in conn.execute("SELECT hash FROM objects")
+                if digest not in referenced
+            ]
+            for i in range(0, len(unreferenced), QUERY_BATCH):
+                batch = unreferenced[i:i + QUERY_BATCH]
+                conn.execute(
+                    f"DELETE FROM objects WHERE hash IN ({_placeholders(batch)})", batch
+                )
+
+        if unreferenced:
+            # 解放したページをファイルから返却
+            incremental_vacuum(conn)
+            self._truncate_wal(conn)
+        return len(unreferenced)
+
+    def store_bytes(self) -> int:
+        """ストアファイルのサイズ"""
+        return self.store_path.stat().st_size if self.store_path.exists() else 0
@@ -0,0 +1,171 @@
+"""
+プロセス間共有トークンバケット方式のレート制限
+CLI・ダッシュボード・スケジューラーなど同一キャッシュを使う全プロセスで
+上流API（yfinance）へのリクエスト予算を共有する
+"""
+
+from typing import Callable, Dict, Optional, Union
+from pathlib import Path
+import sqlite3
+import time
+from loguru import logger
+
+
+class RateLimitTimeout(Exception):
+    """指定時間内にトークンを取得できなかった"""
+
+
+class TokenBucketRateLimiter:
+    """
+    SQLiteで状態を共有するトークンバケット
+    バケットの残量と最終更新時刻をDBに保持し、BEGIN IMMEDIATEで排他的に更新する
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        rate_per_minute: float = 100,
+        capacity: Optional[float] = None,
+        bucket_name: str = "yfinance",
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        初期化
+
+        Args:
+            db_path: バケット状態を保存するSQLiteファイル（共有したいプロセス間で同一にする）
+            rate_per_minute: 1分あたりの補充トークン数
+            capacity: バケット容量（最大バースト数、省略時は1分間の補充量の1/10、最低1）
+            bucket_name: バケット名（上流APIごとに分ける場合に使用）
+            clock: 補充量の計算に使う時計（UNIX秒、プロセス間で共有するため壁時計）
+        """
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minuteは正の値が必要です: {rate_per_minute}")
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.rate_per_second = rate_per_minute / 60.0
+        if capacity is None:
+            capacity = max(1.0, rate_per_minute / 10.0)
+        self.capacity = capacity
+        self.bucket_name = bucket_name
+        self._clock = clock
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """自動コミットモードの接続（トランザクションは明示的に制御）"""
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_database(self):
+        """バケットテーブル作成"""
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT OR IGNORE INTO token_buckets (name, tokens, updated_at) "
+                "VALUES (?, ?, ?)",
+                (self.bucket_name, self.capacity, self._clock())
+            )
+        finally:
+            conn.close()
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        トークンの取得を1回試行
+
+        Args:
+            tokens: 消費するトークン数
+
+        Returns:
+            取得できた場合は0、できなかった場合は不足分が補充されるまでの待ち秒数
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?",
+                (self.bucket_name,)
+            ).fetchone()
+
+            now = self._clock()
+            if row is None:
+                available = self.capacity
+            else:
+                elapsed = max(0.0, now - row[1])
+                available = min(self.capacity, row[0] + elapsed * self.rate_per_second)
+
+            if available >= tokens:
+                available -= tokens
+                wait_seconds = 0.0
+            else:
+                wait_seconds = (tokens - available) / self.rate_per_second
+
+            conn.execute(
+                "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) "
+                "VALUES (?, ?, ?)",
+                (self.bucket_name, available, now)
+            )
+            conn.execute("COMMIT")
+            return wait_seconds
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> float:
+        """
+        トークンを取得できるまで待機
+
+        Args:
+            tokens: 消費するトークン数
+            timeout: 最大待機秒数（Noneの場合は無制限）
+
+        Returns:
+            待機した秒数
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"バケット容量({self.capacity})を超えるトークン数は取得できません: {tokens}")
+
+        start = time.monotonic()
+        while True:
+            wait_seconds = self.try_acquire(tokens)
+            if wait_seconds == 0:
+                waited = time.monotonic() - start
+                if waited > 0.5:
+                    logger.debug(f"レート制限で待機: {waited:.2f}秒 ({self.bucket_name})")
+                return waited
+
+            elapsed = time.monotonic() - start
+            if timeout is not None and elapsed + wait_seconds > timeout:
+                raise RateLimitTimeout(
+                    f"レート制限のトークン取得がタイムアウトしました ({self.bucket_name}, {timeout}秒)"
+                )
+            time.sleep(wait_seconds)
+
+    def get_state(self) -> Dict[str, float]:
+        """現在のバケット状態（補充分を反映した残量）"""
+        with sqlite3.connect(self.db_path, timeout=30) as conn:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?",
+                (self.bucket_name,)
+            ).fetchone()
+
+        available = self.capacity
+        if row is not None:
+            elapsed = max(0.0, self._clock() - row[1])
+            available = min(self.capacity, row[0] + elapsed * self.rate_per_second)
+
+        return {
+            'available_tokens': available,
+            'capacity': self.capacity,
+            'rate_per_minute': self.rate_per_second * 60.0
+        }
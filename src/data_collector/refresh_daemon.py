@@ -0,0 +1,268 @@
+"""
+キャッシュ先読みデーモン
+SchedulerConfig.data_update_intervals のスケジュールでウォッチリスト銘柄のデータを取得し、
+CLI・ダッシュボードからの要求がキャッシュから返るように保つ
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from loguru import logger
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from .fundamentals_store import FundamentalsStore
+from .stock_data_collector import StockDataCollector
+from .symbol_manager import SymbolManager
+from .watchlist_storage import WatchlistStorage
+from ..config.settings import SchedulerConfig, settings_manager
+
+
+# 間隔ごとの先読み期間（CLI・ダッシュボードの既定の取得期間を含む長さ）
+REFRESH_PERIODS = {
+    "1m": "1d",
+    "2m": "5d",
+    "5m": "5d",
+    "15m": "1mo",
+    "30m": "1mo",
+    "1h": "1mo",
+    "1d": "1y",
+}
+
+
+class RefreshDaemon:
+    """
+    ウォッチリストのキャッシュ先読みクラス
+    取得は StockDataCollector.get_stock_data を通すため、有効期限ポリシー・レート制限・
+    重複実行抑止がそのまま適用され、取引時間外は上流へのリクエストが発生しない。
+    失敗した銘柄は指数バックオフで次回以降の先読みから一時的に除外する。
+    """
+
+    def __init__(
+        self,
+        collector: Optional[StockDataCollector] = None,
+        watchlist_storage: Optional[WatchlistStorage] = None,
+        config: Optional[SchedulerConfig] = None,
+        watchlists: Optional[Dict[str, List[str]]] = None,
+        symbol_manager: Optional[SymbolManager] = None,
+        clock: Callable[[], float] = time.monotonic,
+        fundamentals_store: Optional[FundamentalsStore] = None
+    ):
+        """
+        初期化
+
+        Args:
+            collector: データ取得に使用するコレクター
+            watchlist_storage: 先読み対象のウォッチリスト（省略時は既定のDBを使用）
+            config: スケジューラー設定（省略時はsettings.scheduler）
+            watchlists: 追加の先読み対象（省略時はsettings.default_watchlists）
+            symbol_manager: 銘柄コードの正規化に使用
+            clock: バックオフ判定に使う単調増加の時計（秒）
+            fundamentals_store: ファンダメンタルズの保存先（省略時は初回の更新時に既定のDBを使用）
+        """
+        settings = settings_manager.settings
+        self.config = config or settings.scheduler
+        self.collector = collector or StockDataCollector(
+            cache_dir=settings.data_collector.cache_dir,
+            max_workers=settings.data_collector.max_workers
+        )
+        self.watchlist_storage = watchlist_storage
+        if watchlists is None:
+            watchlists = settings.default_watchlists
+        self.watchlists = watchlists
+        self.symbol_manager = symbol_manager or SymbolManager()
+        self._clock = clock
+        self.fundamentals_store = fundamentals_store
+
+        # (銘柄, 間隔) ごとの連続失敗回数と次回試行可能時刻
+        self._failures: Dict[Tuple[str, str], int] = {}
+        self._retry_at: Dict[Tuple[str, str], float] = {}
+
+    def get_symbols(self) -> List[str]:
+        """
+        先読み対象の銘柄（ウォッチリスト・既定ウォッチリストの和集合、登録順）
+
+        Returns:
+            正規化済み銘柄コードのリスト
+        """
+        symbols: List[str] = []
+        if self.watchlist_storage is not None:
+            try:
+                symbols.extend(self.watchlist_storage.get_symbols())
+            except Exception as e:
+                logger.error(f"ウォッチリスト読み込みエラー: {e}")
+        for watchlist in self.watchlists.values():
+            symbols.extend(watchlist)
+
+        normalized = (
+            self.symbol_manager.normalize_symbol(symbol) for symbol in symbols
+        )
+        return list(dict.fromkeys(symbol for symbol in normalized if symbol))
+
+    def _backoff_seconds(self, failures: int) -> float:
+        """連続失敗回数に応じた待機秒数（上限あり、同時刻に再試行が集中しないよう揺らぎを加える）"""
+        delay = min(self.config.refresh_backoff_base_seconds * 2 ** (failures - 1),
+                    self.config.refresh_backoff_max_seconds)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _record(self, symbol: str, interval: str, success: bool):
+        """取得結果をバックオフ状態に反映"""
+        key = (symbol, interval)
+        if success:
+            self._failures.pop(key, None)
+            self._retry_at.pop(key, None)
+            return
+
+        failures = self._failures.get(key, 0) + 1
+        self._failures[key] = failures
+        delay = self._backoff_seconds(failures)
+        self._retry_at[key] = self._clock() + delay
+        logger.warning(f"先読み失敗: {symbol} {interval}（{failures}回連続、{delay:.0f}秒後に再試行）")
+
+    def refresh(self, interval: str) -> Dict[str, int]:
+        """
+        指定間隔の先読みを1回実行
+
+        Args:
+            interval: データ間隔
+
+        Returns:
+            対象・成功・失敗・バックオフ中でスキップした銘柄数
+        """
+        symbols = self.get_symbols()
+        now = self._clock()
+        due = [
+            symbol for symbol in symbols
+            if self._retry_at.get((symbol, interval), 0) <= now
+        ]
+        default_period = settings_manager.settings.data_collector.default_period
+        period = REFRESH_PERIODS.get(interval, default_period)
+        summary = {
+            'symbols': len(symbols), 'refreshed': 0, 'failed': 0,
+            'skipped': len(symbols) - len(due)
+        }
+
+        if due:
+            max_workers = max(1, self.config.refresh_max_concurrency)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_symbol = {
+                    executor.submit(
+                        self.collector.get_stock_data, symbol, interval, period, True,
+                        compact=False
+                    ): symbol
+                    for symbol in due
+                }
+                for future in as_completed(future_to_symbol):
+                    symbol = future_to_symbol[future]
+                    try:
+                        success = future.result() is not None
+                    except Exception as e:
+                        logger.error(f"先読みエラー {symbol} {interval}: {e}")
+                        success = False
+                    self._record(symbol, interval, success)
+                    summary['refreshed' if success else 'failed'] += 1
+
+        logger.info(
+            f"先読み完了 {interval}: 成功{summary['refreshed']} 失敗{summary['failed']} "
+            f"スキップ{summary['skipped']} / {summary['symbols']}銘柄"
+        )
+        return summary
+
+    def refresh_all(self) -> Dict[str, Dict[str, int]]:
+        """
+        設定された全間隔の先読みを1回ずつ実行
+
+        Returns:
+            間隔をキーとした実行結果
+        """
+        return {
+            interval: self.refresh(interval)
+            for interval in self.config.data_update_intervals
+        }
+
+    def refresh_fundamentals(self, force: bool = False) -> Dict[str, int]:
+        """
+        ウォッチリスト銘柄のファンダメンタルズのうち期限切れのものをまとめて更新
+
+        Args:
+            force: 有効期限内の値も再取得するか
+
+        Returns:
+            FundamentalsStore.refreshの実行結果
+        """
+        if self.fundamentals_store is None:
+            self.fundamentals_store = FundamentalsStore()
+        return self.fundamentals_store.refresh(
+            self.get_symbols(), self.collector.data_provider,
+            force=force, max_workers=self.config.refresh_max_concurrency
+        )
+
+    def build_scheduler(self, blocking: bool = True):
+        """
+        data_update_intervals のcron式ごとの先読みジョブと、ファンダメンタルズの一括更新ジョブ
+        （fundamentals_refresh_cron が空でない場合）を登録したスケジューラーを作成
+
+        Args:
+            blocking: Trueならstart()で処理をブロックするスケジューラー
+
+        Returns:
+            APSchedulerのスケジューラー（未開始）
+        """
+        scheduler_cls = BlockingScheduler if blocking else BackgroundScheduler
+        scheduler = scheduler_cls(timezone=self.config.timezone)
+        for interval, expression in self.config.data_update_intervals.items():
+            trigger = CronTrigger.from_crontab(
+                expression, timezone=self.config.timezone
+            )
+            # 複数プロセス・複数間隔の実行が同じ秒に集中しないよう起動時刻を揺らす
+            trigger.jitter = self.config.refresh_jitter_seconds or None
+            scheduler.add_job(
+                self.refresh,
+                trigger,
+                args=[interval],
+                id=f"refresh_{interval}",
+                name=f"キャッシュ先読み {interval}",
+                max_instances=1,  # 前回の先読みが終わっていなければ実行しない
+                coalesce=True,
+                misfire_grace_time=60
+            )
+
+        if self.config.fundamentals_refresh_cron:
+            trigger = CronTrigger.from_crontab(
+                self.config.fundamentals_refresh_cron, timezone=self.config.timezone
+            )
+            trigger.jitter = self.config.refresh_jitter_seconds or None
+            scheduler.add_job(
+                self.refresh_fundamentals,
+                trigger,
+                id="refresh_fundamentals",
+                name="ファンダメンタルズ更新",
+                max_instances=1,
+                coalesce=True,
+                misfire_grace_time=3600
+            )
+        return scheduler
+
+    def run(self, warm: bool = True):
+        """
+        デーモンとして実行（中断されるまでブロック）
+
+        Args:
+            warm: 開始時に全間隔を1回先読みするか
+        """
+        logger.info(
+            f"キャッシュ先読みデーモン開始: {len(self.get_symbols())}銘柄 "
+            f"{list(self.config.data_update_intervals)} ({self.config.timezone})"
+        )
+        if warm:
+            self.refresh_all()
+            if self.config.fundamentals_refresh_cron:
+                self.refresh_fundamentals()
+
+        scheduler = self.build_scheduler(blocking=True)
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            logger.info("キャッシュ先読みデーモン停止")
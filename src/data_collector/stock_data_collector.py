@@ -1,7 +1,6 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import pandas as pd
-import yfinance as yf
 import sqlite3
 from pathlib import Path
 import time
@@ -10,6 +9,27 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from .bar_blocks import delete_blocks_created_before
+from .bar_ingestion import (
+    BarIngestionStage, IngestionResult, initialize_quarantine_schema, read_quarantine,
+    read_tail_close, release_quarantine, write_quarantine
+)
+from .bar_schema import (
+    UPSERT_BAR_SQL, bound_to_epoch_ns, build_bar_rows, compact_series, drop_series,
+    from_epoch_ns, get_series, initialize_bar_schema, iter_bar_rows, read_bars,
+    read_series_stats, timezone_name, to_bar_frame
+)
+from .bar_store import BarStore, ParquetBarStore, align_timestamp_bound
+from .cache_policy import CacheTTLPolicy, FixedTTLPolicy, create_ttl_policy
+from .cache_ranges import CacheRangeIndex
+from .data_provider import DataProvider, create_data_provider
+from .frame_cache import FrameCache, frame_cache as shared_frame_cache
+from .frame_compaction import compact_bar_frame, compaction_report
+from .rate_limiter import TokenBucketRateLimiter
+from ..config.settings import settings_manager
+from ..utils.single_flight import SingleFlight, single_flight as shared_single_flight
+from ..utils.sqlite_pool import connection_manager
+
 
 class StockDataCollector:
     """
@@ -17,52 +37,137 @@ class StockDataCollector:
     複数銘柄の1分足・5分足データを効率的に取得し、SQLiteにキャッシュする
     """
     
-    def __init__(self, cache_dir: str = "cache", max_workers: int = 5):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_workers: int = 5,
+        storage_backend: Optional[str] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        data_provider: Optional[DataProvider] = None,
+        frame_cache: Optional[FrameCache] = None,
+        ttl_policy: Optional[CacheTTLPolicy] = None
+    ):
         """
         初期化
         
         Args:
-            cache_dir: キャッシュディレクトリパス
+            cache_dir: キャッシュディレクトリパス（省略時はDataCollectorConfig.cache_dirに従う）
             max_workers: 並列処理のワーカー数
+            storage_backend: バーデータ保存先 ("sqlite" または "parquet"、
+                省略時はDataCollectorConfig.storage_backendに従う)
+            rate_limiter: 上流APIのレート制限（省略時は同じキャッシュを使う全プロセスで共有）
+            data_provider: 市場データの取得元（省略時はDataCollectorConfig.data_providerに従う）
+            frame_cache: 読み込み済みデータのメモリキャッシュ（省略時はプロセス全体で共有）
+            ttl_policy: キャッシュ有効期限ポリシー（省略時はDataCollectorConfig.cache_ttl_policyに従う）
         """
-        self.cache_dir = Path(cache_dir)
+        config = settings_manager.settings.data_collector
+        self.cache_dir = Path(cache_dir or config.cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.db_path = self.cache_dir / "stock_data.db"
         self.max_workers = max_workers
         
+        # 市場データの取得元（yfinance / オフライン再生）
+        self.data_provider = data_provider or create_data_provider()
+
         # データベース初期化
         self._init_database()
         
+        # 取得済み時間範囲のメタデータ（鮮度判定用）
+        self.range_index = CacheRangeIndex(self._connect)
+
+        # キャッシュ有効期限ポリシー（取引時間外のデータは再取得しない）
+        self.ttl_policy = ttl_policy or create_ttl_policy()
+
+        # 返却するDataFrameの省メモリ化
+        # （DataCollectorConfig.compact_frames / compact_float32）と累計削減量
+        self.compact_frames = config.compact_frames
+        self.compact_float32 = config.compact_float32
+        self.compaction_stats: Dict[str, int] = {
+            'frames': 0, 'bytes_before': 0, 'bytes_after': 0, 'bytes_saved': 0
+        }
+        self._compaction_lock = threading.Lock()
+
+        # 取得したバーの保存前検証（DataCollectorConfig.ingestion_validation、不正なバーは隔離テーブルへ）
+        self.ingestion: Optional[BarIngestionStage] = None
+        if config.ingestion_validation:
+            self.ingestion = BarIngestionStage(
+                max_price_jump=config.ingestion_max_price_jump
+            )
+        self.ingestion_stats: Dict[str, int] = {
+            'rows': 0, 'accepted': 0, 'quarantined': 0, 'duplicates': 0
+        }
+        self._ingestion_lock = threading.Lock()
+
+        # 直近の書き込みスループット（save_framesごとに更新）
+        self.last_write_stats: Dict[str, float] = {
+            'rows': 0, 'seconds': 0.0, 'rows_per_second': 0.0
+        }
+
+        # 代替ストレージバックエンド（Noneの場合はSQLiteのstock_dataテーブルを使用）
+        storage_backend = storage_backend or config.storage_backend
+        self.bar_store: Optional[BarStore] = None
+        if storage_backend == "parquet":
+            self.bar_store = ParquetBarStore(self.cache_dir / "bars")
+        elif storage_backend != "sqlite":
+            raise ValueError(f"未対応のストレージバックエンド: {storage_backend}")
+
+        # 読み込み済みDataFrameのLRUキャッシュ（キーは保存先ごとに分ける）
+        self.frame_cache = (
+            frame_cache if frame_cache is not None else shared_frame_cache
+        )
+        if self.bar_store is not None:
+            cache_path = self.bar_store.root_dir
+        else:
+            cache_path = self.db_path
+        self._cache_location = str(cache_path.resolve())
+
+        # 同じ要求が同時に来た場合は1回の取得結果を共有（同じキャッシュを使うコレクター間で共有）
+        self.single_flight: SingleFlight = shared_single_flight
+
         # レート制限管理
         self._last_request_time = 0
         self._request_lock = threading.Lock()
         self.min_request_interval = 0.1  # 100ms間隔
+
+        # プロセス間で共有するトークンバケット（APIConfig.rate_limit_per_minuteに従う）
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter(
+            self.cache_dir / "rate_limit.db",
+            rate_per_minute=settings_manager.settings.api.rate_limit_per_minute
+        )
     
+    # キャッシュ読み込み結果（旧stock_dataテーブル互換）のカラム順
+    CACHE_COLUMNS = ['symbol', 'interval', 'timestamp', 'open', 'high',
+                     'low', 'close', 'volume', 'created_at']
+
+    # yfinanceの取得期間指定に対応する期間長（ytd/maxは別扱い）
+    PERIOD_LENGTHS = {
+        "1d": timedelta(days=1),
+        "5d": timedelta(days=5),
+        "1mo": timedelta(days=31),
+        "3mo": timedelta(days=92),
+        "6mo": timedelta(days=183),
+        "1y": timedelta(days=366),
+        "2y": timedelta(days=731),
+        "5y": timedelta(days=1827),
+        "10y": timedelta(days=3653),
+    }
+
+    # キャッシュ先頭が期間開始よりこの日数以上遅い場合に先頭の欠損とみなす（週末・祝日分の余裕）
+    HEAD_GAP_TOLERANCE = timedelta(days=4)
+
+    def _connect(self) -> sqlite3.Connection:
+        """スレッドごとにプールされたSQLite接続を取得（WAL・チューニング済みPRAGMAは接続作成時に適用済み）"""
+        return connection_manager.connection(self.db_path)
+
     def _init_database(self):
         """SQLiteデータベース初期化"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS stock_data (
-                    symbol TEXT,
-                    interval TEXT,
-                    timestamp TEXT,
-                    open REAL,
-                    high REAL,
-                    low REAL,
-                    close REAL,
-                    volume INTEGER,
-                    created_at TEXT,
-                    PRIMARY KEY (symbol, interval, timestamp)
-                )
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_symbol_interval_time 
-                ON stock_data(symbol, interval, timestamp)
-            """)
+        # barsテーブル（エポックナノ秒の整数タイムスタンプ）を作成し、旧TEXTスキーマがあれば移行
+        with self._connect() as conn:
+            initialize_bar_schema(conn)
+            initialize_quarantine_schema(conn)
     
     def _rate_limit(self):
-        """レート制限の実装"""
+        """レート制限の実装（インスタンス内の最小間隔 + プロセス間共有のトークンバケット）"""
         with self._request_lock:
             current_time = time.time()
             time_since_last = current_time - self._last_request_time
@@ -70,6 +175,8 @@ class StockDataCollector:
                 sleep_time = self.min_request_interval - time_since_last
                 time.sleep(sleep_time)
             self._last_request_time = time.time()
+
+        self.rate_limiter.acquire()
     
     @retry(
         stop=stop_after_attempt(3),
@@ -79,49 +186,36 @@ class StockDataCollector:
         self, 
         symbol: str, 
         interval: str = "1m",
-        period: str = "1d"
+        period: str = "1d",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
     ) -> Optional[pd.DataFrame]:
         """
-        yfinanceを使用してデータ取得（リトライ機能付き）
+        データプロバイダー（既定はyfinance）を使用してデータ取得（リトライ機能付き）
         
         Args:
             symbol: 銘柄コード
             interval: データ間隔 (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
             period: 取得期間 (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            start: 取得開始日時（指定時はperiodより優先）
+            end: 取得終了日時（startと併用）
         
         Returns:
             株価データのDataFrame
         """
         try:
-            self._rate_limit()
+            if self.data_provider.rate_limited:
+                self._rate_limit()
             
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period, interval=interval)
+            data = self.data_provider.history(
+                symbol, interval=interval, period=period, start=start, end=end
+            )
             
-            if data.empty:
+            if data is None or data.empty:
                 logger.warning(f"データが取得できませんでした: {symbol}")
                 return None
             
-            # インデックスをリセットしてtimestampカラムに
-            data.reset_index(inplace=True)
-            
-            # カラム名を標準化
-            column_mapping = {
-                'Datetime': 'timestamp',
-                'Date': 'timestamp',
-                'index': 'timestamp',  # reset_index()で作られるカラム
-                'Open': 'open',
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Volume': 'volume'
-            }
-            data.rename(columns=column_mapping, inplace=True)
-            
-            # 追加情報
-            data['symbol'] = symbol
-            data['interval'] = interval
-            data['created_at'] = datetime.now().isoformat()
+            data = self._normalize_history(data, symbol, interval)
             
             logger.info(f"データ取得成功: {symbol} ({len(data)}件)")
             return data
@@ -130,32 +224,313 @@ class StockDataCollector:
             logger.error(f"データ取得エラー {symbol}: {str(e)}")
             raise
     
+    @staticmethod
+    def _normalize_history(
+        data: pd.DataFrame,
+        symbol: str,
+        interval: str
+    ) -> pd.DataFrame:
+        """yfinanceの取得結果をキャッシュ形式のカラムに標準化"""
+        # インデックスをリセットしてtimestampカラムに
+        data.reset_index(inplace=True)
+
+        # カラム名を標準化
+        column_mapping = {
+            'Datetime': 'timestamp',
+            'Date': 'timestamp',
+            'index': 'timestamp',  # reset_index()で作られるカラム
+            'Open': 'open',
+            'High': 'high',
+            'Low': 'low',
+            'Close': 'close',
+            'Volume': 'volume'
+        }
+        data.rename(columns=column_mapping, inplace=True)
+
+        # 追加情報
+        data['symbol'] = symbol
+        data['interval'] = interval
+        data['created_at'] = datetime.now().isoformat()
+        return data
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10)
+    )
+    def _fetch_batch_yfinance(
+        self,
+        symbols: List[str],
+        interval: str = "1m",
+        period: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        データプロバイダーの複数銘柄一括ダウンロードでデータ取得（リトライ機能付き）
+
+        Args:
+            symbols: 銘柄コードのリスト
+            interval: データ間隔
+            period: 取得期間
+
+        Returns:
+            銘柄コードをキーとした株価データの辞書（データがない銘柄は含まない）
+        """
+        try:
+            if self.data_provider.rate_limited:
+                self._rate_limit()
+
+            data = self.data_provider.download(
+                symbols, interval=interval, period=period
+            )
+
+            results = {}
+            if data is None or data.empty:
+                logger.warning(f"一括取得でデータが取得できませんでした: {len(symbols)}銘柄")
+                return results
+
+            for symbol in symbols:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    frame = data[symbol]
+                else:
+                    frame = data
+
+                # 他銘柄との時刻の和集合で生じた空行を除去
+                frame = frame.dropna(how='all')
+                if frame.empty:
+                    continue
+                results[symbol] = self._normalize_history(
+                    frame.copy(), symbol, interval
+                )
+
+            logger.info(f"一括取得成功: {len(results)}/{len(symbols)}銘柄")
+            return results
+
+        except Exception as e:
+            logger.error(f"一括取得エラー {symbols}: {str(e)}")
+            raise
+
+    def _fetch_bars(self, *args, **kwargs) -> Optional[pd.DataFrame]:
+        """データ取得と保存前検証（引数は_fetch_data_yfinanceと同じ）"""
+        return self._ingest(self._fetch_data_yfinance(*args, **kwargs))
+
+    def _read_tail_close(self, symbol: str, interval: str,
+                         before: pd.Timestamp) -> Optional[pd.Series]:
+        """キャッシュ済み系列で指定時刻より前の直近の終値（保存前検証の比較基準）"""
+        rows = self.ingestion.tail_rows
+        if self.bar_store is None:
+            with self._connect() as conn:
+                return read_tail_close(conn, symbol, interval, before, rows)
+
+        cached = self._load_from_cache(symbol, interval, end_time=before)
+        if cached is None:
+            return None
+        close = cached.loc[cached['timestamp'] < before, 'close']
+        return close.tail(rows).reset_index(drop=True)
+
+    def _ingest(self, data: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """
+        取得したバーを保存前に整形・検証し、不正なバーを隔離テーブルへ保存
+        既存キャッシュとは新しいバーより前の直近数本の終値だけを比較する
+
+        Args:
+            data: 取得結果（1銘柄・1間隔）
+
+        Returns:
+            保存・返却するバー（すべて隔離された場合はNone）
+        """
+        if data is None or data.empty or self.ingestion is None:
+            return data
+
+        symbol = data['symbol'].iloc[0]
+        interval = data['interval'].iloc[0]
+        try:
+            tail_close = self._read_tail_close(
+                symbol, interval, pd.Timestamp(data['timestamp'].min())
+            )
+            result = self.ingestion.process(data, tail_close)
+            if result.rebase:
+                result = self._rebase_series(symbol, interval, result)
+            with self._connect() as conn:
+                release_quarantine(conn, result.accepted)
+                write_quarantine(conn, result.rejected)
+            if not result.rejected.empty:
+                reasons = (
+                    result.rejected['reasons'].str.split(',').explode()
+                    .value_counts().to_dict()
+                )
+                logger.warning(
+                    f"不正なバーを隔離: {symbol} {interval} "
+                    f"{len(result.rejected)}件 {reasons}"
+                )
+        except Exception as e:
+            # 検証自体の失敗では取得結果を捨てない
+            logger.error(f"保存前検証エラー {symbol}: {str(e)}")
+            return data
+
+        with self._ingestion_lock:
+            self.ingestion_stats['rows'] += len(data)
+            self.ingestion_stats['accepted'] += len(result.accepted)
+            self.ingestion_stats['quarantined'] += len(result.rejected)
+            self.ingestion_stats['duplicates'] += result.duplicates
+        return result.accepted if not result.accepted.empty else None
+
+    def _rebase_series(self, symbol: str, interval: str,
+                       result: IngestionResult) -> IngestionResult:
+        """
+        取得したバーがそろって既存キャッシュの末尾から乖離した系列（株式分割など）を
+        キャッシュ済みの全期間について再取得し、キャッシュを置き換える
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            result: 末尾と比較した検証結果（再取得できない場合はこの結果を使用）
+
+        Returns:
+            再取得した履歴の検証結果
+        """
+        start = self._series_start(symbol, interval)
+        try:
+            history = self._fetch_data_yfinance(symbol, interval, start=start)
+        except Exception as e:
+            logger.error(f"履歴の再取得エラー {symbol}: {str(e)}")
+            return result
+        if history is None:
+            return result
+
+        rebased = self.ingestion.process(history)
+        if rebased.accepted.empty:
+            return result
+        self._replace_series(symbol, interval, rebased.accepted)
+        logger.warning(
+            f"価格水準の変化を検出し履歴を置き換え: {symbol} {interval} ({len(rebased.accepted)}件)"
+        )
+        return rebased
+
+    def _series_start(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """キャッシュ済み系列の先頭時刻（SQLiteは系列の集計行、Parquetは先頭パーティションだけを読む）"""
+        if self.bar_store is not None:
+            first = next(self.bar_store.iter_load(symbol, interval), None)
+            return None if first is None else first['timestamp'].iloc[0]
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT st.min_ts, s.tz FROM series s "
+                "JOIN series_stats st ON st.series_id = s.series_id "
+                "WHERE s.symbol = ? AND s.interval = ?",
+                (symbol, interval)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return from_epoch_ns([row[0]], row[1]).iloc[0]
+
+    def _replace_series(self, symbol: str, interval: str, data: pd.DataFrame):
+        """系列のキャッシュ（圧縮ブロックを含む）を削除してdataで置き換え"""
+        if self.bar_store is not None:
+            self.bar_store.clear(symbol, interval=interval)
+            self.bar_store.save(data)
+        else:
+            # 削除と保存を1トランザクションで行い、読み込み側に空の系列を見せない
+            with self._connect() as conn:
+                series = get_series(conn, symbol, interval)
+                if series is not None:
+                    drop_series(conn, series[0])
+                conn.executemany(UPSERT_BAR_SQL, self._frame_to_rows(conn, data))
+
+        self._invalidate_frames(data)
+
+    def get_quarantined_bars(self, symbol: Optional[str] = None,
+                             interval: Optional[str] = None) -> pd.DataFrame:
+        """
+        保存前検証で隔離したバー
+
+        Args:
+            symbol: 銘柄コード（省略時はすべて）
+            interval: データ間隔（省略時はすべて）
+
+        Returns:
+            銘柄・間隔・timestamp・OHLCV・理由コード（reasons）・隔離時刻のDataFrame
+        """
+        with self._connect() as conn:
+            return read_quarantine(conn, symbol, interval)
+
+    def _frame_to_rows(
+        self,
+        conn: sqlite3.Connection,
+        data: pd.DataFrame
+    ) -> List[tuple]:
+        """DataFrameをbarsテーブルへのバルク挿入用タプル列に変換（系列は必要に応じて登録）"""
+        rows = []
+        grouped = data.groupby(['symbol', 'interval'], sort=False)
+        for (symbol, interval), group in grouped:
+            timestamps = group['timestamp']
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                timestamps = pd.to_datetime(timestamps, format='ISO8601')
+
+            series_id, _ = get_series(
+                conn, symbol, interval, timezone_name(timestamps), create=True
+            )
+            created_at = None
+            if 'created_at' in group.columns:
+                created_at = pd.to_datetime(group['created_at'], format='ISO8601')
+            rows.extend(build_bar_rows(series_id, timestamps, group, created_at))
+        return rows
+
+    def save_frames(self, frames: List[pd.DataFrame]) -> int:
+        """
+        複数のDataFrameを単一トランザクションでキャッシュに一括保存
+
+        Args:
+            frames: 保存する株価データのリスト
+
+        Returns:
+            保存した件数
+        """
+        frames = [frame for frame in frames if frame is not None and not frame.empty]
+        if not frames:
+            return 0
+
+        if self.bar_store is not None:
+            saved = 0
+            for frame in frames:
+                saved += self.bar_store.save(frame)
+                self._invalidate_frames(frame)
+            return saved
+
+        start = time.perf_counter()
+
+        # with句の範囲が1トランザクション（系列登録とexecutemanyでの一括挿入）
+        with self._connect() as conn:
+            rows = [row for frame in frames for row in self._frame_to_rows(conn, frame)]
+            conn.executemany(UPSERT_BAR_SQL, rows)
+
+        # コミット後にメモリキャッシュを破棄（以降の読み込みは新しいバーを含む）
+        for frame in frames:
+            self._invalidate_frames(frame)
+
+        elapsed = time.perf_counter() - start
+        self.last_write_stats = {
+            'rows': len(rows),
+            'seconds': elapsed,
+            'rows_per_second': len(rows) / elapsed if elapsed > 0 else float(len(rows))
+        }
+        logger.debug(
+            f"キャッシュ一括保存: {len(rows)}件 "
+            f"({self.last_write_stats['rows_per_second']:,.0f} rows/s)"
+        )
+        return len(rows)
+
+    def _invalidate_frames(self, data: pd.DataFrame):
+        """書き込んだ系列のメモリキャッシュを破棄"""
+        series = data[['symbol', 'interval']].drop_duplicates()
+        for symbol, interval in series.itertuples(index=False):
+            self.frame_cache.invalidate(self._cache_location, symbol, interval)
+
     def _save_to_cache(self, data: pd.DataFrame):
-        """データをSQLiteキャッシュに保存"""
+        """データをキャッシュ（SQLiteまたは代替ストレージバックエンド）に保存"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # timestampを文字列に変換
-                data_copy = data.copy()
-                data_copy['timestamp'] = data_copy['timestamp'].astype(str)
-                
-                # DBスキーマに存在するカラムのみをフィルタリング
-                db_columns = ['symbol', 'interval', 'timestamp', 'open', 'high', 
-                             'low', 'close', 'volume', 'created_at']
-                existing_columns = [col for col in db_columns if col in data_copy.columns]
-                data_filtered = data_copy[existing_columns]
-                
-                # INSERT OR REPLACEで重複データを上書き
-                # まず既存データを削除してから挿入
-                for _, row in data_filtered.iterrows():
-                    conn.execute(
-                        "INSERT OR REPLACE INTO stock_data "
-                        "(symbol, interval, timestamp, open, high, low, close, volume, created_at) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        tuple(row)
-                    )
-                
-                logger.debug(f"キャッシュ保存完了: {data['symbol'].iloc[0]} ({len(data)}件)")
-                
+            self.save_frames([data])
+            logger.debug(f"キャッシュ保存完了: {data['symbol'].iloc[0]} ({len(data)}件)")
         except Exception as e:
             logger.error(f"キャッシュ保存エラー: {str(e)}")
     
@@ -166,87 +541,554 @@ class StockDataCollector:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None
     ) -> Optional[pd.DataFrame]:
-        """キャッシュからデータを読み込み"""
+        """キャッシュからデータを読み込み（読み込み済みの範囲はメモリキャッシュから返す）"""
+        key = (self._cache_location, symbol, interval)
+        # 他プロセス（先読みデーモンなど）の書き込みは系列のバージョンの変化で検出
+        version = self._series_version(symbol, interval)
+        cached = self.frame_cache.get(key, start_time, end_time, version)
+        if cached is not None:
+            logger.debug(f"メモリキャッシュ使用: {symbol} ({len(cached)}件)")
+            return cached
+
+        generation = self.frame_cache.generation(key)
+        data = self._read_cache(symbol, interval, start_time, end_time)
+        if data is not None:
+            self.frame_cache.put(key, data, start_time, end_time, generation, version)
+            data = data.copy()
+        return data
+
+    def _series_version(self, symbol: str, interval: str) -> Optional[tuple]:
+        """保存先での系列の変更を示す値（SQLiteはトリガーで維持される系列の集計行、バー本体は読まない）"""
         try:
-            query = """
-                SELECT * FROM stock_data 
-                WHERE symbol = ? AND interval = ?
-            """
-            params = [symbol, interval]
-            
-            if start_time:
-                query += " AND timestamp >= ?"
-                params.append(start_time.isoformat())
-            
-            if end_time:
-                query += " AND timestamp <= ?"
-                params.append(end_time.isoformat())
-            
-            query += " ORDER BY timestamp"
-            
-            with sqlite3.connect(self.db_path) as conn:
-                data = pd.read_sql_query(query, conn, params=params)
-                
-                if data.empty:
+            if self.bar_store is not None:
+                return self.bar_store.series_version(symbol, interval)
+
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT st.row_count, st.cold_rows, st.max_ts, st.last_fetch, "
+                    "st.bytes FROM series s "
+                    "JOIN series_stats st ON st.series_id = s.series_id "
+                    "WHERE s.symbol = ? AND s.interval = ?",
+                    (symbol, interval)
+                ).fetchone()
+            return tuple(row) if row else ()
+        except Exception as e:
+            logger.error(f"キャッシュのバージョン取得エラー: {str(e)}")
+            return None
+
+    def _read_cache(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Optional[pd.DataFrame]:
+        """保存先（SQLite/Parquet）からデータを読み込み"""
+        if self.bar_store is not None:
+            try:
+                return self.bar_store.load(symbol, interval, start_time, end_time)
+            except Exception as e:
+                logger.error(f"キャッシュ読み込みエラー: {str(e)}")
+                return None
+
+        try:
+            with self._connect() as conn:
+                series = get_series(conn, symbol, interval)
+                if series is None:
                     return None
+                series_id, tz = series
                 
-                # timestampをdatetimeに変換
-                data['timestamp'] = pd.to_datetime(data['timestamp'])
-                
-                logger.debug(f"キャッシュ読み込み: {symbol} ({len(data)}件)")
-                return data
+                # 範囲条件は系列と同じ基準のエポックナノ秒で比較（主キー順の範囲スキャン）
+                data = read_bars(
+                    conn, series_id, symbol, interval, tz,
+                    start_ns=bound_to_epoch_ns(start_time, tz) if start_time else None,
+                    end_ns=bound_to_epoch_ns(end_time, tz) if end_time else None
+                )
+
+            if data.empty:
+                return None
+
+            logger.debug(f"キャッシュ読み込み: {symbol} ({len(data)}件)")
+            return data
                 
         except Exception as e:
             logger.error(f"キャッシュ読み込みエラー: {str(e)}")
             return None
     
+    def iter_bars(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        chunk_rows: int = 100_000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        キャッシュ済みの履歴を一定行数ずつ時系列順に返す
+        全件をDataFrameに読み込まないため、長期間の1分足のバックテスト・書き出しでもメモリ使用量は
+        chunk_rowsに比例する。メモリキャッシュは経由せず、反復中は開始時点のスナップショットを読む
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            start: 開始時刻（含む、省略時は先頭から）
+            end: 終了時刻（含む、省略時は末尾まで）
+            chunk_rows: 1チャンクの行数（最後のチャンクのみ少なくなる）
+
+        Yields:
+            _load_from_cacheと同じカラム構成のDataFrame
+        """
+        if chunk_rows <= 0:
+            raise ValueError(f"chunk_rowsは1以上を指定してください: {chunk_rows}")
+
+        if self.bar_store is not None:
+            yield from self._rechunk_frames(
+                self.bar_store.iter_load(symbol, interval, start, end), chunk_rows
+            )
+            return
+
+        # 呼び出し側が反復中にプール接続で書き込んでも影響しないよう、読み取り専用の専用接続を使用
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            series = get_series(conn, symbol, interval)
+            if series is None:
+                return
+            series_id, tz = series
+
+            rows = iter_bar_rows(
+                conn, series_id,
+                start_ns=bound_to_epoch_ns(start, tz) if start else None,
+                end_ns=bound_to_epoch_ns(end, tz) if end else None,
+                chunk_rows=chunk_rows
+            )
+            frames = (to_bar_frame(chunk, symbol, interval, tz) for chunk in rows)
+            yield from self._rechunk_frames(frames, chunk_rows)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _rechunk_frames(
+        frames: Iterable[pd.DataFrame], chunk_rows: int
+    ) -> Iterator[pd.DataFrame]:
+        """時系列順のDataFrame列をchunk_rows行ずつに区切り直す"""
+        pending: List[pd.DataFrame] = []
+        pending_rows = 0
+        for frame in frames:
+            pending.append(frame)
+            pending_rows += len(frame)
+            if pending_rows < chunk_rows:
+                continue
+
+            if len(pending) > 1:
+                buffer = pd.concat(pending, ignore_index=True)
+            else:
+                buffer = frame
+            offset = 0
+            while pending_rows - offset >= chunk_rows:
+                yield buffer.iloc[offset:offset + chunk_rows].reset_index(drop=True)
+                offset += chunk_rows
+            pending = [buffer.iloc[offset:]] if offset < pending_rows else []
+            pending_rows -= offset
+
+        if pending_rows:
+            if len(pending) > 1:
+                yield pd.concat(pending, ignore_index=True)
+            else:
+                yield pending[0].reset_index(drop=True)
+
+    def get_latest_timestamp(
+        self,
+        symbol: str,
+        interval: str
+    ) -> Optional[pd.Timestamp]:
+        """
+        キャッシュ済み系列の最新バー時刻（バー本体は読み込まない）
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+
+        Returns:
+            最新バーのtimestamp（キャッシュがない場合はNone）
+        """
+        if self.bar_store is not None:
+            data = self._load_from_cache(symbol, interval)
+            return None if data is None else data['timestamp'].max()
+
+        with self._connect() as conn:
+            series = get_series(conn, symbol, interval)
+            if series is None:
+                return None
+            # 最新バーは通常barsテーブルにあるが、全期間が圧縮済みの系列はブロックの終端を使用
+            latest_ts, = conn.execute(
+                "SELECT MAX(latest) FROM ("
+                "SELECT MAX(ts) AS latest FROM bars WHERE series_id = ? "
+                "UNION ALL SELECT MAX(end_ts) FROM bar_blocks WHERE series_id = ?)",
+                (series[0], series[0])
+            ).fetchone()
+
+        if latest_ts is None:
+            return None
+        return from_epoch_ns([latest_ts], series[1]).iloc[0]
+
     def get_stock_data(
         self,
         symbol: str,
         interval: str = "1m",
         period: str = "1d",
         use_cache: bool = True,
-        cache_expire_hours: int = 1
+        cache_expire_hours: Optional[float] = None,
+        compact: Optional[bool] = None
     ) -> Optional[pd.DataFrame]:
         """
         株価データ取得（キャッシュ機能付き）
+        同じ要求が実行中の場合は上流APIを呼ばずにその結果を待って共有する
         
         Args:
             symbol: 銘柄コード
             interval: データ間隔
             period: 取得期間
             use_cache: キャッシュ使用フラグ
-            cache_expire_hours: キャッシュ有効期限（時間）
+            cache_expire_hours: キャッシュ有効期限（時間、省略時は有効期限ポリシーで判定）
+            compact: 省メモリ形式で返すか（省略時はcompact_frames属性に従う、詳細はcompact_bar_frame）
         
         Returns:
             株価データのDataFrame
         """
+        args = (symbol, interval, period, use_cache, cache_expire_hours)
+        key = (self._cache_location, *args)
+        data, shared = self.single_flight.do(key, self._get_stock_data, *args)
+        if data is not None and self._should_compact(compact):
+            # 変換結果は新しいDataFrameのため、共有した結果を複製する必要はない
+            return self._compact_output(data)
+        if shared:
+            logger.debug(f"同時リクエストの取得結果を共有: {symbol}")
+            # 待機者がいた場合はリーダーも含め、呼び出し元ごとに独立したDataFrameを返す
+            if data is not None:
+                data = data.copy()
+        return data
+
+    def _should_compact(self, compact: Optional[bool]) -> bool:
+        """省メモリ形式で返すか（引数の指定がなければ設定に従う）"""
+        return self.compact_frames if compact is None else compact
+
+    def _compact_output(self, data: pd.DataFrame) -> pd.DataFrame:
+        """返却用DataFrameを省メモリ形式に変換し、削減量を集計"""
+        compact = compact_bar_frame(data, float32_prices=self.compact_float32)
+        report = compaction_report(data, compact)
+        with self._compaction_lock:
+            self.compaction_stats['frames'] += 1
+            for name, value in report.items():
+                self.compaction_stats[name] += value
+        logger.debug(
+            f"省メモリ化: {report['bytes_before']:,} → {report['bytes_after']:,} bytes "
+            f"({report['bytes_saved']:,} bytes削減)"
+        )
+        return compact
+
+    def _get_stock_data(
+        self,
+        symbol: str,
+        interval: str,
+        period: str,
+        use_cache: bool,
+        cache_expire_hours: Optional[float]
+    ) -> Optional[pd.DataFrame]:
+        """株価データ取得の本体（キャッシュ確認・差分取得・全件取得）"""
         cached_data = None
+        policy = self._resolve_ttl_policy(cache_expire_hours)
         
         if use_cache:
+            # 取得範囲メタデータがある場合は、バーを読まずに鮮度判定して不足範囲のみ取得
+            handled, ranged_data = self._get_from_fetched_ranges(
+                symbol, interval, period, policy
+            )
+            if handled:
+                return ranged_data
+
             cached_data = self._load_from_cache(symbol, interval)
             
             if cached_data is not None:
                 # キャッシュの有効期限チェック
                 latest_cache_time = pd.to_datetime(cached_data['created_at'].iloc[-1])
-                if datetime.now() - latest_cache_time < timedelta(hours=cache_expire_hours):
+                if pd.notna(latest_cache_time) and policy.is_fresh(
+                    symbol, interval, latest_cache_time
+                ):
                     logger.info(f"キャッシュデータを使用: {symbol}")
                     return cached_data
+
+                # 期限切れの場合は不足分（末尾・先頭）のみ差分取得
+                refreshed = self._refresh_incremental(
+                    symbol, interval, period, cached_data
+                )
+                if refreshed is not None:
+                    self._record_period_fetch(symbol, interval, period, refreshed)
+                    return refreshed
         
         # 新しいデータを取得
-        fresh_data = self._fetch_data_yfinance(symbol, interval, period)
+        fresh_data = self._fetch_bars(symbol, interval, period)
         
-        if fresh_data is not None and use_cache:
-            self._save_to_cache(fresh_data)
+        if use_cache:
+            if fresh_data is not None:
+                self._save_to_cache(fresh_data)
+            self._record_period_fetch(symbol, interval, period, fresh_data)
         
         return fresh_data
     
+    def _resolve_ttl_policy(
+        self,
+        cache_expire_hours: Optional[float]
+    ) -> CacheTTLPolicy:
+        """有効期限の指定があれば固定期限、なければ既定のポリシー"""
+        if cache_expire_hours is None:
+            return self.ttl_policy
+        return FixedTTLPolicy(cache_expire_hours)
+
+    def _uncovered_ranges(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        policy: CacheTTLPolicy
+    ) -> Optional[List[Tuple[pd.Timestamp, pd.Timestamp]]]:
+        """有効期限ポリシーに従って未カバー範囲を判定"""
+        return self.range_index.uncovered_ranges(
+            symbol, interval, start, end, policy.live_ttl(symbol, interval),
+            is_live_fresh=lambda fetched_at: policy.is_fresh(
+                symbol, interval, fetched_at
+            )
+        )
+
+    def is_range_fresh(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        cache_expire_hours: Optional[float] = None
+    ) -> bool:
+        """
+        指定範囲が鮮度のある取得済み範囲でカバーされているか（バーデータは読み込まない）
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            start: 判定範囲の開始
+            end: 判定範囲の終了
+            cache_expire_hours: 現在時刻を含む範囲の有効期限（時間、省略時は有効期限ポリシーで判定）
+
+        Returns:
+            全範囲がカバー済みならTrue
+        """
+        uncovered = self._uncovered_ranges(
+            symbol, interval, start, end, self._resolve_ttl_policy(cache_expire_hours)
+        )
+        return uncovered == []
+
+    def _record_period_fetch(
+        self,
+        symbol: str,
+        interval: str,
+        period: str,
+        data: Optional[pd.DataFrame]
+    ):
+        """期間指定の取得結果を取得済み範囲として記録"""
+        now = pd.Timestamp.now(tz='UTC')
+        start = self._period_start(period, now) or pd.Timestamp(0, tz='UTC')
+
+        # yfinanceの期間は営業日ベースのため、返ってきた最古のバーまでを取得済みとする
+        if data is not None and not data.empty:
+            first_bar = pd.Timestamp(data['timestamp'].min())
+            if first_bar.tzinfo is None:
+                first_bar = first_bar.tz_localize('UTC')
+            start = min(start, first_bar)
+
+        self.range_index.record(symbol, interval, start, now)
+
+    def _trim_to_period(
+        self,
+        data: pd.DataFrame,
+        period: str,
+        start: pd.Timestamp
+    ) -> pd.DataFrame:
+        """キャッシュから読み込んだデータを要求期間に絞り込む"""
+        if period in ("1d", "5d"):
+            # 日数指定はyfinanceと同様に直近N営業日（データが存在する日）を返す
+            trading_days = int(period[:-1])
+            dates = data['timestamp'].dt.date
+            first_date = sorted(dates.unique())[-trading_days:][0]
+            return data[dates >= first_date].reset_index(drop=True)
+
+        start = align_timestamp_bound(start, data['timestamp'])
+        return data[data['timestamp'] >= start].reset_index(drop=True)
+
+    def _get_from_fetched_ranges(
+        self,
+        symbol: str,
+        interval: str,
+        period: str,
+        policy: CacheTTLPolicy
+    ) -> Tuple[bool, Optional[pd.DataFrame]]:
+        """
+        取得範囲メタデータに基づいてキャッシュから応答（不足範囲のみ取得）
+
+        Returns:
+            (応答済みフラグ, 要求期間のDataFrame)
+            メタデータがない・キャッシュが消えている場合は (False, None) で通常取得に任せる
+        """
+        now = pd.Timestamp.now(tz='UTC')
+        start = self._period_start(period, now) or pd.Timestamp(0, tz='UTC')
+
+        uncovered = self._uncovered_ranges(symbol, interval, start, now, policy)
+        if uncovered is None:
+            return False, None
+
+        fetched = False
+        if uncovered:
+            uncovered_length = sum(
+                (range_end - range_start for range_start, range_end in uncovered),
+                timedelta()
+            )
+            if uncovered_length >= (now - start) * 0.99:
+                # 要求範囲全体が未取得の場合は期間指定で一括取得
+                fresh_data = self._fetch_bars(symbol, interval, period)
+                if fresh_data is not None:
+                    self._save_to_cache(fresh_data)
+                self._record_period_fetch(symbol, interval, period, fresh_data)
+            else:
+                for range_start, range_end in uncovered:
+                    live_edge = now - timedelta(
+                        seconds=CacheRangeIndex.LIVE_EDGE_TOLERANCE
+                    )
+                    is_live = range_end >= live_edge
+                    fresh_data = self._fetch_bars(
+                        symbol, interval, period,
+                        start=range_start, end=None if is_live else range_end
+                    )
+                    if fresh_data is not None:
+                        self._save_to_cache(fresh_data)
+                    self.range_index.record(
+                        symbol, interval, range_start, now if is_live else range_end
+                    )
+                logger.info(f"未取得範囲のみ取得: {symbol} ({len(uncovered)}範囲)")
+            fetched = True
+
+        # 日数指定の期間は週末・祝日をまたぐため余裕を持って読み込み、営業日単位で絞り込む
+        load_start = start - timedelta(days=7) if period in ("1d", "5d") else start
+        data = self._load_from_cache(symbol, interval, start_time=load_start)
+        if data is None:
+            # 取得直後で空ならデータなし、それ以外はキャッシュが消えているため通常取得に任せる
+            return fetched, None
+
+        if not fetched:
+            logger.info(f"キャッシュデータを使用: {symbol}")
+        return True, self._trim_to_period(data, period, start)
+
+    @staticmethod
+    def _now_like(reference: pd.Timestamp) -> pd.Timestamp:
+        """referenceとタイムゾーン有無を揃えた現在時刻"""
+        if reference.tzinfo is not None:
+            return pd.Timestamp.now(tz=reference.tzinfo)
+        return pd.Timestamp.now()
+
+    def _period_start(
+        self,
+        period: str,
+        reference: pd.Timestamp
+    ) -> Optional[pd.Timestamp]:
+        """取得期間の開始日時（maxや未知の期間はNone）"""
+        now = self._now_like(reference)
+        if period == "ytd":
+            return now.normalize().replace(month=1, day=1)
+        length = self.PERIOD_LENGTHS.get(period)
+        return now - length if length is not None else None
+
+    @staticmethod
+    def _merge_bars(base: pd.DataFrame, updates: List[pd.DataFrame]) -> pd.DataFrame:
+        """キャッシュ済みデータに差分データをマージ（同一timestampは差分側を優先）"""
+        base_tz = getattr(base['timestamp'].dt, 'tz', None)
+        frames = [base]
+        for update in updates:
+            columns = [col for col in base.columns if col in update.columns]
+            update = update[columns].copy()
+            update['timestamp'] = pd.to_datetime(update['timestamp'])
+            update_tz = getattr(update['timestamp'].dt, 'tz', None)
+            if base_tz is not None and update_tz is not None:
+                update['timestamp'] = update['timestamp'].dt.tz_convert(base_tz)
+            frames.append(update)
+
+        merged = pd.concat(frames, ignore_index=True)
+        return (
+            merged.drop_duplicates(subset=['timestamp'], keep='last')
+            .sort_values('timestamp')
+            .reset_index(drop=True)
+        )
+
+    def _refresh_incremental(
+        self,
+        symbol: str,
+        interval: str,
+        period: str,
+        cached_data: pd.DataFrame
+    ) -> Optional[pd.DataFrame]:
+        """
+        キャッシュの最新時刻（ハイウォーターマーク）以降の不足分のみ取得してマージ
+
+        Args:
+            symbol: 銘柄コード
+            interval: データ間隔
+            period: 取得期間
+            cached_data: キャッシュ済みデータ（timestamp昇順）
+
+        Returns:
+            マージ済みのDataFrame（全件再取得が必要な場合はNone）
+        """
+        first_cached = pd.Timestamp(cached_data['timestamp'].iloc[0])
+        high_water_mark = pd.Timestamp(cached_data['timestamp'].iloc[-1])
+        period_start = self._period_start(period, high_water_mark)
+
+        # 期間全体がキャッシュ範囲外なら差分取得の意味がないため全件取得
+        if period_start is None or high_water_mark < period_start:
+            return None
+
+        updates = []
+
+        # 先頭の欠損（キャッシュ開始が要求期間より遅い）を補完
+        if first_cached > period_start + self.HEAD_GAP_TOLERANCE:
+            logger.info(f"キャッシュ先頭の欠損を補完: {symbol} ({period_start} 〜 {first_cached})")
+            head = self._fetch_bars(
+                symbol, interval, period, start=period_start, end=first_cached
+            )
+            if head is not None:
+                updates.append(head)
+
+        # ハイウォーターマーク以降の末尾のみ取得（最新バーは確定前の可能性があるため含めて再取得）
+        tail = self._fetch_bars(symbol, interval, period, start=high_water_mark)
+        if tail is not None:
+            updates.append(tail)
+
+        if not updates:
+            # 取得済みは呼び出し側が取得範囲として記録するため、バー（系列のバージョン）は書き換えない
+            logger.info(f"新しいバーなし: {symbol}")
+            return cached_data
+
+        for update in updates:
+            self._save_to_cache(update)
+        merged = self._merge_bars(cached_data, updates)
+        logger.info(
+            f"差分取得完了: {symbol} (+{sum(len(u) for u in updates)}件, 合計{len(merged)}件)"
+        )
+        return merged
+
     def get_multiple_stocks(
         self,
         symbols: List[str],
         interval: str = "1m",
         period: str = "1d",
-        use_cache: bool = True
+        use_cache: bool = True,
+        batch_size: Optional[int] = None,
+        compact: Optional[bool] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         複数銘柄のデータを並列取得
@@ -256,10 +1098,18 @@ class StockDataCollector:
             interval: データ間隔
             period: 取得期間
             use_cache: キャッシュ使用フラグ
+            batch_size: 指定時は未キャッシュ銘柄をこの銘柄数ずつ一括ダウンロード
+            compact: 省メモリ形式で返すか（省略時はcompact_frames属性に従う）
         
         Returns:
             銘柄コードをキーとした株価データの辞書
         """
+        if batch_size:
+            return self._get_multiple_stocks_batched(
+                symbols, interval, period, use_cache, batch_size,
+                self._should_compact(compact)
+            )
+
         results = {}
         
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
@@ -267,7 +1117,7 @@ class StockDataCollector:
             future_to_symbol = {
                 executor.submit(
                     self.get_stock_data, 
-                    symbol, interval, period, use_cache
+                    symbol, interval, period, use_cache, compact=compact
                 ): symbol
                 for symbol in symbols
             }
@@ -286,6 +1136,86 @@ class StockDataCollector:
         logger.info(f"複数銘柄取得完了: {len(results)}/{len(symbols)}")
         return results
     
+    def _get_multiple_stocks_batched(
+        self,
+        symbols: List[str],
+        interval: str,
+        period: str,
+        use_cache: bool,
+        batch_size: int,
+        compact: bool = False
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        複数銘柄を一括ダウンロードで取得（新鮮なキャッシュがある銘柄は取得しない）
+
+        Args:
+            symbols: 銘柄コードのリスト
+            interval: データ間隔
+            period: 取得期間
+            use_cache: キャッシュ使用フラグ
+            batch_size: 1リクエストあたりの銘柄数
+            compact: 省メモリ形式で返すか
+
+        Returns:
+            銘柄コードをキーとした株価データの辞書
+        """
+        results = {}
+        unique_symbols = list(dict.fromkeys(symbols))
+
+        # 取得範囲メタデータで新鮮と判定できる銘柄はキャッシュから応答
+        stale_symbols = []
+        now = pd.Timestamp.now(tz='UTC')
+        period_start = self._period_start(period, now) or pd.Timestamp(0, tz='UTC')
+        for symbol in unique_symbols:
+            if use_cache and self.is_range_fresh(symbol, interval, period_start, now):
+                data = self.get_stock_data(
+                    symbol, interval, period, use_cache=True, compact=compact
+                )
+                if data is not None:
+                    results[symbol] = data
+                    continue
+            stale_symbols.append(symbol)
+
+        round_trips = 0
+        for i in range(0, len(stale_symbols), batch_size):
+            batch = stale_symbols[i:i + batch_size]
+            try:
+                fetched = self._fetch_batch_yfinance(batch, interval, period)
+                round_trips += 1
+                fetched = {
+                    symbol: data for symbol, data in
+                    ((symbol, self._ingest(data)) for symbol, data in fetched.items())
+                    if data is not None
+                }
+            except Exception as e:
+                logger.error(f"一括取得失敗 {batch}: {str(e)}")
+                continue
+
+            if use_cache:
+                # バッチ内の全銘柄を単一トランザクションで保存
+                if self.bar_store is None:
+                    self.save_frames(list(fetched.values()))
+                else:
+                    for data in fetched.values():
+                        self._save_to_cache(data)
+                for symbol in batch:
+                    self._record_period_fetch(
+                        symbol, interval, period, fetched.get(symbol)
+                    )
+
+            for symbol in batch:
+                if symbol in fetched:
+                    frame = fetched[symbol]
+                    results[symbol] = self._compact_output(frame) if compact else frame
+                else:
+                    logger.warning(f"データ取得失敗: {symbol}")
+
+        logger.info(
+            f"複数銘柄一括取得完了: {len(results)}/{len(unique_symbols)} "
+            f"(キャッシュ{len(unique_symbols) - len(stale_symbols)}銘柄, リクエスト{round_trips}回)"
+        )
+        return results
+
     def clear_cache(self, symbol: Optional[str] = None, older_than_days: int = 30):
         """
         キャッシュクリア
@@ -295,48 +1225,182 @@ class StockDataCollector:
             older_than_days: 指定日数より古いデータをクリア
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cutoff_date = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+            self.range_index.clear(
+                symbol, datetime.now() - timedelta(days=older_than_days)
+            )
+        except Exception as e:
+            logger.error(f"取得範囲メタデータクリアエラー: {str(e)}")
+
+        if self.bar_store is not None:
+            try:
+                cutoff = datetime.now() - timedelta(days=older_than_days)
+                removed = self.bar_store.clear(symbol, cutoff)
+                logger.info(f"キャッシュクリア完了: {symbol or '全銘柄'} ({removed}件)")
+            except Exception as e:
+                logger.error(f"キャッシュクリアエラー: {str(e)}")
+            self.frame_cache.invalidate(self._cache_location, symbol)
+            return
+
+        try:
+            with self._connect() as conn:
+                cutoff = bound_to_epoch_ns(
+                    datetime.now() - timedelta(days=older_than_days), None
+                )
                 
                 if symbol:
                     conn.execute(
-                        "DELETE FROM stock_data WHERE symbol = ? AND created_at < ?",
-                        (symbol, cutoff_date)
+                        "DELETE FROM bars WHERE created_at < ? AND series_id IN "
+                        "(SELECT series_id FROM series WHERE symbol = ?)",
+                        (cutoff, symbol)
                     )
+                    series_ids = [
+                        row[0] for row in conn.execute(
+                            "SELECT series_id FROM series WHERE symbol = ?", (symbol,)
+                        )
+                    ]
+                    delete_blocks_created_before(conn, cutoff, series_ids)
                     logger.info(f"キャッシュクリア完了: {symbol}")
                 else:
                     conn.execute(
-                        "DELETE FROM stock_data WHERE created_at < ?",
-                        (cutoff_date,)
+                        "DELETE FROM bars WHERE created_at < ?",
+                        (cutoff,)
                     )
+                    delete_blocks_created_before(conn, cutoff)
                     logger.info("全キャッシュクリア完了")
                     
         except Exception as e:
             logger.error(f"キャッシュクリアエラー: {str(e)}")
+
+        self.frame_cache.invalidate(self._cache_location, symbol)
     
+    def compact_cache(
+        self,
+        older_than_days: Optional[int] = None,
+        symbol: Optional[str] = None,
+        vacuum: bool = False
+    ) -> int:
+        """
+        古い取引日のバーを日次圧縮ブロックへ移動（読み込み時は透過的に展開される）
+
+        Args:
+            older_than_days: この日数より前の現地日を圧縮
+                （省略時はDataCollectorConfig.cold_storage_days、0以下で無効）
+            symbol: 特定銘柄のみ圧縮（Noneの場合は全て）
+            vacuum: 圧縮後にVACUUMで空き領域をファイルから解放するか
+
+        Returns:
+            圧縮ブロックへ移動したバー数
+        """
+        if older_than_days is None:
+            older_than_days = settings_manager.settings.data_collector.cold_storage_days
+        if self.bar_store is not None or older_than_days <= 0:
+            # Parquetバックエンドは保存形式自体が列指向の圧縮ファイル
+            return 0
+
+        before = pd.Timestamp.now(tz='UTC') - timedelta(days=older_than_days)
+        compacted = 0
+        try:
+            with self._connect() as conn:
+                query = "SELECT series_id, tz FROM series"
+                params = []
+                if symbol:
+                    query += " WHERE symbol = ?"
+                    params.append(symbol)
+                for series_id, tz in conn.execute(query, params).fetchall():
+                    compacted += compact_series(conn, series_id, tz, before)
+
+            if vacuum and compacted:
+                with self._connect() as conn:
+                    conn.execute("VACUUM")
+        except Exception as e:
+            logger.error(f"キャッシュ圧縮エラー: {str(e)}")
+            return compacted
+
+        logger.info(
+            f"キャッシュ圧縮完了: {symbol or '全銘柄'} "
+            f"({compacted}件, {older_than_days}日より前)"
+        )
+        return compacted
+
+    def get_series_stats(self) -> pd.DataFrame:
+        """
+        系列ごとのキャッシュ統計（集計テーブルから取得）
+
+        Returns:
+            symbol, interval, records, cold_records, first, last, last_fetch, bytes
+            のDataFrame
+        """
+        columns = [
+            'symbol', 'interval', 'records', 'cold_records',
+            'first', 'last', 'last_fetch', 'bytes'
+        ]
+        if self.bar_store is not None:
+            return pd.DataFrame(columns=columns)
+
+        with self._connect() as conn:
+            stats = read_series_stats(conn)
+
+        def bound(value, tz):
+            return from_epoch_ns([value], tz).iloc[0] if pd.notna(value) else pd.NaT
+
+        return pd.DataFrame({
+            'symbol': stats['symbol'],
+            'interval': stats['interval'],
+            'records': stats['records'],
+            'cold_records': stats['cold_records'],
+            'first': [
+                bound(value, tz) for value, tz in zip(stats['min_ts'], stats['tz'])
+            ],
+            'last': [
+                bound(value, tz) for value, tz in zip(stats['max_ts'], stats['tz'])
+            ],
+            'last_fetch': pd.to_datetime(stats['last_fetch'], unit='ns'),
+            'bytes': stats['bytes'],
+        }, columns=columns)
+
     def get_cache_stats(self) -> Dict[str, Union[int, str]]:
         """キャッシュ統計情報取得"""
+        if self.bar_store is not None:
+            try:
+                return self.bar_store.stats()
+            except Exception as e:
+                logger.error(f"キャッシュ統計取得エラー: {str(e)}")
+                return {}
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
-                # 総レコード数
-                cursor.execute("SELECT COUNT(*) FROM stock_data")
-                total_records = cursor.fetchone()[0]
-                
-                # 銘柄数
-                cursor.execute("SELECT COUNT(DISTINCT symbol) FROM stock_data")
-                unique_symbols = cursor.fetchone()[0]
-                
-                # 最新データ時刻
-                cursor.execute("SELECT MAX(created_at) FROM stock_data")
-                latest_update = cursor.fetchone()[0]
+                # 系列ごとの集計テーブルから算出（バーの件数によらず系列数に比例するコスト）
+                cursor.execute("""
+                    SELECT COALESCE(SUM(st.row_count + st.cold_rows), 0),
+                           COALESCE(SUM(st.cold_rows), 0),
+                           COALESCE(SUM(st.cold_blocks), 0),
+                           COUNT(DISTINCT s.symbol),
+                           MAX(st.last_fetch),
+                           COALESCE(SUM(st.bytes), 0)
+                    FROM series_stats st JOIN series s ON s.series_id = st.series_id
+                    WHERE st.row_count + st.cold_rows > 0
+                """)
+                (total_records, cold_records, cold_blocks,
+                 unique_symbols, latest_update, data_bytes) = cursor.fetchone()
                 
                 return {
                     'total_records': total_records,
+                    'cold_records': cold_records,
+                    'cold_blocks': cold_blocks,
                     'unique_symbols': unique_symbols,
-                    'latest_update': latest_update or 'N/A',
-                    'cache_file_size': f"{self.db_path.stat().st_size / 1024 / 1024:.2f} MB"
+                    'latest_update': (
+                        pd.Timestamp(latest_update).isoformat()
+                        if latest_update else 'N/A'
+                    ),
+                    'data_size': f"{data_bytes / 1024 / 1024:.2f} MB",
+                    'cache_file_size': (
+                        f"{self.db_path.stat().st_size / 1024 / 1024:.2f} MB"
+                    ),
+                    'connection_pool': connection_manager.get_stats(),
+                    'frame_cache': self.frame_cache.get_stats(),
+                    'single_flight': self.single_flight.get_stats()
                 }
                 
         except Exception as e:
@@ -13,7 +13,8 @@ from dataclasses import dataclass
 
 from .symbol_manager import SymbolManager, MarketType
 from .backup_manager import BackupManager, BackupConfig
-from ..config.settings import DatabaseConfig
+from ..config.settings import DatabaseConfig, settings_manager
+from ..utils.sqlite_pool import connection_manager
 
 logger = logging.getLogger(__name__)
 
@@ -42,14 +43,14 @@ class WatchlistStorage:
         Args:
             db_path: データベースファイルパス
             user_id: ユーザーID（将来の複数ユーザー対応用）
-            db_config: データベース設定
+            db_config: データベース設定（省略時はアプリ設定のdatabaseに従う）
         """
         self.db_path = db_path
         self.user_id = user_id
         self.symbol_manager = SymbolManager()
         
         # バックアップ設定とマネージャー初期化
-        self.db_config = db_config or DatabaseConfig()
+        self.db_config = db_config or settings_manager.settings.database
         backup_config = BackupConfig(
             backup_enabled=self.db_config.backup_enabled,
             backup_dir=self.db_config.backup_dir,
@@ -57,7 +58,8 @@ class WatchlistStorage:
             backup_retention_count=self.db_config.backup_retention_count,
             backup_compression_enabled=self.db_config.backup_compression_enabled,
             daily_backup_enabled=self.db_config.daily_backup_enabled,
-            backup_interval_hours=self.db_config.backup_interval_hours
+            backup_interval_hours=self.db_config.backup_interval_hours,
+            incremental=self.db_config.backup_incremental
         )
         self.backup_manager = BackupManager(backup_config)
         
@@ -72,9 +74,13 @@ class WatchlistStorage:
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
     
+    def _connect(self) -> sqlite3.Connection:
+        """スレッドごとにプールされたSQLite接続を取得"""
+        return connection_manager.connection(self.db_path)
+
     def initialize_database(self):
         """データベース初期化"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # ウォッチリストテーブル
@@ -140,7 +146,7 @@ class WatchlistStorage:
                 logger.warning(f"未知の市場タイプのため追加をスキップ: {symbol}")
                 return False
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # 最大ポジションを取得
@@ -184,7 +190,7 @@ class WatchlistStorage:
             # 銘柄コードを正規化
             normalized_symbol = self.symbol_manager.normalize_symbol(symbol)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # 削除対象のポジションを取得
@@ -229,7 +235,7 @@ class WatchlistStorage:
             銘柄コードリスト（ポジション順）
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -256,7 +262,7 @@ class WatchlistStorage:
             ウォッチリストアイテムリスト
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -300,7 +306,7 @@ class WatchlistStorage:
         try:
             # 操作前バックアップ
             self._backup_before_operation("reorder", f"順序変更: {len(symbol_order)}銘柄")
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # 正規化された銘柄コードで更新
@@ -361,7 +367,7 @@ class WatchlistStorage:
         try:
             # 操作前バックアップ
             self._backup_before_operation("clear", "ウォッチリストクリア")
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -384,7 +390,7 @@ class WatchlistStorage:
             統計情報辞書
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
                 # 総銘柄数
@@ -14,6 +14,8 @@ import json
 from pathlib import Path
 from loguru import logger
 
+from ..utils.sqlite_pool import connection_manager
+
 
 class TradeStatus(Enum):
     """取引ステータス"""
@@ -151,9 +153,13 @@ class TradeHistoryManager:
         
         logger.info(f"TradeHistoryManager initialized with database: {self.db_path}")
     
+    def _connect(self) -> sqlite3.Connection:
+        """スレッドごとにプールされたSQLite接続を取得"""
+        return connection_manager.connection(self.db_path)
+
     def _init_database(self):
         """データベーステーブル初期化"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             # 取引履歴テーブル
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS trade_history (
@@ -232,7 +238,7 @@ class TradeHistoryManager:
             成功した場合True
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 trade_dict = trade.to_dict()
                 
                 # 必要なフィールドのみ抽出（テーブル定義に合わせる）
@@ -271,7 +277,7 @@ class TradeHistoryManager:
             成功した場合True
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 trade_dict = trade.to_dict()
                 
                 # 更新フィールド設定
@@ -362,9 +368,10 @@ class TradeHistoryManager:
             取引記録（見つからない場合はNone）
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(
+            with self._connect() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(
                     "SELECT * FROM trade_history WHERE trade_id = ?",
                     (trade_id,)
                 )
@@ -400,9 +407,7 @@ class TradeHistoryManager:
             取引記録リスト
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
+            with self._connect() as conn:
                 where_conditions = []
                 params = []
                 
@@ -431,7 +436,9 @@ class TradeHistoryManager:
                 
                 query = f"SELECT * FROM trade_history{where_clause} ORDER BY entry_time DESC{limit_clause}"
                 
-                cursor = conn.execute(query, params)
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(query, params)
                 rows = cursor.fetchall()
                 
                 return [TradeRecord.from_dict(dict(row)) for row in rows]
@@ -571,7 +578,7 @@ class TradeHistoryManager:
             成功した場合True
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("DELETE FROM trade_history WHERE trade_id = ?", (trade_id,))
                 
                 if cursor.rowcount == 0:
@@ -600,8 +607,13 @@ class TradeHistoryManager:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_path = self.db_path.parent / f"trade_history_backup_{timestamp}.db"
             
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # WALモードではDBファイルのコピーに未チェックポイントの更新が含まれないため、
+            # SQLiteのオンラインバックアップAPIで複製する
+            backup_conn = sqlite3.connect(backup_path)
+            try:
+                self._connect().backup(backup_conn)
+            finally:
+                backup_conn.close()
             
             logger.info(f"Database backed up to: {backup_path}")
             return True
@@ -10,11 +10,13 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from dataclasses import dataclass
 from loguru import logger
 from enum import Enum
 
+from ..data_collector.data_provider import DataProvider, create_data_provider
+from ..data_collector.fundamentals_store import FUNDAMENTAL_FIELDS, FundamentalsStore
+
 
 class HealthScore(Enum):
     """財務健全性スコア評価レベル"""
@@ -85,28 +87,52 @@ class HealthScoreResult:
 class FundamentalAnalyzer:
     """ファンダメンタルズ分析メインクラス"""
 
-    def __init__(self):
-        """初期化"""
+    def __init__(
+        self,
+        data_provider: Optional[DataProvider] = None,
+        store: Optional[FundamentalsStore] = None
+    ):
+        """
+        初期化
+
+        Args:
+            data_provider: 銘柄情報・財務諸表の取得元（省略時はDataCollectorConfig.data_providerに従う）
+            store: プロセス間で共有するディスクキャッシュ（省略時はキャッシュディレクトリのfundamentals.db）
+        """
+        self.data_provider = data_provider or create_data_provider()
+        self.store = store or FundamentalsStore()
         self._cache = {}
-        self._cache_expire_hours = 24  # キャッシュ有効期限24時間
+        self._cache_expire_hours = self.store.ttl_hours["info"]  # 銘柄情報のキャッシュ有効期限
+
+    def _is_cache_fresh(self, field: str, cache_time: datetime) -> bool:
+        """メモリキャッシュの有効期限チェック（財務諸表は項目ごとの長い有効期限）"""
+        if field == "info":
+            expire = timedelta(hours=self._cache_expire_hours)
+            return datetime.now() - cache_time < expire
+        return self.store.is_fresh(field, cache_time)
 
     def _get_ticker_info(self, symbol: str) -> Dict:
-        """yfinanceから銘柄情報を取得（キャッシュ機能付き）"""
+        """yfinanceから銘柄情報を取得（メモリ・ディスクキャッシュ機能付き）"""
         cache_key = f"info_{symbol}"
-        now = datetime.now()
 
         # キャッシュチェック
         if cache_key in self._cache:
             cache_data, cache_time = self._cache[cache_key]
-            if now - cache_time < timedelta(hours=self._cache_expire_hours):
+            if self._is_cache_fresh("info", cache_time):
                 return cache_data
 
+        stored = self.store.get(symbol, "info")
+        if stored is not None:
+            self._cache[cache_key] = stored
+            return stored[0]
+
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = self.data_provider.info(symbol)
 
-            # キャッシュに保存
-            self._cache[cache_key] = (info, now)
+            # キャッシュに保存（空の場合は取得失敗として保存しない）
+            self._cache[cache_key] = (info, datetime.now())
+            if info:
+                self.store.put(symbol, "info", info)
 
             logger.info(f"銘柄情報取得成功: {symbol}")
             return info
@@ -116,25 +142,34 @@ class FundamentalAnalyzer:
             return {}
 
     def _get_financial_data(self, symbol: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """財務諸表データを取得"""
+        """財務諸表データを取得（メモリ・ディスクキャッシュ機能付き）"""
         cache_key = f"financials_{symbol}"
-        now = datetime.now()
 
         # キャッシュチェック
         if cache_key in self._cache:
             cache_data, cache_time = self._cache[cache_key]
-            if now - cache_time < timedelta(hours=self._cache_expire_hours):
+            if self._is_cache_fresh("financials", cache_time):
                 return cache_data
 
-        try:
-            ticker = yf.Ticker(symbol)
+        stored = self.store.load_many([symbol], ["financials", "balance_sheet"])
+        if len(stored) == 2:
+            (financials, fetched_at), (balance_sheet, _) = (
+                stored[(symbol, "financials")], stored[(symbol, "balance_sheet")]
+            )
+            self._cache[cache_key] = ((financials, balance_sheet), fetched_at)
+            return financials, balance_sheet
 
+        try:
             # 損益計算書と貸借対照表を取得
-            financials = ticker.financials
-            balance_sheet = ticker.balance_sheet
+            financials, balance_sheet = self.data_provider.financials(symbol)
 
-            # キャッシュに保存
-            self._cache[cache_key] = (financials, balance_sheet)
+            # キャッシュに保存（空の場合は取得失敗として保存しない）
+            self._cache[cache_key] = ((financials, balance_sheet), datetime.now())
+            if not financials.empty and not balance_sheet.empty:
+                self.store.put_many([
+                    (symbol, "financials", financials),
+                    (symbol, "balance_sheet", balance_sheet),
+                ])
 
             logger.info(f"財務データ取得成功: {symbol}")
             return financials, balance_sheet
@@ -143,6 +178,37 @@ class FundamentalAnalyzer:
             logger.error(f"財務データ取得エラー {symbol}: {str(e)}")
             return pd.DataFrame(), pd.DataFrame()
 
+    def prefetch(self, symbols: List[str], force: bool = False,
+                 max_workers: int = 8) -> Dict[str, int]:
+        """
+        複数銘柄の銘柄情報・財務諸表をまとめて準備
+        期限切れ・未取得の銘柄だけを並列取得してディスクキャッシュに保存し、
+        全銘柄の値を1回の読み込みでメモリキャッシュに載せる
+
+        Args:
+            symbols: 銘柄コードのリスト
+            force: 有効期限内の値も再取得するか
+            max_workers: 同時取得銘柄数
+
+        Returns:
+            FundamentalsStore.refreshの実行結果
+        """
+        summary = self.store.refresh(
+            symbols, self.data_provider, force=force, max_workers=max_workers
+        )
+
+        stored = self.store.load_many(symbols, FUNDAMENTAL_FIELDS)
+        for symbol in dict.fromkeys(symbols):
+            if (symbol, "info") in stored:
+                self._cache[f"info_{symbol}"] = stored[(symbol, "info")]
+            if (symbol, "financials") in stored and (symbol, "balance_sheet") in stored:
+                financials, fetched_at = stored[(symbol, "financials")]
+                balance_sheet, _ = stored[(symbol, "balance_sheet")]
+                self._cache[f"financials_{symbol}"] = (
+                    (financials, balance_sheet), fetched_at
+                )
+        return summary
+
     def _normalize_dividend_yield(self, dividend_yield: Optional[float], 
                                 dividend_rate: Optional[float], 
                                 current_price: Optional[float]) -> Optional[float]:
@@ -421,6 +487,9 @@ class FundamentalAnalyzer:
     ) -> Optional[ComparisonResult]:
         """同業他社との比較分析"""
         try:
+            # 期限切れの銘柄だけをまとめて並列取得し、以降はキャッシュから計算
+            self.prefetch([target_symbol] + peer_symbols)
+
             # 全銘柄の財務指標を取得
             all_metrics = {}
 
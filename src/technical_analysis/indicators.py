@@ -22,7 +22,8 @@ class TechnicalIndicators:
             data: OHLCV形式のDataFrame
                   必須カラム: open, high, low, close, volume, timestamp
         """
-        self.data = data.copy()
+        # 浅いコピー（BarArrays.to_frame参照）
+        self.data = data.copy(deep=False)
         self._validate_data()
         self._prepare_data()
         
@@ -54,8 +55,11 @@ class TechnicalIndicators:
         if not pd.api.types.is_datetime64_any_dtype(self.data['timestamp']):
             self.data['timestamp'] = pd.to_datetime(self.data['timestamp'])
         
-        # 時系列ソート
-        self.data = self.data.sort_values('timestamp').reset_index(drop=True)
+        # 時系列ソート（整列済みのデータは複製しない）
+        if not self.data['timestamp'].is_monotonic_increasing:
+            self.data = self.data.sort_values('timestamp')
+        if not self.data.index.equals(pd.RangeIndex(len(self.data))):
+            self.data = self.data.reset_index(drop=True)
         
         # 典型価格（HL2, HLC3, OHLC4）を事前計算
         self.data['hl2'] = (self.data['high'] + self.data['low']) / 2
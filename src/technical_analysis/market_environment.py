@@ -8,12 +8,15 @@
 - VIX指数による市場心理分析
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
+import threading
 import pandas as pd
 import numpy as np
 from enum import Enum
+from loguru import logger
 
 from ..data_collector.stock_data_collector import StockDataCollector
 from ..technical_analysis.indicators import TechnicalIndicators
@@ -83,33 +86,58 @@ class MarketEnvironmentAnalyzer:
         "extreme_high": 50
     }
     
-    def __init__(self):
-        """初期化"""
-        self.data_collector = StockDataCollector()
+    def __init__(
+        self,
+        data_collector: Optional[StockDataCollector] = None,
+        max_workers: Optional[int] = None
+    ):
+        """初期化
+
+        Args:
+            data_collector: データ取得に使用するコレクター（省略時は新規作成）
+            max_workers: 同時取得数（省略時はインデックス・セクターETFの全銘柄を同時に取得）
+        """
+        self.data_collector = data_collector or StockDataCollector()
         self.validator = DataValidator()
+        self.max_workers = max_workers or len(self.INDICES) + len(self.SECTOR_ETFS)
+        # (期間, 間隔) ごとの分析結果（次のバー確定まで再利用）
+        self._snapshots: Dict[Tuple[str, str], MarketEnvironment] = {}
+        self._snapshot_lock = threading.Lock()
         
     def analyze_market_environment(
         self,
         period: str = "5d",
-        interval: str = "1d"
+        interval: str = "1d",
+        use_cache: bool = True
     ) -> MarketEnvironment:
         """市場環境の総合分析
         
         Args:
             period: 分析期間
             interval: データ間隔
+            use_cache: 次のバーが確定するまで前回の分析結果を再利用するか
             
         Returns:
             MarketEnvironment: 市場環境分析結果
         """
+        if use_cache:
+            snapshot = self._cached_snapshot(period, interval)
+            if snapshot is not None:
+                return snapshot
+
+        # インデックス・VIX・セクターETFのデータを同時に取得
+        market_data = self._fetch_market_data(period, interval)
+
         # インデックスデータの取得
-        indices_data = self._fetch_indices_data(period, interval)
+        indices_data = self._fetch_indices_data(period, interval, market_data)
         
         # インデックスパフォーマンスの計算
         indices_performance = self._calculate_indices_performance(indices_data)
         
         # セクターパフォーマンスの分析
-        sector_performance = self._analyze_sector_performance(period, interval)
+        sector_performance = self._analyze_sector_performance(
+            period, interval, market_data
+        )
         
         # VIX指数の取得と市場センチメント判定
         vix_level = self._get_current_vix(indices_data)
@@ -134,7 +162,7 @@ class MarketEnvironmentAnalyzer:
             market_sentiment, risk_state, risk_factors, opportunities
         )
         
-        return MarketEnvironment(
+        env = MarketEnvironment(
             timestamp=datetime.now(),
             indices_performance=indices_performance,
             sector_performance=sector_performance,
@@ -146,20 +174,101 @@ class MarketEnvironmentAnalyzer:
             risk_factors=risk_factors,
             opportunities=opportunities
         )
+        # 一部の銘柄が取得できなかった結果は次のバーまで固定されないよう保持しない
+        expected = {*self.INDICES.values(), *self.SECTOR_ETFS.values()}
+        if len(market_data) == len(expected):
+            with self._snapshot_lock:
+                self._snapshots[(period, interval)] = env
+        return env
     
-    def _fetch_indices_data(self, period: str, interval: str) -> Dict[str, pd.DataFrame]:
-        """インデックスデータの取得"""
-        indices_data = {}
+    def _cached_snapshot(self, period: str,
+                         interval: str) -> Optional[MarketEnvironment]:
+        """次のバーが確定していない場合は前回の分析結果を返す
         
-        for name, symbol in self.INDICES.items():
-            try:
-                data = self.data_collector.get_stock_data(symbol, interval=interval, period=period)
-                if data is not None and not data.empty:
-                    indices_data[name] = data
-            except Exception as e:
-                print(f"インデックス {name} ({symbol}) のデータ取得に失敗: {e}")
-                
-        return indices_data
+        いずれかの銘柄でキャッシュ有効期限ポリシー上の新しいバーが確定していれば期限切れとする
+        （取引時間外に分析した結果は次の取引開始まで再利用される）
+        """
+        with self._snapshot_lock:
+            snapshot = self._snapshots.get((period, interval))
+        if snapshot is None:
+            return None
+
+        policy = self.data_collector.ttl_policy
+        symbols = [*self.INDICES.values(), *self.SECTOR_ETFS.values()]
+        if all(policy.is_fresh(symbol, interval, snapshot.timestamp)
+               for symbol in symbols):
+            return snapshot
+        return None
+
+    def clear_snapshots(self):
+        """保持している分析結果を破棄"""
+        with self._snapshot_lock:
+            self._snapshots.clear()
+
+    def _fetch_market_data(
+        self,
+        period: str,
+        interval: str,
+        symbols: Optional[List[str]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """複数銘柄のデータを同時に取得
+
+        Args:
+            period: 分析期間
+            interval: データ間隔
+            symbols: 銘柄コードのリスト（省略時はインデックス・VIX・セクターETFの全銘柄）
+
+        Returns:
+            銘柄コードをキーとしたデータ（取得できなかった銘柄は含まない）
+        """
+        if symbols is None:
+            symbols = [*self.INDICES.values(), *self.SECTOR_ETFS.values()]
+        symbols = list(dict.fromkeys(symbols))
+
+        market_data = {}
+        max_workers = max(1, min(self.max_workers, len(symbols)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.data_collector.get_stock_data,
+                    symbol, interval=interval, period=period, compact=False
+                ): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    data = future.result()
+                    if data is not None and not data.empty:
+                        market_data[symbol] = data
+                except Exception as e:
+                    logger.error(f"{symbol} のデータ取得に失敗: {e}")
+
+        return market_data
+
+    def _fetch_indices_data(
+        self,
+        period: str,
+        interval: str,
+        market_data: Optional[Dict[str, pd.DataFrame]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """インデックスデータの取得
+
+        Args:
+            period: 分析期間
+            interval: データ間隔
+            market_data: 取得済みのデータ（省略時はインデックスのみ同時に取得）
+        """
+        if market_data is None:
+            market_data = self._fetch_market_data(
+                period, interval, list(self.INDICES.values())
+            )
+
+        return {
+            name: market_data[symbol]
+            for name, symbol in self.INDICES.items()
+            if symbol in market_data
+        }
     
     def _calculate_indices_performance(self, indices_data: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, float]]:
         """インデックスパフォーマンスの計算"""
@@ -212,21 +321,37 @@ class MarketEnvironmentAnalyzer:
                 
         return performance
     
-    def _analyze_sector_performance(self, period: str, interval: str) -> Dict[str, float]:
-        """セクター別パフォーマンスの分析"""
+    def _analyze_sector_performance(
+        self,
+        period: str,
+        interval: str,
+        market_data: Optional[Dict[str, pd.DataFrame]] = None
+    ) -> Dict[str, float]:
+        """セクター別パフォーマンスの分析
+
+        Args:
+            period: 分析期間
+            interval: データ間隔
+            market_data: 取得済みのデータ（省略時はセクターETFのみ同時に取得）
+        """
+        if market_data is None:
+            market_data = self._fetch_market_data(
+                period, interval, list(self.SECTOR_ETFS.values())
+            )
+
         sector_performance = {}
         
         for sector, symbol in self.SECTOR_ETFS.items():
+            data = market_data.get(symbol)
             try:
-                data = self.data_collector.get_stock_data(symbol, interval=interval, period=period)
-                if data is not None and not data.empty and len(data) >= 2:
+                if data is not None and len(data) >= 2:
                     # 期間リターンを計算
                     current_price = data['close'].iloc[-1]
                     start_price = data['close'].iloc[0]
                     performance = ((current_price / start_price) - 1) * 100
                     sector_performance[sector] = performance
             except Exception as e:
-                print(f"セクター {sector} ({symbol}) のデータ取得エラー: {e}")
+                print(f"セクター {sector} ({symbol}) のパフォーマンス計算エラー: {e}")
                 
         return sector_performance
     
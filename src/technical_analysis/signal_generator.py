@@ -92,7 +92,8 @@ class SignalGenerator:
             data: OHLCV形式のDataFrame
             config_file: 設定ファイルパス
         """
-        self.data = data.copy()
+        # 浅いコピー（BarArrays.to_frame参照）
+        self.data = data.copy(deep=False)
         self._validate_data()
         
         # 技術指標計算器初期化
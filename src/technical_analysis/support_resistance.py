@@ -63,7 +63,8 @@ class SupportResistanceDetector:
             tolerance_percent: 価格レベル認定の許容誤差（%）
             lookback_period: 分析対象期間
         """
-        self.data = data.copy()
+        # 浅いコピー（BarArrays.to_frame参照）
+        self.data = data.copy(deep=False)
         self.min_touches = min_touches
         self.tolerance_percent = tolerance_percent / 100
         self.lookback_period = lookback_period
@@ -92,8 +93,11 @@ class SupportResistanceDetector:
         if not pd.api.types.is_datetime64_any_dtype(self.data['timestamp']):
             self.data['timestamp'] = pd.to_datetime(self.data['timestamp'])
         
-        # 時系列ソート
-        self.data = self.data.sort_values('timestamp').reset_index(drop=True)
+        # 時系列ソート（整列済みのデータは複製しない）
+        if not self.data['timestamp'].is_monotonic_increasing:
+            self.data = self.data.sort_values('timestamp')
+        if not self.data.index.equals(pd.RangeIndex(len(self.data))):
+            self.data = self.data.reset_index(drop=True)
         
         # 時間帯情報を追加
         self.data['hour'] = self.data['timestamp'].dt.hour
@@ -11,11 +11,29 @@ class DataValidator:
     データ品質チェック、異常値検出、欠損値処理
     """
     
+    # 異常値・ギャップの検出結果のカラム
+    ANOMALY_COLUMNS = {
+        "price_anomalies": ["timestamp", "change_rate", "price"],
+        "volume_anomalies": ["timestamp", "volume", "ratio_to_mean"],
+        "ohlc_inconsistencies": ["timestamp", "open", "high", "low", "close"],
+    }
+    GAP_COLUMNS = ["start_time", "end_time", "gap_duration", "expected_duration"]
+
+    # 取り込み時に拒否するバーの理由コード
+    REJECT_REASONS = {
+        "missing_price": "価格の欠損",
+        "non_positive_price": "0以下の価格",
+        "negative_volume": "負の出来高",
+        "ohlc_inconsistent": "高値・安値と始値・終値の不整合",
+        "price_jump": "直前の終値からの過大な乖離",
+    }
+
     def __init__(self):
         # 異常値検出の閾値
         self.price_change_threshold = 0.2  # 20%以上の価格変動
         self.volume_spike_threshold = 5.0  # 通常の5倍以上の出来高
         self.zero_volume_tolerance = 0.05  # 5%までのゼロ出来高は許容
+        self.max_price_jump = 0.5  # 取り込み時に参照終値から50%超乖離したバーは拒否（0で無効）
     
     def validate_dataframe(self, df: pd.DataFrame, symbol: str = "") -> Dict[str, Any]:
         """
@@ -45,11 +63,14 @@ class DataValidator:
                 "symbol": symbol
             }
         
+        # 時系列順への並べ替えは1回だけ行い、統計・異常値検出で共有する
+        ordered = self._sort_by_timestamp(df)
+
         # 基本統計
-        stats = self._calculate_basic_stats(df)
+        stats = self._calculate_basic_stats(ordered, presorted=True)
         
         # 異常値検出
-        anomalies = self._detect_anomalies(df)
+        anomalies = self._detect_anomalies(ordered, presorted=True)
         
         # データ品質チェック
         quality_issues = self._check_data_quality(df)
@@ -74,7 +95,8 @@ class DataValidator:
         
         return result
     
-    def _calculate_basic_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_basic_stats(self, df: pd.DataFrame,
+                               presorted: bool = False) -> Dict[str, Any]:
         """基本統計の計算"""
         try:
             price_cols = ['open', 'high', 'low', 'close']
@@ -94,7 +116,7 @@ class DataValidator:
                 "missing_data": {
                     col: df[col].isna().sum() for col in df.columns
                 },
-                "data_gaps": self._detect_time_gaps(df)
+                "data_gaps": self._detect_time_gaps(df, presorted=presorted)
             }
             
             return stats
@@ -103,63 +125,139 @@ class DataValidator:
             logger.error(f"統計計算エラー: {e}")
             return {}
     
-    def _detect_anomalies(self, df: pd.DataFrame) -> Dict[str, List]:
-        """異常値検出"""
+    @staticmethod
+    def _sort_by_timestamp(df: pd.DataFrame) -> pd.DataFrame:
+        """時系列順に並べたDataFrame（昇順の場合はコピーせずそのまま返す）"""
+        try:
+            if df['timestamp'].is_monotonic_increasing:
+                return df
+            return df.sort_values('timestamp', kind='stable')
+        except Exception:
+            # 比較できない値が混在する場合は元の順序で検査する
+            return df
+
+    @staticmethod
+    def _empty_result(columns: List[str]) -> pd.DataFrame:
+        return pd.DataFrame({col: pd.Series(dtype='float64') for col in columns})
+
+    def _detect_anomalies(self, df: pd.DataFrame,
+                          presorted: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        異常値検出
+
+        Args:
+            df: 株価データのDataFrame
+            presorted: 時系列順に並べ済みか（Falseの場合は価格変動の計算前に並べ替える）
+
+        Returns:
+            種類ごとの異常値（1行1件のDataFrame、カラムはANOMALY_COLUMNS）
+        """
         anomalies = {
-            "price_anomalies": [],
-            "volume_anomalies": [],
-            "ohlc_inconsistencies": []
+            kind: self._empty_result(columns)
+            for kind, columns in self.ANOMALY_COLUMNS.items()
         }
         
         try:
-            # 価格変動の異常検出
-            df_temp = df.copy()  # 元のDataFrameを変更しないようにコピー
-            df_temp['price_change'] = df_temp['close'].pct_change(fill_method=None)
-            # FutureWarning を避けるため、explicit に float64 を指定
-            df_temp['price_change'] = df_temp['price_change'].astype('float64')
-            extreme_changes = df_temp[abs(df_temp['price_change']) > self.price_change_threshold]
-            
-            for idx, row in extreme_changes.iterrows():
-                anomalies["price_anomalies"].append({
-                    "timestamp": row['timestamp'],
-                    "change_rate": float(row['price_change']),  # numpy型を明示的にfloatに変換
-                    "price": float(row['close'])
-                })
+            data = df if presorted else self._sort_by_timestamp(df)
+            close = data['close'].to_numpy(dtype='float64', na_value=np.nan)
+
+            # 価格変動の異常検出（直前の終値からの変化率）
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = close[1:] / close[:-1] - 1
+            positions = np.flatnonzero(np.abs(change) > self.price_change_threshold) + 1
+            anomalies["price_anomalies"] = pd.DataFrame({
+                "timestamp": data['timestamp'].iloc[positions].reset_index(drop=True),
+                "change_rate": change[positions - 1],
+                "price": close[positions]
+            })
             
             # 出来高の異常検出
-            volume_mean = df['volume'].mean()
-            volume_spikes = df[df['volume'] > volume_mean * self.volume_spike_threshold]
-            
-            for idx, row in volume_spikes.iterrows():
-                anomalies["volume_anomalies"].append({
-                    "timestamp": row['timestamp'],
-                    "volume": row['volume'],
-                    "ratio_to_mean": row['volume'] / volume_mean
-                })
+            volume = data['volume'].to_numpy(dtype='float64', na_value=np.nan)
+            volume_mean = np.nanmean(volume) if len(volume) else np.nan
+            with np.errstate(invalid='ignore'):
+                threshold = volume_mean * self.volume_spike_threshold
+                positions = np.flatnonzero(volume > threshold)
+            anomalies["volume_anomalies"] = pd.DataFrame({
+                "timestamp": data['timestamp'].iloc[positions].reset_index(drop=True),
+                "volume": volume[positions],
+                "ratio_to_mean": volume[positions] / volume_mean
+            })
             
             # OHLC整合性チェック
-            ohlc_issues = df[
-                (df['high'] < df['low']) |
-                (df['high'] < df['open']) |
-                (df['high'] < df['close']) |
-                (df['low'] > df['open']) |
-                (df['low'] > df['close'])
-            ]
-            
-            for idx, row in ohlc_issues.iterrows():
-                anomalies["ohlc_inconsistencies"].append({
-                    "timestamp": row['timestamp'],
-                    "open": row['open'],
-                    "high": row['high'],
-                    "low": row['low'],
-                    "close": row['close']
-                })
+            open_, high, low = (
+                data[col].to_numpy(dtype='float64', na_value=np.nan)
+                for col in ['open', 'high', 'low']
+            )
+            inconsistent = (
+                (high < low) | (high < open_) | (high < close)
+                | (low > open_) | (low > close)
+            )
+            positions = np.flatnonzero(inconsistent)
+            anomalies["ohlc_inconsistencies"] = pd.DataFrame({
+                "timestamp": data['timestamp'].iloc[positions].reset_index(drop=True),
+                "open": open_[positions],
+                "high": high[positions],
+                "low": low[positions],
+                "close": close[positions]
+            })
                 
         except Exception as e:
             logger.error(f"異常値検出エラー: {e}")
         
         return anomalies
     
+    def bar_rejection_reasons(
+        self,
+        df: pd.DataFrame,
+        reference_close: Optional[np.ndarray] = None
+    ) -> pd.Series:
+        """
+        バーごとの拒否理由（取り込み時の検証）
+
+        Args:
+            df: 株価データのDataFrame
+            reference_close: バーごとの比較基準の終値（直前のバーの終値など、NaNは比較しない）
+
+        Returns:
+            dfと同じインデックスの理由コード（REJECT_REASONSのキーをカンマ区切り、問題なしは空文字）
+        """
+        price_cols = ['open', 'high', 'low', 'close']
+        prices = {
+            col: df[col].to_numpy(dtype='float64', na_value=np.nan)
+            for col in price_cols
+        }
+        volume = df['volume'].to_numpy(dtype='float64', na_value=np.nan)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            checks = {
+                "missing_price": np.logical_or.reduce(
+                    [np.isnan(prices[col]) for col in price_cols]
+                ),
+                "non_positive_price": np.logical_or.reduce(
+                    [prices[col] <= 0 for col in price_cols]
+                ),
+                "negative_volume": volume < 0,
+                "ohlc_inconsistent": (
+                    (prices['high'] < prices['low']) |
+                    (prices['high'] < prices['open']) |
+                    (prices['high'] < prices['close']) |
+                    (prices['low'] > prices['open']) |
+                    (prices['low'] > prices['close'])
+                ),
+            }
+            if reference_close is not None and self.max_price_jump > 0:
+                reference = np.asarray(reference_close, dtype='float64')
+                change = np.abs(prices['close'] / reference - 1)
+                checks["price_jump"] = change > self.max_price_jump
+
+        reasons = np.full(len(df), "", dtype=object)
+        for code, mask in checks.items():
+            if mask.any():
+                reasons[mask] = np.where(
+                    reasons[mask] == "", code, reasons[mask] + "," + code
+                )
+        return pd.Series(reasons, index=df.index, dtype=object)
+
     def _check_data_quality(self, df: pd.DataFrame) -> Dict[str, List]:
         """データ品質チェック"""
         issues = {
@@ -205,34 +303,43 @@ class DataValidator:
         
         return issues
     
-    def _detect_time_gaps(self, df: pd.DataFrame) -> List[Dict]:
-        """時系列データのギャップ検出"""
-        gaps = []
+    def _detect_time_gaps(self, df: pd.DataFrame,
+                          presorted: bool = False) -> pd.DataFrame:
+        """
+        時系列データのギャップ検出
+
+        Args:
+            df: 株価データのDataFrame
+            presorted: 時系列順に並べ済みか
+
+        Returns:
+            通常の間隔（最頻値）の2倍を超えるギャップ（1行1件のDataFrame、カラムはGAP_COLUMNS）
+        """
+        gaps = self._empty_result(self.GAP_COLUMNS)
         
         try:
             if len(df) < 2:
                 return gaps
             
-            # 時間差を計算
-            df_sorted = df.sort_values('timestamp')
-            time_diffs = df_sorted['timestamp'].diff()
+            ordered = df if presorted else self._sort_by_timestamp(df)
+            timestamps = ordered['timestamp'].reset_index(drop=True)
+            time_diffs = timestamps.diff()
             
             # 通常の間隔を推定（最頻値）
             mode_diff = time_diffs.mode()
             if len(mode_diff) > 0:
                 expected_interval = mode_diff.iloc[0]
                 
-                # 期待値の2倍以上のギャップを検出
-                large_gaps = time_diffs[time_diffs > expected_interval * 2]
-                
-                for idx, gap in large_gaps.items():
-                    if idx > 0:  # 最初の行はNaNなのでスキップ
-                        gaps.append({
-                            "start_time": df_sorted.iloc[idx-1]['timestamp'],
-                            "end_time": df_sorted.iloc[idx]['timestamp'],
-                            "gap_duration": gap,
-                            "expected_duration": expected_interval
-                        })
+                # 期待値の2倍以上のギャップを検出（最初の行の差分はNaNのため対象外）
+                large_gaps = (time_diffs > expected_interval * 2).to_numpy()
+                gaps = pd.DataFrame({
+                    "start_time": (
+                        timestamps.shift(1)[large_gaps].reset_index(drop=True)
+                    ),
+                    "end_time": timestamps[large_gaps].reset_index(drop=True),
+                    "gap_duration": time_diffs[large_gaps].reset_index(drop=True),
+                    "expected_duration": expected_interval
+                })
                         
         except Exception as e:
             logger.error(f"時間ギャップ検出エラー: {e}")
@@ -0,0 +1,118 @@
+"""
+同一リクエストの重複実行抑止（シングルフライト）
+同じキーの処理が実行中の場合は新たに実行せず、実行中の処理の結果を待って共有する
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+from loguru import logger
+
+
+class _Call:
+    """実行中の処理（完了時に結果または例外を保持）"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    キー単位で同時実行を1つにまとめるクラス
+    最初の呼び出し（リーダー）のみ処理を実行し、完了までに同じキーで呼び出したスレッドは
+    その結果（例外の場合は同じ例外）を受け取る。完了後の呼び出しは新たに実行される。
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._counters = {'executed': 0, 'shared': 0, 'errors': 0}
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., Any],
+        *args,
+        **kwargs
+    ) -> Tuple[Any, bool]:
+        """
+        処理を実行（同じキーの処理が実行中なら完了を待って結果を共有）
+
+        Args:
+            key: 重複判定キー
+            fn: 実行する処理
+            *args: fnの位置引数
+            **kwargs: fnのキーワード引数
+
+        Returns:
+            (処理結果, 結果を他の呼び出しと共有したか)
+            待機した呼び出しに加え、待機者がいたリーダーもTrue（結果を変更する場合は複製すること）
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._counters['shared'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._counters['executed'] += 1
+                leader = True
+
+        if not leader:
+            logger.debug(f"実行中の同一リクエストを待機: {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._counters['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                # 削除後は待機者が増えないため、ここで共有の有無が確定する
+                shared = call.waiters > 0
+            call.done.set()
+        return call.result, shared
+
+    def in_flight(self) -> int:
+        """実行中のキー数"""
+        with self._lock:
+            return len(self._calls)
+
+    def waiting(self, key: Hashable) -> int:
+        """指定キーの完了を待っている呼び出し数"""
+        with self._lock:
+            call = self._calls.get(key)
+            return call.waiters if call is not None else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        統計情報
+
+        Returns:
+            実行中のキー数と累計カウンタ（実行・共有・例外）
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            in_flight = len(self._calls)
+
+        requests = counters['executed'] + counters['shared']
+        return {
+            'in_flight': in_flight,
+            **counters,
+            'shared_ratio': counters['shared'] / requests if requests else 0.0,
+        }
+
+
+# アプリケーション全体で共有するインスタンス（同じキャッシュを使う複数のコレクター間でも重複を抑止）
+single_flight = SingleFlight()
@@ -0,0 +1,227 @@
+"""
+SQLite接続プール
+DBファイルごと・スレッドごとに接続を保持し、ファイルオープンとPRAGMA適用を初回のみにする
+"""
+
+from typing import Any, Dict, Optional, Tuple, Union
+from pathlib import Path
+import os
+import sqlite3
+import threading
+import weakref
+from loguru import logger
+
+from ..config.settings import settings_manager
+
+
+# ファイル同一性の判定キー: (デバイス, inode)
+FileIdentity = Tuple[int, int]
+
+# DBパスをキーとした、1スレッドが保持する接続と開いた時点のファイル同一性
+ConnectionMap = Dict[str, Tuple[sqlite3.Connection, Optional[FileIdentity]]]
+
+MEMORY_DATABASE = ":memory:"
+
+
+class _ThreadConnections:
+    """1スレッドが保持する接続（スレッド終了時にまとめて閉じる）"""
+
+    def __init__(self):
+        self.connections: ConnectionMap = {}
+
+
+class SQLiteConnectionManager:
+    """
+    スレッドローカルなSQLite接続プール
+    接続はスレッド間で共有せず、同じスレッドから同じDBファイルへの要求には同一接続を返す。
+    DBファイルが削除・置き換えられた場合は次回要求時に接続し直す。
+
+    返す接続はコンテキストマネージャとして使える（with文はコミット/ロールバックのみで接続は閉じない）。
+    row_factoryなど接続の状態を変更した場合は呼び出し側で元に戻すこと。
+    """
+
+    # 新規接続ごとに適用するPRAGMA
+    DEFAULT_PRAGMAS = {
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": -16000,  # 約16MB（負値はKiB指定）
+        "mmap_size": 256 * 1024 * 1024,
+    }
+
+    def __init__(
+        self,
+        pragmas: Optional[Dict[str, Any]] = None,
+        journal_mode: Optional[str] = "WAL",
+        timeout: float = 30.0
+    ):
+        """
+        初期化
+
+        Args:
+            pragmas: DEFAULT_PRAGMASを上書きするPRAGMA
+            journal_mode: ジャーナルモード（Noneの場合は変更しない）
+            timeout: ロック待ちタイムアウト秒数
+        """
+        self.pragmas = {**self.DEFAULT_PRAGMAS, **(pragmas or {})}
+        self.journal_mode = journal_mode
+        self.timeout = timeout
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._holders: "weakref.WeakSet[_ThreadConnections]" = weakref.WeakSet()
+        self._counters = {'opened': 0, 'reused': 0, 'reopened': 0, 'closed': 0}
+
+    @staticmethod
+    def _key(db_path: Union[str, Path]) -> str:
+        """プールのキー（絶対パス）"""
+        if str(db_path) == MEMORY_DATABASE:
+            return MEMORY_DATABASE
+        return str(Path(db_path).resolve())
+
+    @staticmethod
+    def _file_identity(key: str) -> Optional[FileIdentity]:
+        """DBファイルの同一性（存在しない場合はNone）"""
+        if key == MEMORY_DATABASE:
+            return None
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _thread_connections(self) -> _ThreadConnections:
+        """現在のスレッドの接続保持オブジェクト"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = _ThreadConnections()
+            self._local.holder = holder
+            with self._lock:
+                self._holders.add(holder)
+            # スレッド終了でthreading.localが破棄された時点で接続を閉じる
+            weakref.finalize(holder, self._close_connections, holder.connections)
+        return holder
+
+    def _close_connections(self, connections: ConnectionMap):
+        """接続をまとめて閉じる"""
+        closed = 0
+        for conn, _ in list(connections.values()):
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"SQLite接続のクローズに失敗: {e}")
+            closed += 1
+        connections.clear()
+        if closed:
+            self._count('closed', closed)
+
+    def _open(self, key: str) -> sqlite3.Connection:
+        """新規接続を作成しジャーナルモード・PRAGMAを適用"""
+        conn = sqlite3.connect(key, timeout=self.timeout, check_same_thread=False)
+        try:
+            if self.journal_mode and key != MEMORY_DATABASE:
+                # WALはDBファイルに永続化されるため、異なる場合のみ変更
+                current = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                if current.lower() != self.journal_mode.lower():
+                    conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name}={value}")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def connection(self, db_path: Union[str, Path]) -> sqlite3.Connection:
+        """
+        現在のスレッド用の接続を取得
+
+        Args:
+            db_path: DBファイルパス
+
+        Returns:
+            プールされたSQLite接続
+        """
+        key = self._key(db_path)
+        connections = self._thread_connections().connections
+        identity = self._file_identity(key)
+
+        entry = connections.get(key)
+        if entry is not None:
+            conn, opened_identity = entry
+            same_file = identity is not None and identity == opened_identity
+            if key == MEMORY_DATABASE or same_file:
+                self._count('reused')
+                return conn
+
+            # ファイルが削除・置換されたため古い接続は破棄
+            del connections[key]
+            self._close_connections({key: entry})
+            self._count('reopened')
+
+        conn = self._open(key)
+        connections[key] = (conn, self._file_identity(key))
+        self._count('opened')
+        return conn
+
+    def close(self, db_path: Union[str, Path]):
+        """指定DBファイルへの全スレッドの接続を閉じる（ファイル削除・置換の前に使用）"""
+        key = self._key(db_path)
+        with self._lock:
+            holders = list(self._holders)
+        for holder in holders:
+            entry = holder.connections.pop(key, None)
+            if entry is not None:
+                self._close_connections({key: entry})
+
+    def close_all(self):
+        """全スレッドの全接続を閉じる"""
+        with self._lock:
+            holders = list(self._holders)
+        for holder in holders:
+            self._close_connections(holder.connections)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        プール統計
+
+        Returns:
+            オープン中の接続数・DBファイル数・スレッド数と累計カウンタ
+        """
+        with self._lock:
+            holders = list(self._holders)
+            counters = dict(self._counters)
+
+        databases = set()
+        open_connections = 0
+        threads = 0
+        for holder in holders:
+            keys = list(holder.connections)
+            if keys:
+                threads += 1
+            open_connections += len(keys)
+            databases.update(keys)
+
+        requests = counters['opened'] + counters['reused']
+        return {
+            'open_connections': open_connections,
+            'databases': len(databases),
+            'threads': threads,
+            **counters,
+            'reuse_ratio': counters['reused'] / requests if requests else 0.0,
+        }
+
+
+def _create_default_manager() -> SQLiteConnectionManager:
+    """設定（DatabaseConfig）に従った既定のプールを作成"""
+    database = settings_manager.settings.database
+    return SQLiteConnectionManager(pragmas={
+        "cache_size": -int(database.cache_size_kb),
+        "mmap_size": int(database.mmap_size_mb) * 1024 * 1024,
+    })
+
+
+# アプリケーション全体で共有する接続プール
+connection_manager = _create_default_manager()
@@ -12,6 +12,8 @@ import sys
 # プロジェクトルートをパスに追加
 sys.path.append(str(Path(__file__).parent.parent))
 
+from src.config.settings import settings_manager
+
 
 @pytest.fixture(scope="session")
 def test_data_dir():
@@ -19,6 +21,23 @@ def test_data_dir():
     return Path(__file__).parent / "data"
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """
+    キャッシュディレクトリ（株価・レート制限・ファンダメンタルズのDB）と
+    バックアップディレクトリをテストごとの一時ディレクトリに分離
+    """
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(
+        settings_manager.settings.data_collector, 'cache_dir', str(cache_dir)
+    )
+    monkeypatch.setattr(
+        settings_manager.settings.database, 'backup_dir', str(cache_dir / "backups")
+    )
+    return cache_dir
+
+
 @pytest.fixture
 def temp_workspace(tmp_path):
     """一時的な作業ディレクトリを提供"""
@@ -0,0 +1,78 @@
+"""
+テスト共通のデータ生成ヘルパー
+"""
+
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+def make_bars(
+    symbol: str = "7203.T",
+    periods: int = 120,
+    start: Union[str, pd.Timestamp] = "2024-01-04 09:00",
+    *,
+    close: Optional[Sequence[float]] = None,
+    days: Optional[int] = None,
+    interval: str = "1m",
+    tz: Optional[str] = "Asia/Tokyo",
+    seed: Optional[int] = None,
+    volume: int = 100,
+    created_at: Any = None
+) -> pd.DataFrame:
+    """
+    キャッシュの保存・読み込みと同じ形式の1分足テストデータ
+
+    Args:
+        symbol: 銘柄コード
+        periods: 本数（days指定時は1日あたりの本数）
+        start: 開始日時（タイムゾーンなしはtzで解釈）
+        close: 終値（指定時は本数もこれに従う）
+        days: 指定時はstartの時刻から毎日periods本ずつ作成
+        interval: データ間隔
+        tz: タイムゾーン（Noneでタイムゾーンなし）
+        seed: 指定時は終値を乱数のランダムウォーク、出来高を乱数にする（省略時は1000から1ずつ増加）
+        volume: 出来高（seed省略時）
+        created_at: 取得日時（省略時は列なし）
+    """
+    start = pd.Timestamp(start)
+    if start.tzinfo is None and tz is not None:
+        start = start.tz_localize(tz)
+
+    if days is not None:
+        timestamps = pd.DatetimeIndex([
+            timestamp
+            for day in range(days)
+            for timestamp in pd.date_range(
+                start + pd.Timedelta(days=day), periods=periods, freq="1min"
+            )
+        ])
+    else:
+        count = periods if close is None else len(close)
+        timestamps = pd.date_range(start, periods=count, freq="1min")
+
+    rng = np.random.default_rng(seed)
+    if close is not None:
+        close = np.asarray(close, dtype=float)
+    elif seed is not None:
+        close = np.round(1000 + np.cumsum(rng.normal(0, 1, len(timestamps))), 1)
+    else:
+        close = 1000 + np.arange(len(timestamps), dtype=float)
+
+    data = pd.DataFrame({
+        'symbol': symbol,
+        'interval': interval,
+        'timestamp': timestamps,
+        'open': close,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': (
+            rng.integers(100, 10000, len(timestamps)) if seed is not None
+            else np.full(len(timestamps), volume, dtype=np.int64)
+        ),
+    })
+    if created_at is not None:
+        data['created_at'] = created_at
+    return data
@@ -0,0 +1,160 @@
+"""
+asyncio版株価データ取得クラス（AsyncStockDataCollector）のテスト
+"""
+
+import asyncio
+import pytest
+import tempfile
+import shutil
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.data_collector.async_collector import AsyncStockDataCollector
+from src.data_collector.stock_data_collector import StockDataCollector
+
+
+def _create_frame(symbol: str, rows: int = 5) -> pd.DataFrame:
+    """テスト用の正規化済み株価データ"""
+    timestamps = pd.date_range('2024-01-01 09:00', periods=rows, freq='1min')
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': [100.0 + i for i in range(rows)],
+        'high': [101.0 + i for i in range(rows)],
+        'low': [99.0 + i for i in range(rows)],
+        'close': [100.5 + i for i in range(rows)],
+        'volume': [1000 + i for i in range(rows)],
+        'symbol': symbol,
+        'interval': '1m',
+    })
+
+
+class TestAsyncStockDataCollector:
+    """AsyncStockDataCollectorのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(cache_dir=self.temp_dir)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _patch_fetch(self, fake_get_stock_data):
+        """同期版の取得処理を差し替え"""
+        return patch.object(
+            self.collector, 'get_stock_data', side_effect=fake_get_stock_data
+        )
+
+    def _async_collector(self, max_concurrency: int) -> AsyncStockDataCollector:
+        """並行度を指定した非同期版コレクター"""
+        return AsyncStockDataCollector(self.collector, max_concurrency=max_concurrency)
+
+    def test_invalid_concurrency(self):
+        """並行度0以下はエラーになること"""
+        with pytest.raises(ValueError):
+            AsyncStockDataCollector(self.collector, max_concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_get_multiple_stocks_bounded_concurrency(self):
+        """同時実行数がmax_concurrencyを超えないこと"""
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def fake_get_stock_data(symbol, *args):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+            return _create_frame(symbol)
+
+        symbols = [f"{1000 + i}.T" for i in range(12)]
+        with self._patch_fetch(fake_get_stock_data):
+            async with self._async_collector(3) as async_collector:
+                results = await async_collector.get_multiple_stocks(symbols)
+
+        assert set(results) == set(symbols)
+        assert state['peak'] <= 3
+
+    @pytest.mark.asyncio
+    async def test_failed_and_timed_out_symbols_are_skipped(self):
+        """取得失敗・タイムアウトの銘柄は結果から除外されること"""
+        def fake_get_stock_data(symbol, *args):
+            if symbol == "ERROR":
+                raise RuntimeError("取得失敗")
+            if symbol == "SLOW":
+                time.sleep(0.5)
+            if symbol == "EMPTY":
+                return None
+            return _create_frame(symbol)
+
+        with self._patch_fetch(fake_get_stock_data):
+            async with self._async_collector(4) as async_collector:
+                results = await async_collector.get_multiple_stocks(
+                    ["7203.T", "ERROR", "SLOW", "EMPTY"], timeout=0.2
+                )
+
+        assert list(results) == ["7203.T"]
+
+    @pytest.mark.asyncio
+    async def test_cancellation_cancels_pending_fetches(self):
+        """キャンセル時に未開始の取得は実行されないこと"""
+        started = []
+
+        def fake_get_stock_data(symbol, *args):
+            started.append(symbol)
+            time.sleep(0.1)
+            return _create_frame(symbol)
+
+        symbols = [f"{2000 + i}.T" for i in range(10)]
+        with self._patch_fetch(fake_get_stock_data):
+            async with self._async_collector(2) as async_collector:
+                task = asyncio.create_task(async_collector.get_multiple_stocks(symbols))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                await asyncio.sleep(0.2)
+
+        assert len(started) <= 4
+
+    @pytest.mark.asyncio
+    async def test_iter_stocks_yields_as_completed(self):
+        """完了した銘柄から順に返すこと"""
+        delays = {"SLOW": 0.2, "FAST": 0.0}
+
+        def fake_get_stock_data(symbol, *args):
+            time.sleep(delays[symbol])
+            return _create_frame(symbol)
+
+        with self._patch_fetch(fake_get_stock_data):
+            async with self._async_collector(2) as async_collector:
+                stocks = async_collector.iter_stocks(["SLOW", "FAST"])
+                order = [symbol async for symbol, _ in stocks]
+
+        assert order == ["FAST", "SLOW"]
+
+    @pytest.mark.asyncio
+    async def test_async_cache_roundtrip(self):
+        """非同期でキャッシュの保存・読み込みができること"""
+        async with AsyncStockDataCollector(self.collector) as async_collector:
+            saved = await async_collector.save_frames([_create_frame("7203.T")])
+            loaded = await async_collector.load_from_cache("7203.T", "1m")
+
+        assert saved == 5
+        assert len(loaded) == 5
+        assert loaded['close'].tolist() == [100.5, 101.5, 102.5, 103.5, 104.5]
+
+    @pytest.mark.asyncio
+    async def test_get_stock_data_uses_sync_fetch_path(self):
+        """取得はStockDataCollectorのリトライ・レート制限付き経路を通ること"""
+        with patch.object(self.collector, '_fetch_data_yfinance',
+                          return_value=_create_frame("7203.T")) as mock_fetch:
+            async with AsyncStockDataCollector(self.collector) as async_collector:
+                data = await async_collector.get_stock_data("7203.T", use_cache=False)
+
+        mock_fetch.assert_called_once_with("7203.T", "1m", "1d")
+        assert len(data) == 5
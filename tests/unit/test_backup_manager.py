@@ -454,4 +454,145 @@ class TestBackupManager:
         assert backup_info.backup_type == "manual"
         assert backup_info.file_size == 1024
         assert not backup_info.is_compressed
-        assert backup_info.original_db_path == "/path/to/original.db"
\ No newline at end of file
+        assert backup_info.original_db_path == "/path/to/original.db"
+
+
+class TestIncrementalBackup:
+    """ページ単位の差分バックアップのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "watchlist.db")
+        self.config = BackupConfig(
+            backup_dir=os.path.join(self.temp_dir, "backups"),
+            backup_retention_count=3,
+            incremental=True
+        )
+        self.backup_manager = BackupManager(self.config)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT)")
+            conn.executemany(
+                "INSERT INTO items (payload) VALUES (?)",
+                [(f"row-{i}-" + "x" * 200,) for i in range(2000)]
+            )
+
+    def teardown_method(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _rows(self, db_path=None):
+        with sqlite3.connect(db_path or self.db_path) as conn:
+            return conn.execute("SELECT id, payload FROM items ORDER BY id").fetchall()
+
+    def _snapshot(self):
+        backup_path = self.backup_manager.create_backup(
+            self.db_path, "before_operation"
+        )
+        store = self.backup_manager._page_store()
+        return backup_path, store.list_snapshots()[-1]
+
+    def test_second_snapshot_adds_changed_pages_only(self):
+        """2回目以降は変更されたページのみストアに追加すること"""
+        first_path, first = self._snapshot()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE items SET payload = 'changed' WHERE id = 1")
+        _, second = self._snapshot()
+
+        assert first_path.endswith("page_store.db#1")
+        assert first['bytes_added'] >= first['page_count'] * first['page_size'] // 2
+        assert 0 < second['bytes_added'] <= 4 * second['page_size'] + 64 * 1024
+
+        _, third = self._snapshot()
+        assert third['bytes_added'] == 0
+
+    def test_restore_round_trip(self):
+        """スナップショットから元のデータベースを復元できること"""
+        backup_path, _ = self._snapshot()
+        expected = self._rows()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM items WHERE id > 10")
+
+        assert self.backup_manager.restore_backup(backup_path, self.db_path)
+        assert self._rows() == expected
+        with sqlite3.connect(self.db_path) as conn:
+            assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+
+    def test_restore_to_time(self):
+        """指定時点以前で最新のスナップショットを復元すること"""
+        self._snapshot()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM items WHERE id > 100")
+        self._snapshot()
+        middle = datetime.now()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM items")
+        self._snapshot()
+
+        target = os.path.join(self.temp_dir, "restored.db")
+        assert self.backup_manager.restore_to_time(self.db_path, middle, target)
+        assert len(self._rows(target)) == 100
+        assert not self.backup_manager.restore_to_time(
+            self.db_path, middle - timedelta(days=1), target
+        )
+
+    def test_cleanup_releases_unreferenced_pages(self):
+        """保持数を超えたスナップショットを削除し、参照されないページを解放すること"""
+        for i in range(5):
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("UPDATE items SET payload = ? WHERE id = 1", (f"v{i}",))
+            self._snapshot()
+        store = self.backup_manager._page_store()
+        count_sql = "SELECT COUNT(*) FROM objects"
+        objects_before = store._connect().execute(count_sql).fetchone()[0]
+
+        assert self.backup_manager.cleanup_old_backups("watchlist") == 2
+
+        backups = self.backup_manager.list_backups("watchlist")
+        assert [b.snapshot_id for b in backups] == [5, 4, 3]
+        assert store._connect().execute(count_sql).fetchone()[0] < objects_before
+        assert self.backup_manager.restore_backup(backups[-1].file_path, self.db_path)
+        assert self._rows()[0][1] == "v2"
+
+    def test_cleanup_removes_snapshots_missing_from_metadata(self):
+        """メタデータに記録されていないスナップショットもストアの一覧から削除すること"""
+        for i in range(5):
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("UPDATE items SET payload = ? WHERE id = 1", (f"v{i}",))
+            self._snapshot()
+        # 別プロセスがメタデータを上書きして記録が失われた状態
+        os.remove(os.path.join(self.config.backup_dir, "backup_metadata.json"))
+
+        assert self.backup_manager.cleanup_old_backups("watchlist") == 2
+
+        store = self.backup_manager._page_store()
+        assert [s['snapshot_id'] for s in store.list_snapshots()] == [3, 4, 5]
+
+    def test_wal_database(self):
+        """WALモードのデータベースは書き戻し前の更新も含めて保存すること"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("UPDATE items SET payload = 'in-wal' WHERE id = 2")
+        conn.commit()
+
+        backup_path, _ = self._snapshot()
+        conn.close()
+
+        target = os.path.join(self.temp_dir, "restored.db")
+        assert self.backup_manager.restore_backup(backup_path, target)
+        assert self._rows(target)[1][1] == "in-wal"
+
+    def test_compressed_pages(self):
+        """圧縮を有効にした場合もページを復元できること"""
+        self.backup_manager = BackupManager(BackupConfig(
+            backup_dir=os.path.join(self.temp_dir, "compressed"),
+            backup_compression_enabled=True,
+            incremental=True
+        ))
+        backup_path, snapshot = self._snapshot()
+        expected = self._rows()
+
+        target = os.path.join(self.temp_dir, "restored.db")
+        full_size = snapshot['page_count'] * snapshot['page_size']
+        assert snapshot['bytes_added'] < full_size / 2
+        assert self.backup_manager.restore_backup(backup_path, target)
+        assert self._rows(target) == expected
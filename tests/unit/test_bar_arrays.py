@@ -0,0 +1,129 @@
+"""
+メモリマップ型バー配列（BarArrayStore / BarArrays）のテスト
+"""
+
+import tempfile
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_collector.bar_arrays import BarArrayStore
+from src.data_collector.frame_cache import FrameCache
+from src.data_collector.stock_data_collector import StockDataCollector
+from src.technical_analysis.indicators import TechnicalIndicators
+from src.technical_analysis.support_resistance import SupportResistanceDetector
+from tests.helpers import make_bars
+
+
+class TestBarArrayStore:
+    """BarArrayStoreのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = BarArrayStore(Path(self.temp_dir) / "arrays")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """書き出したバーを同じ値・時刻で読み込めること"""
+        data = make_bars(seed=0)
+        self.store.write("7203.T", "1m", data)
+
+        bars = self.store.open("7203.T", "1m")
+
+        assert len(bars) == 120
+        assert bars.tz == "Asia/Tokyo"
+        np.testing.assert_array_equal(bars.close, data['close'].to_numpy())
+        np.testing.assert_array_equal(bars.volume, data['volume'].to_numpy(dtype=float))
+        assert bars.timestamps.equals(pd.DatetimeIndex(data['timestamp']))
+
+    def test_naive_timestamps(self):
+        """タイムゾーンなしの系列は壁時計時刻のまま保持すること"""
+        data = make_bars(seed=0, tz=None)
+        self.store.write("7203.T", "1m", data)
+
+        bars = self.store.open("7203.T", "1m")
+
+        assert bars.tz is None
+        assert bars.timestamps[0] == pd.Timestamp("2024-01-04 09:00")
+
+    def test_views_are_read_only(self):
+        """列はファイルを参照する読み取り専用ビューであること"""
+        self.store.write("7203.T", "1m", make_bars(seed=0))
+        bars = self.store.open("7203.T", "1m")
+
+        with pytest.raises(ValueError):
+            bars.close[0] = -1.0
+        assert np.shares_memory(bars.to_frame()['close'].to_numpy(), bars.values)
+
+    def test_rewrite_keeps_open_mapping(self):
+        """書き出し中・書き出し後も開いているビューは元の内容を参照すること"""
+        self.store.write("7203.T", "1m", make_bars(periods=60, seed=0))
+        old = self.store.open("7203.T", "1m")
+        first_close = float(old.close[0])
+
+        rewritten = make_bars(periods=120, seed=0).assign(close=0.0)
+        self.store.write("7203.T", "1m", rewritten)
+
+        assert len(old) == 60
+        assert old.close[0] == first_close
+        assert len(self.store.open("7203.T", "1m")) == 120
+
+    def test_missing_file(self):
+        """書き出していない系列はNoneを返すこと"""
+        assert self.store.open("AAPL", "1d") is None
+
+    def test_export_from_collector(self):
+        """コレクターのキャッシュを書き出せること"""
+        collector = StockDataCollector(
+            cache_dir=self.temp_dir, frame_cache=FrameCache(0)
+        )
+        collector.save_frames([make_bars(seed=0)])
+
+        assert self.store.export(collector, "7203.T", "1m") is not None
+        assert self.store.export(collector, "AAPL", "1m") is None
+        assert len(self.store.open("7203.T", "1m")) == 120
+
+
+class TestZeroCopyAnalysis:
+    """分析クラスがメモリマップされたバーを複製しないことのテスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = BarArrayStore(self.temp_dir)
+        self.data = make_bars(seed=0)
+        self.store.write("7203.T", "1m", self.data)
+        self.bars = self.store.open("7203.T", "1m")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_indicators_share_mapped_columns(self):
+        """指標計算は元データの列を参照し、通常のDataFrameと同じ結果を返すこと"""
+        indicators = TechnicalIndicators(self.bars.to_frame())
+
+        assert np.shares_memory(indicators.data['close'].to_numpy(), self.bars.values)
+        expected = TechnicalIndicators(self.data).sma(20)
+        np.testing.assert_allclose(indicators.sma(20).to_numpy(), expected.to_numpy())
+
+    def test_support_resistance_accepts_mapped_frame(self):
+        """サポレジ分析もメモリマップされたバーで実行できること"""
+        detector = SupportResistanceDetector(self.bars.to_frame(), lookback_period=20)
+
+        assert np.shares_memory(detector.data['close'].to_numpy(), self.bars.values)
+        assert detector.find_swing_highs_lows(window=3)['highs']
+
+    def test_caller_frame_not_modified(self):
+        """分析クラスは呼び出し元のDataFrameに列を追加しないこと"""
+        shuffled = self.data.iloc[::-1]
+        columns = list(shuffled.columns)
+
+        TechnicalIndicators(shuffled)
+        SupportResistanceDetector(shuffled)
+
+        assert list(shuffled.columns) == columns
+        assert shuffled['timestamp'].is_monotonic_decreasing
@@ -0,0 +1,163 @@
+"""
+日次圧縮バーブロック（bar_blocks）のテスト
+"""
+
+from functools import partial
+import tempfile
+import shutil
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from src.data_collector.bar_blocks import BLOCK_COLUMNS, decode_block, encode_block
+from src.data_collector.cache_policy import FixedTTLPolicy
+from src.data_collector.frame_cache import FrameCache
+from src.data_collector.stock_data_collector import StockDataCollector
+from tests.helpers import make_bars
+
+
+# 1日あたり300本の1分足（引数は日数）
+session_bars = partial(
+    make_bars, periods=300, seed=0, created_at=pd.Timestamp("2024-02-01 12:00")
+)
+
+
+class TestBlockCodec:
+    """ブロックの圧縮・展開のテストクラス"""
+
+    def test_round_trip(self):
+        """欠損値を含めて元の値に復元できること"""
+        rows = pd.DataFrame({
+            'ts': (
+                np.arange(5, dtype=np.int64) * 60_000_000_000
+                + 1_704_326_400_000_000_000
+            ),
+            'open': [100.0, np.nan, 101.5, 102.0, 99.5],
+            'high': [101.0, 102.0, 103.0, 104.0, 105.0],
+            'low': [99.0, 98.0, 97.0, 96.0, 95.0],
+            'close': [100.5, 101.0, 101.5, 102.0, 102.5],
+            'volume': [1000, None, 3000, 4000, 5000],
+            'created_at': [1_706_788_800_000_000_000] * 5,
+        }, columns=BLOCK_COLUMNS)
+
+        decoded = decode_block(encode_block(rows))
+
+        assert decoded['ts'].tolist() == rows['ts'].tolist()
+        assert np.isnan(decoded['open'].iloc[1])
+        assert np.isnan(decoded['volume'].iloc[1])
+        assert decoded['volume'].iloc[4] == 5000
+        assert decoded['created_at'].dtype == np.int64
+        assert decoded['created_at'].iloc[0] == 1_706_788_800_000_000_000
+
+    def test_regular_bars_compress(self):
+        """一定間隔の足は行形式より大幅に小さくなること"""
+        data = session_bars(days=1)
+        rows = pd.DataFrame({
+            'ts': data['timestamp'].astype('int64'),
+            'open': data['open'], 'high': data['high'],
+            'low': data['low'], 'close': data['close'],
+            'volume': data['volume'],
+            'created_at': data['created_at'].astype('int64'),
+        })
+
+        assert len(encode_block(rows)) < len(rows) * 8 * len(BLOCK_COLUMNS) / 4
+
+
+class TestCollectorColdStorage:
+    """StockDataCollectorとの統合テスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=FixedTTLPolicy(1),
+            frame_cache=FrameCache(0)
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _count(self, table: str) -> int:
+        with sqlite3.connect(self.collector.db_path) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_compaction_is_transparent(self):
+        """圧縮後も同じデータが読み込めること"""
+        self.collector.save_frames([session_bars(days=5)])
+        before = self.collector._read_cache("7203.T", "1m")
+
+        compacted = self.collector.compact_cache(older_than_days=30)
+
+        assert compacted == 1500
+        assert self._count("bars") == 0
+        assert self._count("bar_blocks") == 5
+        pd.testing.assert_frame_equal(
+            self.collector._read_cache("7203.T", "1m"), before
+        )
+
+    def test_range_read_spans_cold_and_hot(self):
+        """圧縮済みの日と未圧縮の日をまたぐ範囲を時刻順に読み込めること"""
+        self.collector.save_frames([session_bars(days=3)])
+        self.collector.compact_cache(older_than_days=30)
+        yesterday = pd.Timestamp.now(tz="Asia/Tokyo").normalize() - pd.Timedelta(days=1)
+        recent = session_bars(days=1, start=str(yesterday))
+        self.collector.save_frames([recent])
+
+        subset = self.collector._read_cache(
+            "7203.T", "1m",
+            start_time=pd.Timestamp("2024-01-05 13:00"),
+            end_time=pd.Timestamp("2024-01-06 09:09")
+        )
+        assert len(subset) == 60 + 10
+        assert subset['timestamp'].is_monotonic_increasing
+
+        full = self.collector._read_cache("7203.T", "1m")
+        assert len(full) == 1200
+        latest = self.collector.get_latest_timestamp("7203.T", "1m")
+        assert latest == recent['timestamp'].iloc[-1]
+
+    def test_late_write_overrides_block(self):
+        """圧縮済みの日への書き込みは読み込み・再圧縮で新しい値が優先されること"""
+        self.collector.save_frames([session_bars(days=2)])
+        self.collector.compact_cache(older_than_days=30)
+
+        update = session_bars(days=1).iloc[:1].assign(close=-1.0)
+        self.collector.save_frames([update])
+        assert self.collector._read_cache("7203.T", "1m")['close'].iloc[0] == -1.0
+
+        self.collector.compact_cache(older_than_days=30)
+        data = self.collector._read_cache("7203.T", "1m")
+        assert len(data) == 600
+        assert data['close'].iloc[0] == -1.0
+        assert self._count("bars") == 0
+
+    def test_latest_timestamp_from_blocks(self):
+        """全期間が圧縮済みでも最新バー時刻を返すこと"""
+        data = session_bars(days=2)
+        self.collector.save_frames([data])
+        self.collector.compact_cache(older_than_days=30)
+
+        latest = self.collector.get_latest_timestamp("7203.T", "1m")
+        assert latest == data['timestamp'].iloc[-1]
+
+    def test_clear_and_stats_include_blocks(self):
+        """統計・キャッシュクリアが圧縮済みのバーも対象にすること"""
+        self.collector.save_frames([session_bars(days=2)])
+        self.collector.compact_cache(older_than_days=30)
+
+        stats = self.collector.get_cache_stats()
+        assert stats['total_records'] == 600
+        assert stats['cold_records'] == 600
+        assert stats['unique_symbols'] == 1
+
+        self.collector.clear_cache("7203.T", older_than_days=1)
+
+        assert self._count("bar_blocks") == 0
+        assert self.collector._read_cache("7203.T", "1m") is None
+
+    def test_disabled(self):
+        """0日指定では圧縮しないこと"""
+        self.collector.save_frames([session_bars(days=2)])
+
+        assert self.collector.compact_cache(older_than_days=0) == 0
+        assert self._count("bar_blocks") == 0
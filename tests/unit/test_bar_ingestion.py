@@ -0,0 +1,264 @@
+"""
+取得データの保存前検証（BarIngestionStage）と隔離テーブルのテスト
+"""
+
+import tempfile
+import shutil
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from src.data_collector.bar_ingestion import BarIngestionStage, read_tail_close
+from src.data_collector.cache_policy import FixedTTLPolicy
+from src.data_collector.frame_cache import FrameCache
+from src.data_collector.stock_data_collector import StockDataCollector
+from src.utils.data_validator import DataValidator
+from tests.helpers import make_bars
+
+
+class TestBarRejectionReasons:
+    """DataValidator.bar_rejection_reasonsのテストクラス"""
+
+    def test_reason_codes(self):
+        """バーごとに該当する理由コードをすべて返すこと"""
+        data = make_bars(close=[1000, 1000, 1000, 1000, 1000])
+        data.loc[1, 'close'] = np.nan
+        data.loc[2, ['low', 'close']] = [-5.0, -5.0]
+        data.loc[3, 'volume'] = -1
+        data.loc[4, 'high'] = 900.0
+
+        reasons = DataValidator().bar_rejection_reasons(data)
+
+        assert reasons.tolist() == [
+            "", "missing_price", "non_positive_price", "negative_volume",
+            "ohlc_inconsistent"
+        ]
+
+    def test_price_jump_against_reference(self):
+        """参照終値からの乖離が閾値を超えたバーのみ拒否すること"""
+        validator = DataValidator()
+        data = make_bars(close=[1000, 1400, 1600])
+
+        reasons = validator.bar_rejection_reasons(data, np.array([np.nan, 1000, 1000]))
+
+        assert reasons.tolist() == ["", "", "price_jump"]
+        validator.max_price_jump = 0
+        reasons = validator.bar_rejection_reasons(data, np.array([np.nan, 1000, 1000]))
+        assert (reasons == "").all()
+
+
+class TestBarIngestionStage:
+    """BarIngestionStageのテストクラス"""
+
+    def test_clean_sorts_and_deduplicates(self):
+        """時系列順に並べ、重複したタイムスタンプは後の行を採用すること"""
+        data = make_bars(close=[1000, 1001, 1002])
+        data = pd.concat([
+            data.iloc[[2, 0, 1]], data.iloc[[1]].assign(close=1005.0, high=1006.0)
+        ])
+
+        result = BarIngestionStage().process(data)
+
+        assert result.duplicates == 1
+        assert result.accepted['timestamp'].is_monotonic_increasing
+        assert result.accepted['close'].tolist() == [1000, 1005, 1002]
+        assert result.rejected.empty
+
+    def test_spike_compared_with_tail(self):
+        """既存キャッシュの末尾と比較して外れたバーのみ隔離すること"""
+        stage = BarIngestionStage()
+        data = make_bars(close=[1002, 5000, 1003, 1004])
+
+        result = stage.process(data, tail_close=pd.Series([1000.0, 1001.0]))
+
+        assert result.accepted['close'].tolist() == [1002, 1003, 1004]
+        assert result.rejected['close'].tolist() == [5000]
+        assert result.rejected['reasons'].tolist() == ["price_jump"]
+
+    def test_first_bar_checked_against_tail(self):
+        """新しいバーの先頭も既存キャッシュの終値と比較すること"""
+        result = BarIngestionStage().process(
+            make_bars(close=[3000]), tail_close=pd.Series([1000.0])
+        )
+
+        assert len(result.rejected) == 1
+        assert result.rebase
+        result = BarIngestionStage().process(make_bars(close=[3000, 3001]))
+        assert len(result.accepted) == 2
+
+    def test_level_shift_confirmed_by_following_bars(self):
+        """後続のバーも同じ水準の乖離は外れ値ではなく水準の変化として受け入れること"""
+        stage = BarIngestionStage()
+        data = make_bars(close=[1000, 1001, 400, 401, 402])
+
+        result = stage.process(data, tail_close=pd.Series([1000.0, 1000.0]))
+
+        assert result.rejected.empty
+        assert not result.rebase
+        rejected = stage.process(make_bars(close=[1000, 1001, 400])).rejected
+        assert rejected['close'].tolist() == [400]
+
+    def test_rebase_only_when_batch_consistent(self):
+        """取得したバーがそろって末尾から乖離している場合のみ再取得が必要と判定すること"""
+        stage = BarIngestionStage()
+        tail = pd.Series([300.0] * 5)
+
+        assert stage.process(make_bars(close=[100, 101, 100]), tail_close=tail).rebase
+        assert not stage.process(
+            make_bars(close=[100, 300, 301]), tail_close=tail
+        ).rebase
+        assert not stage.process(make_bars(close=[301, 302]), tail_close=tail).rebase
+
+
+class TestCollectorIngestion:
+    """StockDataCollectorの保存前検証のテスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=FixedTTLPolicy(1),
+            frame_cache=FrameCache(0)
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _bad_fetch(self) -> pd.DataFrame:
+        data = make_bars(close=np.linspace(1000, 1010, 10))
+        data.loc[3, 'close'] = np.nan
+        data.loc[6, 'high'] = 900.0
+        return data
+
+    def test_rejected_bars_quarantined(self):
+        """不正なバーは返却・保存せず、理由コード付きで隔離すること"""
+        with patch.object(self.collector, '_fetch_data_yfinance',
+                          return_value=self._bad_fetch()):
+            data = self.collector.get_stock_data("7203.T", "1m", "1d")
+
+        assert len(data) == 8
+        assert len(self.collector._read_cache("7203.T", "1m")) == 8
+
+        quarantined = self.collector.get_quarantined_bars("7203.T")
+        assert quarantined['reasons'].tolist() == ["missing_price", "ohlc_inconsistent"]
+        expected = pd.Timestamp("2024-01-04 09:03", tz="Asia/Tokyo")
+        assert quarantined['timestamp'].iloc[0] == expected
+        assert self.collector.ingestion_stats == {
+            'rows': 10, 'accepted': 8, 'quarantined': 2, 'duplicates': 0
+        }
+
+    def test_incremental_fetch_uses_cached_tail(self):
+        """差分取得したバーは保存済みの直近の終値と比較すること"""
+        self.collector.save_frames([make_bars(close=[1000, 1001, 1002])])
+
+        accepted = self.collector._ingest(
+            make_bars(close=[2500, 1003], start="2024-01-04 09:03")
+        )
+
+        assert accepted['close'].tolist() == [1003]
+        quarantined = self.collector.get_quarantined_bars()
+        assert quarantined['reasons'].tolist() == ["price_jump"]
+
+    def test_compacted_tail_checked(self):
+        """圧縮ブロックへ移動済みの系列でも直近の終値と比較すること"""
+        self.collector.save_frames([make_bars(close=[1000, 1001, 1002])])
+        assert self.collector.compact_cache(older_than_days=1) == 3
+
+        accepted = self.collector._ingest(
+            make_bars(close=[2500, 1003], start="2024-01-04 09:03")
+        )
+
+        assert accepted['close'].tolist() == [1003]
+        quarantined = self.collector.get_quarantined_bars()
+        assert quarantined['reasons'].tolist() == ["price_jump"]
+
+    def test_tail_merges_blocks_and_bars(self):
+        """直近の終値は圧縮ブロックとbarsテーブルをまたいで時刻順に読むこと"""
+        self.collector.save_frames([make_bars(close=[1000, 1001, 1002])])
+        self.collector.compact_cache(older_than_days=1)
+        self.collector.save_frames([
+            make_bars(close=[1003, 1004], start="2024-01-05 09:00")
+        ])
+        before = pd.Timestamp("2024-01-05 09:02", tz="Asia/Tokyo")
+
+        with self.collector._connect() as conn:
+            tail = read_tail_close(conn, "7203.T", "1m", before, rows=4)
+            older = read_tail_close(conn, "7203.T", "1m", before, rows=2)
+
+        assert tail.tolist() == [1001, 1002, 1003, 1004]
+        assert older.tolist() == [1003, 1004]
+
+    def test_requarantine_overwrites(self):
+        """同じバーを再取得した場合は隔離テーブルの行を上書きすること"""
+        self.collector._ingest(self._bad_fetch())
+        self.collector._ingest(self._bad_fetch())
+
+        assert len(self.collector.get_quarantined_bars()) == 2
+
+    def test_split_rebases_cached_history(self):
+        """株式分割後のバーは隔離せず、調整済みの履歴を再取得してキャッシュを置き換えること"""
+        self.collector.save_frames([make_bars(close=[300.0] * 20)])
+        adjusted = make_bars(close=[100.0] * 25)
+
+        def fetch(symbol, interval, period="1d", start=None, end=None):
+            # 取得元は分割調整済み（再取得は先頭から、差分取得は新しいバーのみ）
+            if start == adjusted['timestamp'].iloc[0]:
+                return adjusted.iloc[:self.refreshes + 20].copy()
+            return adjusted.iloc[[self.refreshes + 19]].copy()
+
+        with patch.object(self.collector, '_fetch_data_yfinance', side_effect=fetch):
+            for self.refreshes in range(1, 6):
+                new_bar = self.collector._fetch_data_yfinance("7203.T", "1m")
+                self.collector._save_to_cache(self.collector._ingest(new_bar))
+
+        cached = self.collector._read_cache("7203.T", "1m")
+        assert len(cached) == 25
+        assert (cached['close'] == 100.0).all()
+        assert self.collector.get_quarantined_bars().empty
+
+    def test_split_rebases_compacted_history(self):
+        """圧縮済みの系列も集計行の先頭時刻から再取得して置き換えること"""
+        self.collector.save_frames([make_bars(close=[300.0] * 20)])
+        self.collector.compact_cache(older_than_days=1)
+        adjusted = make_bars(close=[100.0] * 21)
+
+        with patch.object(self.collector, '_fetch_data_yfinance',
+                          return_value=adjusted) as fetch, \
+                patch.object(self.collector, '_load_from_cache') as load:
+            self.collector._save_to_cache(
+                self.collector._ingest(adjusted.iloc[[20]].copy())
+            )
+
+        load.assert_not_called()
+        assert fetch.call_args.kwargs['start'] == adjusted['timestamp'].iloc[0]
+        cached = self.collector._read_cache("7203.T", "1m")
+        assert cached['close'].tolist() == [100.0] * 21
+
+    def test_real_move_accepted_once_confirmed(self):
+        """取得元でも乖離したままの値動きは、後続のバーで確認できた時点で受け入れること"""
+        self.collector.save_frames([make_bars(close=[300.0] * 20)])
+        history = make_bars(close=[300.0] * 20 + [100.0, 100.0])
+
+        with patch.object(self.collector, '_fetch_data_yfinance',
+                          return_value=history.iloc[:21].copy()):
+            assert self.collector._ingest(history.iloc[[20]].copy()) is not None
+        assert len(self.collector.get_quarantined_bars()) == 1
+        assert self.collector._read_cache("7203.T", "1m")['close'].iloc[-1] == 300.0
+
+        accepted = self.collector._ingest(history.iloc[19:].copy())
+        self.collector._save_to_cache(accepted)
+
+        cached = self.collector._read_cache("7203.T", "1m")
+        assert cached['close'].tolist()[-2:] == [100.0, 100.0]
+        assert self.collector.get_quarantined_bars().empty
+
+    def test_disabled(self):
+        """検証を無効にした場合は取得結果をそのまま保存すること"""
+        self.collector.ingestion = None
+
+        with patch.object(self.collector, '_fetch_data_yfinance',
+                          return_value=self._bad_fetch()):
+            data = self.collector.get_stock_data("7203.T", "1m", "1d")
+
+        assert len(data) == 10
+        assert self.collector.get_quarantined_bars().empty
@@ -0,0 +1,189 @@
+"""
+バーリサンプリング（BarResampler）のテスト
+"""
+
+import tempfile
+import shutil
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_collector.bar_resampler import BarResampler, parse_sessions, resample_bars
+from src.data_collector.data_provider import ReplayDataProvider
+from src.data_collector.stock_data_collector import StockDataCollector
+
+
+# 東証の前場・後場
+TOKYO_SESSIONS = parse_sessions("09:00-11:30, 12:30-15:00")
+
+
+def make_minute_bars(symbol: str, start: str, periods: int,
+                     tz: str = "Asia/Tokyo") -> pd.DataFrame:
+    """1分足のテストデータ"""
+    timestamps = pd.date_range(start, periods=periods, freq="1min", tz=tz)
+    close = 1000 + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        'symbol': symbol,
+        'interval': "1m",
+        'timestamp': timestamps,
+        'open': close - 0.5,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': np.full(periods, 100, dtype=np.int64),
+    })
+
+
+class TestResampleBars:
+    """resample_barsのテストクラス"""
+
+    def test_parse_sessions(self):
+        """取引時間表記を分単位に変換できること"""
+        assert parse_sessions("09:00-11:30, 12:30-15:00") == [(540, 690), (750, 900)]
+        assert parse_sessions(None) == []
+
+    def test_ohlcv_aggregation(self):
+        """OHLCVと出来高加重VWAPが正しく集約されること"""
+        data = make_minute_bars("7203.T", "2024-01-04 09:00", 10)
+        data.loc[5:, 'volume'] = 300
+
+        result = resample_bars(data, "5m", TOKYO_SESSIONS, "Asia/Tokyo")
+
+        assert len(result) == 2
+        first = result.iloc[0]
+        assert first['open'] == data['open'].iloc[0]
+        assert first['close'] == data['close'].iloc[4]
+        assert first['high'] == data['high'].iloc[:5].max()
+        assert first['low'] == data['low'].iloc[:5].min()
+        assert first['volume'] == 500
+        typical = (data['high'] + data['low'] + data['close']) / 3
+        expected_vwap = (typical.iloc[5:] * 300).sum() / 1500
+        assert result.iloc[1]['vwap'] == pytest.approx(expected_vwap)
+        assert (result['interval'] == "5m").all()
+
+    def test_session_anchored_buckets(self):
+        """1時間足のバケットが後場の開始時刻（12:30）を起点とすること"""
+        morning = make_minute_bars("7203.T", "2024-01-04 09:00", 150)
+        afternoon = make_minute_bars("7203.T", "2024-01-04 12:30", 150)
+        data = pd.concat([morning, afternoon], ignore_index=True)
+
+        result = resample_bars(data, "1h", TOKYO_SESSIONS, "Asia/Tokyo")
+
+        labels = result['timestamp'].dt.strftime("%H:%M").tolist()
+        assert labels == ["09:00", "10:00", "11:00", "12:30", "13:30", "14:30"]
+        assert result['volume'].tolist() == [6000, 6000, 3000, 6000, 6000, 3000]
+
+    def test_daily_buckets_in_market_timezone(self):
+        """日足は市場の現地日付で区切られ、元のタイムゾーンを保持すること"""
+        data = make_minute_bars("AAPL", "2024-01-04 09:30", 390, tz="America/New_York")
+        data['timestamp'] = data['timestamp'].dt.tz_convert("UTC")
+
+        result = resample_bars(
+            data, "1d", parse_sessions("09:30-16:00"), "America/New_York"
+        )
+
+        assert len(result) == 1
+        assert str(result['timestamp'].dt.tz) == "UTC"
+        expected = pd.Timestamp("2024-01-04", tz="America/New_York")
+        assert result['timestamp'].iloc[0] == expected
+        assert result['volume'].iloc[0] == 39000
+
+    def test_unsupported_interval(self):
+        """未対応の間隔はValueErrorとなること"""
+        with pytest.raises(ValueError):
+            resample_bars(make_minute_bars("7203.T", "2024-01-04 09:00", 5), "7m")
+
+
+class TestBarResampler:
+    """BarResamplerのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, data_provider=ReplayDataProvider()
+        )
+        self.resampler = BarResampler(self.collector)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_candidate_sources(self):
+        """期間がyfinanceの遡及上限を超える元データは候補外となること"""
+        assert self.resampler.candidate_sources("5m", "1d") == ["1m"]
+        assert self.resampler.candidate_sources("1h", "1mo") == [
+            "2m", "5m", "15m", "30m"
+        ]
+        assert self.resampler.candidate_sources("1d", "1y") == ["1h"]
+        assert self.resampler.candidate_sources("1m", "1d") == []
+        assert self.resampler.candidate_sources("1h", "max") == []
+
+    def test_select_source_prefers_cached(self):
+        """期間をカバーするキャッシュ済みの元データがあればそれを選ぶこと"""
+        assert self.resampler.select_source("7203.T", "30m", "5d") is None
+
+        self.collector.get_stock_data("7203.T", interval="15m", period="5d")
+
+        assert self.resampler.select_source("7203.T", "30m", "5d") == "15m"
+
+    def test_select_source_requires_period_coverage(self):
+        """キャッシュ済みの元データが期間の一部しかカバーしない場合は選ばないこと"""
+        self.collector.get_stock_data("7203.T", interval="1m", period="1d")
+
+        assert self.resampler.select_source("7203.T", "5m", "1d") == "1m"
+        assert self.resampler.select_source("7203.T", "5m", "5d") is None
+
+    def test_get_resampled_derives_from_fine_bars(self):
+        """キャッシュ済みの細かい足から粗い足を上流から取得せずに生成・保存すること"""
+        self.collector.get_stock_data("7203.T", interval="1m", period="5d")
+
+        with patch.object(
+            self.collector, '_fetch_data_yfinance',
+            wraps=self.collector._fetch_data_yfinance
+        ) as mock_fetch:
+            data = self.resampler.get_resampled("7203.T", "5m", "5d")
+            self.resampler.get_resampled("7203.T", "1h", "5d")
+
+        mock_fetch.assert_not_called()
+        assert data is not None and not data.empty
+        assert {'open', 'high', 'low', 'close', 'volume', 'vwap'} <= set(data.columns)
+
+        cached = self.collector._load_from_cache("7203.T", "5m")
+        assert len(cached) == len(data)
+        assert cached['close'].tolist() == data['close'].tolist()
+
+    def test_direct_fetch_without_cached_source(self):
+        """細かい足がキャッシュにない場合は要求された間隔を直接取得すること"""
+        with patch.object(
+            self.collector, '_fetch_data_yfinance',
+            wraps=self.collector._fetch_data_yfinance
+        ) as mock_fetch:
+            data = self.resampler.get_resampled("7203.T", "5m", "5d")
+
+        assert [call.args[1] for call in mock_fetch.call_args_list] == ["5m"]
+        assert data is not None and not data.empty
+
+    def test_incremental_materialize(self):
+        """2回目以降は最新バケット以降のみ再集約すること"""
+        minute = make_minute_bars("7203.T", "2024-01-04 09:00", 30)
+        self.collector.save_frames([minute])
+
+        assert self.resampler.materialize("7203.T", "5m", "1m") == 6
+        assert self.resampler.materialize("7203.T", "5m", "1m") == 1
+
+        self.collector.save_frames([make_minute_bars("7203.T", "2024-01-04 09:30", 12)])
+
+        assert self.resampler.materialize("7203.T", "5m", "1m") == 4
+        cached = self.collector._load_from_cache("7203.T", "5m")
+        assert len(cached) == 9
+        assert cached['volume'].iloc[-1] == 200
+
+    def test_fallback_to_direct_fetch(self):
+        """生成できない間隔は直接取得すること"""
+        with patch.object(
+            self.collector, 'get_stock_data', return_value=None
+        ) as mock_get:
+            self.resampler.get_resampled("7203.T", "1d", "max")
+
+        mock_get.assert_called_once_with("7203.T", "1d", "max", True)
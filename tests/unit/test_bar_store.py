@@ -0,0 +1,291 @@
+"""
+バーデータ保存バックエンド（ParquetBarStore）のテスト
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import tempfile
+import shutil
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+pytest.importorskip("pyarrow")
+
+from src.data_collector.bar_store import ParquetBarStore, migrate_sqlite_cache
+from src.data_collector.stock_data_collector import StockDataCollector
+from src.config.settings import settings_manager
+
+
+def _create_bars(symbol: str = "7203.T", periods: int = 120,
+                 start: str = "2024-01-04 09:00:00",
+                 freq: str = "1min") -> pd.DataFrame:
+    """テスト用バーデータ作成"""
+    np.random.seed(0)
+    closes = 1000 + np.cumsum(np.random.normal(0, 1, periods))
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start, periods=periods, freq=freq),
+        'open': closes,
+        'high': closes + 1,
+        'low': closes - 1,
+        'close': closes,
+        'volume': np.random.randint(1000, 5000, periods),
+        'symbol': symbol,
+        'interval': '1m',
+        'created_at': datetime.now().isoformat()
+    })
+
+
+class TestParquetBarStore:
+    """ParquetBarStoreのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ParquetBarStore(Path(self.temp_dir) / "bars")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_save_creates_date_partitions(self):
+        """symbol/interval/日付単位でパーティション分割されること"""
+        data = _create_bars(periods=3, freq="1D")
+        self.store.save(data)
+
+        series_dir = Path(self.temp_dir) / "bars" / "symbol=7203.T" / "interval=1m"
+        files = sorted(path.name for path in series_dir.glob("*.parquet"))
+        assert files == [
+            "2024-01-04.parquet", "2024-01-05.parquet", "2024-01-06.parquet"
+        ]
+
+    def test_load_returns_typed_columns(self):
+        """読み込み結果が型付きカラムで返ること"""
+        data = _create_bars()
+        self.store.save(data)
+
+        loaded = self.store.load("7203.T", "1m")
+
+        assert loaded is not None
+        assert list(loaded.columns) == [
+            'symbol', 'interval', 'timestamp', 'open', 'high',
+            'low', 'close', 'volume', 'created_at'
+        ]
+        assert len(loaded) == len(data)
+        assert pd.api.types.is_datetime64_any_dtype(loaded['timestamp'])
+        assert loaded['close'].dtype == np.float64
+        np.testing.assert_allclose(loaded['close'].to_numpy(), data['close'].to_numpy())
+
+    def test_save_overwrites_duplicate_timestamps(self):
+        """同一timestampは後から保存した値で上書きされること"""
+        data = _create_bars()
+        self.store.save(data)
+
+        updated = data.copy()
+        updated['close'] = updated['close'] * 1.1
+        self.store.save(updated)
+
+        loaded = self.store.load("7203.T", "1m")
+        assert len(loaded) == len(data)
+        assert loaded['close'].iloc[0] == pytest.approx(data['close'].iloc[0] * 1.1)
+
+    def test_load_with_time_range(self):
+        """時間範囲指定で読み込めること"""
+        data = _create_bars()
+        self.store.save(data)
+
+        start = data['timestamp'].iloc[10].to_pydatetime()
+        end = data['timestamp'].iloc[20].to_pydatetime()
+        loaded = self.store.load("7203.T", "1m", start, end)
+
+        assert len(loaded) == 11
+        assert loaded['timestamp'].iloc[0] == data['timestamp'].iloc[10]
+        assert loaded['timestamp'].iloc[-1] == data['timestamp'].iloc[20]
+
+    def test_load_with_timezone_aware_timestamps(self):
+        """タイムゾーン付きtimestampでも範囲指定できること"""
+        data = _create_bars()
+        data['timestamp'] = data['timestamp'].dt.tz_localize("Asia/Tokyo")
+        self.store.save(data)
+
+        loaded = self.store.load("7203.T", "1m", start_time=datetime(2024, 1, 4, 10, 0))
+
+        assert loaded is not None
+        assert str(loaded['timestamp'].dt.tz) == "Asia/Tokyo"
+        assert len(loaded) == 60
+
+    def test_load_not_found(self):
+        """存在しない系列はNoneを返すこと"""
+        assert self.store.load("NONEXISTENT", "1m") is None
+
+    def test_iter_load_by_partition(self):
+        """日付パーティションごとに時系列順で読み込めること"""
+        data = _create_bars(periods=72, freq="1h")
+        self.store.save(data)
+
+        start = data['timestamp'].iloc[5].to_pydatetime()
+        frames = list(self.store.iter_load("7203.T", "1m", start_time=start))
+
+        assert [len(frame) for frame in frames] == [10, 24, 24, 9]
+        pd.testing.assert_frame_equal(
+            pd.concat(frames, ignore_index=True),
+            self.store.load("7203.T", "1m", start_time=start)
+        )
+
+    def test_clear(self):
+        """created_at基準で削除されること"""
+        self.store.save(_create_bars("7203.T"))
+        self.store.save(_create_bars("6758.T"))
+
+        removed = self.store.clear("7203.T", datetime.now() + timedelta(seconds=1))
+
+        assert removed == 120
+        assert self.store.load("7203.T", "1m") is None
+        assert self.store.load("6758.T", "1m") is not None
+
+    def test_stats(self):
+        """統計情報がget_cache_statsと同じキーで返ること"""
+        assert self.store.stats()['total_records'] == 0
+
+        self.store.save(_create_bars("7203.T"))
+        self.store.save(_create_bars("6758.T"))
+        stats = self.store.stats()
+
+        assert stats['total_records'] == 240
+        assert stats['unique_symbols'] == 2
+        assert stats['latest_update'] != 'N/A'
+        assert 'MB' in stats['cache_file_size']
+
+
+class TestParquetBackendCollector:
+    """StockDataCollectorのParquetバックエンド利用テスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_collector_uses_parquet_backend(self):
+        """キャッシュ保存・読み込みがParquetストア経由になること"""
+        collector = StockDataCollector(
+            cache_dir=self.temp_dir, storage_backend="parquet"
+        )
+        data = _create_bars()
+
+        collector._save_to_cache(data)
+        loaded = collector._load_from_cache("7203.T", "1m")
+
+        assert isinstance(collector.bar_store, ParquetBarStore)
+        assert len(loaded) == len(data)
+        assert collector.get_cache_stats()['total_records'] == len(data)
+
+        with patch.object(StockDataCollector, '_fetch_data_yfinance') as mock_fetch:
+            result = collector.get_stock_data("7203.T", "1m")
+            mock_fetch.assert_not_called()
+        assert len(result) == len(data)
+
+    def test_backend_from_settings(self):
+        """省略時はdata_collector.storage_backendの設定に従うこと"""
+        config = settings_manager.settings.data_collector
+        with patch.object(config, 'storage_backend', "parquet"):
+            collector = StockDataCollector(cache_dir=self.temp_dir)
+
+        assert isinstance(collector.bar_store, ParquetBarStore)
+
+    def test_invalid_backend(self):
+        """未対応のバックエンド指定はエラーになること"""
+        with pytest.raises(ValueError):
+            StockDataCollector(cache_dir=self.temp_dir, storage_backend="unknown")
+
+    def test_migrate_sqlite_cache(self):
+        """既存SQLiteキャッシュをParquetへ移行できること"""
+        sqlite_collector = StockDataCollector(cache_dir=self.temp_dir)
+        sqlite_collector._save_to_cache(_create_bars("7203.T"))
+        sqlite_collector._save_to_cache(_create_bars("AAPL"))
+
+        store = ParquetBarStore(Path(self.temp_dir) / "bars")
+        result = migrate_sqlite_cache(sqlite_collector.db_path, store)
+
+        assert result == {'series': 2, 'records': 240}
+        migrated = store.load("AAPL", "1m")
+        original = sqlite_collector._load_from_cache("AAPL", "1m")
+        assert len(migrated) == len(original)
+        np.testing.assert_allclose(
+            migrated['close'].to_numpy(), original['close'].to_numpy()
+        )
+
+    def test_migrate_missing_database(self):
+        """移行元が存在しない場合は何もしないこと"""
+        store = ParquetBarStore(Path(self.temp_dir) / "bars")
+        result = migrate_sqlite_cache(Path(self.temp_dir) / "missing.db", store)
+        assert result == {'series': 0, 'records': 0}
+
+    def test_migrate_legacy_schema_read_only(self):
+        """旧TEXTスキーマのDBを変更せずに移行できること"""
+        db_path = Path(self.temp_dir) / "stock_data.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE stock_data (
+                    symbol TEXT, interval TEXT, timestamp TEXT, open REAL, high REAL,
+                    low REAL, close REAL, volume INTEGER, created_at TEXT,
+                    PRIMARY KEY (symbol, interval, timestamp)
+                )
+            """)
+            conn.executemany(
+                "INSERT INTO stock_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    ("7203.T", "1d", "2024-01-04 00:00:00+09:00",
+                     100, 101, 99, 100.5, 1000, "2024-01-05T10:00:00"),
+                    ("7203.T", "1d", "2024-01-05 00:00:00+09:00",
+                     101, 102, 100, 101.5, 1200, "2024-01-06T10:00:00"),
+                    ("AAPL", "1d", "2024-01-04 00:00:00-05:00",
+                     180, 181, 179, 180.5, 5000, "2024-01-05T10:00:00"),
+                ]
+            )
+        conn.close()
+        before = db_path.read_bytes()
+
+        store = ParquetBarStore(Path(self.temp_dir) / "bars")
+        result = migrate_sqlite_cache(db_path, store)
+
+        assert result == {'series': 2, 'records': 3}
+        assert db_path.read_bytes() == before
+        migrated = store.load("7203.T", "1d")
+        assert migrated['close'].tolist() == [100.5, 101.5]
+        expected = pd.Timestamp("2024-01-04 00:00:00+09:00")
+        assert migrated['timestamp'].iloc[0] == expected
+
+    def test_migrate_keeps_unknown_created_at_on_clear(self):
+        """取得時刻が不明な行はNoneのまま移行され、期限による削除で残ること"""
+        db_path = Path(self.temp_dir) / "stock_data.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE stock_data (
+                    symbol TEXT, interval TEXT, timestamp TEXT, open REAL, high REAL,
+                    low REAL, close REAL, volume INTEGER, created_at TEXT,
+                    PRIMARY KEY (symbol, interval, timestamp)
+                )
+            """)
+            conn.executemany(
+                "INSERT INTO stock_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    ("7203.T", "1d", "2024-01-04 00:00:00+09:00",
+                     100, 101, 99, 100.5, 1000, None),
+                    ("7203.T", "1d", "2024-01-05 00:00:00+09:00",
+                     101, 102, 100, 101.5, 1200, "2024-01-06T10:00:00"),
+                ]
+            )
+        conn.close()
+
+        store = ParquetBarStore(Path(self.temp_dir) / "bars")
+        migrate_sqlite_cache(db_path, store)
+
+        migrated = store.load("7203.T", "1d")
+        assert migrated['created_at'].iloc[0] is None
+
+        removed = store.clear(older_than=datetime(2025, 1, 1))
+
+        assert removed == 1
+        remaining = store.load("7203.T", "1d")
+        assert remaining['close'].tolist() == [100.5]
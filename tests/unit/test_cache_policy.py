@@ -0,0 +1,227 @@
+"""
+キャッシュ有効期限ポリシー（MarketHoursTTLPolicy / FixedTTLPolicy）のテスト
+"""
+
+import tempfile
+import shutil
+import sqlite3
+from datetime import timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.config.settings import DataCollectorConfig
+from src.data_collector.cache_policy import (
+    CacheTTLPolicy, FixedTTLPolicy, MarketHoursTTLPolicy, create_ttl_policy
+)
+from src.data_collector.stock_data_collector import StockDataCollector
+from src.data_collector.symbol_manager import MarketType
+
+
+def tokyo(value: str) -> pd.Timestamp:
+    return pd.Timestamp(value, tz="Asia/Tokyo")
+
+
+def new_york(value: str) -> pd.Timestamp:
+    return pd.Timestamp(value, tz="America/New_York")
+
+
+class TestMarketHoursTTLPolicy:
+    """MarketHoursTTLPolicyのテストクラス"""
+
+    def setup_method(self):
+        self.policy = MarketHoursTTLPolicy()
+
+    def test_weekend_is_fresh(self):
+        """金曜の引け後に取得したデータは週明けの寄り付きまで有効"""
+        fetched = tokyo("2024-01-12 16:00")
+        is_fresh = self.policy.is_fresh
+
+        assert is_fresh("7203.T", "1m", fetched, tokyo("2024-01-13 12:00"))
+        assert is_fresh("7203.T", "1d", fetched, tokyo("2024-01-15 08:59"))
+        assert not is_fresh("7203.T", "1d", fetched, tokyo("2024-01-15 09:45"))
+
+    def test_live_session_expires_per_interval(self):
+        """取引中は間隔ごとの期限で失効する"""
+        fetched = tokyo("2024-01-09 10:00")
+        is_fresh = self.policy.is_fresh
+
+        assert is_fresh("7203.T", "1m", fetched, tokyo("2024-01-09 10:00:30"))
+        assert not is_fresh("7203.T", "1m", fetched, tokyo("2024-01-09 10:02"))
+        assert is_fresh("7203.T", "5m", fetched, tokyo("2024-01-09 10:02"))
+        assert self.policy.live_ttl("7203.T", "15m") == timedelta(minutes=15)
+
+    def test_lunch_break_is_fresh(self):
+        """昼休み（前場終了の猶予後）に取得したデータは後場開始まで有効"""
+        fetched = tokyo("2024-01-09 11:55")
+        is_fresh = self.policy.is_fresh
+
+        assert is_fresh("7203.T", "1m", fetched, tokyo("2024-01-09 12:25"))
+        assert not is_fresh("7203.T", "1m", fetched, tokyo("2024-01-09 12:35"))
+
+    def test_refetch_once_after_close(self):
+        """取引中に取得したデータは引け後に1回だけ再取得する"""
+        assert not self.policy.is_fresh(
+            "7203.T", "1h", tokyo("2024-01-09 14:55"), tokyo("2024-01-09 18:00")
+        )
+        assert self.policy.is_fresh(
+            "7203.T", "1h", tokyo("2024-01-09 15:25"), tokyo("2024-01-09 23:00")
+        )
+
+    def test_fixed_holidays(self):
+        """年末年始の休場日は取引日に含めない"""
+        fetched = tokyo("2023-12-29 16:00")
+
+        assert self.policy.is_fresh("7203.T", "1d", fetched, tokyo("2024-01-04 08:00"))
+        new_year = pd.Timestamp("2024-01-02").date()
+        assert not self.policy.is_trading_day(MarketType.JAPAN, new_year)
+
+    def test_configured_holidays(self):
+        """設定した休場日は取引日に含めない"""
+        policy = MarketHoursTTLPolicy(holidays={"japan": ["2024-01-08"]})
+        fetched = tokyo("2024-01-05 16:00")
+
+        assert policy.is_fresh("7203.T", "1d", fetched, tokyo("2024-01-08 12:00"))
+
+    def test_us_market_timezone(self):
+        """米国株はニューヨーク時間の取引時間で判定する"""
+        fetched = new_york("2024-01-05 17:00")
+        is_fresh = self.policy.is_fresh
+
+        assert is_fresh("AAPL", "5m", fetched, new_york("2024-01-08 09:00"))
+        assert not is_fresh("AAPL", "5m", fetched, new_york("2024-01-08 10:00"))
+        assert self.policy.is_open("AAPL", new_york("2024-01-08 15:59"))
+        assert not self.policy.is_open("AAPL", new_york("2024-01-08 17:00"))
+
+    def test_epoch_seconds(self):
+        """取得時刻はUNIX秒でも判定できる"""
+        fetched = tokyo("2024-01-05 16:00").timestamp()
+
+        now = tokyo("2024-01-06 12:00").timestamp()
+        assert self.policy.is_fresh("7203.T", "1m", fetched, now)
+
+    def test_unknown_market_uses_fixed_ttl(self):
+        """市場を判定できない銘柄は固定期限で判定する"""
+        policy = MarketHoursTTLPolicy(fallback_expire_hours=2)
+        fetched = pd.Timestamp("2024-01-06 00:00", tz="UTC")
+
+        with patch.object(policy.symbol_manager, 'detect_market_type',
+                          return_value=MarketType.UNKNOWN):
+            one_hour, three_hours = timedelta(hours=1), timedelta(hours=3)
+            assert policy.is_fresh("BTC-USD", "1m", fetched, fetched + one_hour)
+            assert not policy.is_fresh("BTC-USD", "1m", fetched, fetched + three_hours)
+
+
+class TestFixedTTLPolicy:
+    """FixedTTLPolicy・ポリシー作成のテストクラス"""
+
+    def test_fixed_ttl(self):
+        """取得からの経過時間のみで判定する"""
+        policy = FixedTTLPolicy(1)
+        fetched = tokyo("2024-01-06 12:00")
+
+        before, after = timedelta(minutes=59), timedelta(minutes=61)
+        assert policy.is_fresh("7203.T", "1m", fetched, fetched + before)
+        assert not policy.is_fresh("7203.T", "1m", fetched, fetched + after)
+
+    def test_create_ttl_policy(self):
+        """名前からポリシーを作成できる"""
+        assert isinstance(create_ttl_policy("market_hours"), MarketHoursTTLPolicy)
+        assert isinstance(create_ttl_policy("fixed"), FixedTTLPolicy)
+        with pytest.raises(ValueError):
+            create_ttl_policy("unknown")
+
+    def test_default_policy_is_fixed(self):
+        """既定は従来どおりcache_expire_hoursの固定期限（取引時間ベースは明示指定で有効化）"""
+        assert DataCollectorConfig().cache_ttl_policy == "fixed"
+        policy = create_ttl_policy()
+        assert isinstance(policy, FixedTTLPolicy)
+        fetched = tokyo("2024-01-05 16:00")
+        two_hours = timedelta(hours=2)
+        assert not policy.is_fresh("7203.T", "1d", fetched, fetched + two_hours)
+
+
+class _StaticPolicy(CacheTTLPolicy):
+    """判定結果を固定したテスト用ポリシー"""
+
+    def __init__(self, fresh: bool):
+        self.fresh = fresh
+
+    def live_ttl(self, symbol, interval):
+        return timedelta(minutes=1)
+
+    def is_fresh(self, symbol, interval, fetched_at, now=None):
+        return self.fresh
+
+
+class TestCollectorTTLPolicy:
+    """StockDataCollectorとの統合テスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _daily_data(self):
+        timestamps = pd.date_range(
+            end=pd.Timestamp.now(tz="UTC").normalize() - timedelta(days=1),
+            periods=10, freq="D"
+        )
+        return pd.DataFrame({
+            'symbol': "7203.T", 'interval': "1d", 'timestamp': timestamps,
+            'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.5, 'volume': 1000,
+        })
+
+    def _age_ranges(self, collector: StockDataCollector, seconds: int):
+        with sqlite3.connect(collector.db_path) as conn:
+            conn.execute(
+                "UPDATE cache_ranges "
+                "SET fetched_at = fetched_at - ?, range_end = range_end - ?",
+                (seconds, seconds)
+            )
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_closed_market_skips_fetch(self, mock_fetch):
+        """ポリシーが有効と判定した場合は古い取得でも再取得しない"""
+        collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=_StaticPolicy(True)
+        )
+        mock_fetch.return_value = self._daily_data()
+        collector.get_stock_data("7203.T", "1d", period="1mo")
+        self._age_ranges(collector, 2 * 24 * 3600)
+
+        collector.get_stock_data("7203.T", "1d", period="1mo")
+
+        assert mock_fetch.call_count == 1
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_explicit_expire_hours_overrides_policy(self, mock_fetch):
+        """cache_expire_hours指定時は固定期限で判定する"""
+        collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=_StaticPolicy(True)
+        )
+        mock_fetch.return_value = self._daily_data()
+        collector.get_stock_data("7203.T", "1d", period="1mo")
+        self._age_ranges(collector, 2 * 3600)
+
+        mock_fetch.return_value = None
+        collector.get_stock_data("7203.T", "1d", period="1mo", cache_expire_hours=1)
+
+        assert mock_fetch.call_count == 2
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_live_session_refetches_tail(self, mock_fetch):
+        """ポリシーが失効と判定した場合は末尾のみ再取得する"""
+        collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=_StaticPolicy(False)
+        )
+        mock_fetch.return_value = self._daily_data()
+        collector.get_stock_data("7203.T", "1d", period="1mo")
+
+        mock_fetch.return_value = None
+        collector.get_stock_data("7203.T", "1d", period="1mo")
+
+        assert mock_fetch.call_count == 2
+        assert mock_fetch.call_args.kwargs['end'] is None
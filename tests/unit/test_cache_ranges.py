@@ -0,0 +1,162 @@
+"""
+キャッシュ取得範囲メタデータ（CacheRangeIndex）のテスト
+"""
+
+import pytest
+import sqlite3
+import tempfile
+import shutil
+import time
+from pathlib import Path
+from datetime import timedelta
+
+import pandas as pd
+
+from src.data_collector.cache_ranges import CacheRangeIndex, to_epoch, from_epoch
+
+
+class TestCacheRangeIndex:
+    """CacheRangeIndexのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        db_path = Path(self.temp_dir) / "ranges.db"
+        self.index = CacheRangeIndex(lambda: sqlite3.connect(db_path))
+        self.now = time.time()
+        self.ttl = timedelta(hours=1)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _ts(self, seconds_ago: float) -> pd.Timestamp:
+        return from_epoch(self.now - seconds_ago)
+
+    def _rows(self, symbol: str = "7203.T") -> list:
+        with self.index._connect() as conn:
+            return conn.execute(
+                "SELECT range_start, range_end, fetched_at FROM cache_ranges "
+                "WHERE symbol = ? ORDER BY range_start",
+                (symbol,)
+            ).fetchall()
+
+    def test_no_metadata_returns_none(self):
+        """記録がない系列はNoneを返すこと"""
+        uncovered = self.index.uncovered_ranges(
+            "7203.T", "1m", self._ts(3600), self._ts(0), self.ttl
+        )
+        assert uncovered is None
+
+    def test_fully_covered_live_range(self):
+        """TTL内のライブ範囲は現在時刻までカバーすること"""
+        self.index.record("7203.T", "1m", self._ts(86400), self._ts(600),
+                          fetched_at=self.now - 600)
+
+        uncovered = self.index.uncovered_ranges(
+            "7203.T", "1m", self._ts(3600), self._ts(0), self.ttl, now=self.now
+        )
+        assert uncovered == []
+        assert len(self._rows()) == 1
+
+    def test_expired_live_range_leaves_tail(self):
+        """期限切れのライブ範囲は取得時刻-TTL以降が未カバーになること"""
+        fetched_at = self.now - 7200
+        self.index.record("7203.T", "1m", self._ts(86400), from_epoch(fetched_at),
+                          fetched_at=fetched_at)
+
+        uncovered = self.index.uncovered_ranges(
+            "7203.T", "1m", self._ts(43200), self._ts(0), self.ttl, now=self.now
+        )
+        assert len(uncovered) == 1
+        assert to_epoch(uncovered[0][0]) == pytest.approx(fetched_at - 3600)
+        assert to_epoch(uncovered[0][1]) == pytest.approx(self.now)
+
+    def test_closed_range_never_expires(self):
+        """過去で閉じた範囲は取得時刻に関係なく有効なこと"""
+        self.index.record("7203.T", "1d", self._ts(86400 * 30), self._ts(86400 * 10),
+                          fetched_at=self.now - 86400 * 5)
+
+        uncovered = self.index.uncovered_ranges(
+            "7203.T", "1d", self._ts(86400 * 20), self._ts(86400 * 15), self.ttl,
+            now=self.now
+        )
+        assert uncovered == []
+
+    def test_uncovered_head_and_middle(self):
+        """先頭と中間の未カバー範囲を返すこと"""
+        self.index.record("7203.T", "1d", self._ts(800), self._ts(600),
+                          fetched_at=self.now)
+        self.index.record("7203.T", "1d", self._ts(400), self._ts(0),
+                          fetched_at=self.now)
+
+        uncovered = self.index.uncovered_ranges(
+            "7203.T", "1d", self._ts(1000), self._ts(0), self.ttl, now=self.now
+        )
+        spans = [
+            (round(self.now - to_epoch(s)), round(self.now - to_epoch(e)))
+            for s, e in uncovered
+        ]
+        assert spans == [(1000, 800), (600, 400)]
+
+    def test_record_replaces_contained_ranges(self):
+        """新しい範囲に包含される古い記録は削除されること"""
+        self.index.record("7203.T", "1m", self._ts(500), self._ts(400),
+                          fetched_at=self.now - 1000)
+        self.index.record("7203.T", "1m", self._ts(1000), self._ts(0),
+                          fetched_at=self.now)
+
+        assert len(self._rows()) == 1
+
+    def test_sliding_refresh_keeps_one_row(self):
+        """重なる範囲を繰り返し記録しても行数が増えず、最新の取得時刻を保持すること"""
+        for minute in range(500, -1, -1):
+            fetched_at = self.now - minute * 60
+            self.index.record("7203.T", "1m", from_epoch(fetched_at - 86400),
+                              from_epoch(fetched_at), fetched_at=fetched_at)
+
+        rows = self._rows()
+        assert len(rows) == 1
+        assert rows[0][0] == pytest.approx(self.now - 500 * 60 - 86400)
+        assert rows[0][2] == pytest.approx(self.now)
+
+    def test_record_merges_adjacent_ranges(self):
+        """接する範囲・統合で重なる範囲を1行にまとめ、離れた範囲は残すこと"""
+        self.index.record("7203.T", "1d", self._ts(1000), self._ts(800),
+                          fetched_at=self.now - 100)
+        self.index.record("7203.T", "1d", self._ts(600), self._ts(400),
+                          fetched_at=self.now - 100)
+        self.index.record("7203.T", "1d", self._ts(200), self._ts(100),
+                          fetched_at=self.now - 100)
+        self.index.record("7203.T", "1d", self._ts(800), self._ts(600),
+                          fetched_at=self.now)
+
+        rows = self._rows()
+        assert len(rows) == 2
+        assert rows[0][:2] == (
+            pytest.approx(self.now - 1000), pytest.approx(self.now - 400)
+        )
+        assert rows[0][2] == pytest.approx(self.now)
+
+    def test_merge_keeps_live_tail_unconfirmed(self):
+        """古いライブ範囲に過去の範囲を統合しても期限切れの末尾は未カバーのままなこと"""
+        fetched_at = self.now - 7200
+        self.index.record("7203.T", "1m", self._ts(43200), from_epoch(fetched_at),
+                          fetched_at=fetched_at)
+        self.index.record("7203.T", "1m", self._ts(86400), self._ts(40000),
+                          fetched_at=self.now)
+
+        uncovered = self.index.uncovered_ranges(
+            "7203.T", "1m", self._ts(86400), self._ts(0), self.ttl, now=self.now
+        )
+        assert len(self._rows()) == 1
+        assert len(uncovered) == 1
+        assert to_epoch(uncovered[0][0]) == pytest.approx(fetched_at - 3600)
+
+    def test_clear(self):
+        """取得時刻基準で記録を削除できること"""
+        self.index.record("7203.T", "1m", self._ts(1000), self._ts(0))
+        self.index.record("AAPL", "1m", self._ts(1000), self._ts(0))
+
+        self.index.clear("7203.T", from_epoch(self.now + 10).to_pydatetime())
+
+        assert self._rows("7203.T") == []
+        assert len(self._rows("AAPL")) == 1
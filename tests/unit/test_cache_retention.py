@@ -0,0 +1,212 @@
+"""
+系列集計テーブル（series_stats）・保持期間管理（CacheRetentionManager）のテスト
+"""
+
+from functools import partial
+import tempfile
+import shutil
+import sqlite3
+from datetime import timedelta
+
+import pandas as pd
+
+from src.data_collector.bar_schema import initialize_bar_schema, rebuild_series_stats
+from src.data_collector.cache_policy import FixedTTLPolicy
+from src.data_collector.cache_retention import CacheRetentionManager
+from src.data_collector.frame_cache import FrameCache
+from src.data_collector.stock_data_collector import StockDataCollector
+from tests.helpers import make_bars
+
+
+# 1分足60本（開始日時のタイムゾーンをそのまま使用）
+minute_bars = partial(
+    make_bars, periods=60, tz=None, created_at=pd.Timestamp("2024-02-01 12:00")
+)
+
+
+STATS_COLUMNS = (
+    "series_id, row_count, cold_rows, cold_blocks, min_ts, max_ts, last_fetch, bytes"
+)
+
+
+class TestSeriesStats:
+    """series_statsのトリガー集計のテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=FixedTTLPolicy(1),
+            frame_cache=FrameCache(0)
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _stats(self):
+        with sqlite3.connect(self.collector.db_path) as conn:
+            return conn.execute(
+                f"SELECT {STATS_COLUMNS} FROM series_stats "
+                "WHERE row_count + cold_rows > 0 ORDER BY series_id"
+            ).fetchall()
+
+    def _rebuilt(self):
+        with sqlite3.connect(self.collector.db_path) as conn:
+            rebuild_series_stats(conn)
+            rows = conn.execute(
+                f"SELECT {STATS_COLUMNS} FROM series_stats ORDER BY series_id"
+            ).fetchall()
+            conn.rollback()
+        return rows
+
+    def test_triggers_match_rebuild(self):
+        """挿入・上書き・圧縮・削除の後も再集計と一致すること"""
+        tz = "Asia/Tokyo"
+        self.collector.save_frames([
+            minute_bars("7203.T", start=pd.Timestamp("2024-01-04 09:00", tz=tz))
+        ])
+        self.collector.save_frames([
+            minute_bars("7203.T", start=pd.Timestamp("2024-01-04 09:30", tz=tz),
+                        created_at=pd.Timestamp("2024-02-02 12:00"))
+        ])
+        self.collector.save_frames([
+            minute_bars("AAPL", start=pd.Timestamp("2024-01-04 09:30",
+                                                   tz="America/New_York"))
+        ])
+
+        stats = self._stats()
+        assert stats[0][1] == 90
+        assert stats[0][6] == pd.Timestamp("2024-02-02 12:00").value
+        assert stats == self._rebuilt()
+
+        self.collector.compact_cache(older_than_days=30)
+        assert self._stats() == self._rebuilt()
+
+        self.collector.clear_cache("AAPL", older_than_days=1)
+        assert self._stats() == self._rebuilt()
+
+    def test_cache_stats_from_summary(self):
+        """キャッシュ統計は集計テーブルの値を返すこと"""
+        self.collector.save_frames([
+            minute_bars("7203.T", start=pd.Timestamp("2024-01-04 09:00")),
+            minute_bars("6758.T", start=pd.Timestamp("2024-01-04 09:00")),
+        ])
+        self.collector.compact_cache(older_than_days=30, symbol="6758.T")
+
+        stats = self.collector.get_cache_stats()
+        series = self.collector.get_series_stats()
+
+        assert stats['total_records'] == 120
+        assert stats['cold_records'] == 60
+        assert stats['unique_symbols'] == 2
+        assert stats['latest_update'] == pd.Timestamp("2024-02-01 12:00").isoformat()
+        series = series.set_index('symbol')
+        assert series.loc["7203.T", 'first'] == pd.Timestamp("2024-01-04 09:00")
+        assert series.loc["6758.T", 'last'] == pd.Timestamp("2024-01-04 09:59")
+
+    def test_existing_database_is_backfilled(self):
+        """集計テーブル導入前のDBは初期化時に既存のバーから集計すること"""
+        self.collector.save_frames([
+            minute_bars("7203.T", start=pd.Timestamp("2024-01-04 09:00"))
+        ])
+        with sqlite3.connect(self.collector.db_path) as conn:
+            conn.execute("DROP TABLE series_stats")
+
+        with sqlite3.connect(self.collector.db_path) as conn:
+            initialize_bar_schema(conn)
+
+        assert self._stats()[0][1] == 60
+
+    def test_new_database_uses_incremental_vacuum(self):
+        """新規DBはincremental auto_vacuumで作成されること"""
+        with sqlite3.connect(self.collector.db_path) as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+class TestCacheRetentionManager:
+    """CacheRetentionManagerのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=FixedTTLPolicy(1),
+            frame_cache=FrameCache()
+        )
+        self.now = pd.Timestamp.now(tz="Asia/Tokyo").floor("min")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_drop_expired(self):
+        """保持期間より前のバー（圧縮ブロックを含む）を削除すること"""
+        old = minute_bars("7203.T", start=self.now - pd.Timedelta(days=40))
+        middle = minute_bars("7203.T", start=self.now - pd.Timedelta(days=35))
+        recent = minute_bars("7203.T", start=self.now - pd.Timedelta(days=2))
+        self.collector.save_frames([old, middle])
+        self.collector.compact_cache(older_than_days=30)
+        self.collector.save_frames([recent])
+        self.collector.range_index.record(
+            "7203.T", "1m", old['timestamp'].iloc[0], recent['timestamp'].iloc[-1]
+        )
+        self.collector._load_from_cache("7203.T", "1m")
+
+        manager = CacheRetentionManager(self.collector, retention_days=38)
+        removed = manager.drop_expired()
+
+        assert removed == 60
+        data = self.collector._load_from_cache("7203.T", "1m")
+        assert len(data) == 120
+        assert data['timestamp'].iloc[0] == middle['timestamp'].iloc[0]
+        assert self.collector.get_cache_stats()['total_records'] == 120
+        # 削除した期間は取得範囲の記録からも除かれる
+        uncovered = self.collector.range_index.uncovered_ranges(
+            "7203.T", "1m", old['timestamp'].iloc[0], recent['timestamp'].iloc[-1],
+            timedelta(hours=1)
+        )
+        assert uncovered and uncovered[0][0] == old['timestamp'].iloc[0]
+
+    def test_evict_least_recently_fetched(self):
+        """容量上限を超えた場合は最終取得が古い系列から削除すること"""
+        self.collector.save_frames([
+            minute_bars("7203.T", start=self.now - pd.Timedelta(days=1), periods=1000,
+                        created_at=pd.Timestamp("2024-02-01")),
+            minute_bars("6758.T", start=self.now - pd.Timedelta(days=1), periods=1000,
+                        created_at=pd.Timestamp("2024-03-01")),
+        ])
+        manager = CacheRetentionManager(self.collector, max_cache_mb=0.1)
+
+        result = manager.evict_to_size()
+
+        assert result == {'series': 1, 'rows': 1000}
+        assert self.collector._load_from_cache("7203.T", "1m") is None
+        assert self.collector._load_from_cache("6758.T", "1m") is not None
+
+    def test_enforce_returns_free_pages(self):
+        """削除で空いたページをファイルから返却すること"""
+        self.collector.save_frames([
+            minute_bars("7203.T", start=self.now - pd.Timedelta(days=60), periods=20000)
+        ])
+
+        manager = CacheRetentionManager(
+            self.collector, retention_days=30, max_cache_mb=0
+        )
+        result = manager.enforce()
+
+        assert result['expired_rows'] == 20000
+        assert result['freed_pages'] > 0
+        with sqlite3.connect(self.collector.db_path) as conn:
+            assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+    def test_disabled_by_default_settings(self):
+        """保持期間・容量上限が0の場合は削除しないこと"""
+        self.collector.save_frames([
+            minute_bars("7203.T", start=self.now - pd.Timedelta(days=400))
+        ])
+
+        manager = CacheRetentionManager(
+            self.collector, retention_days=0, max_cache_mb=0
+        )
+        result = manager.enforce()
+
+        assert result['expired_rows'] == 0
+        assert result['evicted_series'] == 0
+        assert self.collector.get_cache_stats()['total_records'] == 60
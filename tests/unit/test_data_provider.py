@@ -0,0 +1,206 @@
+"""
+データプロバイダー（YFinanceProvider / ReplayDataProvider）のテスト
+"""
+
+import pytest
+import tempfile
+import shutil
+import time
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from src.data_collector.data_provider import (
+    ReplayDataProvider, RecordingDataProvider, YFinanceProvider, create_data_provider
+)
+from src.data_collector.fundamentals_store import FundamentalsStore
+from src.data_collector.stock_data_collector import StockDataCollector
+from src.technical_analysis.fundamental_analysis import FundamentalAnalyzer
+
+
+class TestReplayDataProvider:
+    """ReplayDataProviderのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.provider = ReplayDataProvider()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_synthetic_daily_history(self):
+        """日足の合成データが営業日のみ・OHLCの整合性を満たすこと"""
+        data = self.provider.history(
+            "7203.T", interval="1d",
+            start=datetime(2024, 1, 1), end=datetime(2024, 2, 1)
+        )
+
+        assert list(data.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert data.index.name == "Date"
+        assert (data.index.dayofweek < 5).all()
+        assert len(data) == 23
+        assert (data['High'] >= data[['Open', 'Close']].max(axis=1)).all()
+        assert (data['Low'] <= data[['Open', 'Close']].min(axis=1)).all()
+
+    def test_synthetic_intraday_within_session(self):
+        """分足の合成データが取引時間内に収まること"""
+        data = self.provider.history(
+            "AAPL", interval="5m", start=datetime(2024, 1, 2), end=datetime(2024, 1, 3)
+        )
+
+        assert str(data.index.tz) == "America/New_York"
+        assert data.index.min().strftime("%H:%M") == "09:30"
+        assert data.index.max().strftime("%H:%M") == "15:55"
+        assert len(data) == 78
+
+    def test_synthetic_is_deterministic(self):
+        """重なる範囲の要求には同じ値を返すこと"""
+        first = self.provider.history(
+            "9984.T", interval="1d",
+            start=datetime(2024, 1, 1), end=datetime(2024, 3, 1)
+        )
+        second = self.provider.history(
+            "9984.T", interval="1d",
+            start=datetime(2024, 2, 1), end=datetime(2024, 3, 1)
+        )
+
+        pd.testing.assert_frame_equal(first.loc[second.index], second)
+
+    def test_period_window(self):
+        """期間指定では現在時刻から遡った範囲を返すこと"""
+        data = self.provider.history("7203.T", interval="1d", period="1mo")
+
+        assert not data.empty
+        earliest = pd.Timestamp.now(tz="Asia/Tokyo") - pd.Timedelta(days=32)
+        assert data.index.min() >= earliest
+
+    def test_latency(self):
+        """設定したレイテンシ分待機すること"""
+        provider = ReplayDataProvider(latency=0.05)
+
+        start = time.monotonic()
+        provider.info("7203.T")
+        assert time.monotonic() - start >= 0.05
+        assert provider.request_count >= 1
+
+    def test_synthetic_disabled(self):
+        """合成無効時は記録がない銘柄に空データを返すこと"""
+        provider = ReplayDataProvider(self.temp_dir, synthetic=False)
+
+        assert provider.history("7203.T", interval="1d").empty
+        assert provider.info("7203.T") == {}
+
+    def test_record_and_replay(self):
+        """記録したデータを再生できること"""
+        source = ReplayDataProvider()
+        recorder = RecordingDataProvider(source, self.temp_dir)
+        original = recorder.history(
+            "7203.T", interval="1d",
+            start=datetime(2024, 1, 1), end=datetime(2024, 2, 1)
+        )
+        recorder.info("7203.T")
+        recorder.financials("7203.T")
+
+        replay = ReplayDataProvider(self.temp_dir, synthetic=False)
+        replayed = replay.history(
+            "7203.T", interval="1d",
+            start=datetime(2024, 1, 1), end=datetime(2024, 2, 1)
+        )
+
+        assert len(replayed) == len(original)
+        assert replayed['Close'].tolist() == original['Close'].tolist()
+        assert replay.info("7203.T")['longName'] == "Synthetic 7203.T"
+        financials, balance_sheet = replay.financials("7203.T")
+        assert "Total Revenue" in financials.index
+        assert "Total Assets" in balance_sheet.index
+
+    def test_recorded_period_counts_from_last_bar(self):
+        """記録データの期間指定は記録の末尾基準で切り出すこと"""
+        source = ReplayDataProvider()
+        recorder = RecordingDataProvider(source, self.temp_dir)
+        recorder.history(
+            "7203.T", interval="1d",
+            start=datetime(2023, 1, 1), end=datetime(2024, 1, 1)
+        )
+
+        replay = ReplayDataProvider(self.temp_dir, synthetic=False)
+        data = replay.history("7203.T", interval="1d", period="1mo")
+
+        assert 15 <= len(data) <= 23
+        assert data.index.max().year == 2023
+
+    def test_download_multiindex(self):
+        """一括取得がyf.download(group_by='ticker')と同じ列構成になること"""
+        data = self.provider.download(["7203.T", "AAPL"], interval="1d", period="5d")
+
+        assert isinstance(data.columns, pd.MultiIndex)
+        assert set(data.columns.get_level_values(0)) == {"7203.T", "AAPL"}
+
+
+class TestProviderIntegration:
+    """コレクター・分析クラスとの統合テスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_create_data_provider(self):
+        """名前からプロバイダーを作成できること"""
+        assert isinstance(create_data_provider("yfinance"), YFinanceProvider)
+        assert isinstance(create_data_provider("replay"), ReplayDataProvider)
+        with pytest.raises(ValueError):
+            create_data_provider("unknown")
+
+    def test_collector_with_replay_provider(self):
+        """オフライン再生でデータ取得・キャッシュ保存ができること（レート制限なし）"""
+        collector = StockDataCollector(
+            cache_dir=self.temp_dir, data_provider=ReplayDataProvider()
+        )
+
+        with patch.object(collector, '_rate_limit') as mock_rate_limit:
+            data = collector.get_stock_data("7203.T", interval="1d", period="1mo")
+
+        mock_rate_limit.assert_not_called()
+        assert data is not None and not data.empty
+        ohlcv = {'timestamp', 'open', 'high', 'low', 'close', 'volume'}
+        assert ohlcv <= set(data.columns)
+        assert collector.get_cache_stats()['total_records'] == len(data)
+
+    def test_collector_batch_with_replay_provider(self):
+        """オフライン再生で一括取得ができること"""
+        collector = StockDataCollector(
+            cache_dir=self.temp_dir, data_provider=ReplayDataProvider()
+        )
+
+        results = collector.get_multiple_stocks(
+            ["7203.T", "AAPL"], interval="1d", period="5d", batch_size=10
+        )
+
+        assert set(results) == {"7203.T", "AAPL"}
+
+    def test_yfinance_provider_delegates_to_ticker(self):
+        """既定プロバイダーはyf.Tickerに委譲すること"""
+        mock_ticker = Mock()
+        mock_ticker.history.return_value = pd.DataFrame()
+        with patch('src.data_collector.data_provider.yf.Ticker',
+                   return_value=mock_ticker):
+            YFinanceProvider().history("7203.T", interval="1m", period="1d")
+
+        mock_ticker.history.assert_called_once_with(period="1d", interval="1m")
+
+    def test_fundamental_analyzer_with_replay_provider(self):
+        """オフライン再生で財務指標を計算できること"""
+        analyzer = FundamentalAnalyzer(
+            data_provider=ReplayDataProvider(),
+            store=FundamentalsStore(f"{self.temp_dir}/fundamentals.db")
+        )
+
+        metrics = analyzer.get_financial_metrics("7203.T")
+
+        assert metrics is not None
+        assert metrics.company_name == "Synthetic 7203.T"
+        assert metrics.per is not None
+        assert metrics.equity_ratio == pytest.approx(0.45)
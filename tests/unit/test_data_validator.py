@@ -212,10 +212,10 @@ class TestDataValidator:
         gaps = self.validator._detect_time_gaps(gap_data)
         
         assert len(gaps) > 0
-        assert "start_time" in gaps[0]
-        assert "end_time" in gaps[0]
-        assert "gap_duration" in gaps[0]
-        assert "expected_duration" in gaps[0]
+        assert "start_time" in gaps.columns
+        assert "end_time" in gaps.columns
+        assert "gap_duration" in gaps.columns
+        assert "expected_duration" in gaps.columns
     
     def test_clean_data(self):
         """データクリーニングテスト"""
@@ -364,7 +364,7 @@ class TestDataValidator:
         assert "price_anomalies" in anomalies
         assert "volume_anomalies" in anomalies
         assert "ohlc_inconsistencies" in anomalies
-        assert isinstance(anomalies["price_anomalies"], list)
+        assert isinstance(anomalies["price_anomalies"], pd.DataFrame)
     
     def test_quality_check_errors(self):
         """品質チェックエラーハンドリングテスト"""
@@ -406,7 +406,7 @@ class TestDataValidator:
         })
         
         gaps = self.validator._detect_time_gaps(irregular_data)
-        assert isinstance(gaps, list)
+        assert isinstance(gaps, pd.DataFrame)
     
     def test_clean_data_edge_cases(self):
         """データクリーニングのエッジケーステスト"""
@@ -521,7 +521,7 @@ class TestDataValidator:
         
         # 市場時間のギャップが適切に検出されることを確認
         gaps = self.validator._detect_time_gaps(market_hours_data)
-        assert isinstance(gaps, list)
+        assert isinstance(gaps, pd.DataFrame)
         
         # 検証結果の確認
         result = self.validator.validate_dataframe(market_hours_data, "MARKET")
@@ -639,4 +639,71 @@ class TestDataValidator:
             'low': lows,
             'close': closes,
             'volume': volumes
-        })
\ No newline at end of file
+        })
+
+
+class TestColumnarAnomalyReports:
+    """異常値・ギャップの列形式の検出結果のテスト"""
+
+    def setup_method(self):
+        self.validator = DataValidator()
+        self.timestamps = pd.date_range(
+            "2024-01-04 09:00", periods=10, freq="1min", tz="Asia/Tokyo"
+        )
+        close = np.full(10, 1000.0)
+        close[5] = 1300.0
+        self.data = pd.DataFrame({
+            'timestamp': self.timestamps,
+            'open': close,
+            'high': close + 5,
+            'low': close - 5,
+            'close': close,
+            'volume': [100] * 9 + [10000]
+        })
+        self.data.loc[3, 'high'] = 900.0
+
+    def test_anomaly_frames(self):
+        """検出結果を行単位のDataFrameで返すこと"""
+        anomalies = self.validator._detect_anomalies(self.data)
+
+        price = anomalies["price_anomalies"]
+        assert list(price.columns) == DataValidator.ANOMALY_COLUMNS["price_anomalies"]
+        assert list(price['timestamp']) == [self.timestamps[5], self.timestamps[6]]
+        assert price['change_rate'].round(4).tolist() == [0.3, -0.2308]
+        volume = anomalies["volume_anomalies"]
+        assert volume['timestamp'].tolist() == [self.timestamps[9]]
+        assert anomalies["ohlc_inconsistencies"]['high'].tolist() == [900.0]
+
+    def test_unsorted_input_checked_in_time_order(self):
+        """並び順に関係なく時系列順の変化率で判定すること"""
+        shuffled = self.data.sample(frac=1, random_state=0)
+
+        expected = self.validator._detect_anomalies(self.data)["price_anomalies"]
+        anomalies = self.validator.validate_dataframe(shuffled)["anomalies"]
+        result = anomalies["price_anomalies"]
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_gap_frame(self):
+        """ギャップの開始・終了時刻とタイムゾーンを保持すること"""
+        data = self.data.drop(index=[4, 5, 6]).sample(frac=1, random_state=1)
+
+        gaps = self.validator._detect_time_gaps(data)
+
+        assert len(gaps) == 1
+        assert gaps.loc[0, 'start_time'] == self.timestamps[3]
+        assert gaps.loc[0, 'end_time'] == self.timestamps[7]
+        assert gaps.loc[0, 'gap_duration'] == timedelta(minutes=4)
+        assert gaps.loc[0, 'expected_duration'] == timedelta(minutes=1)
+
+    def test_empty_results_have_columns(self):
+        """検出なしの場合も同じカラム構成の空のDataFrameを返すこと"""
+        clean = self.data.drop(index=[3, 5, 9])
+
+        anomalies = self.validator._detect_anomalies(clean)
+
+        assert anomalies["ohlc_inconsistencies"].empty
+        assert (list(anomalies["ohlc_inconsistencies"].columns)
+                == DataValidator.ANOMALY_COLUMNS["ohlc_inconsistencies"])
+        gaps = self.validator._detect_time_gaps(clean.iloc[:1])
+        assert list(gaps.columns) == DataValidator.GAP_COLUMNS
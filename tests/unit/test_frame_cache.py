@@ -0,0 +1,171 @@
+"""
+フレームキャッシュ（FrameCache）のテスト
+"""
+
+import tempfile
+import shutil
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.data_collector.frame_cache import FrameCache
+from src.data_collector.stock_data_collector import StockDataCollector
+from tests.helpers import make_bars
+
+
+class TestFrameCache:
+    """FrameCacheのテストクラス"""
+
+    def test_hit_and_miss_counters(self):
+        """ヒット・ミスが計数され、コピーが返ること"""
+        cache = FrameCache()
+        key = ("db", "7203.T", "1m")
+        frame = make_bars("7203.T", 10)
+
+        assert cache.get(key) is None
+        assert cache.put(key, frame, None, None, cache.generation(key))
+
+        result = cache.get(key)
+        result.loc[0, 'close'] = -1.0
+
+        assert cache.get(key)['close'].iloc[0] == 1000.0
+        stats = cache.get_stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+        assert stats['bytes'] > 0
+
+    def test_range_coverage(self):
+        """読み込み済み範囲に含まれる要求は切り出して返し、範囲外はミスとなること"""
+        cache = FrameCache()
+        key = ("db", "7203.T", "1m")
+        frame = make_bars("7203.T", 60)
+        start = frame['timestamp'].iloc[0]
+        cache.put(key, frame, start, None, cache.generation(key))
+
+        # タイムゾーンなしの境界は市場現地時刻として扱う
+        start_time = pd.Timestamp("2024-01-04 09:30")
+        subset = cache.get(key, start_time)
+        assert len(subset) == 30
+        expected = pd.Timestamp("2024-01-04 09:30", tz="Asia/Tokyo")
+        assert subset['timestamp'].iloc[0] == expected
+
+        assert cache.get(key, start_time - pd.Timedelta(hours=1)) is None
+        assert cache.get(key) is None
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """バイト数の上限を超えると最も古く使われたエントリから破棄すること"""
+        frame = make_bars("A", 100)
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+        cache = FrameCache(max_bytes=size * 2 + size // 2)
+
+        for symbol in ("A", "B"):
+            key = ("db", symbol, "1m")
+            cache.put(key, make_bars(symbol, 100), None, None, cache.generation(key))
+        cache.get(("db", "A", "1m"))
+        key = ("db", "C", "1m")
+        cache.put(key, make_bars("C", 100), None, None, cache.generation(key))
+
+        assert cache.get(("db", "B", "1m")) is None
+        assert cache.get(("db", "A", "1m")) is not None
+        stats = cache.get_stats()
+        assert stats['evictions'] == 1
+        assert stats['bytes'] <= stats['max_bytes']
+
+    def test_put_rejected_after_concurrent_write(self):
+        """読み込み中に書き込まれた系列の結果は登録しないこと"""
+        cache = FrameCache()
+        key = ("db", "7203.T", "1m")
+        generation = cache.generation(key)
+
+        cache.invalidate("db", "7203.T", "1m")
+
+        assert not cache.put(key, make_bars("7203.T", 5), None, None, generation)
+        assert cache.get(key) is None
+
+    def test_disabled(self):
+        """上限0ではキャッシュしないこと"""
+        cache = FrameCache(max_bytes=0)
+        key = ("db", "7203.T", "1m")
+
+        generation = cache.generation(key)
+        assert not cache.put(key, make_bars("7203.T", 5), None, None, generation)
+        assert cache.get(key) is None
+
+
+class TestCollectorFrameCache:
+    """StockDataCollectorとの統合テスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, frame_cache=FrameCache()
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_repeated_load_skips_sqlite(self):
+        """同じ系列の再読み込みはSQLiteを読まないこと"""
+        self.collector.save_frames([make_bars("7203.T", 30)])
+        first = self.collector._load_from_cache("7203.T", "1m")
+
+        with patch.object(self.collector, '_read_cache') as mock_read:
+            second = self.collector._load_from_cache("7203.T", "1m")
+            start = pd.Timestamp("2024-01-04 09:20", tz="Asia/Tokyo")
+            narrowed = self.collector._load_from_cache("7203.T", "1m", start_time=start)
+
+        mock_read.assert_not_called()
+        pd.testing.assert_frame_equal(first, second)
+        assert len(narrowed) == 10
+        assert self.collector.get_cache_stats()['frame_cache']['hits'] == 2
+
+    def test_write_invalidates(self):
+        """新しいバーの書き込み後は最新のデータを読み込むこと"""
+        self.collector.save_frames([make_bars("7203.T", 30)])
+        self.collector._load_from_cache("7203.T", "1m")
+
+        self.collector.save_frames([make_bars("7203.T", 10, start="2024-01-04 09:30")])
+        data = self.collector._load_from_cache("7203.T", "1m")
+
+        assert len(data) == 40
+
+    def test_clear_cache_invalidates(self):
+        """キャッシュクリア後は削除結果を反映すること"""
+        bars = make_bars("7203.T", 30).assign(
+            created_at=pd.Timestamp("2024-01-04 16:00")
+        )
+        self.collector.save_frames([bars])
+        self.collector._load_from_cache("7203.T", "1m")
+
+        self.collector.clear_cache(older_than_days=1)
+
+        assert self.collector._load_from_cache("7203.T", "1m") is None
+
+    def test_other_process_write_invalidates(self):
+        """他プロセス（別のフレームキャッシュを持つコレクター）の書き込み後は最新のデータを読み込むこと"""
+        self.collector.save_frames([make_bars("7203.T", 30)])
+        self.collector._load_from_cache("7203.T", "1m")
+
+        other = StockDataCollector(cache_dir=self.temp_dir, frame_cache=FrameCache())
+        other.save_frames([make_bars("7203.T", 10, start="2024-01-04 09:30")])
+        data = self.collector._load_from_cache("7203.T", "1m")
+
+        assert len(data) == 40
+        assert self.collector.get_cache_stats()['frame_cache']['invalidations'] == 1
+
+    def test_other_process_write_invalidates_parquet(self):
+        """Parquetでも他プロセスの書き込みを検出すること"""
+        collector = StockDataCollector(
+            cache_dir=self.temp_dir, storage_backend="parquet", frame_cache=FrameCache()
+        )
+        collector.save_frames([make_bars("7203.T", 30)])
+        collector._load_from_cache("7203.T", "1m")
+
+        other = StockDataCollector(
+            cache_dir=self.temp_dir, storage_backend="parquet", frame_cache=FrameCache()
+        )
+        other.save_frames([make_bars("7203.T", 10, start="2024-01-04 09:30")])
+        data = collector._load_from_cache("7203.T", "1m")
+
+        assert len(data) == 40
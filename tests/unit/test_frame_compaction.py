@@ -0,0 +1,136 @@
+"""
+返却用バーデータの省メモリ化（compact_bar_frame）のテスト
+"""
+
+import tempfile
+import shutil
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.data_collector.cache_policy import FixedTTLPolicy
+from src.data_collector.frame_cache import FrameCache
+from src.data_collector.frame_compaction import compact_bar_frame, compaction_report
+from src.data_collector.stock_data_collector import StockDataCollector
+
+
+def make_fetched(periods: int = 390) -> pd.DataFrame:
+    """取得直後（_normalize_history）と同じ形式のテストデータ"""
+    rng = np.random.default_rng(0)
+    close = 1000 + np.cumsum(rng.normal(0, 1, periods))
+    return pd.DataFrame({
+        'timestamp': pd.date_range(
+            "2024-01-04 09:00", periods=periods, freq="1min", tz="Asia/Tokyo"
+        ),
+        'open': close,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.integers(100, 10000, periods),
+        'symbol': "7203.T",
+        'interval': "1m",
+        'created_at': datetime(2024, 1, 4, 15, 0).isoformat(),
+    })
+
+
+class TestCompactBarFrame:
+    """compact_bar_frameのテストクラス"""
+
+    def test_drop_metadata(self):
+        """メタデータ列を削除し、銘柄・間隔・取得時刻をattrsに移すこと"""
+        data = make_fetched()
+
+        compact = compact_bar_frame(data)
+
+        assert list(compact.columns) == [
+            'timestamp', 'open', 'high', 'low', 'close', 'volume'
+        ]
+        assert compact.attrs == {
+            'symbol': "7203.T", 'interval': "1m",
+            'fetched_at': pd.Timestamp("2024-01-04 15:00")
+        }
+        assert compact['close'].dtype == np.float64
+        assert compact['volume'].dtype == np.int16
+        assert (compact['volume'].to_numpy() == data['volume'].to_numpy()).all()
+        # 元のDataFrameは変更しない
+        assert 'symbol' in data.columns
+        assert data['volume'].dtype == np.int64
+
+    def test_float32_prices(self):
+        """指定時のみ価格列をfloat32にすること"""
+        compact = compact_bar_frame(make_fetched(), float32_prices=True)
+
+        assert all(
+            compact[col].dtype == np.float32 for col in ['open', 'high', 'low', 'close']
+        )
+
+    def test_keep_metadata_as_category(self):
+        """メタデータを残す場合は銘柄・間隔をcategory型、取得時刻をdatetime64にすること"""
+        compact = compact_bar_frame(make_fetched(), drop_metadata=False)
+
+        assert isinstance(compact['symbol'].dtype, pd.CategoricalDtype)
+        assert isinstance(compact['interval'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(compact['created_at'])
+
+    def test_text_timestamp_parsed(self):
+        """文字列のtimestampはdatetime64に変換すること"""
+        data = make_fetched(10)
+        data['timestamp'] = data['timestamp'].astype(str)
+
+        compact = compact_bar_frame(data)
+
+        assert pd.api.types.is_datetime64_any_dtype(compact['timestamp'])
+
+    def test_report(self):
+        """メモリ削減量を報告すること"""
+        data = make_fetched()
+
+        report = compaction_report(data, compact_bar_frame(data, float32_prices=True))
+
+        assert report['bytes_saved'] == report['bytes_before'] - report['bytes_after']
+        assert report['bytes_after'] < report['bytes_before'] / 3
+
+
+class TestCollectorCompactOutput:
+    """StockDataCollectorの省メモリ形式での返却のテスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=FixedTTLPolicy(1),
+            frame_cache=FrameCache(0)
+        )
+        data = make_fetched()
+        data['created_at'] = datetime.now().isoformat()
+        self.collector.save_frames([data])
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_default_returns_full_frame(self):
+        """既定では従来どおりのカラム構成で返すこと"""
+        data = self.collector.get_stock_data("7203.T", "1m", "1d")
+
+        assert list(data.columns) == StockDataCollector.CACHE_COLUMNS
+        assert self.collector.compaction_stats['frames'] == 0
+
+    def test_compact_argument(self):
+        """compact指定時は省メモリ形式で返し、削減量を累計すること"""
+        data = self.collector.get_stock_data("7203.T", "1m", "1d", compact=True)
+
+        assert 'symbol' not in data.columns
+        assert data.attrs['symbol'] == "7203.T"
+        assert len(data) == 390
+        assert self.collector.compaction_stats['frames'] == 1
+        assert self.collector.compaction_stats['bytes_saved'] > 0
+
+    def test_compact_attribute(self):
+        """compact_frames属性で既定の返却形式を切り替えられること"""
+        self.collector.compact_frames = True
+        self.collector.compact_float32 = True
+
+        results = self.collector.get_multiple_stocks(["7203.T"], "1m", "1d")
+
+        assert results["7203.T"]['close'].dtype == np.float32
+        assert 'created_at' not in results["7203.T"].columns
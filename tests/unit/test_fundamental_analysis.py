@@ -79,7 +79,7 @@ class TestFundamentalAnalyzer:
         assert analyzer._cache == {}
         assert analyzer._cache_expire_hours == 24
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_ticker_info_success(self, mock_ticker, analyzer, mock_ticker_info):
         """銘柄情報取得成功テスト"""
         # モックの設定
@@ -94,7 +94,7 @@ class TestFundamentalAnalyzer:
         assert result == mock_ticker_info
         mock_ticker.assert_called_once_with('TEST')
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_ticker_info_cache(self, mock_ticker, analyzer, mock_ticker_info):
         """銘柄情報キャッシュテスト"""
         # モックの設定
@@ -112,7 +112,7 @@ class TestFundamentalAnalyzer:
         assert result1 == result2 == mock_ticker_info
         mock_ticker.assert_called_once()  # 1回だけ呼ばれる
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_data_success(self, mock_ticker, analyzer, mock_financials, mock_balance_sheet):
         """財務データ取得成功テスト"""
         # モックの設定
@@ -129,7 +129,7 @@ class TestFundamentalAnalyzer:
         assert not balance_sheet.empty
         mock_ticker.assert_called_once_with('TEST')
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_metrics_success(self, mock_ticker, analyzer, mock_ticker_info, mock_balance_sheet, mock_financials):
         """財務指標取得成功テスト"""
         # モックの設定
@@ -183,7 +183,7 @@ class TestFundamentalAnalyzer:
         # 負の値を除外すると [110, 121] となり、CAGR = (121/110)^(1/1) - 1 = 0.1
         assert cagr == pytest.approx(0.1, rel=1e-2)
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_analyze_growth_trend(self, mock_ticker, analyzer, mock_financials):
         """成長トレンド分析テスト"""
         # モックの設定
@@ -369,7 +369,7 @@ class TestFundamentalAnalyzerErrorHandling:
     def analyzer(self):
         return FundamentalAnalyzer()
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_ticker_info_exception(self, mock_ticker, analyzer):
         """銘柄情報取得時の例外処理テスト"""
         # yfinanceで例外が発生するケース
@@ -380,7 +380,7 @@ class TestFundamentalAnalyzerErrorHandling:
         # 例外時は空辞書を返す
         assert result == {}
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_data_exception(self, mock_ticker, analyzer):
         """財務データ取得時の例外処理テスト"""
         # yfinanceで例外が発生するケース
@@ -392,7 +392,7 @@ class TestFundamentalAnalyzerErrorHandling:
         assert financials.empty
         assert balance_sheet.empty
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_ticker_info_cache_hit(self, mock_ticker, analyzer):
         """キャッシュヒット時のテスト"""
         # 事前にキャッシュに設定
@@ -407,7 +407,7 @@ class TestFundamentalAnalyzerErrorHandling:
         # yfinanceが呼ばれないことを確認
         mock_ticker.assert_not_called()
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_data_cache_hit(self, mock_ticker, analyzer):
         """財務データキャッシュヒット時のテスト"""
         # 事前にキャッシュに設定
@@ -424,7 +424,7 @@ class TestFundamentalAnalyzerErrorHandling:
         # yfinanceが呼ばれないことを確認
         mock_ticker.assert_not_called()
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_metrics_no_info(self, mock_ticker, analyzer):
         """銘柄情報が取得できない場合のテスト"""
         # 空の銘柄情報を返すモック
@@ -437,7 +437,7 @@ class TestFundamentalAnalyzerErrorHandling:
         # 情報がない場合はNoneを返す
         assert result is None
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_metrics_missing_data(self, mock_ticker, analyzer):
         """一部のデータが欠損している場合のテスト"""
         # 一部のフィールドのみ含む銘柄情報
@@ -458,7 +458,7 @@ class TestFundamentalAnalyzerErrorHandling:
         assert result.pbr is None  # 欠損フィールドはNone
         assert result.roe is None
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_analyze_growth_trend_empty_data(self, mock_ticker, analyzer):
         """空の財務データでの成長トレンド分析テスト"""
         # 空のDataFrameを返すモック
@@ -472,7 +472,7 @@ class TestFundamentalAnalyzerErrorHandling:
         # 空データの場合はNoneを返す
         assert result is None
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_analyze_growth_trend_insufficient_data(self, mock_ticker, analyzer):
         """データ不足時の成長トレンド分析テスト"""
         # 1年分のデータのみ
@@ -498,7 +498,7 @@ class TestFundamentalAnalyzerEdgeCases:
     def analyzer(self):
         return FundamentalAnalyzer()
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_metrics_zero_values(self, mock_ticker, analyzer):
         """ゼロ値を含む財務指標のテスト"""
         mock_instance = Mock()
@@ -522,7 +522,7 @@ class TestFundamentalAnalyzerEdgeCases:
         assert result.dividend_yield == 0
         assert result.price == 0.01
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_metrics_negative_values(self, mock_ticker, analyzer):
         """負の値を含む財務指標のテスト"""
         mock_instance = Mock()
@@ -543,7 +543,7 @@ class TestFundamentalAnalyzerEdgeCases:
         assert result.roe == -0.05
         assert result.roa == -0.03
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_metrics_extreme_values(self, mock_ticker, analyzer):
         """極端な値を含む財務指標のテスト"""
         mock_instance = Mock()
@@ -567,7 +567,7 @@ class TestFundamentalAnalyzerEdgeCases:
         assert result.dividend_yield == 0.5
         assert result.market_cap == 1000000000000
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_analyze_growth_trend_zero_revenue(self, mock_ticker, analyzer):
         """売上ゼロ期間を含む成長トレンド分析テスト"""
         dates = [
@@ -597,7 +597,7 @@ class TestFundamentalAnalyzerEdgeCases:
         assert isinstance(result.revenue_cagr, (float, type(None)))
         assert isinstance(result.profit_cagr, (float, type(None)))
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_analyze_growth_trend_mixed_positive_negative(self, mock_ticker, analyzer):
         """正負混在の財務データテスト"""
         dates = [
@@ -635,7 +635,7 @@ class TestFundamentalAnalyzerEnhancedErrorHandling:
     def analyzer(self):
         return FundamentalAnalyzer()
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_analyze_growth_trend_empty_financials_warning_log(self, mock_logger, mock_ticker, analyzer):
         """空の財務諸表データ時の警告ログテスト"""
@@ -653,7 +653,7 @@ class TestFundamentalAnalyzerEnhancedErrorHandling:
         # 警告ログが出力されることを確認
         mock_logger.warning.assert_called_with("財務諸表データが空です: EMPTY_TEST")
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_analyze_growth_trend_alternative_revenue_search(self, mock_logger, mock_ticker, analyzer):
         """代替売上データ検索のテスト"""
@@ -688,7 +688,7 @@ class TestFundamentalAnalyzerEnhancedErrorHandling:
         # 代替項目発見のログが出力されることを確認
         mock_logger.info.assert_any_call("売上データを代替項目で発見: Revenue")
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_analyze_growth_trend_alternative_profit_search(self, mock_logger, mock_ticker, analyzer):
         """代替利益データ検索のテスト"""
@@ -723,7 +723,7 @@ class TestFundamentalAnalyzerEnhancedErrorHandling:
         # 代替項目発見のログが出力されることを確認
         mock_logger.info.assert_any_call("利益データを代替項目で発見: Profit")
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_analyze_growth_trend_missing_data_warning(self, mock_logger, mock_ticker, analyzer):
         """売上・利益データが見つからない場合の警告ログテスト"""
@@ -756,7 +756,7 @@ class TestFundamentalAnalyzerEnhancedErrorHandling:
         mock_logger.warning.assert_any_call("利益データが見つかりません: MISSING_DATA_TEST, 2024")
         mock_logger.warning.assert_any_call("成長トレンド分析に十分なデータがありません: MISSING_DATA_TEST")
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_analyze_growth_trend_insufficient_valid_data(self, mock_logger, mock_ticker, analyzer):
         """有効データ不足時の処理テスト"""
@@ -790,7 +790,7 @@ class TestFundamentalAnalyzerEnhancedErrorHandling:
         mock_logger.info.assert_any_call("有効な利益データ数: 1/3")
         mock_logger.warning.assert_any_call("成長トレンド分析に十分なデータがありません: INSUFFICIENT_VALID_DATA_TEST")
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_analyze_growth_trend_financial_index_logging(self, mock_logger, mock_ticker, analyzer):
         """財務諸表インデックス情報ログテスト"""
@@ -816,7 +816,7 @@ class TestFundamentalAnalyzerEnhancedErrorHandling:
         expected_index_list = ['Total Revenue', 'Net Income']
         mock_logger.info.assert_any_call(f"財務諸表の行インデックス: {expected_index_list}")
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_analyze_growth_trend_sufficient_single_type_data(self, mock_logger, mock_ticker, analyzer):
         """一方のデータのみ十分な場合の処理テスト"""
@@ -851,7 +851,7 @@ class TestFundamentalAnalyzerEnhancedErrorHandling:
         mock_logger.info.assert_any_call("有効な売上データ数: 3/3")
         mock_logger.info.assert_any_call("有効な利益データ数: 1/3")
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_analyze_growth_trend_case_insensitive_search(self, mock_logger, mock_ticker, analyzer):
         """大文字小文字を区別しない検索のテスト"""
@@ -888,7 +888,7 @@ class TestFundamentalAnalyzerAdvancedFeatures:
     def analyzer(self):
         return FundamentalAnalyzer()
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_get_financial_metrics_comprehensive(self, mock_ticker, analyzer):
         """包括的な財務指標取得テスト"""
         # 完全な財務データを模擬
@@ -935,7 +935,7 @@ class TestFundamentalAnalyzerAdvancedFeatures:
         assert cache_key in analyzer._cache
         
         # 期限切れキャッシュは新しいリクエストで更新される
-        with patch('src.technical_analysis.fundamental_analysis.yf.Ticker') as mock_ticker:
+        with patch('src.data_collector.data_provider.yf.Ticker') as mock_ticker:
             mock_instance = Mock()
             mock_instance.info = {"fresh": "data"}
             mock_ticker.return_value = mock_instance
@@ -1047,7 +1047,7 @@ class TestFundamentalAnalyzerTypeConversionErrorHandling:
     def analyzer(self):
         return FundamentalAnalyzer()
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_current_ratio_calculation_type_error(self, mock_logger, mock_ticker, analyzer):
         """流動比率計算での型変換エラーテスト"""
@@ -1082,7 +1082,7 @@ class TestFundamentalAnalyzerTypeConversionErrorHandling:
             "流動比率計算エラー TYPE_ERROR_TEST: float() argument must be a string or a real number, not 'Timestamp'"
         )
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_equity_ratio_calculation_type_error(self, mock_logger, mock_ticker, analyzer):
         """自己資本比率計算での型変換エラーテスト"""
@@ -1112,7 +1112,7 @@ class TestFundamentalAnalyzerTypeConversionErrorHandling:
             "自己資本比率計算エラー EQUITY_ERROR_TEST: could not convert string to float: 'invalid_string'"
         )
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_debt_ratio_calculation_type_error(self, mock_logger, mock_ticker, analyzer):
         """負債比率計算での型変換エラーテスト"""
@@ -1138,7 +1138,7 @@ class TestFundamentalAnalyzerTypeConversionErrorHandling:
         # 無限大値は float() で変換可能なので、この場合は計算される
         assert result.debt_ratio == float('inf')
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_revenue_data_type_conversion_error(self, mock_logger, mock_ticker, analyzer):
         """売上データ型変換エラーテスト"""
@@ -1170,7 +1170,7 @@ class TestFundamentalAnalyzerTypeConversionErrorHandling:
             "売上データの型変換エラー REVENUE_TYPE_ERROR_TEST, 2024: float() argument must be a string or a real number, not 'Timestamp'"
         )
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_profit_data_type_conversion_error(self, mock_logger, mock_ticker, analyzer):
         """利益データ型変換エラーテスト"""
@@ -1200,7 +1200,7 @@ class TestFundamentalAnalyzerTypeConversionErrorHandling:
             "利益データの型変換エラー PROFIT_TYPE_ERROR_TEST, 2024: could not convert string to float: 'invalid_profit'"
         )
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_alternative_revenue_data_type_conversion_error(self, mock_logger, mock_ticker, analyzer):
         """代替売上データ型変換エラーテスト"""
@@ -1231,7 +1231,7 @@ class TestFundamentalAnalyzerTypeConversionErrorHandling:
             "代替売上データの型変換エラー ALT_REVENUE_TYPE_ERROR_TEST, 2024: float() argument must be a string or a real number, not 'Timestamp'"
         )
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     @patch('src.technical_analysis.fundamental_analysis.logger')
     def test_alternative_profit_data_type_conversion_error(self, mock_logger, mock_ticker, analyzer):
         """代替利益データ型変換エラーテスト"""
@@ -1453,7 +1453,7 @@ class TestFundamentalAnalyzerNaNHandling:
     def analyzer(self):
         return FundamentalAnalyzer()
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_financial_metrics_with_nan_values(self, mock_ticker, analyzer):
         """NaN値を含む財務指標の処理テスト"""
         mock_instance = Mock()
@@ -1494,7 +1494,7 @@ class TestFundamentalAnalyzerNaNHandling:
         assert result.current_ratio is None  # NaN値のため計算不可
         assert result.equity_ratio is None  # None値のため計算不可
     
-    @patch('src.technical_analysis.fundamental_analysis.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_growth_trend_with_mixed_nan_values(self, mock_ticker, analyzer):
         """売上・利益データにNaN値が混在する場合のテスト"""
         dates = [
@@ -0,0 +1,178 @@
+"""
+ファンダメンタルズ永続キャッシュ（FundamentalsStore）のテスト
+"""
+
+import tempfile
+import shutil
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from src.data_collector.data_provider import ReplayDataProvider
+from src.data_collector.fundamentals_store import FundamentalsStore
+from src.technical_analysis.fundamental_analysis import FundamentalAnalyzer
+
+
+def make_statements():
+    """決算期を列に持つ財務諸表"""
+    columns = pd.to_datetime(["2024-03-31", "2023-03-31"])
+    financials = pd.DataFrame(
+        [[1.5e12, 1.2e12], [1.2e11, np.nan]],
+        index=["Total Revenue", "Net Income"], columns=columns
+    )
+    balance_sheet = pd.DataFrame(
+        [[3.0e12, 2.8e12]], index=["Total Assets"], columns=columns
+    )
+    return financials, balance_sheet
+
+
+class TestFundamentalsStore:
+    """FundamentalsStoreのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = FundamentalsStore(
+            Path(self.temp_dir) / "fundamentals.db",
+            ttl_hours={"info": 24, "financials": 720, "balance_sheet": 720}
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """銘柄情報・財務諸表を同じ値で読み込めること"""
+        financials, balance_sheet = make_statements()
+        self.store.put_many([
+            ("7203.T", "info", {'longName': "Toyota", 'trailingPE': 9.5}),
+            ("7203.T", "financials", financials),
+            ("7203.T", "balance_sheet", balance_sheet),
+        ])
+
+        info, _ = self.store.get("7203.T", "info")
+        loaded, _ = self.store.get("7203.T", "financials")
+
+        assert info == {'longName': "Toyota", 'trailingPE': 9.5}
+        pd.testing.assert_frame_equal(loaded, financials, check_freq=False)
+        stored_sheet, _ = self.store.get("7203.T", "balance_sheet")
+        assert stored_sheet.loc["Total Assets"].iloc[0] == 3.0e12
+
+    def test_field_ttl(self):
+        """項目ごとの有効期限で判定すること"""
+        financials, balance_sheet = make_statements()
+        two_days_ago = time.time() - 2 * 24 * 3600
+        self.store.put_many([
+            ("7203.T", "info", {'longName': "Toyota"}),
+            ("7203.T", "financials", financials),
+            ("7203.T", "balance_sheet", balance_sheet),
+        ], fetched_at=two_days_ago)
+
+        assert self.store.get("7203.T", "info") is None
+        assert self.store.get("7203.T", "financials") is not None
+        assert self.store.stale_fields(["7203.T", "6758.T"]) == {
+            "7203.T": ["info"],
+            "6758.T": ["info", "financials", "balance_sheet"],
+        }
+        stored = self.store.load_many(["7203.T"], include_stale=True)
+        assert ("7203.T", "info") in stored
+
+    def test_refresh_fetches_only_stale(self):
+        """期限切れの項目だけを取得し、失敗した銘柄は保存しないこと"""
+        financials, balance_sheet = make_statements()
+        self.store.put_many([
+            ("7203.T", "financials", financials),
+            ("7203.T", "balance_sheet", balance_sheet),
+        ])
+        provider = Mock()
+        provider.info.side_effect = (
+            lambda symbol: {} if symbol == "BAD" else {'longName': symbol}
+        )
+        provider.financials.return_value = make_statements()
+
+        summary = self.store.refresh(["7203.T", "6758.T", "BAD"], provider)
+
+        assert summary == {'symbols': 3, 'fetched': 2, 'failed': 1, 'fresh': 0}
+        assert provider.financials.call_count == 1
+        assert self.store.get("6758.T", "balance_sheet") is not None
+        assert self.store.get("BAD", "info") is None
+
+        assert self.store.refresh(["7203.T", "6758.T"], provider)['fresh'] == 2
+
+    def test_refresh_skips_empty_statements(self):
+        """空の財務諸表は取得失敗として保存しないこと"""
+        provider = Mock()
+        provider.info.return_value = {'longName': "ETF"}
+        provider.financials.return_value = (pd.DataFrame(), pd.DataFrame())
+
+        summary = self.store.refresh(["1306.T"], provider)
+
+        assert summary['failed'] == 1
+        assert self.store.get("1306.T", "financials") is None
+        assert self.store.stale_fields(["1306.T"]) == {
+            "1306.T": ["info", "financials", "balance_sheet"]
+        }
+
+    def test_clear(self):
+        """銘柄を指定して削除できること"""
+        self.store.put("7203.T", "info", {'longName': "Toyota"})
+        self.store.put("6758.T", "info", {'longName': "Sony"})
+
+        assert self.store.clear("7203.T") == 1
+        assert self.store.get("6758.T", "info") is not None
+
+
+class TestAnalyzerWithStore:
+    """FundamentalAnalyzerとディスクキャッシュの統合テスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / "fundamentals.db"
+        self.provider = Mock(wraps=ReplayDataProvider())
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _analyzer(self, provider=None) -> FundamentalAnalyzer:
+        return FundamentalAnalyzer(
+            data_provider=provider or self.provider,
+            store=FundamentalsStore(self.db_path)
+        )
+
+    def test_shared_across_instances(self):
+        """別のインスタンス（別プロセス相当）は保存済みの値を取得せずに使うこと"""
+        first = self._analyzer().get_financial_metrics("7203.T")
+        other_provider = Mock()
+
+        second = self._analyzer(other_provider).get_financial_metrics("7203.T")
+
+        assert second.per == first.per
+        assert second.equity_ratio == first.equity_ratio
+        other_provider.info.assert_not_called()
+        other_provider.financials.assert_not_called()
+
+    def test_peer_comparison_served_locally(self):
+        """同業比較は未取得の銘柄をまとめて取得し、2回目以降は取得しないこと"""
+        peers = [f"{code}.T" for code in range(1301, 1331)]
+        first = self._analyzer().compare_with_peers("7203.T", peers)
+        assert self.provider.info.call_count == 31
+
+        other_provider = Mock()
+        result = self._analyzer(other_provider).compare_with_peers("7203.T", peers)
+
+        other_provider.info.assert_not_called()
+        assert result.industry_average == first.industry_average
+
+    def test_empty_statements_not_persisted(self):
+        """空の財務諸表はディスクキャッシュに保存せず、別のインスタンスで再取得すること"""
+        provider = Mock()
+        provider.financials.return_value = (pd.DataFrame(), pd.DataFrame())
+        self._analyzer(provider)._get_financial_data("1306.T")
+
+        other_provider = Mock()
+        other_provider.financials.return_value = make_statements()
+        financials, _ = self._analyzer(other_provider)._get_financial_data("1306.T")
+
+        other_provider.financials.assert_called_once_with("1306.T")
+        assert not financials.empty
@@ -0,0 +1,125 @@
+"""
+キャッシュ済み履歴の分割読み込み（StockDataCollector.iter_bars）のテスト
+"""
+
+from functools import partial
+import tempfile
+import shutil
+
+import pandas as pd
+import pytest
+
+from src.data_collector.cache_policy import FixedTTLPolicy
+from src.data_collector.frame_cache import FrameCache
+from src.data_collector.stock_data_collector import StockDataCollector
+from src.utils.sqlite_pool import connection_manager
+from tests.helpers import make_bars
+
+
+# 1日あたり300本の1分足（引数は日数）
+session_bars = partial(
+    make_bars, periods=300, created_at=pd.Timestamp("2024-02-01 12:00")
+)
+
+
+class TestIterBars:
+    """iter_barsのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, ttl_policy=FixedTTLPolicy(1),
+            frame_cache=FrameCache(0)
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _collect(self, **kwargs) -> list:
+        return list(self.collector.iter_bars("7203.T", "1m", **kwargs))
+
+    def test_chunks_match_full_read(self):
+        """分割して読んだ結果を結合すると一括読み込みと一致すること"""
+        self.collector.save_frames([session_bars(days=5)])
+
+        chunks = self._collect(chunk_rows=400)
+
+        assert [len(chunk) for chunk in chunks] == [400, 400, 400, 300]
+        pd.testing.assert_frame_equal(
+            pd.concat(chunks, ignore_index=True),
+            self.collector._read_cache("7203.T", "1m")
+        )
+
+    def test_merges_cold_blocks_and_late_writes(self):
+        """圧縮済みの日・未圧縮の日・圧縮後の上書きを時刻順に重複なく返すこと"""
+        self.collector.save_frames([session_bars(days=3)])
+        self.collector.compact_cache(older_than_days=30)
+        late = session_bars(days=1, start="2024-01-05 09:00").iloc[:5]
+        late = late.assign(close=-1.0)
+        self.collector.save_frames([late])
+        self.collector.save_frames([session_bars(days=2, start="2024-01-08 09:00")])
+
+        chunks = self._collect(chunk_rows=128)
+        data = pd.concat(chunks, ignore_index=True)
+
+        assert all(len(chunk) == 128 for chunk in chunks[:-1])
+        assert len(data) == 1500
+        assert data['timestamp'].is_monotonic_increasing
+        assert data['timestamp'].is_unique
+        assert (data['close'] == -1.0).sum() == 5
+        pd.testing.assert_frame_equal(data, self.collector._read_cache("7203.T", "1m"))
+
+    def test_range(self):
+        """開始・終了時刻（含む）で範囲を絞れること"""
+        self.collector.save_frames([session_bars(days=3)])
+        self.collector.compact_cache(older_than_days=30)
+
+        chunks = self._collect(
+            start=pd.Timestamp("2024-01-05 13:00"),
+            end=pd.Timestamp("2024-01-06 09:09"),
+            chunk_rows=7
+        )
+        data = pd.concat(chunks, ignore_index=True)
+
+        assert len(data) == 60 + 10
+        expected = pd.Timestamp("2024-01-05 13:00", tz="Asia/Tokyo")
+        assert data['timestamp'].iloc[0] == expected
+
+    def test_write_during_iteration(self):
+        """反復中に同じスレッドから書き込んでも開始時点の内容を返すこと"""
+        self.collector.save_frames([session_bars(days=2)])
+        chunks = self.collector.iter_bars("7203.T", "1m", chunk_rows=100)
+        first = next(chunks)
+
+        self.collector.save_frames([session_bars(days=1, start="2024-01-10 09:00")])
+        rest = list(chunks)
+
+        assert len(first) + sum(len(chunk) for chunk in rest) == 600
+
+    def test_without_pooled_connection(self):
+        """プール接続を閉じた後も読み込めること"""
+        self.collector.save_frames([session_bars(days=1)])
+        connection_manager.close(self.collector.db_path)
+
+        assert sum(len(chunk) for chunk in self._collect()) == 300
+
+    def test_missing_series(self):
+        """キャッシュがない系列は何も返さないこと"""
+        assert self._collect() == []
+
+    def test_invalid_chunk_rows(self):
+        """chunk_rowsが0以下の場合はエラー"""
+        with pytest.raises(ValueError):
+            self._collect(chunk_rows=0)
+
+    def test_rechunk_frames(self):
+        """区切り直しは行の順序を保つこと"""
+        frames = [
+            pd.DataFrame({'x': range(start, start + size)})
+            for start, size in [(0, 3), (3, 10), (13, 1)]
+        ]
+
+        chunks = list(StockDataCollector._rechunk_frames(frames, 4))
+
+        assert [len(chunk) for chunk in chunks] == [4, 4, 4, 2]
+        assert pd.concat(chunks)['x'].tolist() == list(range(14))
@@ -636,4 +636,95 @@ class TestMarketEnvironmentAnalyzerRSIFix:
         assert 'minimum_index' in result
         # RSIは計算される可能性があるが、NaNでないことを確認
         if 'rsi' in result['minimum_index']:
-            assert pd.notna(result['minimum_index']['rsi'])
\ No newline at end of file
+            assert pd.notna(result['minimum_index']['rsi'])
+
+
+class TestMarketEnvironmentConcurrentFetch:
+    """インデックス・セクターETFの同時取得と分析結果キャッシュのテスト"""
+
+    @staticmethod
+    def make_collector(fresh: bool = True, failing: tuple = ()):
+        """全銘柄の取得が同時に実行されるまで待ち合わせるコレクター"""
+        import threading
+
+        total = (len(MarketEnvironmentAnalyzer.INDICES)
+                 + len(MarketEnvironmentAnalyzer.SECTOR_ETFS))
+        state = {'calls': [], 'barrier': threading.Barrier(total, timeout=10)}
+        lock = threading.Lock()
+
+        def get_stock_data(symbol, interval="1d", period="5d", compact=None):
+            with lock:
+                state['calls'].append(symbol)
+            # 順次取得の場合は待ち合わせがタイムアウトして取得失敗になる
+            state['barrier'].wait()
+            if symbol in failing:
+                raise Exception("取得エラー")
+            close = np.linspace(100, 110, 30)
+            return pd.DataFrame({
+                'timestamp': pd.date_range(end=datetime.now(), periods=30, freq='D'),
+                'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+                'volume': np.full(30, 1000)
+            })
+
+        collector = Mock()
+        collector.get_stock_data.side_effect = get_stock_data
+        collector.ttl_policy.is_fresh.return_value = fresh
+        return collector, state
+
+    def test_fetches_all_symbols_concurrently(self):
+        """インデックス・VIX・セクターETFを同時に取得すること"""
+        collector, state = self.make_collector(failing=("1618.T",))
+        analyzer = MarketEnvironmentAnalyzer(data_collector=collector)
+
+        env = analyzer.analyze_market_environment(period="1mo", interval="1d")
+
+        total = len(analyzer.INDICES) + len(analyzer.SECTOR_ETFS)
+        assert len(state['calls']) == total
+        assert not state['barrier'].broken
+        assert set(env.indices_performance) == set(analyzer.INDICES)
+        # 取得に失敗したセクターのみ欠ける
+        assert set(env.sector_performance) == set(analyzer.SECTOR_ETFS) - {"energy"}
+
+    def test_snapshot_reused_until_next_bar(self):
+        """次のバーが確定するまでは再取得せずに同じ結果を返すこと"""
+        collector, state = self.make_collector(fresh=True)
+        analyzer = MarketEnvironmentAnalyzer(data_collector=collector)
+
+        first = analyzer.analyze_market_environment(period="1mo", interval="1d")
+        second = analyzer.analyze_market_environment(period="1mo", interval="1d")
+
+        assert second is first
+        assert len(state['calls']) == len(analyzer.INDICES) + len(analyzer.SECTOR_ETFS)
+
+        # 期間・間隔が異なる場合は別に分析する
+        analyzer.analyze_market_environment(period="5d", interval="1d")
+        symbols = len(analyzer.INDICES) + len(analyzer.SECTOR_ETFS)
+        assert len(state['calls']) == 2 * symbols
+
+    def test_snapshot_expires_when_bar_closes(self):
+        """新しいバーが確定した後は再分析すること"""
+        collector, state = self.make_collector(fresh=True)
+        analyzer = MarketEnvironmentAnalyzer(data_collector=collector)
+        first = analyzer.analyze_market_environment(period="1mo", interval="1d")
+
+        collector.ttl_policy.is_fresh.return_value = False
+        second = analyzer.analyze_market_environment(period="1mo", interval="1d")
+
+        assert second is not first
+        assert collector.ttl_policy.is_fresh.call_args[0][:2] == ("^N225", "1d")
+        refreshed = analyzer.analyze_market_environment(
+            period="1mo", interval="1d", use_cache=False
+        )
+        assert refreshed is not second
+
+    def test_partial_result_not_reused(self):
+        """一部の銘柄が取得できなかった結果は再利用しないこと"""
+        collector, state = self.make_collector(fresh=True, failing=("1618.T",))
+        analyzer = MarketEnvironmentAnalyzer(data_collector=collector)
+
+        first = analyzer.analyze_market_environment(period="1mo", interval="1d")
+        second = analyzer.analyze_market_environment(period="1mo", interval="1d")
+
+        assert second is not first
+        symbols = len(analyzer.INDICES) + len(analyzer.SECTOR_ETFS)
+        assert len(state['calls']) == 2 * symbols
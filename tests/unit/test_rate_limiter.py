@@ -0,0 +1,150 @@
+"""
+プロセス間共有トークンバケット（TokenBucketRateLimiter）のテスト
+"""
+
+import pytest
+import tempfile
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from src.data_collector.rate_limiter import TokenBucketRateLimiter, RateLimitTimeout
+from src.data_collector.stock_data_collector import StockDataCollector
+
+
+class TestTokenBucketRateLimiter:
+    """TokenBucketRateLimiterのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / "rate_limit.db"
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_default_capacity(self):
+        """容量省略時は1分間の補充量の1/10になること"""
+        limiter = TokenBucketRateLimiter(self.db_path, rate_per_minute=100)
+        assert limiter.capacity == 10
+        assert limiter.get_state()['available_tokens'] == pytest.approx(10)
+
+    def test_burst_within_capacity(self):
+        """容量内のバーストは待機なしで取得できること"""
+        limiter = TokenBucketRateLimiter(
+            self.db_path, rate_per_minute=60, capacity=3, clock=lambda: 1000.0
+        )
+
+        for _ in range(3):
+            assert limiter.try_acquire() == 0
+
+        # 4回目は1秒（60回/分）の待ちが必要
+        assert limiter.try_acquire() == 1.0
+
+    def test_acquire_waits_for_refill(self):
+        """トークン不足時は補充まで待機すること"""
+        limiter = TokenBucketRateLimiter(self.db_path, rate_per_minute=600, capacity=1)
+
+        limiter.acquire()
+        start = time.monotonic()
+        limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.08  # 600回/分 = 0.1秒ごとに補充
+
+    def test_acquire_timeout(self):
+        """待ち時間がタイムアウトを超える場合は例外になること"""
+        limiter = TokenBucketRateLimiter(self.db_path, rate_per_minute=1, capacity=1)
+        limiter.acquire()
+
+        with pytest.raises(RateLimitTimeout):
+            limiter.acquire(timeout=0.1)
+
+    def test_acquire_more_than_capacity(self):
+        """容量を超えるトークン数は指定できないこと"""
+        limiter = TokenBucketRateLimiter(self.db_path, rate_per_minute=60, capacity=2)
+        with pytest.raises(ValueError):
+            limiter.acquire(tokens=3)
+
+    def test_invalid_rate(self):
+        """不正な補充レートはエラーになること"""
+        with pytest.raises(ValueError):
+            TokenBucketRateLimiter(self.db_path, rate_per_minute=0)
+
+    def test_bucket_shared_between_instances(self):
+        """同じDBファイルを使うインスタンス（別プロセス相当）で残量を共有すること"""
+        limiter_a = TokenBucketRateLimiter(self.db_path, rate_per_minute=60, capacity=2)
+        limiter_b = TokenBucketRateLimiter(self.db_path, rate_per_minute=60, capacity=2)
+
+        assert limiter_a.try_acquire() == 0
+        assert limiter_b.try_acquire() == 0
+        assert limiter_a.try_acquire() > 0
+        assert limiter_b.try_acquire() > 0
+
+    def test_separate_buckets(self):
+        """バケット名が異なれば残量は独立していること"""
+        limiter_a = TokenBucketRateLimiter(
+            self.db_path, rate_per_minute=60, capacity=1, bucket_name="a"
+        )
+        limiter_b = TokenBucketRateLimiter(
+            self.db_path, rate_per_minute=60, capacity=1, bucket_name="b"
+        )
+
+        assert limiter_a.try_acquire() == 0
+        assert limiter_b.try_acquire() == 0
+
+    def test_concurrent_threads_never_exceed_capacity(self):
+        """並行取得でも容量を超えて払い出さないこと"""
+        limiter = TokenBucketRateLimiter(self.db_path, rate_per_minute=1, capacity=5)
+        granted = []
+
+        def worker():
+            granted.append(limiter.try_acquire() == 0)
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(granted) == 5
+
+
+class TestCollectorRateLimiter:
+    """StockDataCollectorとの統合テスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_collectors_share_bucket_in_same_cache(self):
+        """同じキャッシュディレクトリのコレクターはバケットを共有すること"""
+        collector_a = StockDataCollector(cache_dir=self.temp_dir)
+        collector_b = StockDataCollector(cache_dir=self.temp_dir)
+        # 補充が進まないよう両方の時計を固定
+        frozen = time.time() + 3600
+        for collector in (collector_a, collector_b):
+            collector.rate_limiter._clock = lambda: frozen
+
+        assert collector_a.rate_limiter.db_path == collector_b.rate_limiter.db_path
+        before = collector_b.rate_limiter.get_state()['available_tokens']
+        collector_a._rate_limit()
+        after = collector_b.rate_limiter.get_state()['available_tokens']
+        assert after == before - 1
+
+    def test_custom_rate_limiter(self):
+        """レート制限を外部から注入できること"""
+        limiter = TokenBucketRateLimiter(
+            Path(self.temp_dir) / "custom.db", rate_per_minute=600, capacity=1
+        )
+        collector = StockDataCollector(cache_dir=self.temp_dir, rate_limiter=limiter)
+        collector.min_request_interval = 0
+
+        collector._rate_limit()
+        start = time.monotonic()
+        collector._rate_limit()
+
+        assert collector.rate_limiter is limiter
+        assert time.monotonic() - start >= 0.08
@@ -0,0 +1,171 @@
+"""
+キャッシュ先読みデーモン（RefreshDaemon）のテスト
+"""
+
+import tempfile
+import shutil
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from src.config.settings import DatabaseConfig, SchedulerConfig
+from src.data_collector.refresh_daemon import REFRESH_PERIODS, RefreshDaemon
+from src.data_collector.watchlist_storage import WatchlistStorage
+
+
+class FakeClock:
+    """手動で進める時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRefreshDaemon:
+    """RefreshDaemonのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = WatchlistStorage(
+            db_path=str(Path(self.temp_dir) / "watchlist.db"),
+            db_config=DatabaseConfig(
+                backup_enabled=False,
+                daily_backup_enabled=False,
+                backup_dir=str(Path(self.temp_dir) / "backups")
+            )
+        )
+        self.collector = MagicMock()
+        self.collector.get_stock_data.return_value = pd.DataFrame({'close': [100.0]})
+        self.clock = FakeClock()
+        self.config = SchedulerConfig(
+            data_update_intervals={"5m": "*/5 * * * *", "1d": "0 9 * * *"},
+            refresh_max_concurrency=2,
+            refresh_jitter_seconds=10,
+            refresh_backoff_base_seconds=60,
+            refresh_backoff_max_seconds=300
+        )
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _daemon(self, watchlists=None) -> RefreshDaemon:
+        return RefreshDaemon(
+            collector=self.collector,
+            watchlist_storage=self.storage,
+            config=self.config,
+            watchlists={"主要": ["7203", "AAPL"]} if watchlists is None else watchlists,
+            clock=self.clock
+        )
+
+    def test_symbols_merge_watchlists(self):
+        """ウォッチリストと既定ウォッチリストを正規化して重複なく対象にすること"""
+        self.storage.add_symbol("7203.T")
+        self.storage.add_symbol("6758.T")
+        daemon = self._daemon()
+
+        assert daemon.get_symbols() == ["7203.T", "6758.T", "AAPL"]
+
+    def test_refresh_uses_collector_cache_path(self):
+        """間隔ごとの先読み期間でキャッシュ経由の取得を行うこと"""
+        daemon = self._daemon()
+
+        summary = daemon.refresh("5m")
+
+        assert summary == {'symbols': 2, 'refreshed': 2, 'failed': 0, 'skipped': 0}
+        for call in self.collector.get_stock_data.call_args_list:
+            assert call.args[1:] == ("5m", REFRESH_PERIODS["5m"], True)
+
+    def test_failed_symbol_backs_off(self):
+        """失敗した銘柄は待機時間が経過するまで先読みしないこと"""
+        def fetch(symbol, interval, period, use_cache, compact=None):
+            if symbol == "AAPL":
+                raise ConnectionError("upstream error")
+            return pd.DataFrame({'close': [100.0]})
+
+        self.collector.get_stock_data.side_effect = fetch
+        daemon = self._daemon()
+
+        assert daemon.refresh("5m")['failed'] == 1
+        assert daemon.refresh("5m")['skipped'] == 1
+        # 他の間隔には影響しない
+        assert daemon.refresh("1d")['skipped'] == 0
+
+        self.clock.now += 60
+        assert daemon.refresh("5m")['failed'] == 1
+        assert daemon._failures[("AAPL", "5m")] == 2
+
+        self.collector.get_stock_data.side_effect = None
+        self.clock.now += 300
+        assert daemon.refresh("5m") == {
+            'symbols': 2, 'refreshed': 2, 'failed': 0, 'skipped': 0
+        }
+        assert ("AAPL", "5m") not in daemon._failures
+
+    def test_none_result_counts_as_failure(self):
+        """取得結果がない場合も失敗として扱うこと"""
+        self.collector.get_stock_data.return_value = None
+        daemon = self._daemon()
+
+        assert daemon.refresh("1d")['failed'] == 2
+
+    def test_bounded_concurrency(self):
+        """同時取得数が設定値を超えないこと"""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fetch(symbol, interval, period, use_cache, compact=None):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return pd.DataFrame({'close': [100.0]})
+
+        self.collector.get_stock_data.side_effect = fetch
+        symbols = [f"{code}.T" for code in range(1301, 1311)]
+        daemon = self._daemon(watchlists={"多数": symbols})
+
+        assert daemon.refresh("5m")['refreshed'] == 10
+        assert peak <= 2
+
+    def test_build_scheduler(self):
+        """間隔ごとにcron式・揺らぎ付きのジョブを登録すること"""
+        daemon = self._daemon()
+
+        scheduler = daemon.build_scheduler(blocking=False)
+        jobs = {job.id: job for job in scheduler.get_jobs()}
+
+        assert set(jobs) == {"refresh_5m", "refresh_1d", "refresh_fundamentals"}
+        assert jobs["refresh_5m"].args == ("5m",)
+        assert jobs["refresh_5m"].trigger.jitter == 10
+        assert jobs["refresh_1d"].max_instances == 1
+        assert str(jobs["refresh_1d"].trigger.timezone) == "Asia/Tokyo"
+
+    def test_build_scheduler_without_fundamentals(self):
+        """ファンダメンタルズ更新のcron式が空ならジョブを登録しないこと"""
+        self.config.fundamentals_refresh_cron = ""
+
+        scheduler = self._daemon().build_scheduler(blocking=False)
+
+        assert "refresh_fundamentals" not in {job.id for job in scheduler.get_jobs()}
+
+    def test_refresh_fundamentals(self):
+        """ウォッチリスト銘柄のファンダメンタルズを保存先へまとめて更新すること"""
+        store = MagicMock()
+        daemon = self._daemon()
+        daemon.fundamentals_store = store
+
+        daemon.refresh_fundamentals()
+
+        symbols, provider = store.refresh.call_args.args
+        assert symbols == ["7203.T", "AAPL"]
+        assert provider is self.collector.data_provider
+        assert store.refresh.call_args.kwargs['max_workers'] == 2
@@ -0,0 +1,163 @@
+"""
+シングルフライト（SingleFlight）のテスト
+"""
+
+import tempfile
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from src.data_collector.stock_data_collector import StockDataCollector
+from src.utils.single_flight import SingleFlight
+
+
+def wait_for_waiters(group: SingleFlight, key, count: int, timeout: float = 5.0):
+    """指定数の呼び出しが完了待ちになるまで待機"""
+    deadline = time.monotonic() + timeout
+    while group.waiting(key) < count:
+        if time.monotonic() > deadline:
+            raise TimeoutError("待機中の呼び出しが揃いませんでした")
+        time.sleep(0.001)
+
+
+class TestSingleFlight:
+    """SingleFlightのテストクラス"""
+
+    def test_concurrent_calls_share_result(self):
+        """実行中の同一キーは1回だけ実行し、結果を共有すること"""
+        group = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            wait_for_waiters(group, "key", 3)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(group.do, "key", work) for _ in range(4)]
+            results = [future.result() for future in futures]
+
+        assert len(calls) == 1
+        # 待機者がいたリーダーも結果を共有している
+        assert all(shared for _, shared in results)
+        assert all(value == "result" for value, _ in results)
+        stats = group.get_stats()
+        assert stats['executed'] == 1
+        assert stats['shared'] == 3
+        assert stats['in_flight'] == 0
+
+    def test_error_propagates_to_waiters(self):
+        """実行中の処理の例外を待機中の呼び出しにも伝えること"""
+        group = SingleFlight()
+
+        def work():
+            wait_for_waiters(group, "key", 1)
+            raise ValueError("upstream error")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(group.do, "key", work) for _ in range(2)]
+            for future in futures:
+                with pytest.raises(ValueError):
+                    future.result()
+
+        assert group.get_stats()['errors'] == 1
+
+    def test_sequential_calls_execute_again(self):
+        """完了後の呼び出しは新たに実行すること"""
+        group = SingleFlight()
+        counter = iter(range(10))
+
+        assert group.do("key", lambda: next(counter)) == (0, False)
+        assert group.do("key", lambda: next(counter)) == (1, False)
+
+    def test_distinct_keys_run_independently(self):
+        """異なるキーはまとめないこと"""
+        group = SingleFlight()
+        started = threading.Barrier(2, timeout=5)
+
+        def work(value):
+            started.wait()
+            return value
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(group.do, "a", work, 1)
+            second = executor.submit(group.do, "b", work, 2)
+
+        assert first.result() == (1, False)
+        assert second.result() == (2, False)
+
+
+class TestCollectorSingleFlight:
+    """StockDataCollectorとの統合テスト"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.collector = StockDataCollector(cache_dir=self.temp_dir)
+        self.collector.single_flight = SingleFlight()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _fake_fetch(self, waiters: int):
+        """同時呼び出しが揃うまで待ってからデータを返す取得処理"""
+        key = (self.collector._cache_location, "7203.T", "1m", "1d", True, None)
+        calls = []
+
+        def fetch(symbol, interval, period, start=None, end=None):
+            calls.append(symbol)
+            wait_for_waiters(self.collector.single_flight, key, waiters)
+            return pd.DataFrame({
+                'symbol': symbol,
+                'interval': interval,
+                'timestamp': pd.date_range(
+                    "2024-01-04 09:00", periods=5, freq="1min", tz="Asia/Tokyo"
+                ),
+                'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.5,
+                'volume': 1000,
+            })
+
+        return fetch, calls
+
+    def test_duplicate_symbols_fetch_once(self):
+        """重複銘柄の並列取得で上流へのリクエストが1回になること"""
+        fetch, calls = self._fake_fetch(waiters=2)
+        self.collector._fetch_data_yfinance = fetch
+
+        results = self.collector.get_multiple_stocks(
+            ["7203.T", "7203.T", "7203.T"], interval="1m", period="1d"
+        )
+
+        assert calls == ["7203.T"]
+        assert len(results["7203.T"]) == 5
+        assert self.collector.get_cache_stats()['single_flight']['shared'] == 2
+
+    def test_shared_result_is_independent_copy(self):
+        """共有された結果は呼び出し元ごとに独立したDataFrameであること"""
+        fetch, _ = self._fake_fetch(waiters=1)
+        self.collector._fetch_data_yfinance = fetch
+        published = []
+        get_stock_data = self.collector._get_stock_data
+
+        def record(*args):
+            published.append(get_stock_data(*args))
+            return published[-1]
+
+        self.collector._get_stock_data = record
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(self.collector.get_stock_data, "7203.T", "1m", "1d")
+                for _ in range(2)
+            ]
+            first, second = [future.result() for future in futures]
+
+        assert first is not second
+        # 共有元のオブジェクトはリーダーにも返さない
+        assert len(published) == 1
+        assert first is not published[0] and second is not published[0]
+        first.loc[0, 'close'] = -1.0
+        assert second.loc[0, 'close'] == 100.5
@@ -0,0 +1,119 @@
+"""
+SQLite接続プール（SQLiteConnectionManager）のテスト
+"""
+
+import gc
+import os
+import tempfile
+import shutil
+import threading
+from pathlib import Path
+
+from src.utils.sqlite_pool import SQLiteConnectionManager
+
+
+class TestSQLiteConnectionManager:
+    """SQLiteConnectionManagerのテストクラス"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / "test.db"
+        self.manager = SQLiteConnectionManager(
+            pragmas={"cache_size": -8000, "mmap_size": 1024 * 1024}
+        )
+
+    def teardown_method(self):
+        self.manager.close_all()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_same_thread_reuses_connection(self):
+        """同じスレッド・同じファイルでは同一接続を返すこと"""
+        conn_a = self.manager.connection(self.db_path)
+        conn_b = self.manager.connection(str(self.db_path))
+
+        assert conn_a is conn_b
+        stats = self.manager.get_stats()
+        assert stats['opened'] == 1
+        assert stats['reused'] == 1
+        assert stats['reuse_ratio'] == 0.5
+
+    def test_pragmas_applied(self):
+        """WAL・synchronous・cache_size・mmap_sizeが適用されること"""
+        conn = self.manager.connection(self.db_path)
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8000
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1024 * 1024
+
+    def test_context_manager_keeps_connection_open(self):
+        """with文の終了でコミットされ、接続は閉じないこと"""
+        with self.manager.connection(self.db_path) as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+
+        with self.manager.connection(self.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+    def test_threads_get_separate_connections(self):
+        """スレッドごとに別の接続を持つこと"""
+        main_conn = self.manager.connection(self.db_path)
+        thread_conns = []
+
+        def worker():
+            thread_conns.append(self.manager.connection(self.db_path))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert thread_conns[0] is not main_conn
+
+    def test_thread_exit_closes_connections(self):
+        """スレッド終了時にそのスレッドの接続が閉じられること"""
+        self.manager.connection(self.db_path)
+
+        def worker():
+            self.manager.connection(self.db_path)
+            assert self.manager.get_stats()['open_connections'] == 2
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        gc.collect()
+
+        stats = self.manager.get_stats()
+        assert stats['open_connections'] == 1
+        assert stats['closed'] == 1
+
+    def test_reconnect_after_file_replaced(self):
+        """DBファイルが削除・再作成された場合は接続し直すこと"""
+        with self.manager.connection(self.db_path) as conn:
+            conn.execute("CREATE TABLE old_table (v INTEGER)")
+
+        self.manager.close(self.db_path)
+        os.remove(self.db_path)
+        for suffix in ("-wal", "-shm"):
+            Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
+
+        first = self.manager.connection(self.db_path)
+        os.remove(self.db_path)
+        second = self.manager.connection(self.db_path)
+
+        assert first is not second
+        assert self.manager.get_stats()['reopened'] == 1
+        tables = second.execute("SELECT name FROM sqlite_master").fetchall()
+        assert tables == []
+
+    def test_stats_per_database(self):
+        """統計にDBファイル数・接続数が反映されること"""
+        self.manager.connection(self.db_path)
+        self.manager.connection(Path(self.temp_dir) / "other.db")
+
+        stats = self.manager.get_stats()
+        assert stats['databases'] == 2
+        assert stats['open_connections'] == 2
+        assert stats['threads'] == 1
+
+        self.manager.close_all()
+        assert self.manager.get_stats()['open_connections'] == 0
@@ -17,6 +17,7 @@ from pathlib import Path
 # プロジェクトルートをパスに追加
 sys.path.append(str(Path(__file__).parent.parent))
 
+from src.data_collector.cache_policy import FixedTTLPolicy
 from src.data_collector.stock_data_collector import StockDataCollector
 
 
@@ -27,7 +28,10 @@ class TestStockDataCollector:
         """各テストメソッド実行前の初期化"""
         # 一時ディレクトリを作成
         self.temp_dir = tempfile.mkdtemp()
-        self.collector = StockDataCollector(cache_dir=self.temp_dir, max_workers=2)
+        # 有効期限の判定が実行時刻（取引時間内外）に依存しないよう固定期限を使用
+        self.collector = StockDataCollector(
+            cache_dir=self.temp_dir, max_workers=2, ttl_policy=FixedTTLPolicy(1)
+        )
         
         # テスト用データ
         self.test_symbol = "7203.T"
@@ -78,7 +82,12 @@ class TestStockDataCollector:
             cursor = conn.cursor()
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = [row[0] for row in cursor.fetchall()]
-            assert 'stock_data' in tables
+            assert 'bars' in tables
+            assert 'series' in tables
+
+            # 旧スキーマ互換のビュー
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='view'")
+            assert 'stock_data' in [row[0] for row in cursor.fetchall()]
     
     def test_init_database(self):
         """データベース初期化テスト"""
@@ -86,17 +95,22 @@ class TestStockDataCollector:
         with sqlite3.connect(self.collector.db_path) as conn:
             cursor = conn.cursor()
             
-            # テーブル構造の確認
+            # barsテーブル: 整数タイムスタンプ・WITHOUT ROWIDのクラスタ化主キー
+            cursor.execute("PRAGMA table_info(bars)")
+            columns = {row[1]: (row[2], row[5]) for row in cursor.fetchall()}
+            assert columns['ts'] == ('INTEGER', 2)
+            assert columns['series_id'] == ('INTEGER', 1)
+            assert columns['created_at'][0] == 'INTEGER'
+            sql = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'bars'"
+            ).fetchone()[0]
+            assert 'WITHOUT ROWID' in sql
+
+            # 互換ビューは旧カラム構成を維持
             cursor.execute("PRAGMA table_info(stock_data)")
             columns = [row[1] for row in cursor.fetchall()]
             expected_columns = ['symbol', 'interval', 'timestamp', 'open', 'high', 'low', 'close', 'volume', 'created_at']
-            for col in expected_columns:
-                assert col in columns
-            
-            # インデックスの確認
-            cursor.execute("PRAGMA index_list(stock_data)")
-            indexes = cursor.fetchall()
-            assert len(indexes) > 0  # 少なくとも1つのインデックスが存在
+            assert columns == expected_columns
     
     def test_rate_limit(self):
         """レート制限テスト"""
@@ -111,7 +125,7 @@ class TestStockDataCollector:
         elapsed = end_time - start_time
         assert elapsed >= self.collector.min_request_interval
     
-    @patch('src.data_collector.stock_data_collector.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_fetch_data_yfinance_success(self, mock_ticker):
         """yfinanceデータ取得成功テスト"""
         # モックデータの設定
@@ -139,7 +153,7 @@ class TestStockDataCollector:
         assert (result['symbol'] == "7203.T").all()
         assert (result['interval'] == "1m").all()
     
-    @patch('src.data_collector.stock_data_collector.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_fetch_data_yfinance_empty_data(self, mock_ticker):
         """yfinanceデータ取得失敗テスト（空データ）"""
         mock_ticker_instance = Mock()
@@ -149,7 +163,7 @@ class TestStockDataCollector:
         result = self.collector._fetch_data_yfinance("INVALID.T", "1m", "1d")
         assert result is None
     
-    @patch('src.data_collector.stock_data_collector.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_fetch_data_yfinance_exception(self, mock_ticker):
         """yfinanceデータ取得例外テスト"""
         mock_ticker.side_effect = Exception("Network error")
@@ -197,6 +211,47 @@ class TestStockDataCollector:
             expected_price = original_price * 1.1
             assert abs(updated_price - expected_price) < 0.01
     
+    def test_save_frames_single_transaction(self):
+        """複数銘柄の一括保存テスト"""
+        frames = []
+        for symbol in ["7203.T", "6758.T", "9984.T"]:
+            data = self.test_data.copy()
+            data['symbol'] = symbol
+            frames.append(data)
+
+        saved = self.collector.save_frames(frames + [None, pd.DataFrame()])
+
+        assert saved == len(self.test_data) * 3
+        assert self.collector.last_write_stats['rows'] == saved
+        assert self.collector.last_write_stats['rows_per_second'] > 0
+        with sqlite3.connect(self.collector.db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM stock_data").fetchone()[0]
+            assert count == saved
+
+    def test_save_frames_with_missing_values(self):
+        """欠損値はNULLとして保存されるテスト"""
+        data = self.test_data.copy()
+        data.loc[0, 'volume'] = np.nan
+        data = data.drop(columns=['created_at'])
+
+        self.collector.save_frames([data])
+
+        with sqlite3.connect(self.collector.db_path) as conn:
+            row = conn.execute(
+                "SELECT volume, created_at FROM stock_data ORDER BY timestamp LIMIT 1"
+            ).fetchone()
+            assert row == (None, None)
+
+    def test_wal_journal_mode(self):
+        """WALジャーナルモードが有効になっているテスト"""
+        with sqlite3.connect(self.collector.db_path) as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode == "wal"
+
+    def test_save_frames_empty(self):
+        """空データの一括保存テスト"""
+        assert self.collector.save_frames([]) == 0
+
     def test_load_from_cache(self):
         """キャッシュ読み込みテスト"""
         # データを保存
@@ -274,6 +329,256 @@ class TestStockDataCollector:
         # 期限切れなので新しいデータを取得
         mock_fetch.assert_called_once()
     
+    def _create_recent_data(self, periods: int, end: datetime,
+                            created_at: datetime) -> pd.DataFrame:
+        """直近時刻で終わるテストデータを作成"""
+        data = self.test_data.head(periods).copy()
+        data['timestamp'] = pd.date_range(end=end, periods=periods, freq='1min')
+        data['created_at'] = created_at.isoformat()
+        return data
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_get_stock_data_incremental_tail(self, mock_fetch):
+        """期限切れキャッシュはハイウォーターマーク以降のみ差分取得するテスト"""
+        now = datetime.now().replace(second=0, microsecond=0)
+        cached = self._create_recent_data(
+            50, now - timedelta(minutes=10), now - timedelta(hours=2)
+        )
+        self.collector._save_to_cache(cached)
+
+        high_water_mark = cached['timestamp'].iloc[-1]
+        tail = self._create_recent_data(11, now, now)
+        mock_fetch.return_value = tail
+
+        result = self.collector.get_stock_data(self.test_symbol, "1m", period="1d")
+
+        mock_fetch.assert_called_once()
+        assert mock_fetch.call_args.kwargs['start'] == high_water_mark
+        assert len(result) == 60  # 最新バーは差分側で上書き
+        assert result['timestamp'].is_monotonic_increasing
+
+        # 差分がキャッシュに追記されていること
+        reloaded = self.collector._load_from_cache(self.test_symbol, "1m")
+        assert len(reloaded) == 60
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_get_stock_data_incremental_no_new_bars(self, mock_fetch):
+        """新しいバーがない場合はキャッシュを返し、取得済みとして記録するテスト"""
+        now = datetime.now().replace(second=0, microsecond=0)
+        cached = self._create_recent_data(
+            30, now - timedelta(minutes=5), now - timedelta(hours=2)
+        )
+        self.collector._save_to_cache(cached)
+        mock_fetch.return_value = None
+
+        version = self.collector._series_version(self.test_symbol, "1m")
+
+        result = self.collector.get_stock_data(self.test_symbol, "1m", period="1d")
+        assert len(result) == 30
+        assert mock_fetch.call_count == 1
+
+        # バーは書き換えず、取得範囲の記録により次回はキャッシュヒットになる
+        assert self.collector._series_version(self.test_symbol, "1m") == version
+        fetched_until = pd.Timestamp.now(tz='UTC')
+        assert self.collector.is_range_fresh(
+            self.test_symbol, "1m", fetched_until - timedelta(hours=1), fetched_until,
+            cache_expire_hours=1
+        )
+        self.collector.get_stock_data(self.test_symbol, "1m", period="1d")
+        assert mock_fetch.call_count == 1
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_get_stock_data_incremental_head_gap(self, mock_fetch):
+        """キャッシュ先頭が要求期間より遅い場合は先頭の欠損も補完するテスト"""
+        now = datetime.now().replace(second=0, microsecond=0)
+        cached = self._create_recent_data(
+            30, now - timedelta(minutes=5), now - timedelta(hours=2)
+        )
+        self.collector._save_to_cache(cached)
+        mock_fetch.return_value = None
+
+        self.collector.get_stock_data(self.test_symbol, "1m", period="1mo")
+
+        assert mock_fetch.call_count == 2
+        head_call = mock_fetch.call_args_list[0]
+        assert head_call.kwargs['end'] == cached['timestamp'].iloc[0]
+        first_cached = cached['timestamp'].iloc[0]
+        assert head_call.kwargs['start'] < first_cached - timedelta(days=25)
+
+    @patch('src.data_collector.data_provider.yf.Ticker')
+    def test_fetch_data_yfinance_with_start(self, mock_ticker):
+        """開始日時指定での取得テスト"""
+        mock_ticker_instance = Mock()
+        mock_ticker_instance.history.return_value = pd.DataFrame({
+            'Open': [1000], 'High': [1005], 'Low': [995], 'Close': [1002],
+            'Volume': [10000]
+        }, index=pd.date_range('2024-01-01 09:00', periods=1, freq='1min'))
+        mock_ticker.return_value = mock_ticker_instance
+        start = datetime(2024, 1, 1, 9, 0)
+
+        result = self.collector._fetch_data_yfinance("7203.T", "1m", "1d", start=start)
+
+        assert len(result) == 1
+        mock_ticker_instance.history.assert_called_once_with(
+            start=start, end=None, interval="1m"
+        )
+
+    def _create_daily_data(self, days: int) -> pd.DataFrame:
+        """直近日付で終わる日足テストデータを作成"""
+        data = self.test_data.head(days).copy()
+        data['timestamp'] = pd.date_range(
+            end=pd.Timestamp.now(tz='UTC').normalize() - timedelta(days=1),
+            periods=days, freq='D'
+        )
+        data['interval'] = '1d'
+        data['created_at'] = datetime.now().isoformat()
+        return data
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_get_stock_data_fresh_range_skips_loading_full_history(self, mock_fetch):
+        """取得済み範囲が新鮮な場合は再取得せず要求期間のみ返すテスト"""
+        mock_fetch.return_value = self._create_daily_data(60)
+
+        first = self.collector.get_stock_data(self.test_symbol, "1d", period="3mo")
+        second = self.collector.get_stock_data(self.test_symbol, "1d", period="1mo")
+
+        assert mock_fetch.call_count == 1
+        assert len(first) == 60
+        # 1mo要求では3mo分ではなく直近31日分のみ返す
+        assert 29 <= len(second) <= 31
+        assert self.collector.is_range_fresh(
+            self.test_symbol, "1d",
+            datetime.now() - timedelta(days=30), datetime.now()
+        )
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_get_stock_data_fetches_only_uncovered_head(self, mock_fetch):
+        """短い期間の取得後に長い期間を要求すると未取得の先頭範囲のみ取得するテスト"""
+        recent = self._create_daily_data(5)
+        mock_fetch.return_value = recent
+        self.collector.get_stock_data(self.test_symbol, "1d", period="5d")
+
+        mock_fetch.return_value = None
+        self.collector.get_stock_data(self.test_symbol, "1d", period="1mo")
+
+        assert mock_fetch.call_count == 2
+        head_call = mock_fetch.call_args_list[1]
+        assert head_call.kwargs['end'] == recent['timestamp'].min()
+        first_recent = recent['timestamp'].min()
+        assert head_call.kwargs['start'] < first_recent - timedelta(days=20)
+
+        # 先頭範囲も取得済みとして記録され、3回目は取得しない
+        self.collector.get_stock_data(self.test_symbol, "1d", period="1mo")
+        assert mock_fetch.call_count == 2
+
+    @patch.object(StockDataCollector, '_fetch_data_yfinance')
+    def test_get_stock_data_expired_live_range_fetches_tail(self, mock_fetch):
+        """現在時刻を含む範囲の期限切れ時は末尾のみ取得するテスト"""
+        mock_fetch.return_value = self._create_daily_data(20)
+        self.collector.get_stock_data(self.test_symbol, "1d", period="1mo")
+
+        # 取得時刻を2時間前に書き換えて期限切れにする
+        with sqlite3.connect(self.collector.db_path) as conn:
+            conn.execute(
+                "UPDATE cache_ranges "
+                "SET fetched_at = fetched_at - 7200, range_end = range_end - 7200"
+            )
+
+        mock_fetch.return_value = None
+        result = self.collector.get_stock_data(self.test_symbol, "1d", period="1mo")
+
+        assert mock_fetch.call_count == 2
+        tail_call = mock_fetch.call_args_list[1]
+        assert tail_call.kwargs['end'] is None
+        recent_start = pd.Timestamp.now(tz='UTC') - timedelta(hours=4)
+        assert tail_call.kwargs['start'] > recent_start
+        assert len(result) == 20
+
+    def test_is_range_fresh_without_metadata(self):
+        """メタデータがない場合は新鮮と判定しないテスト"""
+        assert not self.collector.is_range_fresh(
+            self.test_symbol, "1m", datetime.now() - timedelta(hours=1), datetime.now()
+        )
+
+    def test_load_from_cache_time_range_filter(self):
+        """時間範囲指定での読み込みが境界を含めて正しく絞り込まれるテスト"""
+        self.collector._save_to_cache(self.test_data)
+
+        start = self.test_data['timestamp'].iloc[10].to_pydatetime()
+        end = self.test_data['timestamp'].iloc[20].to_pydatetime()
+        loaded = self.collector._load_from_cache(self.test_symbol, "1m", start, end)
+
+        assert len(loaded) == 11
+        assert loaded['timestamp'].iloc[0] == self.test_data['timestamp'].iloc[10]
+
+    def test_timezone_aware_roundtrip(self):
+        """タイムゾーン付きデータは同じタイムゾーンのdatetime64で読み込まれるテスト"""
+        data = self.test_data.copy()
+        data['timestamp'] = data['timestamp'].dt.tz_localize('Asia/Tokyo')
+        self.collector.save_frames([data])
+
+        loaded = self.collector._load_from_cache(self.test_symbol, "1m")
+
+        assert str(loaded['timestamp'].dt.tz) == 'Asia/Tokyo'
+        assert (loaded['timestamp'] == data['timestamp']).all()
+        assert pd.api.types.is_datetime64_any_dtype(loaded['created_at'])
+
+        # タイムゾーンなしの境界は市場現地時刻として整数比較される
+        start = data['timestamp'].iloc[5].tz_localize(None).to_pydatetime()
+        loaded = self.collector._load_from_cache(
+            self.test_symbol, "1m", start_time=start
+        )
+        assert len(loaded) == len(data) - 5
+
+        with sqlite3.connect(self.collector.db_path) as conn:
+            ts, = conn.execute("SELECT MIN(ts) FROM bars").fetchone()
+            tz, = conn.execute(
+                "SELECT tz FROM series WHERE symbol = ?", (self.test_symbol,)
+            ).fetchone()
+        assert ts == data['timestamp'].iloc[0].value
+        assert tz == 'Asia/Tokyo'
+
+    def test_migrate_legacy_text_schema(self):
+        """旧TEXTスキーマのstock_dataテーブルが初期化時にbarsへ移行されるテスト"""
+        legacy_dir = Path(self.temp_dir) / "legacy"
+        legacy_dir.mkdir()
+        with sqlite3.connect(legacy_dir / "stock_data.db") as conn:
+            conn.execute("""
+                CREATE TABLE stock_data (
+                    symbol TEXT, interval TEXT, timestamp TEXT, open REAL, high REAL,
+                    low REAL, close REAL, volume INTEGER, created_at TEXT,
+                    PRIMARY KEY (symbol, interval, timestamp)
+                )
+            """)
+            conn.executemany(
+                "INSERT INTO stock_data VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    ("7203.T", "1d", "2024-01-04 00:00:00+09:00",
+                     100, 101, 99, 100.5, 1000, "2024-01-05T10:00:00"),
+                    ("7203.T", "1d", "2024-01-05 00:00:00+09:00",
+                     101, 102, 100, 101.5, None, None),
+                    ("AAPL", "1d", "2024-01-04 00:00:00-05:00",
+                     180, 181, 179, 180.5, 5000, "2024-01-05T10:00:00"),
+                ]
+            )
+
+        collector = StockDataCollector(cache_dir=str(legacy_dir))
+
+        with sqlite3.connect(collector.db_path) as conn:
+            kind, = conn.execute(
+                "SELECT type FROM sqlite_master WHERE name = 'stock_data'"
+            ).fetchone()
+            count, = conn.execute("SELECT COUNT(*) FROM bars").fetchone()
+        assert kind == 'view'
+        assert count == 3
+
+        loaded = collector._load_from_cache("7203.T", "1d")
+        assert len(loaded) == 2
+        assert loaded['timestamp'].iloc[0] == pd.Timestamp("2024-01-04 00:00:00+09:00")
+        assert pd.isna(loaded['volume'].iloc[1])
+        assert pd.isna(loaded['created_at'].iloc[1])
+        assert collector._load_from_cache("AAPL", "1d")['close'].iloc[0] == 180.5
+
     @patch.object(StockDataCollector, 'get_stock_data')
     def test_get_multiple_stocks(self, mock_get_stock_data):
         """複数銘柄取得テスト"""
@@ -317,6 +622,78 @@ class TestStockDataCollector:
         assert "6758.T" in results
         assert "INVALID.T" not in results
     
+    def _create_batch_download(self, symbols):
+        """yf.download(group_by='ticker')形式のマルチインデックスデータを作成"""
+        index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=5, freq='D')
+        frames = {}
+        for i, symbol in enumerate(symbols):
+            frames[symbol] = pd.DataFrame({
+                'Open': np.arange(5) + 100.0 * (i + 1),
+                'High': np.arange(5) + 101.0 * (i + 1),
+                'Low': np.arange(5) + 99.0 * (i + 1),
+                'Close': np.arange(5) + 100.5 * (i + 1),
+                'Volume': np.arange(5) + 1000
+            }, index=index)
+        data = pd.concat(frames, axis=1)
+        data.index.name = 'Date'
+        return data
+
+    @patch('src.data_collector.data_provider.yf.download')
+    def test_get_multiple_stocks_batched(self, mock_download):
+        """複数銘柄一括ダウンロードモードのテスト"""
+        symbols = ["7203.T", "6758.T", "9984.T", "AAPL", "MSFT"]
+        mock_download.side_effect = (
+            lambda tickers, **kwargs: self._create_batch_download(tickers)
+        )
+
+        results = self.collector.get_multiple_stocks(
+            symbols + ["7203.T"], "1d", "5d", batch_size=2
+        )
+
+        # 重複を除いた5銘柄を2銘柄ずつ3リクエストで取得
+        assert mock_download.call_count == 3
+        assert set(results.keys()) == set(symbols)
+        assert len(results["AAPL"]) == 5
+        assert (results["AAPL"]['symbol'] == "AAPL").all()
+        assert 'close' in results["AAPL"].columns
+
+        # キャッシュに保存され、再実行時はダウンロードしない
+        with sqlite3.connect(self.collector.db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM stock_data").fetchone()[0]
+        assert count == 25
+
+        cached_results = self.collector.get_multiple_stocks(
+            symbols, "1d", "5d", batch_size=2
+        )
+        assert mock_download.call_count == 3
+        assert len(cached_results) == len(symbols)
+
+    @patch('src.data_collector.data_provider.yf.download')
+    def test_get_multiple_stocks_batched_missing_symbol(self, mock_download):
+        """一括ダウンロードで一部銘柄のデータがない場合のテスト"""
+        data = self._create_batch_download(["7203.T", "INVALID.T"]).astype(float)
+        data.loc[:, "INVALID.T"] = np.nan
+        mock_download.return_value = data
+
+        results = self.collector.get_multiple_stocks(
+            ["7203.T", "INVALID.T"], "1d", "5d", batch_size=10
+        )
+
+        assert list(results.keys()) == ["7203.T"]
+
+    @patch('src.data_collector.data_provider.yf.download')
+    def test_get_multiple_stocks_batched_without_cache(self, mock_download):
+        """キャッシュ無効時の一括ダウンロードテスト"""
+        mock_download.side_effect = (
+            lambda tickers, **kwargs: self._create_batch_download(tickers)
+        )
+
+        results = self.collector.get_multiple_stocks(["7203.T", "AAPL"], "1d", "5d",
+                                                     use_cache=False, batch_size=10)
+
+        assert len(results) == 2
+        assert self.collector.get_cache_stats()['total_records'] == 0
+
     def test_clear_cache_specific_symbol(self):
         """特定銘柄のキャッシュクリアテスト"""
         # 複数銘柄のデータを保存
@@ -386,7 +763,7 @@ class TestStockDataCollector:
             'Volume': [10000, 11000]
         }, index=pd.date_range('2024-01-01', periods=2, freq='D'))
         
-        with patch('src.data_collector.stock_data_collector.yf.Ticker') as mock_ticker:
+        with patch('src.data_collector.data_provider.yf.Ticker') as mock_ticker:
             mock_ticker_instance = Mock()
             mock_ticker_instance.history.return_value = yf_data
             mock_ticker.return_value = mock_ticker_instance
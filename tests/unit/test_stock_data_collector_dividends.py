@@ -74,7 +74,7 @@ class TestStockDataCollectorDividends:
             assert 'dividends' not in columns
             assert 'stock_splits' not in columns
     
-    @patch('src.data_collector.stock_data_collector.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_fetch_data_with_dividends_columns(self, mock_ticker):
         """yfinanceから配当・株式分割カラムを含むデータを取得するテスト"""
         # yfinanceの実際の応答を模倣
@@ -145,7 +145,7 @@ class TestStockDataCollectorDividends:
         assert len(loaded_data) == len(old_data)
         assert set(loaded_data['symbol'].unique()) == {'6758.T'}
     
-    @patch('src.data_collector.stock_data_collector.yf.Ticker')
+    @patch('src.data_collector.data_provider.yf.Ticker')
     def test_full_pipeline_with_dividends(self, mock_ticker):
         """配当情報を含む完全なデータパイプラインテスト"""
         # モックデータの設定
@@ -273,8 +273,8 @@ class TestWatchlistStorage:
     
     def test_add_symbol_with_exceptions(self):
         """例外処理テスト"""
-        with patch('sqlite3.connect') as mock_connect:
-            mock_connect.side_effect = sqlite3.Error("Database error")
+        with patch.object(self.storage, '_connect',
+                          side_effect=sqlite3.Error("Database error")):
             result = self.storage.add_symbol("7203")
             assert result is False
     
@@ -282,22 +282,22 @@ class TestWatchlistStorage:
         """削除時の例外処理テスト"""
         self.storage.add_symbol("7203")
         
-        with patch('sqlite3.connect') as mock_connect:
-            mock_connect.side_effect = sqlite3.Error("Database error")
+        with patch.object(self.storage, '_connect',
+                          side_effect=sqlite3.Error("Database error")):
             result = self.storage.remove_symbol("7203.T")
             assert result is False
     
     def test_get_symbols_with_exceptions(self):
         """シンボル取得時の例外処理テスト"""
-        with patch('sqlite3.connect') as mock_connect:
-            mock_connect.side_effect = sqlite3.Error("Database error")
+        with patch.object(self.storage, '_connect',
+                          side_effect=sqlite3.Error("Database error")):
             symbols = self.storage.get_symbols()
             assert symbols == []
     
     def test_get_watchlist_items_with_exceptions(self):
         """ウォッチリストアイテム取得時の例外処理テスト"""
-        with patch('sqlite3.connect') as mock_connect:
-            mock_connect.side_effect = sqlite3.Error("Database error")
+        with patch.object(self.storage, '_connect',
+                          side_effect=sqlite3.Error("Database error")):
             items = self.storage.get_watchlist_items()
             assert items == []
     
@@ -327,8 +327,8 @@ class TestWatchlistStorage:
         self.storage.add_symbol("7203")
         self.storage.add_symbol("AAPL")
         
-        with patch('sqlite3.connect') as mock_connect:
-            mock_connect.side_effect = sqlite3.Error("Database error")
+        with patch.object(self.storage, '_connect',
+                          side_effect=sqlite3.Error("Database error")):
             result = self.storage.reorder_symbols(["AAPL", "7203.T"])
             assert result is False
     
@@ -336,8 +336,8 @@ class TestWatchlistStorage:
         """クリア時の例外処理テスト"""
         self.storage.add_symbol("7203")
         
-        with patch('sqlite3.connect') as mock_connect:
-            mock_connect.side_effect = sqlite3.Error("Database error")
+        with patch.object(self.storage, '_connect',
+                          side_effect=sqlite3.Error("Database error")):
             result = self.storage.clear_watchlist()
             assert result is False
     